@@ -0,0 +1,104 @@
+"""
+Chain Registry
+Prompt templates compiled once at import and `prompt | llm | parser` chains
+composed once per LLM, instead of on every call. System prompts are fixed
+strings and every per-call value goes in the user message, so the prompt
+prefix stays byte-identical across calls and provider prompt caching can hit.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import Runnable
+
+logger = logging.getLogger("agents.chains")
+
+PARSERS = {
+    "str": StrOutputParser,
+    "json": JsonOutputParser,
+}
+
+
+@dataclass
+class ChainSpec:
+    name: str
+    system: str
+    user: str
+    parser: str
+    prompt: ChatPromptTemplate
+
+
+class ChainRegistry:
+    """
+    name -> compiled prompt template; (name, llm) -> composed chain.
+
+    Modules register their prompts at import time and fetch chains with
+    get(name, llm); the chain for a given LLM instance is built on first use
+    (or by prepare() in the owning service's __init__) and reused after that.
+    """
+
+    def __init__(self):
+        self._specs: Dict[str, ChainSpec] = {}
+        self._chains: Dict[Tuple[str, int], Tuple[Any, Runnable]] = {}   # (name, id(llm)) -> (llm, chain)
+        self.stats = {"compiled": 0, "hits": 0}
+
+    def register(self, name: str, system: str, user: str, parser: str = "str") -> ChainSpec:
+        """
+        Compile a prompt template.
+
+        Args:
+            name: Registry key, "<owner>.<step>"
+            system: Static system prompt (literal braces must be doubled)
+            user: User message template holding every per-call variable
+            parser: "str" or "json"
+        """
+        if name in self._specs:
+            raise ValueError(f"Chain already registered: {name}")
+        if parser not in PARSERS:
+            raise ValueError(f"Unknown parser {parser!r} for chain {name}")
+        prompt = ChatPromptTemplate.from_messages([("system", system), ("user", user)])
+        system_vars = prompt.messages[0].input_variables
+        if system_vars:
+            raise ValueError(f"System prompt of {name} must be static, found variables {system_vars}")
+        spec = ChainSpec(name, system, user, parser, prompt)
+        self._specs[name] = spec
+        return spec
+
+    def get(self, name: str, llm: Any) -> Runnable:
+        """The compiled chain for a registered prompt on a given LLM."""
+        key = (name, id(llm))
+        entry = self._chains.get(key)
+        if entry is not None and entry[0] is llm:
+            self.stats["hits"] += 1
+            return entry[1]
+        spec = self._specs[name]
+        chain = spec.prompt | llm | PARSERS[spec.parser]()
+        self._chains[key] = (llm, chain)
+        self.stats["compiled"] += 1
+        return chain
+
+    def prepare(self, llms: List[Any], *names: str):
+        """Compile chains up front (service startup) for every available LLM."""
+        for llm in filter(None, llms):
+            for name in names:
+                self.get(name, llm)
+
+    def spec(self, name: str) -> ChainSpec:
+        return self._specs[name]
+
+    def names(self) -> List[str]:
+        return sorted(self._specs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "templates": len(self._specs),
+            "chains": len(self._chains),
+        }
+
+
+# Module-level singleton
+chain_registry = ChainRegistry()
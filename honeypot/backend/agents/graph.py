@@ -5,9 +5,9 @@ from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, SystemMessage
 from langgraph.graph import StateGraph, END
-from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 
+from agents.chains import chain_registry
+from agents.llm_router import PROVIDER_MAX_RETRIES, llm_router
 from agents.prompts import (
     SYSTEM_PROMPT, 
     PERSONA_PROMPT, 
@@ -17,6 +17,15 @@ from agents.prompts import (
 )
 from config import settings
 
+# Prompt chains, compiled once (agents/chains.py)
+chain_registry.register("honeypot.intent", INTENT_ANALYSIS_PROMPT, "{input}", parser="json")
+chain_registry.register(
+    "honeypot.response",
+    f"{SYSTEM_PROMPT}\n\n{PERSONA_PROMPT}\n\n{RESPONSE_PLANNER_PROMPT}",
+    "Context: {history}\nStrategy: {strategy}"
+)
+chain_registry.register("honeypot.humanize", HUMANIZER_PROMPT, "Input: {text}")
+
 # State Definition
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
@@ -34,40 +43,36 @@ class HoneyPotAgent:
         
         # Primary LLM (Groq)
         if self.groq_key:
-            self.llm = ChatGroq(temperature=0.7, model_name="llama-3.3-70b-versatile", api_key=self.groq_key)
+            self.llm = ChatGroq(temperature=0.7, model_name="llama-3.3-70b-versatile", api_key=self.groq_key,
+                                base_url=settings.GROQ_BASE_URL or None, max_retries=PROVIDER_MAX_RETRIES)
         else:
             self.llm = None
             
         # Fallback (Gemini)
         if self.gemini_key:
-            self.fallback_llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=self.gemini_key)
+            self.fallback_llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=self.gemini_key,
+                                                       base_url=settings.GEMINI_BASE_URL or None,
+                                                       max_retries=PROVIDER_MAX_RETRIES)
         else:
             self.fallback_llm = None
 
+        # Candidates in preference order; llm_router picks the healthiest per call
+        self.llms = [llm for llm in (self.llm, self.fallback_llm) if llm]
+        chain_registry.prepare(
+            self.llms, "honeypot.intent", "honeypot.response", "honeypot.humanize"
+        )
         self.workflow = self._build_graph()
 
-    def _get_llm(self):
-        return self.llm if self.llm else self.fallback_llm
-
-    def _analyze_intent(self, state: AgentState):
+    async def _analyze_intent(self, state: AgentState):
         """Node 1: Analyze scamer intent"""
         messages = state["messages"]
         last_msg = messages[-1].content
         
-        llm = self._get_llm()
-        if not llm:
+        if not self.llms:
              return {"intent": "scam", "emotion": "aggressive", "strategy": "stall"}
 
-        # New pattern: System prompt + User input
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", INTENT_ANALYSIS_PROMPT),
-            ("user", "{input}")
-        ])
-        
-        chain = prompt | llm | JsonOutputParser()
-        
         try:
-            result = chain.invoke({"input": last_msg})
+            result = await llm_router.ainvoke("honeypot.intent", {"input": last_msg}, self.llms, "chat")
             return {
                 "intent": result.get("intent", "unknown"),
                 "emotion": result.get("emotion", "neutral"),
@@ -83,51 +88,33 @@ class HoneyPotAgent:
                  "behavioral_notes": "Scammer is engaging in suspicious behavior."
              }
 
-    def _generate_response(self, state: AgentState):
+    async def _generate_response(self, state: AgentState):
         """Node 2: Generate draft response"""
-        # Format history simply
-        history_text = "\n".join([f"{m.type}: {m.content}" for m in state["messages"][-5:]])
-        
-        # Combine System + Persona + Strategy + History
-        full_system_prompt = f"{SYSTEM_PROMPT}\n\n{PERSONA_PROMPT}\n\n{RESPONSE_PLANNER_PROMPT}"
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", full_system_prompt),
-            ("user", "Context: {history}\nStrategy: {strategy}")
-        ])
-        
-        llm = self._get_llm()
-        if not llm:
+        # History arrives already trimmed to the AgentMemory token budget
+        history_text = "\n".join([f"{m.type}: {m.content}" for m in state["messages"]])
+
+        if not self.llms:
             return {"draft_response": "I am not sure what do you mean. Can you explain?"}
 
-        chain = prompt | llm | StrOutputParser()
-        
+        # System + Persona + Strategy prompt is static; history goes in the user turn
         try:
-            result = chain.invoke({
+            result = await llm_router.ainvoke("honeypot.response", {
                 "history": history_text,
                 "strategy": state["strategy"]
-            })
+            }, self.llms, "chat")
             return {"draft_response": result}
         except Exception:
             return {"draft_response": "I am confused."}
 
-    def _humanize(self, state: AgentState):
+    async def _humanize(self, state: AgentState):
         """Node 3: Humanize the output"""
         draft = state["draft_response"]
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", HUMANIZER_PROMPT),
-            ("user", "Input: {text}")
-        ])
-        
-        llm = self._get_llm()
-        if not llm:
+        if not self.llms:
              return {"final_response": draft, "turn_count": state["turn_count"] + 1}
 
-        chain = prompt | llm | StrOutputParser()
-        
         try:
-            result = chain.invoke({"text": draft})
+            result = await llm_router.ainvoke("honeypot.humanize", {"text": draft}, self.llms, "chat")
         except:
             result = draft
             
@@ -0,0 +1,553 @@
+"""
+LLM Provider Router
+Routes each LLM call to the healthiest provider (Groq, Gemini) for its request
+class, using rolling latency and error rates per model, with a circuit breaker
+per model that opens on error spikes and 429 storms. A slow-but-alive provider
+loses latency-sensitive traffic instead of taking every request. Each attempt
+first waits for a slot from agents/llm_scheduler.py (priority lanes, per-provider
+concurrency and token budgets). Live calls can
+opt into hedging: if the primary is slower than its usual tail, a duplicate goes
+to the next provider and whichever answers first wins.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+from langchain_core.exceptions import OutputParserException
+
+from agents.chains import chain_registry
+from agents.llm_scheduler import LLMQueueTimeout, estimate_tokens, llm_scheduler
+from agents.llm_usage import llm_usage
+from config import settings
+from core.rate_limiter import TokenBucket
+
+logger = logging.getLogger("agents.llm_router")
+
+T = TypeVar("T")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# SDK-level retries for the provider clients. Kept at 0: a client that sleeps
+# out a 429's Retry-After or retries 5xx itself hides the failure from the
+# router, which would otherwise fail over at once and open the breaker.
+PROVIDER_MAX_RETRIES = 0
+
+
+@dataclass(frozen=True)
+class RequestClass:
+    timeout: float              # Per-attempt deadline (s) before failing over
+    latency_weight: float       # How much measured latency outweighs provider order
+
+
+# live voice turns > chat replies > detection > background work
+REQUEST_CLASSES: Dict[str, RequestClass] = {
+    "live": RequestClass(timeout=8.0, latency_weight=1.0),
+    "chat": RequestClass(timeout=20.0, latency_weight=0.5),
+    "detection": RequestClass(timeout=15.0, latency_weight=0.5),
+    "background": RequestClass(timeout=60.0, latency_weight=0.1),
+}
+
+
+class LLMUnavailableError(Exception):
+    """No configured provider could serve the request."""
+
+
+def provider_name(llm: Any) -> str:
+    """Health is tracked per provider model, shared by every instance of it."""
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None) or "default"
+    family = type(llm).__name__.replace("Chat", "").lower()
+    return f"{family}:{model}"
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return "ratelimit" in text or "rate limit" in text or "resourceexhausted" in text or " 429" in text
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Retry-After from the provider's response, if it sent one."""
+    response = getattr(error, "response", None)
+    value = getattr(response, "headers", {}).get("retry-after") if response is not None else None
+    if value is None:
+        match = re.search(r"try again in ([\d.]+)s", str(error))
+        value = match.group(1) if match else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class ProviderHealth:
+    """Rolling latency / error window and circuit breaker for one provider model."""
+
+    def __init__(
+        self,
+        name: str,
+        window_s: float,
+        error_rate: float,
+        min_requests: int,
+        storm_429: int,
+        cooldown_s: float,
+        max_cooldown_s: float
+    ):
+        self.name = name
+        self.window_s = window_s
+        self.error_rate_threshold = error_rate
+        self.min_requests = min_requests
+        self.storm_429 = storm_429
+        self.cooldown_s = cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+
+        self._outcomes: Deque[Tuple[float, bool]] = deque()     # (time, ok)
+        self._rate_limits: Deque[float] = deque()
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=100)
+        self.ewma: Optional[float] = None
+        self.state = CLOSED
+        self.open_until = 0.0
+        self._trips = 0                     # consecutive opens, for back-off
+        self._probing = False
+        self.stats = {
+            "requests": 0,
+            "successes": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "timeouts": 0,
+            "abandoned": 0,             # lost a hedge race and was cancelled
+            "opens": 0,
+        }
+
+    # ── Breaker ───────────────────────────────────────────────────
+
+    def available(self, now: float) -> bool:
+        """Would allow() let a request through (without claiming the probe)."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            return now >= self.open_until
+        return not self._probing
+
+    def allow(self, now: float) -> bool:
+        """Claim a request slot; half-open lets exactly one probe through."""
+        if not self.available(now):
+            return False
+        if self.state != CLOSED:
+            self.state = HALF_OPEN
+            self._probing = True
+        return True
+
+    def _open(self, now: float, reason: str, hint: Optional[float] = None):
+        self._trips += 1
+        cooldown = min(self.cooldown_s * 2 ** (self._trips - 1), self.max_cooldown_s)
+        if hint:
+            cooldown = max(cooldown, min(hint, self.max_cooldown_s))
+        self.state = OPEN
+        self.open_until = now + cooldown
+        self._probing = False
+        self.stats["opens"] += 1
+        logger.warning(f"⚡ LLM circuit OPEN for {self.name} ({reason}), retry in {cooldown:.0f}s")
+
+    # ── Outcomes ──────────────────────────────────────────────────
+
+    def record_success(self, latency: float, now: float):
+        self.stats["requests"] += 1
+        self.stats["successes"] += 1
+        self._outcomes.append((now, True))
+        self._observe_latency(latency, now)
+        if self.state != CLOSED:
+            # Recovered: start a fresh window so old errors can't re-trip it at once
+            logger.info(f"✅ LLM circuit closed for {self.name}")
+            self._outcomes = deque([(now, True)])
+            self._rate_limits.clear()
+        self.state = CLOSED
+        self._trips = 0
+        self._probing = False
+
+    def record_failure(self, error: BaseException, latency: float, now: float):
+        self.stats["requests"] += 1
+        self.stats["errors"] += 1
+        self._outcomes.append((now, False))
+        if isinstance(error, asyncio.TimeoutError):
+            self.stats["timeouts"] += 1
+            # A timeout is a latency sample too: the provider is at least this slow
+            self._observe_latency(latency, now)
+
+        if self.state == HALF_OPEN:
+            self._open(now, f"probe failed: {type(error).__name__}", retry_after(error))
+            return
+
+        if is_rate_limited(error):
+            self.stats["rate_limited"] += 1
+            self._rate_limits.append(now)
+            self._trim(now)
+            if len(self._rate_limits) >= self.storm_429:
+                self._open(now, f"{len(self._rate_limits)} rate limits", retry_after(error))
+                return
+
+        self._trim(now)
+        if len(self._outcomes) >= self.min_requests and self.error_rate(now) >= self.error_rate_threshold:
+            self._open(now, f"error rate {self.error_rate(now):.0%}")
+
+    def record_abandoned(self, latency: float, now: float):
+        """Cancelled after a hedge won: not an error, but it was at least this slow."""
+        self.stats["abandoned"] += 1
+        if self.state == HALF_OPEN:
+            self._probing = False
+        self._observe_latency(latency, now)
+
+    def _observe_latency(self, latency: float, now: float):
+        self._latencies.append((now, latency))
+        if self.ewma is None:
+            self.ewma = latency
+        else:
+            # React to slowdowns within a few calls, forget them more gradually
+            alpha = 0.5 if latency > self.ewma else 0.2
+            self.ewma += alpha * (latency - self.ewma)
+
+    def _trim(self, now: float):
+        cutoff = now - self.window_s
+        while self._outcomes and self._outcomes[0][0] < cutoff:
+            self._outcomes.popleft()
+        while self._rate_limits and self._rate_limits[0] < cutoff:
+            self._rate_limits.popleft()
+
+    # ── Metrics ───────────────────────────────────────────────────
+
+    def error_rate(self, now: float) -> float:
+        self._trim(now)
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def error_score(self, now: float) -> float:
+        """Error rate smoothed over at least `min_requests`, so one blip doesn't reroute."""
+        self._trim(now)
+        errors = sum(1 for _, ok in self._outcomes if not ok)
+        return errors / max(len(self._outcomes), self.min_requests)
+
+    def expected_latency(self, now: float) -> float:
+        """EWMA latency. No recent samples counts as fast, so a provider that
+        was routed away from gets one request (and a fresh sample) per window."""
+        if self.ewma is None or not self._latencies or now - self._latencies[-1][0] > self.window_s:
+            return 0.0
+        return self.ewma
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self._latencies:
+            return None
+        ordered = sorted(latency for _, latency in self._latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            **self.stats,
+            "state": self.state,
+            "open_for_s": round(max(self.open_until - now, 0.0), 1) if self.state == OPEN else 0.0,
+            "error_rate": round(self.error_rate(now), 3),
+            "ewma_ms": round(self.ewma * 1000) if self.ewma is not None else None,
+            "p50_ms": round(p50 * 1000) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000) if p95 is not None else None,
+        }
+
+
+class LLMRouter:
+    """
+    Shared by every LLM-using service. Callers pass their candidate models in
+    preference order (e.g. [groq, gemini]); the router ranks the ones whose
+    breaker allows traffic and fails over down the ranking on errors/timeouts.
+    """
+
+    ORDER_PENALTY_S = 0.3       # Preference order expressed as seconds of latency
+    ERROR_PENALTY_S = 3.0       # Seconds of latency per 100% (smoothed) error rate
+    HEDGE_MIN_SAMPLES = 20      # Latency samples before the percentile deadline is trusted
+    HEDGE_MIN_DELAY_S = 0.3     # Never hedge sooner than this
+    RATE_LIMIT_PAUSE_S = 10.0   # Token-budget pause on a 429 without Retry-After
+
+    def __init__(
+        self,
+        window_s: float = 60.0,
+        error_rate: float = 0.5,
+        min_requests: int = 5,
+        storm_429: int = 3,
+        cooldown_s: float = 30.0,
+        max_cooldown_s: float = 300.0,
+        hedge_enabled: bool = False,
+        hedge_percentile: float = 0.9,
+        hedge_delay_s: float = 1.5,
+        hedge_max_per_min: float = 30
+    ):
+        self._config = dict(
+            window_s=window_s,
+            error_rate=error_rate,
+            min_requests=min_requests,
+            storm_429=storm_429,
+            cooldown_s=cooldown_s,
+            max_cooldown_s=max_cooldown_s
+        )
+        self._health: Dict[str, ProviderHealth] = {}
+        self.stats = {
+            "requests": 0,
+            "failovers": 0,
+            "unavailable": 0,
+        }
+        self._routed: Dict[str, Dict[str, int]] = {}     # request class -> provider -> count
+
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay_s = hedge_delay_s
+        # Spend cap: hedges/min, with ~10 s of burst
+        self._hedge_budget = TokenBucket(
+            "llm_hedge", hedge_max_per_min, burst=max(1, int(hedge_max_per_min // 6))
+        )
+        self.hedge_stats = {
+            "eligible": 0,          # hedge=True requests while hedging is enabled
+            "hedged": 0,            # deadline passed, duplicate sent
+            "hedge_wins": 0,        # duplicate answered first
+            "capped": 0,            # deadline passed, budget exhausted
+        }
+
+    def health(self, llm: Any) -> ProviderHealth:
+        name = provider_name(llm)
+        health = self._health.get(name)
+        if health is None:
+            health = self._health[name] = ProviderHealth(name, **self._config)
+        return health
+
+    def rank(self, llms: List[Any], request_class: str = "chat") -> List[Any]:
+        """Candidates whose breaker allows a request, best first."""
+        cls = REQUEST_CLASSES.get(request_class, REQUEST_CLASSES["chat"])
+        now = time.monotonic()
+        scored = []
+        for order, llm in enumerate(filter(None, llms)):
+            health = self.health(llm)
+            score = (
+                cls.latency_weight * health.expected_latency(now)
+                + order * self.ORDER_PENALTY_S
+                + health.error_score(now) * self.ERROR_PENALTY_S
+            )
+            scored.append((score, order, llm, health))
+        scored.sort(key=lambda item: (item[0], item[1]))
+        return [llm for _, _, llm, health in scored if health.available(now)]
+
+    def hedge_delay(self, llm: Any) -> float:
+        """How long to wait on `llm` before hedging: its latency percentile."""
+        health = self.health(llm)
+        delay = self.hedge_delay_s
+        if len(health._latencies) >= self.HEDGE_MIN_SAMPLES:
+            delay = health.percentile(self.hedge_percentile) or delay
+        return max(delay, self.HEDGE_MIN_DELAY_S)
+
+    async def _attempt(
+        self,
+        llm: Any,
+        call: Callable[[Any], Awaitable[T]],
+        request_class: str,
+        timeout: float,
+        tokens: Optional[int] = None,
+        node: str = "adhoc"
+    ) -> T:
+        """
+        One call on a provider whose breaker slot was already claimed: queue for
+        a scheduler slot, then time the call and record health.
+
+        Raises:
+            LLMQueueTimeout: no scheduler slot within `timeout` (provider health untouched)
+        """
+        health = self.health(llm)
+        try:
+            async with llm_scheduler.slot(health.name, request_class, tokens, max_wait=timeout):
+                start = time.monotonic()
+                try:
+                    with llm_usage.track(node, health.name, request_class):
+                        result = await asyncio.wait_for(call(llm), timeout=timeout)
+                except OutputParserException:
+                    # The provider answered; bad output isn't a health problem
+                    health.record_success(time.monotonic() - start, time.monotonic())
+                    raise
+                except Exception as e:
+                    health.record_failure(e, time.monotonic() - start, time.monotonic())
+                    if is_rate_limited(e):
+                        llm_scheduler.penalize(health.name, retry_after(e) or self.RATE_LIMIT_PAUSE_S)
+                    logger.warning(f"LLM {health.name} failed for {request_class} "
+                                   f"({type(e).__name__}: {str(e)[:120]})")
+                    raise
+        except (asyncio.CancelledError, LLMQueueTimeout):
+            if health.state == HALF_OPEN:
+                health._probing = False
+            raise
+        health.record_success(time.monotonic() - start, time.monotonic())
+        routed = self._routed.setdefault(request_class, {})
+        routed[health.name] = routed.get(health.name, 0) + 1
+        return result
+
+    async def _hedged(
+        self,
+        primary: Any,
+        backups: Deque[Any],
+        call: Callable[[Any], Awaitable[T]],
+        request_class: str,
+        timeout: float,
+        tokens: Optional[int] = None,
+        node: str = "adhoc"
+    ) -> T:
+        """
+        Run on `primary`; if it hasn't answered by its hedge deadline, race a
+        duplicate on the next available backup (or the same model when it is
+        the only one). First success wins, the other is cancelled.
+        """
+        self.hedge_stats["eligible"] += 1
+        start = time.monotonic()
+        first = asyncio.ensure_future(self._attempt(primary, call, request_class, timeout, tokens, node))
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_delay(primary))
+        except asyncio.CancelledError:
+            first.cancel()
+            raise
+        if done:
+            return first.result()
+
+        now = time.monotonic()
+        backup = next((llm for llm in backups if self.health(llm).available(now)), None)
+        if backup is None and self.health(primary).state == CLOSED:
+            backup = primary
+        if backup is None:
+            return await first
+        if self._hedge_budget.reserve(max_wait=0) is None:
+            self.hedge_stats["capped"] += 1
+            return await first
+        if backup is not primary:
+            backups.remove(backup)
+            self.health(backup).allow(now)
+
+        self.hedge_stats["hedged"] += 1
+        second = asyncio.ensure_future(self._attempt(backup, call, request_class, timeout, tokens, node))
+        racing = {first, second}
+        error: Optional[BaseException] = None
+        try:
+            while racing:
+                done, racing = await asyncio.wait(racing, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedge_stats["hedge_wins"] += 1
+                            if not first.done():
+                                self.health(primary).record_abandoned(
+                                    time.monotonic() - start, time.monotonic()
+                                )
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in (first, second):
+                if not task.done():
+                    task.cancel()
+
+    async def arun(
+        self,
+        llms: List[Any],
+        call: Callable[[Any], Awaitable[T]],
+        request_class: str = "chat",
+        timeout: Optional[float] = None,
+        hedge: bool = False,
+        tokens: Optional[int] = None,
+        node: str = "adhoc"
+    ) -> T:
+        """
+        Run `call(llm)` on the best provider, failing over on errors.
+
+        Args:
+            llms: Candidate models in preference order (None entries ignored)
+            call: async fn(llm) -> result
+            request_class: "live" | "chat" | "detection" | "background"
+            timeout: Per-attempt deadline, defaults to the class's
+            hedge: Race a duplicate on the next provider if the first is slow
+                (only when LLM_HEDGE_ENABLED)
+            tokens: Estimated prompt + completion tokens, for the provider's token budget
+            node: Name the call is accounted under (agents/llm_usage.py)
+
+        Raises:
+            LLMUnavailableError: every candidate is open or failed
+        """
+        cls = REQUEST_CLASSES.get(request_class, REQUEST_CLASSES["chat"])
+        timeout = timeout or cls.timeout
+        self.stats["requests"] += 1
+        last_error: Optional[BaseException] = None
+
+        candidates = deque(self.rank(llms, request_class))
+        attempts = 0
+        while candidates:
+            llm = candidates.popleft()
+            if not self.health(llm).allow(time.monotonic()):
+                continue
+            if attempts:
+                self.stats["failovers"] += 1
+            attempts += 1
+            try:
+                if hedge and self.hedge_enabled and attempts == 1:
+                    return await self._hedged(llm, candidates, call, request_class, timeout, tokens, node)
+                return await self._attempt(llm, call, request_class, timeout, tokens, node)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                last_error = e
+
+        self.stats["unavailable"] += 1
+        if last_error is not None:
+            raise LLMUnavailableError(f"All LLM providers failed: {last_error}") from last_error
+        raise LLMUnavailableError("No LLM provider available (unconfigured or circuits open)")
+
+    async def ainvoke(
+        self,
+        chain_name: str,
+        inputs: Dict[str, Any],
+        llms: List[Any],
+        request_class: str = "chat",
+        hedge: bool = False
+    ) -> Any:
+        """Run a registered chain (agents/chains.py) through the router."""
+        return await self.arun(
+            llms,
+            lambda llm: chain_registry.get(chain_name, llm).ainvoke(inputs),
+            request_class,
+            hedge=hedge,
+            tokens=estimate_tokens(chain_registry.spec(chain_name).system, *inputs.values()),
+            node=chain_name
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            **self.stats,
+            "providers": {name: h.snapshot(now) for name, h in self._health.items()},
+            "routed": self._routed,
+            "hedging": self._hedge_snapshot(),
+        }
+
+    def _hedge_snapshot(self) -> Dict[str, Any]:
+        eligible, hedged = self.hedge_stats["eligible"], self.hedge_stats["hedged"]
+        return {
+            "enabled": self.hedge_enabled,
+            **self.hedge_stats,
+            "hedge_rate": round(hedged / eligible, 3) if eligible else 0.0,
+            "win_rate": round(self.hedge_stats["hedge_wins"] / hedged, 3) if hedged else 0.0,
+            "budget": self._hedge_budget.get_stats(),
+        }
+
+
+# Module-level singleton
+llm_router = LLMRouter(
+    error_rate=getattr(settings, 'LLM_BREAKER_ERROR_RATE', 0.5),
+    storm_429=getattr(settings, 'LLM_BREAKER_429_STORM', 3),
+    cooldown_s=getattr(settings, 'LLM_BREAKER_COOLDOWN_S', 30.0),
+    hedge_enabled=getattr(settings, 'LLM_HEDGE_ENABLED', False),
+    hedge_percentile=getattr(settings, 'LLM_HEDGE_PERCENTILE', 0.9),
+    hedge_delay_s=getattr(settings, 'LLM_HEDGE_DELAY_S', 1.5),
+    hedge_max_per_min=getattr(settings, 'LLM_HEDGE_MAX_PER_MIN', 30)
+)
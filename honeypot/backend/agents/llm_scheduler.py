@@ -0,0 +1,243 @@
+"""
+LLM Scheduler
+Process-wide admission control for LLM calls. Each provider model gets a
+concurrency limit and a token-per-minute budget (core.rate_limiter.TokenBucket);
+waiting calls are served by priority lane, live voice > chat > detection >
+background, and lower lanes leave headroom so they yield under pressure.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from config import settings
+from core.rate_limiter import TokenBucket
+
+logger = logging.getLogger("agents.llm_scheduler")
+
+LANES = ("live", "chat", "detection", "background")
+PRIORITY = {lane: i for i, lane in enumerate(LANES)}
+
+# Fraction of a provider's concurrency each lane may fill. Live can take every
+# slot; background never takes more than a quarter. Calls wait in the queue,
+# not in a slot, until the token budget covers them, so a backlog of
+# extraction can't delay a live turn.
+LANE_SHARE = {
+    "live": 1.0,
+    "chat": 0.75,
+    "detection": 0.5,
+    "background": 0.25,
+}
+
+OUTPUT_TOKENS = 300         # Completion allowance added to prompt estimates
+DEFAULT_TOKENS = 1000       # Estimate when the caller can't size its prompt
+
+
+def estimate_tokens(*texts: Any) -> int:
+    """Rough prompt + completion size (~4 chars per token)."""
+    return sum(len(str(text)) for text in texts) // 4 + OUTPUT_TOKENS
+
+
+class LLMQueueTimeout(Exception):
+    """Waited longer than allowed for a provider slot (local, not a provider error)."""
+
+
+class ProviderQueue:
+    """Concurrency slots, token budget and priority wait queue for one provider model."""
+
+    def __init__(self, name: str, concurrency: int, tokens_per_min: float):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.bucket: Optional[TokenBucket] = None
+        if tokens_per_min:
+            self.bucket = TokenBucket(
+                f"llm:{name}", tokens_per_min, burst=max(1, int(tokens_per_min // 6))
+            )
+        self.in_flight = 0
+        # heap of (priority, seq, future, lane, tokens, deadline)
+        self._waiters: List[Tuple[int, int, asyncio.Future, str, int, Optional[float]]] = []
+        self._seq = itertools.count()
+        self._wakeup: Optional[asyncio.TimerHandle] = None
+        self.lanes = {
+            lane: {"granted": 0, "timeouts": 0, "wait_s": 0.0, "max_wait_s": 0.0}
+            for lane in LANES
+        }
+
+    def _limit(self, lane: str) -> int:
+        return max(1, int(self.concurrency * LANE_SHARE[lane]))
+
+    def _dispatch(self):
+        """Grant slots to the head of the queue while it is admissible (strict priority)."""
+        while self._waiters:
+            _, _, future, lane, tokens, deadline = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)        # cancelled / timed out while queued
+                continue
+            if self.in_flight >= self._limit(lane):
+                return
+            delay = self.bucket.time_until(tokens) if self.bucket else 0.0
+            if delay:
+                if deadline is not None and time.monotonic() + delay > deadline:
+                    # Budget paused (429) or short: fail now so the router can fail over
+                    heapq.heappop(self._waiters)
+                    future.set_exception(LLMQueueTimeout(
+                        f"{lane} call would wait {delay:.1f}s for {self.name} token budget"
+                    ))
+                    continue
+                self._schedule_wakeup(max(delay, 0.05))
+                return
+            heapq.heappop(self._waiters)
+            if self.bucket:
+                self.bucket.reserve(tokens)         # calls over the burst leave a debt
+            self.in_flight += 1
+            future.set_result(None)
+
+    def _schedule_wakeup(self, delay: float):
+        loop = asyncio.get_running_loop()
+        if self._wakeup is not None:
+            if self._wakeup.when() <= loop.time() + delay:
+                return
+            self._wakeup.cancel()
+
+        def wake():
+            self._wakeup = None
+            self._dispatch()
+
+        self._wakeup = loop.call_later(delay, wake)
+
+    async def acquire(self, lane: str, tokens: int, max_wait: Optional[float] = None):
+        """
+        Wait for a slot in priority order. The token budget is waited for in
+        the queue, before a slot is taken, and counts against max_wait.
+
+        Raises:
+            LLMQueueTimeout: no slot within max_wait, or the token budget
+                (e.g. paused by a 429 Retry-After) can't cover the call in time
+        """
+        enqueued = time.monotonic()
+        deadline = enqueued + max_wait if max_wait is not None else None
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITY[lane], next(self._seq), future, lane, tokens, deadline))
+        self._dispatch()
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout=max_wait)
+        except LLMQueueTimeout:
+            self.lanes[lane]["timeouts"] += 1
+            raise
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self.release()          # granted at the same moment; hand it back
+            else:
+                future.cancel()
+            if isinstance(e, asyncio.TimeoutError):
+                self.lanes[lane]["timeouts"] += 1
+                raise LLMQueueTimeout(
+                    f"{lane} call waited over {max_wait:.1f}s for {self.name}"
+                ) from None
+            raise
+
+        waited = time.monotonic() - enqueued
+        stats = self.lanes[lane]
+        stats["granted"] += 1
+        stats["wait_s"] = round(stats["wait_s"] + waited, 3)
+        stats["max_wait_s"] = round(max(stats["max_wait_s"], waited), 3)
+
+    def release(self):
+        self.in_flight = max(0, self.in_flight - 1)
+        self._dispatch()
+
+    def get_stats(self) -> Dict[str, Any]:
+        queued = {lane: 0 for lane in LANES}
+        for _, _, future, lane, _, _ in self._waiters:
+            if not future.done():
+                queued[lane] += 1
+        return {
+            "in_flight": self.in_flight,
+            "concurrency": self.concurrency,
+            "queue_depth": sum(queued.values()),
+            "lanes": {
+                lane: {
+                    **stats,
+                    "queued": queued[lane],
+                    "avg_wait_ms": round(stats["wait_s"] / stats["granted"] * 1000) if stats["granted"] else 0,
+                }
+                for lane, stats in self.lanes.items()
+            },
+            "tokens": self.bucket.get_stats() if self.bucket else None,
+        }
+
+
+class LLMScheduler:
+    """
+    One ProviderQueue per provider model. llm_router wraps every provider
+    attempt in slot(), so queueing time is kept out of provider latency.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[int, float]], default: Tuple[int, float] = (8, 0)):
+        self._limits = limits               # provider family -> (concurrency, tokens/min)
+        self._default = default
+        self._queues: Dict[str, ProviderQueue] = {}
+
+    def queue(self, name: str) -> ProviderQueue:
+        """Queue for a provider model name ("groq:llama-3.3-70b-versatile")."""
+        queue = self._queues.get(name)
+        if queue is None:
+            family = name.split(":", 1)[0]
+            concurrency, tokens_per_min = self._limits.get(family, self._default)
+            queue = self._queues[name] = ProviderQueue(name, concurrency, tokens_per_min)
+        return queue
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        name: str,
+        request_class: str = "chat",
+        tokens: Optional[int] = None,
+        max_wait: Optional[float] = None
+    ) -> AsyncIterator[None]:
+        """
+        Hold a concurrency slot on a provider for the duration of one call.
+
+        Args:
+            name: Provider model name
+            request_class: Priority lane ("live" | "chat" | "detection" | "background")
+            tokens: Estimated prompt + completion tokens
+            max_wait: Give up queueing after this many seconds
+
+        Raises:
+            LLMQueueTimeout: no slot within max_wait
+        """
+        lane = request_class if request_class in PRIORITY else "chat"
+        queue = self.queue(name)
+        await queue.acquire(lane, tokens or DEFAULT_TOKENS, max_wait)
+        try:
+            yield
+        finally:
+            queue.release()
+
+    def penalize(self, name: str, retry_after: float):
+        """Provider returned 429: pause its token budget for Retry-After."""
+        queue = self.queue(name)
+        if queue.bucket is not None:
+            queue.bucket.penalize(retry_after)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {name: queue.get_stats() for name, queue in self._queues.items()}
+
+
+# Module-level singleton
+llm_scheduler = LLMScheduler({
+    "groq": (
+        getattr(settings, 'LLM_GROQ_CONCURRENCY', 8),
+        getattr(settings, 'LLM_GROQ_TOKENS_PER_MIN', 12000)
+    ),
+    "googlegenerativeai": (
+        getattr(settings, 'LLM_GEMINI_CONCURRENCY', 8),
+        getattr(settings, 'LLM_GEMINI_TOKENS_PER_MIN', 250000)
+    ),
+})
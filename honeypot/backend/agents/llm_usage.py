@@ -0,0 +1,262 @@
+"""
+LLM Usage
+Per-node accounting for every LLM call made through llm_router: wall time,
+time to first token, prompt / completion / cached tokens, provider, errors and
+cost. Aggregates feed core.metrics (GET /metrics); calls made while a session
+is bound are also $inc'ed onto that session's document under `llm_usage`.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.exceptions import OutputParserException
+from langchain_core.outputs import LLMResult
+from langchain_core.tracers.context import register_configure_hook
+
+from config import settings
+from core.metrics import metrics
+from db.mongo import db
+
+logger = logging.getLogger("agents.llm_usage")
+
+# USD per 1M tokens (input, output); unknown models are counted at 0
+PRICES: Dict[str, Tuple[float, float]] = {
+    "llama-3.3-70b-versatile": (0.59, 0.79),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-1.5-flash": (0.075, 0.30),
+}
+
+SessionRef = Tuple[str, str, str]       # (collection, key field, id)
+
+_session: ContextVar[Optional[SessionRef]] = ContextVar("llm_usage_session", default=None)
+_handler: ContextVar[Optional["UsageCallbackHandler"]] = ContextVar("llm_usage_handler", default=None)
+
+# Every LangChain run started while _handler is set gets it as a callback,
+# including chains built inside caller lambdas.
+register_configure_hook(_handler, inheritable=True)
+
+
+def bind_session(session_id: str, collection: str = "sessions", key: str = "session_id"):
+    """
+    Attribute LLM calls in the current task (and tasks it creates) to a
+    session document.
+
+    Args:
+        session_id: Document id value
+        collection: "sessions" (chat / voice / takeover) or "live_calls"
+        key: Id field in that collection
+    """
+    if session_id:
+        _session.set((collection, key, session_id))
+
+
+@dataclass
+class LLMCall:
+    node: str
+    provider: str
+    request_class: str
+    started: float
+    session: Optional[SessionRef] = None
+    first_token: Optional[float] = None
+    finished: Optional[float] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+
+    def add_usage(self, response: LLMResult):
+        found = False
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if not usage:
+                    continue
+                found = True
+                self.prompt_tokens += usage.get("input_tokens", 0)
+                self.completion_tokens += usage.get("output_tokens", 0)
+                self.cached_tokens += (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+        if not found:
+            token_usage = (response.llm_output or {}).get("token_usage") or {}
+            self.prompt_tokens += token_usage.get("prompt_tokens", 0)
+            self.completion_tokens += token_usage.get("completion_tokens", 0)
+
+
+class UsageCallbackHandler(BaseCallbackHandler):
+    """Collects token timing and usage for the LLM run(s) of one routed call."""
+
+    run_inline = True
+
+    def __init__(self, call: LLMCall):
+        self.call = call
+
+    def on_llm_new_token(self, token: str, **kwargs: Any):
+        if self.call.first_token is None:
+            self.call.first_token = time.monotonic()
+
+    def on_llm_end(self, response: LLMResult, **kwargs: Any):
+        self.call.finished = time.monotonic()
+        self.call.add_usage(response)
+
+
+class LLMUsage:
+    """
+    Records each call into metrics and buffers per-session increments,
+    flushed to Mongo every `flush_interval_s` (one update per session).
+    """
+
+    def __init__(self, flush_interval_s: float = 5.0):
+        self.flush_interval_s = flush_interval_s
+        self._pending: Dict[SessionRef, Dict[str, float]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._nodes: Dict[str, Dict[str, float]] = {}
+        self.stats = {
+            "flushes": 0,
+            "flush_errors": 0,
+        }
+
+        self.duration = metrics.histogram(
+            "llm_request_duration_seconds", "Wall time of one LLM call", ("node", "provider")
+        )
+        self.ttft = metrics.histogram(
+            "llm_time_to_first_token_seconds",
+            "Time to first token (whole response when the model doesn't stream)",
+            ("node", "provider")
+        )
+        self.requests = metrics.counter(
+            "llm_requests_total", "LLM calls by outcome", ("node", "provider", "outcome")
+        )
+        self.tokens = metrics.counter(
+            "llm_tokens_total", "LLM tokens (prompt, completion, cached prompt)", ("node", "provider", "kind")
+        )
+        self.cost = metrics.counter(
+            "llm_cost_usd_total", "Estimated LLM spend", ("node", "provider")
+        )
+
+    @contextmanager
+    def track(self, node: str, provider: str, request_class: str) -> Iterator[LLMCall]:
+        """Instrument one provider call; LangChain runs inside it report their usage here."""
+        call = LLMCall(node, provider, request_class, time.monotonic(), session=_session.get())
+        token = _handler.set(UsageCallbackHandler(call))
+        outcome = "ok"
+        try:
+            yield call
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        except OutputParserException:
+            outcome = "parse_error"
+            raise
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            _handler.reset(token)
+            self.record(call, outcome)
+
+    @staticmethod
+    def price(provider: str, prompt_tokens: int, completion_tokens: int) -> float:
+        model = provider.split(":", 1)[-1]
+        price_in, price_out = PRICES.get(model, (0.0, 0.0))
+        return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+    def record(self, call: LLMCall, outcome: str):
+        elapsed = time.monotonic() - call.started
+        labels = {"node": call.node, "provider": call.provider}
+        cost = self.price(call.provider, call.prompt_tokens, call.completion_tokens)
+
+        self.requests.inc(node=call.node, provider=call.provider, outcome=outcome)
+        self.duration.observe(elapsed, **labels)
+        first = call.first_token or call.finished
+        if first is not None:
+            self.ttft.observe(first - call.started, **labels)
+        for kind, count in (("prompt", call.prompt_tokens),
+                            ("completion", call.completion_tokens),
+                            ("cached", call.cached_tokens)):
+            if count:
+                self.tokens.inc(count, kind=kind, **labels)
+        if cost:
+            self.cost.inc(cost, **labels)
+
+        usage = {
+            "calls": 1,
+            "errors": 0 if outcome in ("ok", "cancelled") else 1,
+            "prompt_tokens": call.prompt_tokens,
+            "completion_tokens": call.completion_tokens,
+            "cached_tokens": call.cached_tokens,
+            "cost_usd": cost,
+            "latency_s": elapsed,
+        }
+        node_totals = self._nodes.setdefault(call.node, dict.fromkeys(usage, 0))
+        for field, value in usage.items():
+            node_totals[field] += value
+
+        if call.session is not None:
+            pending = self._pending.setdefault(call.session, {})
+            node = call.node.replace(".", ":")    # a dot would nest the Mongo field
+            for field, value in usage.items():
+                if value:
+                    for path in (f"llm_usage.total.{field}", f"llm_usage.nodes.{node}.{field}"):
+                        pending[path] = pending.get(path, 0) + value
+            self._ensure_started()
+
+    # ── Session documents ─────────────────────────────────────────
+
+    def _ensure_started(self):
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop(), name="llm-usage-flush")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval_s)
+            await self.flush()
+
+    async def flush(self):
+        """Write buffered per-session usage ($inc, so concurrent flushes add up)."""
+        pending, self._pending = self._pending, {}
+        for (collection, key, session_id), increments in pending.items():
+            try:
+                await getattr(db, collection).update_one(
+                    {key: session_id},
+                    {"$inc": {path: round(value, 6) for path, value in increments.items()}}
+                )
+                self.stats["flushes"] += 1
+            except Exception as e:
+                self.stats["flush_errors"] += 1
+                logger.warning(f"LLM usage flush failed for {collection}/{session_id}: {e}")
+
+    async def stop(self):
+        """Cancel the flusher and write what's buffered (app shutdown)."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        nodes = {}
+        for node, totals in self._nodes.items():
+            calls = totals["calls"] or 1
+            nodes[node] = {
+                **{k: v for k, v in totals.items() if k not in ("latency_s", "cost_usd")},
+                "cost_usd": round(totals["cost_usd"], 6),
+                "avg_ms": round(totals["latency_s"] / calls * 1000),
+            }
+        return {
+            **self.stats,
+            "pending_sessions": len(self._pending),
+            "nodes": nodes,
+        }
+
+
+# Module-level singleton
+llm_usage = LLMUsage(
+    flush_interval_s=getattr(settings, 'LLM_USAGE_FLUSH_S', 5.0)
+)
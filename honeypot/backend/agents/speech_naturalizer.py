@@ -7,14 +7,20 @@ import logging
 from typing import Optional
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 
+from agents.chains import chain_registry
+from agents.llm_router import PROVIDER_MAX_RETRIES, llm_router
 from agents.prompts import SPEECH_NATURALIZATION_PROMPT
 from config import settings
 
 logger = logging.getLogger("speech_naturalizer")
 
+chain_registry.register(
+    "naturalizer.speech",
+    SPEECH_NATURALIZATION_PROMPT,
+    "Language: {language}\n\nText to naturalize:\n{text}"
+)
+
 class SpeechNaturalizer:
     """
     Converts written responses into natural spoken language
@@ -26,18 +32,22 @@ class SpeechNaturalizer:
         
         # Primary LLM (Groq)
         if self.groq_key:
-            self.llm = ChatGroq(temperature=0.7, model_name="llama-3.3-70b-versatile", api_key=self.groq_key)
+            self.llm = ChatGroq(temperature=0.7, model_name="llama-3.3-70b-versatile", api_key=self.groq_key,
+                                base_url=settings.GROQ_BASE_URL or None, max_retries=PROVIDER_MAX_RETRIES)
         else:
             self.llm = None
             
         # Fallback (Gemini)
         if self.gemini_key:
-            self.fallback_llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=self.gemini_key)
+            self.fallback_llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key=self.gemini_key,
+                                                       base_url=settings.GEMINI_BASE_URL or None,
+                                                       max_retries=PROVIDER_MAX_RETRIES)
         else:
             self.fallback_llm = None
-    
-    def _get_llm(self):
-        return self.llm if self.llm else self.fallback_llm
+        
+        # Candidates in preference order; llm_router picks the healthiest per call
+        self.llms = [llm for llm in (self.llm, self.fallback_llm) if llm]
+        chain_registry.prepare(self.llms, "naturalizer.speech")
     
     async def naturalize(
         self,
@@ -54,28 +64,16 @@ class SpeechNaturalizer:
         Returns:
             Naturalized spoken text
         """
-        llm = self._get_llm()
-        
         # Fallback if no LLM available
-        if not llm:
+        if not self.llms:
             logger.warning("No LLM available for speech naturalization, using rule-based fallback")
             return self._rule_based_naturalization(written_text)
         
         try:
-            # Create prompt
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", SPEECH_NATURALIZATION_PROMPT),
-                ("user", "Language: {language}\n\nText to naturalize:\n{text}")
-            ])
-            
-            # Chain
-            chain = prompt | llm | StrOutputParser()
-            
-            # Invoke
-            result = await chain.ainvoke({
+            result = await llm_router.ainvoke("naturalizer.speech", {
                 "language": language,
                 "text": written_text
-            })
+            }, self.llms, "chat")
             
             logger.info(f"Speech naturalization complete: {language}")
             return result.strip()
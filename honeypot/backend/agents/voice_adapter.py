@@ -93,13 +93,14 @@ class VoiceAdapter:
             
             # 2. Synthesize if autonomous mode
             if mode == "ai_speaks":
-                tts_result = self.tts.synthesize(
+                tts_result = await self.tts.synthesize(
                     naturalized_text, 
                     language=language, 
                     session_id=session_id
                 )
                 result["audio_path"] = tts_result["audio_path"]
                 result["duration"] = tts_result["duration"]
+                result["upload_job_id"] = tts_result.get("upload_job_id")
             
             return result
         except Exception as e:
@@ -148,6 +149,7 @@ class VoiceAdapter:
             "agent_reply": agent_reply_text,
             "agent_naturalized": voice_output["naturalized_text"],
             "agent_audio_path": voice_output.get("audio_path"),
+            "agent_audio_upload_job": voice_output.get("upload_job_id"),
             "mode": mode,
             "agent_intent": agent_result.get("intent", "unknown"),
             "agent_emotion": agent_result.get("emotion", "unknown"),
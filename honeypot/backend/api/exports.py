@@ -0,0 +1,316 @@
+"""
+Export API - Streaming NDJSON / CSV exports
+Pages through MongoDB with batched cursors and streams rows as they arrive,
+so memory stays flat however long a call is or however many sessions match.
+Used by analysts and the nightly analytics job.
+"""
+
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from config import settings
+from core.auth import verify_api_key
+from db.mongo import db
+
+router = APIRouter()
+logger = logging.getLogger("api.exports")
+
+BATCH_SIZE = getattr(settings, 'EXPORT_BATCH_SIZE', 500)
+
+# One flat column set for every CSV export; unused columns stay empty
+CSV_COLUMNS = [
+    "record", "session_id", "timestamp", "speaker", "text",
+    "entity_type", "entity_value", "confidence", "scam_score", "status",
+]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+# ── Serialization ─────────────────────────────────────────────
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson_line(record: Dict[str, Any]) -> str:
+    return json.dumps(record, default=_json_default, ensure_ascii=False) + "\n"
+
+
+def _csv_row(record: Dict[str, Any]) -> List[Any]:
+    row = []
+    for column in CSV_COLUMNS:
+        value = record.get(column, "")
+        row.append(value.isoformat() if isinstance(value, datetime) else value)
+    return row
+
+
+async def _encode(records: AsyncIterator[Dict[str, Any]], format: str) -> AsyncIterator[str]:
+    """Encode records as NDJSON lines or CSV rows, flushing every BATCH_SIZE rows."""
+    if format == "ndjson":
+        chunk: List[str] = []
+        async for record in records:
+            chunk.append(_ndjson_line(record))
+            if len(chunk) >= BATCH_SIZE:
+                yield "".join(chunk)
+                chunk = []
+        if chunk:
+            yield "".join(chunk)
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    pending = 1
+    async for record in records:
+        writer.writerow(_csv_row(record))
+        pending += 1
+        if pending >= BATCH_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    if pending:
+        yield buffer.getvalue()
+
+
+def _stream(records: AsyncIterator[Dict[str, Any]], format: str, filename: str) -> StreamingResponse:
+    return StreamingResponse(
+        _encode(records, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    )
+
+
+# ── Record sources ────────────────────────────────────────────
+
+def _session_record(session: Dict[str, Any]) -> Dict[str, Any]:
+    record = {k: v for k, v in session.items() if k != "_id"}
+    record["record"] = "session"
+    record["timestamp"] = session.get("start_time")
+    return record
+
+
+def _entity_records(session: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    intel = session.get("extracted_intelligence") or {}
+    for entity_type, values in intel.items():
+        for value in values or []:
+            yield {
+                "record": "entity",
+                "session_id": session.get("session_id"),
+                "entity_type": entity_type,
+                "entity_value": value,
+            }
+
+
+def _message_record(message: Dict[str, Any]) -> Dict[str, Any]:
+    record = {k: v for k, v in message.items() if k != "_id"}
+    record.update({
+        "record": "message",
+        "speaker": message.get("sender"),
+        "text": message.get("content"),
+    })
+    return record
+
+
+async def _session_records(session: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """Session header, its entities, then every message in order."""
+    yield _session_record(session)
+    for record in _entity_records(session):
+        yield record
+
+    cursor = (
+        db.messages.find({"session_id": session["session_id"]}, {"_id": 0})
+        .sort("timestamp", 1)
+        .batch_size(BATCH_SIZE)
+    )
+    async for message in cursor:
+        yield _message_record(message)
+
+
+async def _call_transcript(match: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Transcript lines of live_calls matching `match`, one record per line.
+    $unwind lets the server page through the embedded transcript array.
+    """
+    pipeline = [
+        {"$match": match},
+        {"$sort": {"start_time": 1}},
+        {"$project": {
+            "_id": 0,
+            "call_id": 1,
+            "status": 1,
+            "threat_level": 1,
+            "line": {"$ifNull": ["$final_transcript", "$transcript"]},
+        }},
+        {"$unwind": "$line"},
+    ]
+    async for doc in db.live_calls.aggregate(pipeline, batchSize=BATCH_SIZE):
+        line = doc.get("line") or {}
+        yield {
+            "record": "message",
+            "session_id": doc.get("call_id"),
+            "timestamp": line.get("timestamp"),
+            "speaker": line.get("speaker"),
+            "text": line.get("text"),
+            "confidence": line.get("confidence", ""),
+            "scam_score": doc.get("threat_level"),
+            "status": doc.get("status"),
+        }
+
+
+async def _call_records(match: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+    """Call header + entity records per call, then transcript lines."""
+    cursor = db.live_calls.find(
+        match, {"_id": 0, "transcript": 0, "final_transcript": 0}
+    ).sort("start_time", 1).batch_size(BATCH_SIZE)
+    async for call in cursor:
+        # Entities and transcript lines get their own records below
+        header = {k: v for k, v in call.items() if k not in ("entities", "transcript")}
+        yield {
+            **header,
+            "record": "call",
+            "session_id": call.get("call_id"),
+            "timestamp": call.get("start_time"),
+            "scam_score": call.get("threat_level"),
+        }
+        for entity in call.get("entities") or []:
+            yield {
+                "record": "entity",
+                "session_id": call.get("call_id"),
+                "entity_type": entity.get("type"),
+                "entity_value": entity.get("value"),
+                "confidence": entity.get("confidence", ""),
+            }
+
+    async for record in _call_transcript(match):
+        yield record
+
+
+# ── Filters ───────────────────────────────────────────────────
+
+def _range(lower: Any, upper: Any) -> Optional[Dict[str, Any]]:
+    field_filter: Dict[str, Any] = {}
+    if lower is not None:
+        field_filter["$gte"] = lower
+    if upper is not None:
+        field_filter["$lte"] = upper
+    return field_filter or None
+
+
+def _session_query(
+    since: Optional[datetime],
+    until: Optional[datetime],
+    min_scam_score: Optional[float],
+    max_scam_score: Optional[float],
+    status: Optional[str],
+    confirmed_only: bool
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+    if (started := _range(since, until)):
+        query["start_time"] = started
+    if (score := _range(min_scam_score, max_scam_score)):
+        query["scam_score"] = score
+    if status:
+        query["status"] = status
+    if confirmed_only:
+        query["is_confirmed_scam"] = True
+    return query
+
+
+# ── Endpoints ─────────────────────────────────────────────────
+
+@router.get("/export/sessions/{session_id}")
+async def export_session(
+    session_id: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    api_key: str = Depends(verify_api_key)
+):
+    """Stream one session: header, extracted entities and the full message history."""
+    session = await db.sessions.find_one({"session_id": session_id}, {"_id": 0})
+    if not session:
+        raise HTTPException(404, "Session not found")
+    return _stream(_session_records(session), format, f"session-{session_id}")
+
+
+@router.get("/export/calls/{call_id}")
+async def export_call(
+    call_id: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    api_key: str = Depends(verify_api_key)
+):
+    """Stream one live / WebRTC call: header, entities and every transcript line."""
+    if not await db.live_calls.find_one({"call_id": call_id}, {"_id": 1}):
+        raise HTTPException(404, "Call not found")
+    return _stream(_call_records({"call_id": call_id}), format, f"call-{call_id}")
+
+
+@router.get("/export/sessions")
+async def export_sessions(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_scam_score: Optional[float] = None,
+    max_scam_score: Optional[float] = None,
+    status: Optional[str] = None,
+    confirmed_only: bool = False,
+    include_messages: bool = True,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Bulk export of every session matching the filters (nightly analytics).
+
+    Args:
+        since / until: Session start_time range (ISO 8601)
+        min_scam_score / max_scam_score: scam_score range
+        status: active | terminated | reported
+        confirmed_only: Only sessions flagged is_confirmed_scam
+        include_messages: Also stream each session's messages
+    """
+    query = _session_query(since, until, min_scam_score, max_scam_score, status, confirmed_only)
+    logger.info(f"📤 Bulk session export: {query}")
+
+    async def records() -> AsyncIterator[Dict[str, Any]]:
+        cursor = db.sessions.find(query, {"_id": 0}).sort("start_time", 1).batch_size(BATCH_SIZE)
+        async for session in cursor:
+            if include_messages:
+                async for record in _session_records(session):
+                    yield record
+            else:
+                yield _session_record(session)
+                for record in _entity_records(session):
+                    yield record
+
+    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    return _stream(records(), format, f"sessions-{stamp}")
+
+
+@router.get("/export/calls")
+async def export_calls(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    min_threat: Optional[float] = None,
+    status: Optional[str] = None,
+    api_key: str = Depends(verify_api_key)
+):
+    """Bulk export of live / WebRTC calls (headers and entities, then all transcript lines)."""
+    match: Dict[str, Any] = {}
+    if (started := _range(since, until)):
+        match["start_time"] = started
+    if min_threat is not None:
+        match["threat_level"] = {"$gte": min_threat}
+    if status:
+        match["status"] = status
+    logger.info(f"📤 Bulk call export: {match}")
+
+    stamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
+    return _stream(_call_records(match), format, f"calls-{stamp}")
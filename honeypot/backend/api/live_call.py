@@ -11,13 +11,17 @@ import uuid
 from datetime import datetime
 from typing import Dict, Optional, Set
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Request
 from pydantic import BaseModel
 
+from agents.llm_usage import bind_session
 from core.auth import verify_api_key
+from core.metrics import metrics
+from core.tracing import tracer
 from db.mongo import db
 from features.live_takeover.intelligence_pipeline import intelligence_pipeline
 from features.live_takeover.report_generator import report_generator
+from features.live_takeover.report_store import artifact_response, json_response, report_store
 from features.live_takeover.streaming_stt import StreamingTranscriber, AudioNormalizer
 from features.live_takeover.takeover_agent import takeover_agent
 from services.elevenlabs_service import elevenlabs_service
@@ -181,6 +185,7 @@ class CallManager:
             if normalized:
                 # Re-encode to base64 and send as WAV (more compatible)
                 normalized_base64 = base64.b64encode(normalized).decode('utf-8')
+                tracer.add_bytes("out", len(normalized), pipeline="live_call")
                 await self.send_to_scammer(call_id, {
                     "type": "audio_stream",
                     "audio": normalized_base64,
@@ -208,6 +213,7 @@ class CallManager:
             if normalized:
                 # Re-encode to base64 and send as WAV (more compatible)
                 normalized_base64 = base64.b64encode(normalized).decode('utf-8')
+                tracer.add_bytes("out", len(normalized), pipeline="live_call")
                 await self.send_to_operator(call_id, {
                     "type": "audio_stream",
                     "audio": normalized_base64,
@@ -231,6 +237,10 @@ class CallManager:
 
 call_manager = CallManager()
 
+metrics.gauge("live_active_connections", "Open live pipeline connections", ("pipeline",)).set_function(
+    lambda: len(call_manager.sessions), pipeline="live_call"
+)
+
 
 # ── REST Endpoints ────────────────────────────────────────────
 
@@ -291,19 +301,30 @@ async def end_call(
     # Mark as ended
     session.is_active = False
     
+    # Keep numbers that were still being read out when the call ended
+    session.entities.extend(await intelligence_pipeline.finalize_session(call_id))
+    
     # Update database
+    final_state = {
+        "status": "ended",
+        "end_time": datetime.utcnow(),
+        "transcript": session.transcript,
+        "entities": session.entities,
+        "threat_level": session.threat_level,
+        "tactics": session.tactics
+    }
     await db.live_calls.update_one(
         {"call_id": call_id},
-        {
-            "$set": {
-                "status": "ended",
-                "end_time": datetime.utcnow(),
-                "transcript": session.transcript,
-                "entities": session.entities,
-                "threat_level": session.threat_level,
-                "tactics": session.tactics
-            }
-        }
+        {"$set": final_state}
+    )
+    
+    # Snapshot the report now; artifacts render in the background
+    call_data = {"call_id": call_id, "start_time": session.start_time, **final_state}
+    await report_store.save_snapshot(
+        call_id,
+        report_generator.build_call_report_data(call_data),
+        summary=_call_summary(call_id, call_data),
+        source="live_call"
     )
     
     # Notify both participants
@@ -316,33 +337,8 @@ async def end_call(
     return {"status": "ended", "call_id": call_id}
 
 
-@router.get("/call/report/{call_id}")
-async def get_call_report(
-    call_id: str,
-    format: str = "json",
-    api_key: str = Depends(verify_api_key)
-):
-    """Generate detailed report from call session."""
-    call_data = await db.live_calls.find_one({"call_id": call_id})
-    if not call_data:
-        raise HTTPException(404, "Call not found")
-    
-    if format == "pdf":
-        # Generate PDF report
-        pdf_result = await report_generator.generate_report(session_id=call_id, format="pdf")
-        
-        from fastapi.responses import FileResponse
-        if pdf_result.get("file_path"):
-            return FileResponse(
-                pdf_result["file_path"],
-                media_type="application/pdf",
-                filename=f"call_report_{call_id}.pdf"
-            )
-        else:
-            # Fallback to JSON if PDF failed
-            return pdf_result
-    
-    # Return JSON report
+def _call_summary(call_id: str, call_data: dict) -> dict:
+    """JSON report body for a call, from its live_calls document."""
     return {
         "call_id": call_id,
         "status": call_data.get("status"),
@@ -355,6 +351,53 @@ async def get_call_report(
     }
 
 
+@router.get("/call/report/{call_id}")
+async def get_call_report(
+    call_id: str,
+    request: Request,
+    format: str = "json",
+    api_key: str = Depends(verify_api_key)
+):
+    """Call report; ended calls are served from their cached snapshot (ETag aware)."""
+    if format not in ("json", "pdf", "csv"):
+        raise HTTPException(400, f"Unsupported format: {format}")
+    
+    snapshot = await report_store.get_snapshot(call_id, with_report=False)
+    if snapshot is None:
+        call_data = await db.live_calls.find_one({"call_id": call_id})
+        if not call_data:
+            raise HTTPException(404, "Call not found")
+        
+        summary = _call_summary(call_id, call_data)
+        if call_data.get("status") != "ended":
+            if format != "json":
+                raise HTTPException(409, "PDF/CSV reports are available once the call has ended")
+            return summary
+        
+        # Ended before snapshots were recorded: build it once now
+        await report_store.save_snapshot(
+            call_id,
+            report_generator.build_call_report_data(call_data),
+            summary=summary,
+            source="live_call"
+        )
+        snapshot = await report_store.get_snapshot(call_id, with_report=False)
+        if snapshot is None:
+            return summary
+    
+    if format == "json":
+        return json_response(request, snapshot["summary"], snapshot.get("summary_etag"))
+    
+    try:
+        artifact = await report_store.get_artifact(call_id, format)
+    except Exception as e:
+        logger.error(f"Report render failed for {call_id} ({format}): {e}")
+        raise HTTPException(503, "Report rendering failed, try again shortly")
+    if not artifact:
+        raise HTTPException(404, f"No report snapshot for call {call_id}")
+    return artifact_response(request, artifact, f"call_report_{call_id}")
+
+
 # ── WebSocket Endpoints ───────────────────────────────────────
 
 @router.websocket("/call/connect")
@@ -475,7 +518,10 @@ async def handle_audio_chunk(call_id: str, role: str, data: dict, session: CallS
         await call_manager.route_audio_to_operator(call_id, audio_base64, audio_format)
     
     # 2. Transcribe audio (async background)
-    asyncio.create_task(transcribe_and_analyze(call_id, role, audio_base64, audio_format, session))
+    asyncio.create_task(tracer.run_turn(
+        "live_call", call_id,
+        transcribe_and_analyze(call_id, role, audio_base64, audio_format, session)
+    ))
 
 
 async def transcribe_and_analyze(call_id: str, role: str, audio_base64: str, audio_format: str, session: CallSession):
@@ -484,10 +530,13 @@ async def transcribe_and_analyze(call_id: str, role: str, audio_base64: str, aud
     """
     try:
         # Decode audio
-        audio_bytes = base64.b64decode(audio_base64)
+        with tracer.span("decode"):
+            audio_bytes = base64.b64decode(audio_base64)
+        tracer.add_bytes("in", len(audio_bytes))
         
         # Normalize audio chunk
-        normalized = session.normalizer.normalize_chunk(audio_bytes, source_format=audio_format)
+        with tracer.span("normalize"):
+            normalized = session.normalizer.normalize_chunk(audio_bytes, source_format=audio_format)
         
         # Skip if normalization failed (common for streaming WebM chunks)
         if normalized is None:
@@ -495,10 +544,12 @@ async def transcribe_and_analyze(call_id: str, role: str, audio_base64: str, aud
         
         # Transcribe
         transcriber = session.scammer_transcriber if role == "scammer" else session.operator_transcriber
-        is_ready = transcriber.add_chunk(normalized)
+        with tracer.span("buffer"):
+            is_ready = transcriber.add_chunk(normalized)
         
         if is_ready:
-            result = await transcriber.transcribe_buffer()
+            with tracer.span("stt", speaker=role):
+                result = await transcriber.transcribe_buffer()
             
             if result and result.get("text"):
                 transcription = {
@@ -513,10 +564,11 @@ async def transcribe_and_analyze(call_id: str, role: str, audio_base64: str, aud
                 session.transcript.append(transcription)
                 
                 # Send transcription to operator
-                await call_manager.send_to_operator(call_id, {
-                    "type": "transcription",
-                    **transcription
-                })
+                with tracer.span("emit", kind="transcription"):
+                    await call_manager.send_to_operator(call_id, {
+                        "type": "transcription",
+                        **transcription
+                    })
                 
                 # Save to database
                 await db.live_calls.update_one(
@@ -526,7 +578,8 @@ async def transcribe_and_analyze(call_id: str, role: str, audio_base64: str, aud
                 
                 # If scammer is speaking, extract intelligence and provide AI coaching
                 if role == "scammer":
-                    await extract_intelligence(call_id, result["text"], session)
+                    with tracer.span("intelligence"):
+                        await extract_intelligence(call_id, result["text"], session)
                     await provide_ai_coaching(call_id, session)
     
     except Exception as e:
@@ -585,6 +638,7 @@ async def provide_ai_coaching(call_id: str, session: CallSession):
     Provide AI coaching suggestions to operator based on conversation context.
     Also generates AI voice response using ElevenLabs if needed.
     """
+    bind_session(call_id, collection="live_calls", key="call_id")
     try:
         # Get recent conversation context
         recent_transcript = session.transcript[-10:] if len(session.transcript) > 10 else session.transcript
@@ -596,12 +650,13 @@ async def provide_ai_coaching(call_id: str, session: CallSession):
         ])
         
         # Get AI coaching from takeover agent
-        coaching = await takeover_agent.get_coaching_suggestions(
-            conversation=conversation,
-            entities=session.entities,
-            threat_level=session.threat_level,
-            tactics=session.tactics
-        )
+        with tracer.span("agent", kind="coaching"):
+            coaching = await takeover_agent.get_coaching_suggestions(
+                conversation=conversation,
+                entities=session.entities,
+                threat_level=session.threat_level,
+                tactics=session.tactics
+            )
         
         # Optionally generate AI voice for recommended response
         audio_data = None
@@ -609,11 +664,12 @@ async def provide_ai_coaching(call_id: str, session: CallSession):
             try:
                 # Use ElevenLabs to synthesize the AI response
                 voice_name = getattr(settings, 'ELEVENLABS_DEFAULT_VOICE', 'Rachel')
-                audio_result = await elevenlabs_service.synthesize(
-                    text=coaching["recommended_response"],
-                    voice_name=voice_name,
-                    session_id=call_id
-                )
+                with tracer.span("tts"):
+                    audio_result = await elevenlabs_service.synthesize(
+                        text=coaching["recommended_response"],
+                        voice_name=voice_name,
+                        session_id=call_id
+                    )
                 
                 if audio_result.get("audio_path") and not audio_result.get("error"):
                     # Read audio file and convert to base64
@@ -624,6 +680,7 @@ async def provide_ai_coaching(call_id: str, session: CallSession):
                         with open(audio_path, 'rb') as f:
                             audio_bytes = f.read()
                             audio_base64 = base64.b64encode(audio_bytes).decode('utf-8')
+                            tracer.add_bytes("out", len(audio_bytes))
                             audio_data = {
                                 "audio_base64": audio_base64,
                                 "format": "mp3",
@@ -634,17 +691,18 @@ async def provide_ai_coaching(call_id: str, session: CallSession):
                 logger.warning(f"AI voice generation failed: {voice_error}")
         
         # Send coaching to operator
-        await call_manager.send_to_operator(call_id, {
-            "type": "ai_coaching",
-            "intent": coaching.get("intent", "Unknown"),
-            "confidence": coaching.get("confidence", 0.0),
-            "reasoning": coaching.get("reasoning", ""),
-            "suggestions": coaching.get("suggestions", []),
-            "recommended_response": coaching.get("recommended_response"),
-            "recommended_audio": audio_data,
-            "warning": coaching.get("warning"),
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        with tracer.span("emit", kind="ai_coaching"):
+            await call_manager.send_to_operator(call_id, {
+                "type": "ai_coaching",
+                "intent": coaching.get("intent", "Unknown"),
+                "confidence": coaching.get("confidence", 0.0),
+                "reasoning": coaching.get("reasoning", ""),
+                "suggestions": coaching.get("suggestions", []),
+                "recommended_response": coaching.get("recommended_response"),
+                "recommended_audio": audio_data,
+                "warning": coaching.get("warning"),
+                "timestamp": datetime.utcnow().isoformat()
+            })
     
     except Exception as e:
         logger.error(f"AI coaching error: {e}", exc_info=True)
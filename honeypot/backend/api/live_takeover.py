@@ -12,26 +12,33 @@ import uuid
 from datetime import datetime
 from typing import Dict, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.responses import FileResponse
 from pydantic import BaseModel
-from typing import List
 
+from agents.llm_usage import bind_session
+from agents.memory import agent_memory
 from config import settings
 from core.auth import verify_api_key
+from core.call_recorder import call_recorder
+from core.metrics import metrics
+from core.tracing import tracer
 from db.mongo import db
 from features.live_takeover.intelligence_pipeline import intelligence_pipeline
 from features.live_takeover.report_generator import report_generator
+from features.live_takeover.report_store import artifact_response, report_store
 from features.live_takeover.session_manager import (
     LiveSessionState,
     SessionStatus,
     TakeoverMode,
+    URLScanResult,
     live_session_manager,
 )
 from features.live_takeover.streaming_stt import AudioNormalizer, StreamingTranscriber
 from features.live_takeover.takeover_agent import takeover_agent
-from features.live_takeover.url_scanner import url_scanner
+from features.live_takeover.url_scan_queue import url_scan_queue
 from features.live_takeover.voice_clone_service import voice_clone_service
+from features.live_takeover.phrase_bank import phrase_bank
 
 router = APIRouter()
 logger = logging.getLogger("api.live_takeover")
@@ -74,6 +81,10 @@ class ConnectionManager:
 
 manager = ConnectionManager()
 
+metrics.gauge("live_active_connections", "Open live pipeline connections", ("pipeline",)).set_function(
+    lambda: len(manager.connections), pipeline="live_takeover"
+)
+
 
 # ── Request/Response Models ───────────────────────────────────────
 
@@ -128,6 +139,9 @@ async def start_live_session(
     )
     
     voice_active = bool(req.voice_clone_id) and mode == TakeoverMode.AI_TAKEOVER
+    if voice_active:
+        # Clone may predate this process; make sure its stall clips are ready
+        phrase_bank.warm_in_background(req.voice_clone_id)
     
     logger.info(f"Live session started: {session.session_id} (mode={req.mode})")
     
@@ -195,11 +209,25 @@ async def end_live_session(
     api_key: str = Depends(verify_api_key)
 ):
     """End a live takeover session."""
+    # Emit entities still held back by the incremental extractor
+    trailing = await intelligence_pipeline.finalize_session(session_id)
+    if trailing:
+        await manager.broadcast_intelligence(session_id, {"new_entities": trailing})
+    
+    session = await live_session_manager.get_session(session_id)
     success = await live_session_manager.end_session(session_id)
+    agent_memory.forget(session_id)
     
     if not success:
         raise HTTPException(404, f"Session {session_id} not found")
     
+    # Keep the report available after the in-memory state is gone
+    await report_store.save_snapshot(
+        session_id,
+        report_generator.build_report_data(session),
+        source="live_session"
+    )
+    
     # Notify via WebSocket
     await manager.send(session_id, {
         "type": "session_ended",
@@ -241,6 +269,20 @@ async def generate_report(
         raise HTTPException(500, "Report generation failed")
 
 
+@router.get("/live/report/{session_id}")
+async def download_report(
+    session_id: str,
+    request: Request,
+    format: str = Query("pdf", pattern="^(json|pdf|csv)$"),
+    api_key: str = Depends(verify_api_key)
+):
+    """Download the cached report of an ended session (supports If-None-Match)."""
+    artifact = await report_store.get_artifact(session_id, format)
+    if not artifact:
+        raise HTTPException(404, f"No report snapshot for session {session_id}")
+    return artifact_response(request, artifact, f"report-{session_id}")
+
+
 @router.post("/live/report/all/{session_id}")
 async def generate_all_reports(
     session_id: str,
@@ -290,10 +332,12 @@ async def websocket_endpoint(
     session: LiveSessionState = session_maybe
     
     await manager.connect(session_id, websocket)
+    bind_session(session_id)
     
     # Create streaming transcriber for this session
     transcriber = StreamingTranscriber(buffer_threshold_ms=2500)
     normalizer = AudioNormalizer()
+    call_recorder.start("live_takeover", session_id, mode=session.current_mode.value)
     
     try:
         # Send initial status
@@ -320,14 +364,17 @@ async def websocket_endpoint(
             
             # ── Audio Chunk Processing ────────────────────
             if msg_type == "audio_chunk":
-                await _handle_audio_chunk(
-                    websocket, session_id, session,
-                    message, transcriber, normalizer
-                )
+                call_recorder.audio(session_id, message.get("data", ""), message.get("format", "wav"))
+                with tracer.turn("live_takeover", session_id):
+                    await _handle_audio_chunk(
+                        websocket, session_id, session,
+                        message, transcriber, normalizer
+                    )
             
             # ── Mode Switch ───────────────────────────────
             elif msg_type == "mode_switch":
                 new_mode_str = message.get("mode", "")
+                call_recorder.event(session_id, "mode_switch", {"mode": new_mode_str})
                 try:
                     new_mode = TakeoverMode(new_mode_str)
                     await live_session_manager.switch_mode(session_id, new_mode)
@@ -357,6 +404,7 @@ async def websocket_endpoint(
             # ── Text Input (coached mode) ─────────────────
             elif msg_type == "text_input":
                 text = message.get("text", "")
+                call_recorder.event(session_id, "text_input", {"text": text})
                 if text:
                     # Add to transcript as user-narrated
                     session.transcript.append({
@@ -365,6 +413,8 @@ async def websocket_endpoint(
                         "timestamp": datetime.utcnow().isoformat(),
                         "source": "user_narrated"
                     })
+                    if agent_memory.has(session_id):
+                        agent_memory.add(session_id, "agent", text)
                     session.turn_count += 1
             
             # ── Ping/Keep-alive ───────────────────────────
@@ -390,6 +440,7 @@ async def websocket_endpoint(
             pass
     finally:
         manager.disconnect(session_id)
+        await call_recorder.finish(session_id)
 
 
 async def _handle_audio_chunk(
@@ -406,35 +457,47 @@ async def _handle_audio_chunk(
         audio_b64 = message.get("data", "")
         audio_format = message.get("format", "wav")
         
-        audio_bytes = base64.b64decode(audio_b64)
+        with tracer.span("decode"):
+            audio_bytes = base64.b64decode(audio_b64)
+        tracer.add_bytes("in", len(audio_bytes))
         
         # Normalize audio
-        normalized = normalizer.normalize_chunk(audio_bytes, audio_format)
+        with tracer.span("normalize"):
+            normalized = normalizer.normalize_chunk(audio_bytes, audio_format)
         if not normalized:
             return
         
         # Buffer and transcribe
-        is_ready = transcriber.add_chunk(normalized)
+        with tracer.span("buffer"):
+            is_ready = transcriber.add_chunk(normalized)
         
         if not is_ready:
             return  # Not enough audio buffered yet
         
         # Transcribe the buffer
-        transcription = await transcriber.transcribe_buffer()
+        with tracer.span("stt"):
+            transcription = await transcriber.transcribe_buffer()
         if not transcription:
             return  # Transcription failed
         
         scammer_text = transcription["text"]
+        call_recorder.transcription(session_id, "scammer", scammer_text, transcription.get("language"))
         
         # ── Push transcription to client ──────────────────
-        await websocket.send_json({
-            "type": "transcription",
-            "text": scammer_text,
-            "speaker": "scammer",
-            "language": transcription.get("language", "en"),
-            "confidence": transcription.get("confidence", 0.0),
-            "timestamp": datetime.utcnow().isoformat()
-        })
+        with tracer.span("emit", kind="transcription"):
+            await websocket.send_json({
+                "type": "transcription",
+                "text": scammer_text,
+                "speaker": "scammer",
+                "language": transcription.get("language", "en"),
+                "confidence": transcription.get("confidence", 0.0),
+                "timestamp": datetime.utcnow().isoformat()
+            })
+        
+        # Memory starts from the transcript so far (no-op once loaded)
+        agent_memory.seed(session_id, [
+            {"role": t["speaker"], "content": t["text"]} for t in session.transcript
+        ])
         
         # Add to transcript
         session.transcript.append({
@@ -442,33 +505,33 @@ async def _handle_audio_chunk(
             "text": scammer_text,
             "timestamp": datetime.utcnow().isoformat()
         })
+        agent_memory.add(session_id, "scammer", scammer_text)
         
         # ── Intelligence extraction (parallel) ────────────
         intel_callback = lambda data: manager.broadcast_intelligence(session_id, data)
         
-        intel_task = asyncio.create_task(
+        intel_task = asyncio.create_task(tracer.traced(
+            "intelligence",
             intelligence_pipeline.process_transcript(
                 session_id=session_id,
                 text=scammer_text,
                 speaker="scammer",
                 notify_callback=intel_callback
             )
-        )
+        ))
         
         # ── Agent processing ──────────────────────────────
-        # Build history from transcript
-        history = [
-            {"role": t["speaker"], "content": t["text"]}
-            for t in session.transcript[-20:]
-        ]
+        # Recent turns + rolling summary, within the prompt token budget
+        history = agent_memory.context(session_id)
         
-        agent_result = await takeover_agent.run(
-            scammer_text=scammer_text,
-            history=history,
-            mode=session.current_mode.value,
-            language=session.detected_language,
-            turn_count=session.turn_count
-        )
+        with tracer.span("agent"):
+            agent_result = await takeover_agent.run(
+                scammer_text=scammer_text,
+                history=history,
+                mode=session.current_mode.value,
+                language=session.detected_language,
+                turn_count=session.turn_count
+            )
         
         # Wait for intelligence extraction
         intel_result = await intel_task
@@ -476,8 +539,11 @@ async def _handle_audio_chunk(
         # ── URL scanning (if new URLs found) ──────────────
         urls_to_scan = intel_result.get("urls_to_scan", [])
         if urls_to_scan:
-            asyncio.create_task(
-                _scan_and_notify(websocket, session_id, session, urls_to_scan)
+            url_scan_queue.submit(
+                urls_to_scan,
+                notify=_url_scan_notifier(session_id, session),
+                priority=session.threat_level,
+                owner_id=session_id
             )
         
         # ── Process agent extracted data ──────────────────
@@ -500,42 +566,67 @@ async def _handle_audio_chunk(
                 "timestamp": datetime.utcnow().isoformat(),
                 "source": "ai_takeover"
             })
+            agent_memory.add(session_id, "agent", response_text)
             
-            # Synthesize voice with clone
+            # Synthesize voice with clone (stock stall / error lines are pre-rendered)
             audio_result = None
-            if session.voice_clone_id:
-                try:
-                    audio_result = await voice_clone_service.synthesize(
-                        text=response_text,
-                        voice_id=session.voice_clone_id
+            phrase = phrase_bank.lookup(response_text, session.voice_clone_id) if session.voice_clone_id else None
+            streaming = False
+            if session.voice_clone_id and phrase is None and getattr(settings, 'TTS_STREAMING', False):
+                # Text goes out with the first audio chunk; the rest follow as ai_audio_chunk
+                with tracer.span("tts", streaming=True):
+                    streaming = await _stream_clone_audio(
+                        websocket,
+                        response_text,
+                        session.voice_clone_id,
+                        header={
+                            "type": "ai_response",
+                            "text": response_text,
+                            "audio": None,
+                            "audio_streaming": True,
+                            "strategy": agent_result.get("strategy", ""),
+                            "threat_level": intel_result.get("threat_level", 0),
+                            "timestamp": datetime.utcnow().isoformat()
+                        }
                     )
+            if session.voice_clone_id and phrase is None and not streaming:
+                try:
+                    with tracer.span("tts"):
+                        audio_result = await voice_clone_service.synthesize(
+                            text=response_text,
+                            voice_id=session.voice_clone_id
+                        )
                 except Exception as e:
                     logger.error(f"Voice synthesis error: {e}")
             
             # Extract audio bytes if available
-            audio_bytes = audio_result["audio_data"] if audio_result else None
+            audio_bytes = phrase.audio if phrase else (audio_result["audio_data"] if audio_result else None)
             
-            await websocket.send_json({
-                "type": "ai_response",
-                "text": response_text,
-                "audio": base64.b64encode(audio_bytes).decode() if audio_bytes else None,
-                "strategy": agent_result.get("strategy", ""),
-                "threat_level": intel_result.get("threat_level", 0),
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            if not streaming:
+                with tracer.span("emit", kind="ai_response"):
+                    await websocket.send_json({
+                        "type": "ai_response",
+                        "text": response_text,
+                        "audio": base64.b64encode(audio_bytes).decode() if audio_bytes else None,
+                        "strategy": agent_result.get("strategy", ""),
+                        "threat_level": intel_result.get("threat_level", 0),
+                        "timestamp": datetime.utcnow().isoformat()
+                    })
+                tracer.add_bytes("out", len(audio_bytes) if audio_bytes else 0)
         
         elif session.current_mode == TakeoverMode.AI_COACHED:
             scripts = agent_result.get("scripts", [])
             
-            await websocket.send_json({
-                "type": "coaching_scripts",
-                "scripts": scripts,
-                "strategy": agent_result.get("strategy", ""),
-                "intent": agent_result.get("intent", ""),
-                "emotion": agent_result.get("emotion", ""),
-                "threat_level": intel_result.get("threat_level", 0),
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            with tracer.span("emit", kind="coaching_scripts"):
+                await websocket.send_json({
+                    "type": "coaching_scripts",
+                    "scripts": scripts,
+                    "strategy": agent_result.get("strategy", ""),
+                    "intent": agent_result.get("intent", ""),
+                    "emotion": agent_result.get("emotion", ""),
+                    "threat_level": intel_result.get("threat_level", 0),
+                    "timestamp": datetime.utcnow().isoformat()
+                })
         
         # ── Send threat update ────────────────────────────
         await websocket.send_json({
@@ -555,28 +646,53 @@ async def _handle_audio_chunk(
         })
 
 
-async def _scan_and_notify(
-    websocket: WebSocket,
-    session_id: str,
-    session: "LiveSessionState",
-    urls: List[str]
-):
-    """Scan URLs and push results to client."""
-    try:
-        results = await url_scanner.scan_urls(urls)
+async def _stream_clone_audio(websocket: WebSocket, text: str, voice_id: str, header: dict) -> bool:
+    """
+    Forward cloned-voice TTS as `ai_audio_chunk` messages while ElevenLabs is
+    still generating it; `header` is sent just before the first chunk.
+    Returns False (nothing sent) if streaming is unavailable.
+    """
+    from services.elevenlabs_service import STREAM_FORMAT, elevenlabs_service
+    
+    seq = 0
+    async for chunk in elevenlabs_service.stream_synthesis(text, voice_id=voice_id):
+        if seq == 0:
+            await websocket.send_json(header)
+        await websocket.send_json({
+            "type": "ai_audio_chunk",
+            "seq": seq,
+            "audio": base64.b64encode(chunk).decode(),
+            "format": STREAM_FORMAT,
+            "final": False
+        })
+        tracer.add_bytes("out", len(chunk))
+        seq += 1
+    if seq:
+        await websocket.send_json({"type": "ai_audio_chunk", "seq": seq, "audio": "", "format": STREAM_FORMAT, "final": True})
+    return seq > 0
+
+
+def _url_scan_notifier(session_id: str, session: LiveSessionState):
+    """Build the callback the URL scan queue uses to push results to the client."""
+    
+    async def _notify(result: URLScanResult):
+        # Deferred scanners re-deliver an updated verdict for the same URL
+        session.url_scan_results = [
+            r for r in session.url_scan_results if r.url != result.url
+        ] + [result]
         
-        for result in results:
-            session.url_scan_results.append(result)
-            
-            await websocket.send_json({
-                "type": "url_scan_result",
-                "data": {
-                    "url": result.url,
-                    "is_safe": result.is_safe,
-                    "risk_score": result.risk_score,
-                    "findings": result.findings
-                },
-                "timestamp": datetime.utcnow().isoformat()
-            })
-    except Exception as e:
-        logger.error(f"URL scan error: {e}")
+        await manager.send(session_id, {
+            "type": "url_scan_result",
+            "data": {
+                "url": result.url,
+                "is_safe": result.is_safe,
+                "risk_score": result.risk_score,
+                "findings": result.findings,
+                "pending": [
+                    name for name, r in result.scanner_results.items() if r.get("pending")
+                ]
+            },
+            "timestamp": datetime.utcnow().isoformat()
+        })
+    
+    return _notify
@@ -15,6 +15,8 @@ from services.scam_detector import scam_detector
 from services.intelligence_extractor import extraction_service
 from core.lifecycle import lifecycle_manager
 from agents.graph import agent_system
+from agents.llm_usage import bind_session
+from agents.memory import agent_memory
 
 router = APIRouter()
 logger = logging.getLogger("api.message")
@@ -40,6 +42,7 @@ async def process_background_tasks(session_id: str, message_content: str, histor
     """
     Background task: Intelligence Extraction & Lifecycle Management.
     """
+    bind_session(session_id)
     # 1. Extract Intelligence with History Context
     await extraction_service.extract(session_id, message_content, history)
     
@@ -60,6 +63,7 @@ async def receive_message(
     try:
         session_id = payload.sessionId
         incoming_text = payload.message.text
+        bind_session(session_id)
         
         logger.info(f"Received message for session {session_id}: {incoming_text[:50]}...")
         
@@ -86,9 +90,9 @@ async def receive_message(
                 "sessionId": session_id
             }
 
-        # Fetch History
-        current_history = await db.messages.find({"session_id": session_id}).sort("timestamp", 1).to_list(length=20)
-        formatted_history = [{"role": m["sender"], "content": m["content"]} for m in current_history]
+        # Fetch History (recent turns + summary of older ones, token-budgeted)
+        await agent_memory.hydrate_from_messages(session_id)
+        formatted_history = agent_memory.context(session_id)
 
         # 2. Persist User Message
         user_msg = Message(
@@ -98,6 +102,7 @@ async def receive_message(
             metadata=payload.metadata
         )
         await db.messages.insert_one(user_msg.model_dump())
+        agent_memory.add(session_id, "scammer", incoming_text)
         
         # 3. Detect Scam
         is_confirmed_scam = session.is_confirmed_scam
@@ -129,8 +134,8 @@ async def receive_message(
         action_taken = "monitoring"
 
         if is_confirmed_scam:
-            # Add current message to history for the agent
-            full_history = formatted_history + [{"role": "scammer", "content": incoming_text}]
+            # History now ends with the current message
+            full_history = agent_memory.context(session_id)
             
             # Run Agent Graph (Returns dict now)
             agent_result = await agent_system.run(full_history)
@@ -156,6 +161,7 @@ async def receive_message(
                 content=agent_reply
             )
             await db.messages.insert_one(agent_msg.model_dump())
+            agent_memory.add(session_id, "agent", agent_reply)
 
         # 5. Background Tasks (Pass current history to extractor)
         background_tasks.add_task(process_background_tasks, session_id, incoming_text, full_history if is_confirmed_scam else formatted_history)
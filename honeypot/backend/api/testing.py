@@ -133,3 +133,136 @@ async def virustotal_info():
             }
         }
     }
+
+
+@router.get("/url-scanner/stats")
+async def url_scanner_stats():
+    """
+    URL scanner statistics: cache hit rate, coalesced scans, external calls
+    avoided, provider budgets and background queue depth.
+    """
+    from features.live_takeover.url_scanner import url_scanner
+    from features.live_takeover.url_scan_queue import url_scan_queue
+    
+    return {**url_scanner.get_stats(), "queue": url_scan_queue.get_stats()}
+
+
+@router.get("/rate-limits")
+async def rate_limit_stats():
+    """
+    Outbound API quota usage per provider (tokens, waits, 429s / Retry-After).
+    """
+    from core.rate_limiter import get_rate_limiter_stats
+    
+    return get_rate_limiter_stats()
+
+
+@router.get("/tts-cache/stats")
+async def tts_cache_stats():
+    """
+    Shared TTS audio cache: memory / disk hits, misses, bytes served, evictions.
+    """
+    from services.tts_cache import tts_cache
+    
+    return tts_cache.get_stats()
+
+
+@router.get("/piper/stats")
+async def piper_pool_stats():
+    """
+    Offline Piper TTS workers: utterances, latency, real-time factor, restarts.
+    """
+    from services.piper_pool import piper_pool
+    
+    return piper_pool.get_stats()
+
+
+@router.get("/phrase-bank/stats")
+async def phrase_bank_stats():
+    """
+    Pre-rendered filler / stall clips: voices warmed, clips served, misses.
+    """
+    from features.live_takeover.phrase_bank import phrase_bank
+    
+    return phrase_bank.get_stats()
+
+
+@router.get("/memory/stats")
+async def agent_memory_stats():
+    """
+    Agent conversation memory: sessions held, summaries, prompt history tokens.
+    """
+    from agents.memory import agent_memory
+    
+    return agent_memory.get_stats()
+
+
+@router.get("/chains/stats")
+async def chain_registry_stats():
+    """
+    Compiled prompt templates / LLM chains and how often they were reused.
+    """
+    from agents.chains import chain_registry
+    
+    return {**chain_registry.get_stats(), "names": chain_registry.names()}
+
+
+@router.get("/llm/stats")
+async def llm_router_stats():
+    """
+    LLM provider health: circuit state, error rate, latency per model, routing.
+    """
+    from agents.llm_router import llm_router
+    
+    return llm_router.get_stats()
+
+
+@router.get("/llm/scheduler/stats")
+async def llm_scheduler_stats():
+    """
+    LLM scheduler: in-flight calls, queue depth and wait time per priority lane.
+    """
+    from agents.llm_scheduler import llm_scheduler
+    
+    return llm_scheduler.get_stats()
+
+
+@router.get("/llm/usage/stats")
+async def llm_usage_stats():
+    """
+    LLM usage per node: calls, errors, tokens, cached tokens, cost, avg latency.
+    """
+    from agents.llm_usage import llm_usage
+    
+    return llm_usage.get_stats()
+
+
+@router.get("/traces/{call_id}")
+async def call_traces(call_id: str):
+    """
+    Last turns of a live call / session / room with per-stage span timings.
+    """
+    from core.tracing import tracer
+    
+    return {"call_id": call_id, "turns": tracer.recent(call_id)}
+
+
+@router.get("/uploads/stats")
+async def upload_queue_stats():
+    """
+    Background upload queue: pending jobs, retries, failures, bytes uploaded.
+    """
+    from services.upload_queue import upload_queue
+    
+    return upload_queue.get_stats()
+
+
+@router.get("/uploads/{job_id}")
+async def upload_job_status(job_id: str):
+    """Status of one background upload (pending / uploading / uploaded / failed)."""
+    from services.upload_queue import upload_queue
+    
+    status = await upload_queue.get_status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Upload job not found")
+    return status
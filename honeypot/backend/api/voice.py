@@ -17,9 +17,12 @@ from slowapi.util import get_remote_address
 from core.auth import verify_api_key
 from db.mongo import db
 from db.models import Session, Message, VoiceChunk
+from agents.llm_usage import bind_session
+from agents.memory import agent_memory
 from agents.voice_adapter import voice_adapter
 from services.audio_processor import audio_processor
 from services.intelligence_extractor import extraction_service
+from services.upload_queue import upload_queue
 from core.lifecycle import lifecycle_manager
 
 router = APIRouter()
@@ -39,6 +42,7 @@ async def process_voice_background_tasks(session_id: str, transcription: str):
     """
     Background processing for intelligence extraction from voice.
     """
+    bind_session(session_id)
     if transcription:
         # 1. Extract Intelligence
         await extraction_service.extract(session_id, transcription)
@@ -62,6 +66,7 @@ async def upload_voice_chunk(
     """
     try:
         logger.info(f"Received voice chunk for session {sessionId}, seq {sequenceNumber}")
+        bind_session(sessionId)
         
         # 1. Read and Validate Session
         session_data = await db.sessions.find_one({"session_id": sessionId})
@@ -89,10 +94,9 @@ async def upload_voice_chunk(
         audio_content = await audio.read()
         
         # 3. Process Voice Turn
-        # Fetch History for context
-        current_history_cursor = db.messages.find({"session_id": sessionId}).sort("timestamp", 1)
-        current_history = await current_history_cursor.to_list(length=20)
-        formatted_history = [{"role": m["sender"], "content": m["content"]} for m in current_history]
+        # Fetch History for context (recent turns + summary of older ones, token-budgeted)
+        await agent_memory.hydrate_from_messages(sessionId)
+        formatted_history = agent_memory.context(sessionId)
 
         # Use adapter for the heavy lifting
         result = await voice_adapter.run_voice_turn(
@@ -125,9 +129,18 @@ async def upload_voice_chunk(
             is_voice=True,
             speech_naturalized=True,
             audio_file_path=result["agent_audio_path"],
+            upload_status="pending" if result.get("agent_audio_upload_job") else None,
             metadata={"naturalized": result["agent_naturalized"]}
         )
         await db.messages.insert_one(agent_msg.model_dump())
+        agent_memory.add(sessionId, "scammer", result["scammer_transcription"])
+        agent_memory.add(sessionId, "agent", result["agent_reply"])
+        await upload_queue.attach(
+            result.get("agent_audio_upload_job"),
+            "messages",
+            {"message_id": agent_msg.message_id},
+            "audio_url"
+        )
 
         # Update Session Metrics
         await db.sessions.update_one(
@@ -179,3 +192,64 @@ async def get_audio_file(session_id: str, filename: str):
         raise HTTPException(status_code=404, detail="Audio file not found")
         
     return FileResponse(file_path)
+
+@router.get("/voice/recordings/{object_name:path}")
+async def get_recording(
+    object_name: str,
+    request: Request,
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Stream a stored recording (MinIO / local fallback) with HTTP Range support,
+    so players can seek without downloading the whole file.
+    """
+    from fastapi.responses import StreamingResponse
+    from services.storage_service import storage
+    
+    info = await storage.stat(object_name)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Recording not found")
+    
+    size = info["size"]
+    media_type = info.get("content_type") or "audio/wav"
+    headers = {"Accept-Ranges": "bytes"}
+    if info.get("etag"):
+        headers["ETag"] = f'"{info["etag"]}"'
+    
+    range_header = request.headers.get("range")
+    if not range_header:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(storage.stream(object_name), media_type=media_type, headers=headers)
+    
+    # Single range only: "bytes=start-end", "bytes=start-" or "bytes=-suffix"
+    try:
+        unit, _, spec = range_header.partition("=")
+        start_s, _, end_s = spec.split(",")[0].strip().partition("-")
+        if unit.strip() != "bytes":
+            raise ValueError(unit)
+        if start_s:
+            start = int(start_s)
+            end = min(int(end_s), size - 1) if end_s else size - 1
+        else:
+            start = max(size - int(end_s), 0)
+            end = size - 1
+        if start > end or start >= size:
+            raise ValueError(range_header)
+    except ValueError:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    
+    length = end - start + 1
+    headers.update({
+        "Content-Range": f"bytes {start}-{end}/{size}",
+        "Content-Length": str(length),
+    })
+    return StreamingResponse(
+        storage.stream(object_name, offset=start, length=length),
+        status_code=206,
+        media_type=media_type,
+        headers=headers
+    )
@@ -76,6 +76,10 @@ async def create_voice_clone(
         
         logger.info(f"Voice clone created: {result['voice_id']} ({name})")
         
+        # Pre-render fillers / stalls in the new voice
+        from features.live_takeover.phrase_bank import phrase_bank
+        phrase_bank.warm_in_background(result["voice_id"])
+        
         return VoiceCloneResponse(
             voice_id=result["voice_id"],
             name=name,
@@ -150,6 +154,9 @@ async def delete_voice(
         if not success:
             raise HTTPException(404, "Voice not found or deletion failed")
         
+        from features.live_takeover.phrase_bank import phrase_bank
+        phrase_bank.forget(voice_id)
+        
         return {"status": "deleted", "voice_id": voice_id}
         
     except HTTPException:
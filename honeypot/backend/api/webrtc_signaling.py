@@ -9,16 +9,44 @@ from datetime import datetime
 from typing import Dict, Optional
 
 import socketio
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from pydantic import BaseModel
 
+from agents.llm_usage import bind_session
+from agents.memory import agent_memory
+from config import settings
 from core.auth import verify_api_key
+from core.call_recorder import call_recorder
+from core.metrics import metrics
+from core.tracing import tracer
 from db.mongo import db
+from features.live_takeover.phrase_bank import Phrase, phrase_bank
+from features.live_takeover.report_generator import report_generator
+from features.live_takeover.report_store import artifact_response, json_response, report_store
 from features.live_takeover.streaming_stt import StreamingTranscriber, AudioNormalizer
 
 router = APIRouter()
 logger = logging.getLogger("api.webrtc_signaling")
 
+# Silence before a pre-rendered filler covers a pending AI reply, then a stall
+FILLER_DELAY_S = getattr(settings, 'PHRASE_BANK_FILLER_DELAY_S', 1.0)
+STALL_DELAY_S = getattr(settings, 'PHRASE_BANK_STALL_DELAY_S', 3.0)
+TTS_STREAMING = getattr(settings, 'TTS_STREAMING', False)
+
+# Pinned ahead of the conversation so the agent has its operational objective
+AI_MISSION_CONTEXT = (
+    "MISSION CONTEXT: I am an AI honeypot impersonating a real victim. "
+    "My primary objective is to keep this scammer engaged as long as possible "
+    "while covertly extracting: bank account numbers, UPI IDs, phone numbers, "
+    "scam script details, accomplice names, and attack methods. "
+    "I must mirror the scammer's language and emotional tone exactly — "
+    "appear confused, trusting, and hesitant as needed. "
+    "Use stalling tactics, ask clarifying questions, and express uncertainty "
+    "to buy time and extract more information. "
+    "Never break character under any circumstances. "
+    "Proactively steer toward topics that reveal extractable intelligence while appearing natural."
+)
+
 # Socket.IO server for signaling
 sio = socketio.AsyncServer(
     async_mode='asgi',
@@ -132,6 +160,14 @@ class RoomManager:
 
 room_manager = RoomManager()
 
+metrics.gauge("live_active_connections", "Open live pipeline connections", ("pipeline",)).set_function(
+    lambda: len(room_manager.rooms), pipeline="webrtc"
+)
+metrics.gauge("live_queue_depth", "Scammer turns waiting for the AI reply loop", ("pipeline",)).set_function(
+    lambda: sum(room.scammer_message_queue.qsize() for room in list(room_manager.rooms.values())),
+    pipeline="webrtc"
+)
+
 
 # ── Socket.IO Event Handlers ──────────────────────────────────
 
@@ -153,6 +189,8 @@ async def disconnect(sid):
     
     # Leave room
     room_manager.leave_room(sid)
+    if room_id and not room_manager.get_room(room_id):
+        await call_recorder.finish(room_id)
     
     # Notify peer
     if peer_sid:
@@ -177,6 +215,8 @@ async def join_room(sid, data):
     # Join the room
     room = room_manager.join_room(room_id, sid, role)
     await sio.enter_room(sid, room_id)
+    call_recorder.start("webrtc", room_id)
+    call_recorder.event(room_id, "join_room", {"role": role})
     
     # Notify user
     await sio.emit('joined_room', {
@@ -284,11 +324,12 @@ async def transcription_chunk(sid, data):
         return
     
     logger.info(f"✅ Room {room_id} found, queuing for transcription...")
+    call_recorder.audio(room_id, data.get('audio', ''), data.get('format', 'webm'), speaker)
     logger.info(f"   🎭 Room has operator_sid: {room.operator_sid}")
     logger.info(f"   🎭 Room has scammer_sid: {room.scammer_sid}")
     
     # Process transcription in background
-    asyncio.create_task(process_transcription(room, data))
+    asyncio.create_task(tracer.run_turn("webrtc", room.room_id, process_transcription(room, data)))
 
 
 async def process_transcription(room: WebRTCRoom, data: dict):
@@ -310,11 +351,14 @@ async def process_transcription(room: WebRTCRoom, data: dict):
             return
         
         # Decode audio
-        audio_bytes = base64.b64decode(audio_base64)
+        with tracer.span("decode"):
+            audio_bytes = base64.b64decode(audio_base64)
+        tracer.add_bytes("in", len(audio_bytes))
         logger.info(f"🎵 {speaker.upper()}: DECODED {len(audio_bytes)} bytes ({audio_format}) from base64")
         
         # Attempt to normalize audio chunk to WAV
-        normalized = room.normalizer.normalize_chunk(audio_bytes, source_format=audio_format)
+        with tracer.span("normalize"):
+            normalized = room.normalizer.normalize_chunk(audio_bytes, source_format=audio_format)
         
         # Get appropriate transcriber
         logger.info(f"🎯 {speaker.upper()}: Selecting transcriber...")
@@ -330,16 +374,19 @@ async def process_transcription(room: WebRTCRoom, data: dict):
         if normalized is not None:
             chunk_size_kb = len(normalized) / 1024
             logger.info(f"📊 {speaker.upper()}: NORMALIZED to {chunk_size_kb:.1f}KB WAV, adding to buffer...")
-            is_ready = transcriber.add_chunk(normalized, audio_format="wav")
+            with tracer.span("buffer"):
+                is_ready = transcriber.add_chunk(normalized, audio_format="wav")
         else:
             chunk_size_kb = len(audio_bytes) / 1024
             logger.info(f"📊 {speaker.upper()}: Normalization skipped, using raw {audio_format} ({chunk_size_kb:.1f}KB)")
-            is_ready = transcriber.add_chunk(audio_bytes, audio_format=audio_format)
+            with tracer.span("buffer"):
+                is_ready = transcriber.add_chunk(audio_bytes, audio_format=audio_format)
         
         if is_ready:
             buffered_size = len(normalized) if normalized is not None else len(audio_bytes)
             logger.info(f"🎙️ {speaker.upper()}: Buffer ready ({buffered_size} bytes), STARTING TRANSCRIPTION...")
-            result = await transcriber.transcribe_buffer()
+            with tracer.span("stt", speaker=speaker):
+                result = await transcriber.transcribe_buffer()
             
             if result and result.get("text"):
                 text = result["text"].strip()
@@ -367,22 +414,27 @@ async def process_transcription(room: WebRTCRoom, data: dict):
                 
                 # Add to transcript
                 room.transcript.append(transcription)
+                call_recorder.transcription(room.room_id, speaker, text, language)
+                if agent_memory.has(room.room_id):
+                    _remember(room.room_id, transcription)
                 logger.info(f"📝 Added {speaker.upper()} to room transcript (total: {len(room.transcript)} messages)")
                 
                 # Send transcription ONLY to the operator
                 if room.operator_sid:
-                    await sio.emit('transcription', transcription, room=room.operator_sid)
+                    with tracer.span("emit", kind="transcription"):
+                        await sio.emit('transcription', transcription, room=room.operator_sid)
                     logger.info(f"📤 EMITTED {speaker.upper()} transcription to operator {room.operator_sid}")
                 else:
                     logger.warning(f"⚠️ Cannot emit {speaker.upper()} transcription: No operator in room {room.room_id}")
                 
                 # Save to database
                 try:
-                    await db.live_calls.update_one(
-                        {"call_id": room.room_id},
-                        {"$push": {"transcript": transcription}},
-                        upsert=True
-                    )
+                    with tracer.span("persist"):
+                        await db.live_calls.update_one(
+                            {"call_id": room.room_id},
+                            {"$push": {"transcript": transcription}},
+                            upsert=True
+                        )
                     logger.info(f"💾 Saved transcription to MongoDB")
                 except Exception as db_err:
                     logger.error(f"❌ Failed to save to DB: {db_err}")
@@ -390,13 +442,13 @@ async def process_transcription(room: WebRTCRoom, data: dict):
                 # If scammer speaking, extract intelligence and provide AI coaching
                 if speaker == "scammer" and room.operator_sid:
                     logger.info(f"🧠 SCAMMER SPEECH DETECTED - Queuing intelligence extraction...")
-                    asyncio.create_task(extract_intelligence(room, result["text"]))
+                    asyncio.create_task(tracer.traced("intelligence", extract_intelligence(room, result["text"])))
                     # Queue text for AI response loop if AI mode is active
                     if room.ai_mode == "ai_only":
                         await room.scammer_message_queue.put(text)
                         logger.info(f"🤖 Queued scammer text for AI response loop")
                     else:
-                        asyncio.create_task(provide_ai_coaching(room))
+                        asyncio.create_task(tracer.traced("coaching", provide_ai_coaching(room)))
                 elif speaker == "operator":
                     logger.info(f"👮 OPERATOR SPEECH - No intelligence extraction needed")
                 else:
@@ -414,7 +466,6 @@ async def extract_intelligence(room: WebRTCRoom, text: str):
     """Extract intelligence from scammer's speech during WebRTC call."""
     try:
         from features.live_takeover.intelligence_pipeline import intelligence_pipeline
-        from features.live_takeover.url_scanner import url_scanner
         
         logger.info(f"🧠 Extracting intelligence from: '{text[:100]}...'")
         
@@ -437,11 +488,17 @@ async def extract_intelligence(room: WebRTCRoom, text: str):
                 room.tactics.extend(intel_result["tactics"])
                 logger.info(f"🎯 Detected tactics: {', '.join(intel_result.get('tactics', []))}")
             
-            # Scan URLs if any
+            # Scan URLs if any (background queue, results pushed to operator)
             urls_to_scan = intel_result.get("urls_to_scan", [])
             if urls_to_scan:
-                logger.info(f"🔗 Scanning {len(urls_to_scan)} URLs with VirusTotal...")
-                asyncio.create_task(scan_urls_and_notify(room, urls_to_scan))
+                from features.live_takeover.url_scan_queue import url_scan_queue
+                accepted = url_scan_queue.submit(
+                    urls_to_scan,
+                    notify=url_scan_notifier(room),
+                    priority=room.threat_level,
+                    owner_id=room.room_id
+                )
+                logger.info(f"🔗 Queued {accepted}/{len(urls_to_scan)} URLs for scanning")
             
             # Send intelligence update to operator
             if room.operator_sid:
@@ -468,34 +525,24 @@ async def extract_intelligence(room: WebRTCRoom, text: str):
         logger.error(f"❌ Intelligence extraction error: {e}", exc_info=True)
 
 
-async def scan_urls_and_notify(room: WebRTCRoom, urls: list):
-    """Scan URLs with VirusTotal and notify operator of results."""
-    try:
-        from features.live_takeover.url_scanner import url_scanner
-        
-        logger.info(f"🔍 Starting URL scan for {len(urls)} URLs: {urls}")
-        
-        results = await url_scanner.scan_urls(urls)
-        
-        for result in results:
-            logger.info(f"🔎 URL Scan Result: {result.url} - {'MALICIOUS' if not result.is_safe else 'SAFE'} (risk: {result.risk_score:.2f})")
-            
-            # Send to operator
-            if room.operator_sid:
-                await sio.emit('url_scan_result', {
-                    "url": result.url,
-                    "is_safe": result.is_safe,
-                    "risk_score": result.risk_score,
-                    "findings": result.findings,
-                    "scanners": result.scanner_results,
-                    "timestamp": datetime.utcnow().isoformat()
-                }, room=room.operator_sid)
-                logger.info(f"📤 Sent URL scan result to operator for {result.url}")
-        
-        logger.info(f"✅ Completed scanning {len(results)} URLs")
+def url_scan_notifier(room: WebRTCRoom):
+    """Build the callback the URL scan queue uses to push results to the operator."""
+    
+    async def _notify(result):
+        logger.info(f"🔎 URL Scan Result: {result.url} - {'MALICIOUS' if not result.is_safe else 'SAFE'} (risk: {result.risk_score:.2f})")
         
-    except Exception as e:
-        logger.error(f"❌ URL scanning error: {e}", exc_info=True)
+        if room.operator_sid:
+            await sio.emit('url_scan_result', {
+                "url": result.url,
+                "is_safe": result.is_safe,
+                "risk_score": result.risk_score,
+                "findings": result.findings,
+                "scanners": result.scanner_results,
+                "timestamp": datetime.utcnow().isoformat()
+            }, room=room.operator_sid)
+            logger.info(f"📤 Sent URL scan result to operator for {result.url}")
+    
+    return _notify
 
 
 @sio.event
@@ -520,6 +567,7 @@ async def set_ai_mode(sid, data):
 
     logger.info(f"🤖 set_ai_mode → {mode} for room {room_id} (sid={sid})")
     room.ai_mode = mode
+    call_recorder.event(room_id, "set_ai_mode", {"mode": mode})
 
     # Cancel any running AI loop
     if room.ai_loop_task and not room.ai_loop_task.done():
@@ -537,12 +585,84 @@ async def set_ai_mode(sid, data):
         await sio.emit('ai_mode_changed', {'mode': mode}, room=room.operator_sid)
 
 
+async def _emit_phrase(room: WebRTCRoom, phrase: Phrase):
+    """Send a pre-rendered phrase bank clip to the operator (no TTS round trip)."""
+    if room.operator_sid:
+        await sio.emit('audio_response', {
+            "type": "audio_response",
+            "audio": phrase.audio_b64,
+            "format": phrase.format,
+            "text": phrase.text,
+            "filler": True
+        }, room=room.operator_sid)
+
+
+async def _cover_latency(room: WebRTCRoom):
+    """
+    While the agent + TTS are working, play a filler after FILLER_DELAY_S of
+    silence and a longer stall if the reply is still not ready at STALL_DELAY_S.
+    Cancelled as soon as the real reply is ready.
+    """
+    try:
+        await asyncio.sleep(FILLER_DELAY_S)
+        for category, wait in (("filler", STALL_DELAY_S - FILLER_DELAY_S), ("stall", None)):
+            phrase = phrase_bank.get(category)
+            if phrase:
+                await _emit_phrase(room, phrase)
+                logger.debug(f"🗣️ Covered reply latency with {category}: {phrase.text!r}")
+            if wait is None:
+                return
+            await asyncio.sleep(wait)
+    except asyncio.CancelledError:
+        pass
+
+
+async def _stream_ai_audio(room: WebRTCRoom, text: str, on_first_chunk=None) -> bool:
+    """
+    Forward streaming TTS to the operator as `audio_chunk` events while it is
+    generated (PCM, ordered by seq, last event has final=True). Returns False
+    if nothing was streamed so the caller can fall back to a whole clip.
+    """
+    import base64
+    from services.elevenlabs_service import STREAM_FORMAT, elevenlabs_service
+
+    seq = 0
+    sample_rate = int(STREAM_FORMAT.split("_")[1]) if STREAM_FORMAT.startswith("pcm_") else None
+    async for chunk in elevenlabs_service.stream_synthesis(text):
+        if seq == 0 and on_first_chunk:
+            on_first_chunk()
+        if room.operator_sid:
+            await sio.emit('audio_chunk', {
+                "seq": seq,
+                "audio": base64.b64encode(chunk).decode(),
+                "format": STREAM_FORMAT,
+                "sample_rate": sample_rate,
+                "text": text if seq == 0 else None,
+                "final": False
+            }, room=room.operator_sid)
+            tracer.add_bytes("out", len(chunk))
+        seq += 1
+
+    if seq and room.operator_sid:
+        await sio.emit('audio_chunk', {
+            "seq": seq, "audio": "", "format": STREAM_FORMAT,
+            "sample_rate": sample_rate, "text": None, "final": True
+        }, room=room.operator_sid)
+    return seq > 0
+
+
 async def _send_ai_filler(room: WebRTCRoom):
-    """Emit a filler phrase via TTS so operator hears something immediately on handoff."""
+    """Emit a filler phrase so operator hears something immediately on handoff."""
     try:
         import base64
         from services.tts_service import tts_service
 
+        phrase = phrase_bank.get("handoff")
+        if phrase:
+            await _emit_phrase(room, phrase)
+            logger.info("🤖 Pre-rendered filler sent to operator")
+            return
+
         filler_text = "Hmm... haan, ek second..."
         audio_bytes = await tts_service.synthesize_to_bytes(text=filler_text)
         if audio_bytes:
@@ -559,8 +679,43 @@ async def _send_ai_filler(room: WebRTCRoom):
         logger.error(f"Filler TTS error: {e}", exc_info=True)
 
 
+def _memory_turn(entry: dict) -> Optional[Dict[str, str]]:
+    """Map a call transcript entry to an agent history turn."""
+    speaker, text = entry.get("speaker", ""), entry.get("text", "")
+    if not text:
+        return None
+    if speaker == "scammer":
+        return {"role": "scammer", "content": text}
+    if speaker == "ai":
+        return {"role": "agent", "content": text}
+    if speaker == "operator":
+        # Operator turns become scammer-side turns with a prefix so the agent
+        # understands the full exchange without confusing its own role
+        return {"role": "scammer", "content": f"[Operator said]: {text}"}
+    return None
+
+
+def _remember(room_id: str, entry: dict):
+    turn = _memory_turn(entry)
+    if turn:
+        agent_memory.add(room_id, turn["role"], turn["content"])
+
+
+def _call_turn_loader(room_id: str):
+    """Load only the tail of live_calls.transcript (not the whole call) on a memory miss."""
+    async def load(limit: int):
+        call_doc = await db.live_calls.find_one(
+            {"call_id": room_id},
+            {"transcript": {"$slice": -limit}}
+        )
+        entries = (call_doc or {}).get("transcript") or []
+        return [turn for turn in map(_memory_turn, entries) if turn]
+    return load
+
+
 async def _ai_response_loop(room: WebRTCRoom):
     """Background task: consume scammer messages, generate AI response, emit audio."""
+    bind_session(room.room_id, collection="live_calls", key="call_id")
     try:
         import base64
         from services.tts_service import tts_service
@@ -580,6 +735,8 @@ async def _ai_response_loop(room: WebRTCRoom):
             except asyncio.CancelledError:
                 return
 
+            turn = tracer.start_turn("webrtc_ai", room.room_id)
+            cover_task = asyncio.create_task(_cover_latency(room))
             try:
                 # Determine language from recent transcript
                 recent_lang = "en"
@@ -588,53 +745,19 @@ async def _ai_response_loop(room: WebRTCRoom):
                         recent_lang = entry["language"]
                         break
 
-                # Fetch full conversation history from MongoDB
-                history = []
-                try:
-                    call_doc = await db.live_calls.find_one(
-                        {"call_id": room.room_id},
-                        {"transcript": 1}
+                # Recent turns + rolling summary; Mongo is read only on a memory miss
+                with tracer.span("memory"):
+                    await agent_memory.hydrate(room.room_id, _call_turn_loader(room.room_id))
+                    history = agent_memory.context(room.room_id, preamble=AI_MISSION_CONTEXT)
+
+                # Run takeover agent with budgeted conversation context
+                with tracer.span("agent"):
+                    result = await takeover_agent.run(
+                        scammer_text=scammer_text,
+                        history=history,
+                        mode="ai_takeover",
+                        language=recent_lang
                     )
-                    if call_doc and call_doc.get("transcript"):
-                        for entry in call_doc["transcript"]:
-                            spkr = entry.get("speaker", "")
-                            txt = entry.get("text", "")
-                            if not txt:
-                                continue
-                            if spkr == "scammer":
-                                history.append({"role": "scammer", "content": txt})
-                            elif spkr == "ai":
-                                history.append({"role": "agent", "content": txt})
-                            elif spkr == "operator":
-                                # Operator turns become HumanMessage with prefix so agent
-                                # understands full exchange without confusing its own role
-                                history.append({"role": "scammer", "content": f"[Operator said]: {txt}"})
-                except Exception as db_err:
-                    logger.warning(f"Failed to fetch transcript from DB, using empty history: {db_err}")
-
-                # Prepend intelligence-extraction mission context as the first AIMessage
-                # so the agent has its operational objective before processing the conversation
-                mission_context = (
-                    "MISSION CONTEXT: I am an AI honeypot impersonating a real victim. "
-                    "My primary objective is to keep this scammer engaged as long as possible "
-                    "while covertly extracting: bank account numbers, UPI IDs, phone numbers, "
-                    "scam script details, accomplice names, and attack methods. "
-                    "I must mirror the scammer's language and emotional tone exactly — "
-                    "appear confused, trusting, and hesitant as needed. "
-                    "Use stalling tactics, ask clarifying questions, and express uncertainty "
-                    "to buy time and extract more information. "
-                    "Never break character under any circumstances. "
-                    "Proactively steer toward topics that reveal extractable intelligence while appearing natural."
-                )
-                history = [{"role": "agent", "content": mission_context}] + history
-
-                # Run takeover agent with full conversation context
-                result = await takeover_agent.run(
-                    scammer_text=scammer_text,
-                    history=history,
-                    mode="ai_takeover",
-                    language=recent_lang
-                )
 
                 ai_text = result.get("ai_response", "").strip()
                 if not ai_text:
@@ -652,12 +775,14 @@ async def _ai_response_loop(room: WebRTCRoom):
                     "timestamp": datetime.utcnow().isoformat()
                 }
                 room.transcript.append(ai_transcript_entry)
+                _remember(room.room_id, ai_transcript_entry)
                 try:
-                    await db.live_calls.update_one(
-                        {"call_id": room.room_id},
-                        {"$push": {"transcript": ai_transcript_entry}},
-                        upsert=True
-                    )
+                    with tracer.span("persist"):
+                        await db.live_calls.update_one(
+                            {"call_id": room.room_id},
+                            {"$push": {"transcript": ai_transcript_entry}},
+                            upsert=True
+                        )
                     logger.info(f"💾 Saved AI response to MongoDB transcript")
                 except Exception as db_err:
                     logger.error(f"Failed to save AI response to DB: {db_err}")
@@ -667,18 +792,29 @@ async def _ai_response_loop(room: WebRTCRoom):
                     await sio.emit('transcription', ai_transcript_entry, room=room.operator_sid)
 
                 # ── Bug 1 fix: TTS → raw bytes in memory, no file / no Cloudinary ──
-                audio_bytes = await tts_service.synthesize_to_bytes(text=ai_text)
+                phrase = phrase_bank.lookup(ai_text)
+                if phrase is None and TTS_STREAMING:
+                    with tracer.span("tts", streaming=True):
+                        streamed = await _stream_ai_audio(room, ai_text, on_first_chunk=cover_task.cancel)
+                    if streamed:
+                        logger.info("📤 AI audio streamed to operator")
+                        continue
+                with tracer.span("tts", phrase=phrase is not None):
+                    audio_bytes = phrase.audio if phrase else await tts_service.synthesize_to_bytes(text=ai_text)
+                cover_task.cancel()
 
                 if audio_bytes:
-                    audio_b64 = base64.b64encode(audio_bytes).decode()
+                    audio_b64 = phrase.audio_b64 if phrase else base64.b64encode(audio_bytes).decode()
 
                     if room.operator_sid:
-                        await sio.emit('audio_response', {
-                            "type": "audio_response",
-                            "audio": audio_b64,
-                            "format": "mp3",
-                            "text": ai_text
-                        }, room=room.operator_sid)
+                        with tracer.span("emit", kind="audio_response"):
+                            await sio.emit('audio_response', {
+                                "type": "audio_response",
+                                "audio": audio_b64,
+                                "format": "mp3",
+                                "text": ai_text
+                            }, room=room.operator_sid)
+                        tracer.add_bytes("out", len(audio_bytes))
                         logger.info(f"📤 AI audio_response emitted to operator")
 
             except asyncio.CancelledError:
@@ -694,6 +830,9 @@ async def _ai_response_loop(room: WebRTCRoom):
                     }, room=room.operator_sid)
                     await sio.emit('ai_mode_changed', {'mode': 'operator'}, room=room.operator_sid)
                 return
+            finally:
+                cover_task.cancel()
+                tracer.end_turn(turn)
 
     except asyncio.CancelledError:
         logger.info(f"🤖 AI response loop cancelled for room {room.room_id}")
@@ -703,6 +842,7 @@ async def _ai_response_loop(room: WebRTCRoom):
 
 async def provide_ai_coaching(room: WebRTCRoom):
     """Generate AI coaching suggestions for operator."""
+    bind_session(room.room_id, collection="live_calls", key="call_id")
     try:
         from features.live_takeover.takeover_agent import takeover_agent
         
@@ -838,6 +978,7 @@ async def end_webrtc_room(
                         "timestamp": datetime.utcnow().isoformat()
                     }
                     room.transcript.append(transcription)
+                    call_recorder.transcription(room_id, speaker, result["text"], transcription["language"])
                     await db.live_calls.update_one(
                         {"call_id": room_id},
                         {"$push": {"transcript": transcription}}
@@ -845,6 +986,15 @@ async def end_webrtc_room(
         except Exception as e:
             logger.error(f"Error flushing transcribers: {e}")
         
+        # Keep numbers that were still being read out when the call ended
+        try:
+            from features.live_takeover.intelligence_pipeline import intelligence_pipeline
+            room.entities.extend(await intelligence_pipeline.finalize_session(room_id))
+        except Exception as e:
+            logger.error(f"Error flushing intelligence extractor: {e}")
+        
+        await call_recorder.finish(room_id)
+        
         # Notify all participants
         await sio.emit('call_ended', {'room_id': room_id}, room=room_id)
         
@@ -866,21 +1016,32 @@ async def end_webrtc_room(
         }
         
         # Save final state to database
+        final_state = {
+            "status": "ended",
+            "end_time": datetime.utcnow(),
+            "duration_seconds": round(duration, 1),
+            "final_transcript": room.transcript,
+            "entities": room.entities,
+            "threat_level": room.threat_level,
+            "tactics": room.tactics,
+        }
         await db.live_calls.update_one(
             {"call_id": room_id},
-            {"$set": {
-                "status": "ended",
-                "end_time": datetime.utcnow(),
-                "duration_seconds": round(duration, 1),
-                "final_transcript": room.transcript,
-                "entities": room.entities,
-                "threat_level": room.threat_level,
-                "tactics": room.tactics,
-            }}
+            {"$set": final_state}
+        )
+        
+        # Snapshot the report now; artifacts render in the background
+        call_data = {"call_id": room_id, "start_time": room.start_time, **final_state}
+        await report_store.save_snapshot(
+            room_id,
+            report_generator.build_call_report_data(call_data),
+            summary=_webrtc_summary(room_id, call_data),
+            source="webrtc"
         )
         
         # Clean up room from memory
         room_manager.rooms.pop(room_id, None)
+        agent_memory.forget(room_id)
     
     return {
         "message": "Room ended",
@@ -889,20 +1050,8 @@ async def end_webrtc_room(
     }
 
 
-@router.get("/webrtc/room/{room_id}/report")
-async def get_webrtc_call_report(
-    room_id: str,
-    api_key: str = Depends(verify_api_key)
-):
-    """Get report for a completed WebRTC call."""
-    from fastapi import HTTPException
-    
-    call_data = await db.live_calls.find_one({"call_id": room_id})
-    if not call_data:
-        raise HTTPException(status_code=404, detail="Call not found")
-    
-    call_data.pop("_id", None)
-    
+def _webrtc_summary(room_id: str, call_data: dict) -> dict:
+    """JSON report body for a WebRTC call, from its live_calls document."""
     start = call_data.get("start_time", datetime.utcnow())
     end = call_data.get("end_time", datetime.utcnow())
     transcript = call_data.get("final_transcript") or call_data.get("transcript", [])
@@ -927,3 +1076,52 @@ async def get_webrtc_call_report(
         "tactics": call_data.get("tactics", []),
         "summary": f"Call with {len(transcript)} transcribed messages"
     }
+
+
+@router.get("/webrtc/room/{room_id}/report")
+async def get_webrtc_call_report(
+    room_id: str,
+    request: Request,
+    format: str = "json",
+    api_key: str = Depends(verify_api_key)
+):
+    """Get report for a completed WebRTC call (cached snapshot, ETag aware)."""
+    from fastapi import HTTPException
+    
+    if format not in ("json", "pdf", "csv"):
+        raise HTTPException(status_code=400, detail=f"Unsupported format: {format}")
+    
+    snapshot = await report_store.get_snapshot(room_id, with_report=False)
+    if snapshot is None:
+        call_data = await db.live_calls.find_one({"call_id": room_id})
+        if not call_data:
+            raise HTTPException(status_code=404, detail="Call not found")
+        
+        summary = _webrtc_summary(room_id, call_data)
+        if call_data.get("status") != "ended":
+            if format != "json":
+                raise HTTPException(status_code=409, detail="PDF/CSV reports are available once the call has ended")
+            return summary
+        
+        # Ended before snapshots were recorded: build it once now
+        await report_store.save_snapshot(
+            room_id,
+            report_generator.build_call_report_data(call_data),
+            summary=summary,
+            source="webrtc"
+        )
+        snapshot = await report_store.get_snapshot(room_id, with_report=False)
+        if snapshot is None:
+            return summary
+    
+    if format == "json":
+        return json_response(request, snapshot["summary"], snapshot.get("summary_etag"))
+    
+    try:
+        artifact = await report_store.get_artifact(room_id, format)
+    except Exception as e:
+        logger.error(f"Report render failed for {room_id} ({format}): {e}")
+        raise HTTPException(status_code=503, detail="Report rendering failed, try again shortly")
+    if not artifact:
+        raise HTTPException(status_code=404, detail=f"No report snapshot for call {room_id}")
+    return artifact_response(request, artifact, f"call_report_{room_id}")
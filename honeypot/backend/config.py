@@ -23,7 +23,45 @@ class Settings(BaseSettings):
     # AI Providers
     GROQ_API_KEY: str = ""
     GEMINI_API_KEY: str = ""
+    GROQ_STT_RATE_PER_MIN: float = 20  # Whisper requests/min (free tier); raise for paid plans
+    GROQ_STT_BURST: int = 5
     
+    # Agent Memory
+    MEMORY_HOT_TURNS: int = 16  # Recent turns kept verbatim per session
+    MEMORY_TOKEN_BUDGET: int = 1500  # Hard cap on conversation-history tokens per prompt
+    MEMORY_SUMMARY_TOKENS: int = 300  # Rolling summary of turns older than the hot window
+    MEMORY_MAX_SESSIONS: int = 2000  # Sessions held in memory (LRU; cold ones re-hydrate from Mongo)
+    MEMORY_IDLE_TTL_S: float = 3600
+    
+    # LLM Routing (Groq / Gemini circuit breakers)
+    LLM_BREAKER_ERROR_RATE: float = 0.5  # Open a provider's circuit at this error rate (60 s window)
+    LLM_BREAKER_429_STORM: int = 3  # ...or after this many 429s in the window
+    LLM_BREAKER_COOLDOWN_S: float = 30.0  # First open period; doubles while probes keep failing
+    LLM_HEDGE_ENABLED: bool = False  # Live takeover replies/coaching: race a 2nd provider when the 1st is slow
+    LLM_HEDGE_PERCENTILE: float = 0.9  # Hedge once the primary exceeds this latency percentile
+    LLM_HEDGE_DELAY_S: float = 1.5  # Hedge deadline until the primary has enough latency samples
+    LLM_HEDGE_MAX_PER_MIN: float = 30  # Cap on duplicate requests (cost bound)
+
+    # LLM Scheduling (process-wide, per provider model)
+    LLM_GROQ_CONCURRENCY: int = 8  # In-flight Groq calls; background may use a quarter of these
+    LLM_GROQ_TOKENS_PER_MIN: int = 12000  # Groq TPM budget (prompt + completion); 0 = unlimited
+    LLM_GEMINI_CONCURRENCY: int = 8
+    LLM_GEMINI_TOKENS_PER_MIN: int = 250000
+    LLM_USAGE_FLUSH_S: float = 5.0  # Per-session llm_usage ($inc on the session doc) write interval
+
+    # Tracing (live pipelines, see /metrics and /api/traces/{call_id})
+    TRACE_SLOW_TURN_S: float = 3.0  # Log a stage breakdown for turns slower than this
+    CALL_RECORDING_ENABLED: bool = False  # Record live-call audio, events and transcriptions for `python -m replay`
+    CALL_RECORDING_PATH: str = "./storage/recordings"
+    CALL_RECORDING_MAX_MB: float = 50  # Per call; later events are dropped past this
+    
+    # Provider endpoints (point at `python -m fake_providers` for offline benchmarks)
+    GROQ_BASE_URL: str = ""  # "" = SDK default (api.groq.com); chat and Whisper
+    GEMINI_BASE_URL: str = ""  # "" = SDK default (generativelanguage.googleapis.com)
+    ELEVENLABS_BASE_URL: str = "https://api.elevenlabs.io/v1"
+    VIRUSTOTAL_BASE_URL: str = "https://www.virustotal.com/api/v3"
+    URLSCAN_BASE_URL: str = "https://urlscan.io/api/v1"
+
     # Callback
     GUVI_CALLBACK_URL: str = "https://hackathon.guvi.in/api/updateHoneyPotFinalResult"
     
@@ -38,12 +76,37 @@ class Settings(BaseSettings):
     ELEVENLABS_MODEL: str = "eleven_turbo_v2_5"
     ELEVENLABS_DEFAULT_VOICE: str = "Rachel"  # Default voice for AI responses
     ELEVENLABS_VOICE_ID: str = "21m00Tcm4TlvDq8ikWAM"  # Rachel voice ID
+    ELEVENLABS_RATE_PER_MIN: float = 120
+    ELEVENLABS_BURST: int = 5
+    TTS_STREAMING: bool = False  # Forward ElevenLabs audio chunk-by-chunk instead of whole clips
+    TTS_STREAM_FORMAT: str = "pcm_16000"  # Streaming output format (raw 16-bit mono PCM)
+    PHRASE_BANK_ENABLED: bool = True  # Pre-render filler / stall clips per voice
+    PHRASE_BANK_FILE: str = ""  # Optional JSON {category: [phrases]} overriding the defaults
+    PHRASE_BANK_FILLER_DELAY_S: float = 1.0  # Silence before a filler covers a pending AI reply
+    PHRASE_BANK_STALL_DELAY_S: float = 3.0
     
     # Audio Storage
     AUDIO_STORAGE_PATH: str = "./storage/audio"
+    TTS_CACHE_MEMORY_MB: int = 64  # In-memory LRU of synthesized clips
+    TTS_CACHE_DISK_MB: int = 1024  # Disk tier (storage/audio/tts_cache), LRU-evicted
+    PIPER_WORKERS_PER_VOICE: int = 1  # Long-lived Piper processes per voice model
+    PIPER_TIMEOUT_S: float = 10.0  # Per-utterance timeout before a worker is replaced
     
     # URL Scanning
     VIRUSTOTAL_API_KEY: str = ""
+    VIRUSTOTAL_RATE_PER_MIN: float = 4  # Public API quota; every request counts
+    DOMAIN_BLOCKLIST_PATH: str = "./storage/blocklists/phishing_domains.txt"  # Hot-reloaded on change
+    DOMAIN_ALLOWLIST_PATH: str = "./storage/blocklists/allowlist.txt"
+    WHOIS_MAX_WORKERS: int = 4  # Dedicated thread pool for blocking WHOIS lookups
+    WHOIS_TIMEOUT_S: float = 15.0
+    PUBLIC_SUFFIX_LIST_PATH: str = ""  # Optional full PSL file; a bundled subset is used otherwise
+    URL_SCAN_CACHE_SIZE: int = 2048  # In-memory LRU entries (MongoDB tier is unbounded, TTL-expired)
+    URL_SCAN_WORKERS: int = 4
+    URL_SCAN_QUEUE_SIZE: int = 256  # Pending scan jobs before new URLs are rejected
+    
+    # Reports
+    REPORT_RENDER_WORKERS: int = 2  # Processes for off-loop PDF/CSV/JSON rendering
+    EXPORT_BATCH_SIZE: int = 500  # Cursor batch / flush size for streaming exports
     
     # MinIO / S3-compatible Object Storage
     MINIO_ENDPOINT: str = "localhost:9000"
@@ -51,6 +114,11 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str = "minioadmin"
     MINIO_BUCKET: str = "honeybadger-audio"
     MINIO_SECURE: bool = False
+    MINIO_PART_SIZE_MB: int = 16  # Multipart part size for streamed uploads (min 5)
+    
+    # Background uploads (Cloudinary / MinIO)
+    UPLOAD_WORKERS: int = 2
+    UPLOAD_MAX_ATTEMPTS: int = 6  # Exponential backoff between attempts, capped at 5 min
     
     # Redis (for rate limiting)
     REDIS_URL: str = "redis://localhost:6379/0"
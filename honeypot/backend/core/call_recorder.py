@@ -0,0 +1,178 @@
+"""
+Call Recorder
+Captures what a live call actually sent the server - inbound audio chunks with
+their arrival times, control events (mode switches, typed input) and the
+transcriptions produced - as one JSONL file per call, for `python -m replay`.
+Off unless CALL_RECORDING_ENABLED; audio is kept exactly as received (base64).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger("core.call_recorder")
+
+FORMAT_VERSION = 1
+FLUSH_BYTES = 256 * 1024  # Pending lines written out (off-loop) past this size
+
+# Index of the audio chunk being processed; handler tasks inherit it, so a
+# transcription records which chunk's processing produced it
+_chunk: ContextVar[Optional[int]] = ContextVar("recorded_chunk", default=None)
+
+
+class Recording:
+    """One call being recorded: pending lines and where they go."""
+
+    def __init__(self, pipeline: str, call_id: str, path: Path):
+        self.pipeline = pipeline
+        self.call_id = call_id
+        self.path = path
+        self.started = time.monotonic()
+        self.pending: List[str] = []
+        self.pending_bytes = 0
+        self.written_bytes = 0
+        self.counts: Dict[str, int] = {"audio": 0, "event": 0, "transcription": 0}
+        self.audio_bytes = 0
+        self.truncated = False
+        self.lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        return self.written_bytes + self.pending_bytes
+
+    def add(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        self.pending.append(line)
+        self.pending_bytes += len(line)
+
+
+class CallRecorder:
+    """Per-call recordings for the live pipelines (WebRTC, live takeover)."""
+
+    def __init__(self, enabled: bool = False, directory: str = "./storage/recordings", max_mb: float = 50):
+        self.enabled = enabled
+        self.directory = Path(directory)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._recordings: Dict[str, Recording] = {}
+        self.stats = {
+            "recordings_started": 0,
+            "recordings_finished": 0,
+            "recordings_truncated": 0,
+            "write_errors": 0,
+        }
+
+    def start(self, pipeline: str, call_id: str, **meta: Any):
+        """Begin recording a call (no-op when disabled or already recording)."""
+        if not self.enabled or call_id in self._recordings:
+            return
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in call_id)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        recording = Recording(pipeline, call_id, self.directory / f"{pipeline}-{safe_id}-{stamp}.jsonl")
+        recording.add({
+            "type": "header",
+            "version": FORMAT_VERSION,
+            "pipeline": pipeline,
+            "call_id": call_id,
+            "started_at": datetime.utcnow().isoformat(),
+            "meta": meta,
+        })
+        self._recordings[call_id] = recording
+        self.stats["recordings_started"] += 1
+        logger.info(f"⏺️ Recording {pipeline} call {call_id} → {recording.path}")
+
+    def audio(self, call_id: str, audio_b64: str, audio_format: str, speaker: str = "scammer"):
+        """One inbound audio chunk, base64 as received. Call before handing it to the pipeline."""
+        index = self._recordings[call_id].counts["audio"] if call_id in self._recordings else None
+        if self._add(call_id, "audio", {"speaker": speaker, "format": audio_format, "data": audio_b64},
+                     audio_bytes=len(audio_b64) * 3 // 4):
+            _chunk.set(index)
+
+    def event(self, call_id: str, name: str, data: Optional[Dict[str, Any]] = None):
+        """A client control event (mode switch, typed text, ...)."""
+        self._add(call_id, "event", {"name": name, "data": data or {}})
+
+    def transcription(self, call_id: str, speaker: str, text: str, language: Optional[str] = None):
+        """
+        A transcription the server produced (what the replay's fake STT should
+        say), with the audio chunk that triggered it when called while handling one.
+        """
+        fields: Dict[str, Any] = {"speaker": speaker, "text": text, "language": language}
+        if _chunk.get() is not None:
+            fields["chunk"] = _chunk.get()
+        self._add(call_id, "transcription", fields)
+
+    def _add(self, call_id: str, kind: str, fields: Dict[str, Any], audio_bytes: int = 0) -> bool:
+        recording = self._recordings.get(call_id)
+        if recording is None or recording.truncated:
+            return False
+        if recording.size >= self.max_bytes:
+            recording.truncated = True
+            self.stats["recordings_truncated"] += 1
+            logger.warning(f"⏺️ Recording of {call_id} hit {self.max_bytes // 2**20} MB; later events dropped")
+            return False
+        recording.add({"t": round(time.monotonic() - recording.started, 4), "type": kind, **fields})
+        recording.counts[kind] += 1
+        recording.audio_bytes += audio_bytes
+        if recording.pending_bytes >= FLUSH_BYTES:
+            asyncio.create_task(self._flush(recording))
+        return True
+
+    async def finish(self, call_id: str) -> Optional[str]:
+        """Write the rest and close the call's recording; returns its path."""
+        recording = self._recordings.pop(call_id, None)
+        if recording is None:
+            return None
+        recording.add({
+            "t": round(time.monotonic() - recording.started, 4),
+            "type": "end",
+            "counts": recording.counts,
+            "audio_bytes": recording.audio_bytes,
+            "truncated": recording.truncated,
+        })
+        await self._flush(recording)
+        self.stats["recordings_finished"] += 1
+        logger.info(f"⏺️ Recording of {call_id} saved: {recording.counts['audio']} chunks, "
+                    f"{recording.counts['transcription']} transcriptions ({recording.path})")
+        return str(recording.path)
+
+    async def _flush(self, recording: Recording):
+        async with recording.lock:
+            lines, recording.pending, recording.pending_bytes = recording.pending, [], 0
+            if not lines:
+                return
+            data = "".join(lines)
+            try:
+                await asyncio.to_thread(self._append, recording.path, data)
+                recording.written_bytes += len(data)
+            except OSError as e:
+                self.stats["write_errors"] += 1
+                logger.error(f"❌ Failed to write recording {recording.path}: {e}")
+
+    @staticmethod
+    def _append(path: Path, data: str):
+        os.makedirs(path.parent, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "active": len(self._recordings),
+        }
+
+
+# Module-level singleton
+call_recorder = CallRecorder(
+    enabled=getattr(settings, 'CALL_RECORDING_ENABLED', False),
+    directory=getattr(settings, 'CALL_RECORDING_PATH', "./storage/recordings"),
+    max_mb=getattr(settings, 'CALL_RECORDING_MAX_MB', 50)
+)
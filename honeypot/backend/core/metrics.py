@@ -0,0 +1,275 @@
+"""
+Metrics
+In-process Prometheus-style counters, gauges and histograms, rendered in the
+text exposition format at GET /metrics. No client library or external
+collector: a scraper (or curl) reads the current values straight from the
+process. Gauges can be callbacks, and any component's get_stats() can be
+exported as-is with register_stats(), and register_process() adds the
+process's own CPU, memory, fd and task counts.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import resource
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("core.metrics")
+
+# Seconds; covers sub-10ms cache hits through slow LLM tails
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
+
+
+def _resident_bytes() -> float:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # No procfs: fall back to peak RSS (KiB)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        self._lock = threading.Lock()       # observed from to_thread workers too
+
+    def _key(self, labels: Dict[str, object]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in list(self._values.items()):
+            yield self.name, self._labels(key), value
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels):
+        """Read the value from `fn` at scrape time (queue sizes, active rooms)."""
+        self._functions[self._key(labels)] = fn
+
+    def samples(self) -> Iterator[Sample]:
+        for key, value in list(self._values.items()):
+            yield self.name, self._labels(key), value
+        for key, fn in list(self._functions.items()):
+            try:
+                value = float(fn())
+            except Exception as e:
+                logger.debug(f"Gauge {self.name} callback failed: {e}")
+                continue
+            yield self.name, self._labels(key), value
+
+
+class StatsCollector(Metric):
+    """
+    Every numeric leaf of components' get_stats() dicts, as
+    `component_stat{component="...", stat="dotted.path"}` gauges.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, ("component", "stat"))
+        self._sources: Dict[str, Callable[[], Dict[str, Any]]] = {}
+
+    def register(self, component: str, get_stats: Callable[[], Dict[str, Any]]):
+        self._sources[component] = get_stats
+
+    @staticmethod
+    def _flatten(stats: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+        if isinstance(stats, dict):
+            for key, value in stats.items():
+                yield from StatsCollector._flatten(value, f"{prefix}.{key}" if prefix else str(key))
+        elif isinstance(stats, bool):
+            yield prefix, float(stats)
+        elif isinstance(stats, (int, float)):
+            yield prefix, float(stats)
+
+    def samples(self) -> Iterator[Sample]:
+        for component, get_stats in list(self._sources.items()):
+            try:
+                stats = get_stats()
+            except Exception as e:
+                logger.debug(f"Stats for {component} failed: {e}")
+                continue
+            for stat, value in self._flatten(stats):
+                yield self.name, {"component": component, "stat": stat}, value
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List[float]] = {}     # key -> [counts..., sum, count]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+                    break
+            series[-2] += value
+            series[-1] += 1
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Upper bucket bound holding the q-th observation (for JSON stats)."""
+        series = self._series.get(self._key(labels))
+        if not series or not series[-1]:
+            return None
+        target, seen = q * series[-1], 0.0
+        for bound, count in zip(self.buckets, series):
+            seen += count
+            if seen >= target:
+                return bound
+        return math.inf
+
+    def samples(self) -> Iterator[Sample]:
+        for key, series in list(self._series.items()):
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield f"{self.name}_bucket", {**labels, "le": "+Inf"}, series[-1]
+            yield f"{self.name}_sum", labels, series[-2]
+            yield f"{self.name}_count", labels, series[-1]
+
+
+class MetricsRegistry:
+    """Process-wide metric families, get-or-create by name."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def _get(self, cls, name: str, help: str, labels: Sequence[str], **kwargs) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = cls(name, help, labels, **kwargs)
+        elif not isinstance(metric, cls) or metric.labelnames != tuple(labels):
+            raise ValueError(f"Metric {name} already registered with a different type or labels")
+        return metric
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._get(Counter, name, help, labels)
+
+    def gauge(self, name: str, help: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._get(Gauge, name, help, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def register_stats(self, component: str, get_stats: Callable[[], Dict[str, Any]]):
+        """Export a component's get_stats() (numeric leaves) on /metrics."""
+        collector = self._get(
+            StatsCollector, "component_stat", "Component get_stats() values", ("component", "stat")
+        )
+        collector.register(component, get_stats)
+
+    def register_process(self):
+        """CPU seconds, resident memory, open fds, threads and asyncio tasks, read at scrape time."""
+        self.gauge("process_cpu_seconds_total", "User + system CPU time of this process").set_function(
+            lambda: sum(resource.getrusage(resource.RUSAGE_SELF)[:2])
+        )
+        self.gauge("process_resident_memory_bytes", "Resident set size").set_function(_resident_bytes)
+        self.gauge("process_open_fds", "Open file descriptors").set_function(
+            lambda: len(os.listdir("/proc/self/fd"))
+        )
+        self.gauge("process_threads", "Live Python threads").set_function(threading.active_count)
+        self.gauge("process_asyncio_tasks", "Pending asyncio tasks on the event loop").set_function(
+            lambda: len(asyncio.all_tasks())
+        )
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                if labels:
+                    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                    lines.append(f"{name}{{{body}}} {_format_value(value)}")
+                else:
+                    lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+# Module-level singleton
+metrics = MetricsRegistry()
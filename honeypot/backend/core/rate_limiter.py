@@ -0,0 +1,181 @@
+"""
+Outbound Rate Limiting
+Async token buckets for third-party API quotas (VirusTotal, Groq, ElevenLabs).
+Waiters reserve tokens atomically, so concurrent callers can never overdraw
+the bucket, and a 429's Retry-After pauses the whole bucket instead of only
+the request that hit it.
+"""
+
+import asyncio
+import logging
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger("core.rate_limiter")
+
+
+def parse_retry_after(value: Optional[str], default: float = 60.0) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """
+    Token bucket with reservation semantics.
+
+    `acquire()` computes the caller's slot and debits the bucket before
+    sleeping (the balance may go negative), so N concurrent callers get N
+    distinct, correctly spaced slots.
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int = 1):
+        self.name = name
+        self.rate = rate_per_minute / 60.0      # tokens per second
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self.stats: Dict[str, Any] = {
+            "acquired": 0,
+            "rejected": 0,
+            "waited_s": 0.0,
+            "rate_limited": 0,      # 429s reported by the provider
+            "retry_after_s": 0.0,
+        }
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> Optional[float]:
+        """
+        Reserve tokens without awaiting.
+
+        Returns:
+            Seconds the caller must wait before using the reservation,
+            or None if that would exceed max_wait (nothing is reserved).
+        """
+        now = time.monotonic()
+        self._refill(now)
+
+        deficit = tokens - self._tokens
+        wait = deficit / self.rate if deficit > 0 else 0.0
+        wait = max(wait, self._blocked_until - now)
+
+        if max_wait is not None and wait > max_wait:
+            self.stats["rejected"] += 1
+            return None
+
+        self._tokens -= tokens
+        self.stats["acquired"] += 1
+        self.stats["waited_s"] = round(self.stats["waited_s"] + wait, 3)
+        return wait
+
+    async def acquire(self, tokens: float = 1.0, max_wait: Optional[float] = None) -> bool:
+        """Wait for tokens. Returns False (without waiting) if over max_wait."""
+        wait = self.reserve(tokens, max_wait)
+        if wait is None:
+            return False
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return True
+
+    def time_until(self, tokens: float) -> float:
+        """Seconds until `tokens` (capped at the burst) can be spent without debt."""
+        now = time.monotonic()
+        self._refill(now)
+        needed = min(tokens, self.capacity)
+        wait = (needed - self._tokens) / self.rate if self._tokens < needed else 0.0
+        return max(wait, self._blocked_until - now, 0.0)
+
+    def available(self) -> float:
+        """Tokens spendable right now without waiting."""
+        now = time.monotonic()
+        self._refill(now)
+        if now < self._blocked_until:
+            return 0.0
+        return max(self._tokens, 0.0)
+
+    def penalize(self, retry_after: float):
+        """Provider returned 429: pause the bucket and drain it."""
+        self.stats["rate_limited"] += 1
+        self.stats["retry_after_s"] = round(self.stats["retry_after_s"] + retry_after, 3)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        self._tokens = min(self._tokens, 0.0)
+        logger.warning(f"⏳ {self.name} rate limited, pausing {retry_after:.1f}s")
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        self._refill(now)
+        return {
+            **self.stats,
+            "rate_per_minute": round(self.rate * 60, 2),
+            "burst": int(self.capacity),
+            "available": round(max(self._tokens, 0.0), 2),
+            "blocked_for_s": round(max(0.0, self._blocked_until - now), 1),
+        }
+
+
+async def request_with_limit(
+    bucket: TokenBucket,
+    send: Callable[[], Awaitable[Any]],
+    max_wait: Optional[float] = None,
+    retries: int = 1
+) -> Optional[Any]:
+    """
+    Send an httpx request through a bucket, honouring 429 Retry-After.
+
+    Args:
+        bucket: Provider bucket
+        send: Zero-arg coroutine factory returning an httpx.Response
+        max_wait: Give up (return None) rather than wait longer than this
+        retries: Extra attempts after a 429 if Retry-After fits in max_wait
+
+    Returns:
+        The response (any status other than a final 429), or None if throttled
+    """
+    for attempt in range(retries + 1):
+        if not await bucket.acquire(max_wait=max_wait):
+            logger.debug(f"{bucket.name} over budget, skipping request")
+            return None
+
+        response = await send()
+        if response.status_code != 429:
+            return response
+
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        bucket.penalize(retry_after)
+        if attempt < retries and (max_wait is None or retry_after <= max_wait):
+            continue
+        return None
+    return None
+
+
+# ── Registry ──────────────────────────────────────────────────────
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(name: str, rate_per_minute: float, burst: int = 1) -> TokenBucket:
+    """Get (or create) the process-wide bucket for a provider."""
+    bucket = _buckets.get(name)
+    if bucket is None:
+        bucket = TokenBucket(name, rate_per_minute, burst)
+        _buckets[name] = bucket
+    return bucket
+
+
+def get_rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: bucket.get_stats() for name, bucket in _buckets.items()}
@@ -0,0 +1,217 @@
+"""
+Tracing
+Stage spans for the live audio pipelines (live takeover, live call, WebRTC).
+A trace is one turn of one call: its correlation id is the session / call /
+room id, carried in a context variable so log lines and child tasks inherit
+it. Span latencies go to core.metrics histograms and the last few turns per
+call are kept in memory (GET /api/traces/{call_id}); no external collector.
+"""
+
+import logging
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Deque, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from config import settings
+from core.metrics import metrics
+
+logger = logging.getLogger("core.tracing")
+
+T = TypeVar("T")
+
+# Per-chunk work; a trace that only ran these is audio ingest, not a turn
+INGEST_STAGES = frozenset({"decode", "normalize", "buffer"})
+
+
+@dataclass
+class Span:
+    stage: str
+    offset_ms: float
+    duration_ms: float
+    error: Optional[str] = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class Trace:
+    pipeline: str
+    call_id: str
+    trace_id: str
+    started: float
+    started_at: float = field(default_factory=time.time)  # Wall clock, for lining turns up with clients
+    spans: List[Span] = field(default_factory=list)
+
+    @property
+    def is_turn(self) -> bool:
+        return any(span.stage not in INGEST_STAGES for span in self.spans)
+
+    def to_dict(self, total_s: float) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "pipeline": self.pipeline,
+            "started_at": round(self.started_at, 3),
+            "total_ms": round(total_s * 1000, 1),
+            "spans": [
+                {
+                    "stage": span.stage,
+                    "offset_ms": round(span.offset_ms, 1),
+                    "duration_ms": round(span.duration_ms, 1),
+                    **({"error": span.error} if span.error else {}),
+                    **span.attrs,
+                }
+                for span in self.spans
+            ],
+        }
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+def correlation_id() -> Optional[str]:
+    """`<call id>/<trace id>` of the turn being processed, if any."""
+    trace = _current.get()
+    return f"{trace.call_id}/{trace.trace_id}" if trace else None
+
+
+class CorrelationLogFilter(logging.Filter):
+    """Adds `%(trace)s` (" [call/turn]" or "") to log records."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        cid = correlation_id()
+        record.trace = f" [{cid}]" if cid else ""
+        return True
+
+
+class Tracer:
+    """Turn / span recorder shared by the live pipelines."""
+
+    def __init__(self, max_calls: int = 200, turns_per_call: int = 20, slow_turn_s: float = 3.0):
+        self.max_calls = max_calls
+        self.turns_per_call = turns_per_call
+        self.slow_turn_s = slow_turn_s
+        self._recent: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self.stats = {
+            "turns": 0,
+            "slow_turns": 0,
+            "span_errors": 0,
+        }
+
+        self.stage_latency = metrics.histogram(
+            "pipeline_stage_duration_seconds", "Latency of one live pipeline stage", ("pipeline", "stage")
+        )
+        self.turn_latency = metrics.histogram(
+            "pipeline_turn_duration_seconds", "Audio chunk in to last emit, per turn", ("pipeline",)
+        )
+        self.stage_errors = metrics.counter(
+            "pipeline_stage_errors_total", "Live pipeline stages that raised", ("pipeline", "stage")
+        )
+        self.bytes = metrics.counter(
+            "pipeline_bytes_total", "Audio bytes received / sent", ("pipeline", "direction")
+        )
+
+    def start_turn(self, pipeline: str, call_id: str) -> Tuple[Trace, Token]:
+        """Start a trace for one turn; spans opened after this (and in tasks created) join it."""
+        trace = Trace(pipeline, call_id, uuid.uuid4().hex[:8], time.perf_counter())
+        return trace, _current.set(trace)
+
+    def end_turn(self, turn: Tuple[Trace, Token]):
+        trace, token = turn
+        _current.reset(token)
+        if trace.is_turn:
+            self._finish(trace, time.perf_counter() - trace.started)
+
+    @contextmanager
+    def turn(self, pipeline: str, call_id: str) -> Iterator[Trace]:
+        turn = self.start_turn(pipeline, call_id)
+        try:
+            yield turn[0]
+        finally:
+            self.end_turn(turn)
+
+    async def run_turn(self, pipeline: str, call_id: str, awaitable: Awaitable[T]) -> T:
+        """Await as one turn; wrap coroutines handed to create_task."""
+        with self.turn(pipeline, call_id):
+            return await awaitable
+
+    @contextmanager
+    def span(self, stage: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Time one stage of the current turn.
+
+        Yields a dict the caller can add attributes to (sizes, counts).
+        Outside a turn the latency is still recorded, under pipeline "none".
+        """
+        trace = _current.get()
+        pipeline = trace.pipeline if trace else "none"
+        start = time.perf_counter()
+        error = None
+        try:
+            yield attrs
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stage_latency.observe(elapsed, pipeline=pipeline, stage=stage)
+            if error and error != "CancelledError":
+                self.stats["span_errors"] += 1
+                self.stage_errors.inc(pipeline=pipeline, stage=stage)
+            if trace is not None:
+                trace.spans.append(Span(
+                    stage,
+                    (start - trace.started) * 1000,
+                    elapsed * 1000,
+                    error,
+                    attrs
+                ))
+
+    async def traced(self, stage: str, awaitable: Awaitable[T], **attrs: Any) -> T:
+        """Await inside a span; wrap coroutines handed to create_task."""
+        with self.span(stage, **attrs):
+            return await awaitable
+
+    def add_bytes(self, direction: str, count: int, pipeline: Optional[str] = None):
+        if not count:
+            return
+        if pipeline is None:
+            trace = _current.get()
+            pipeline = trace.pipeline if trace else "none"
+        self.bytes.inc(count, pipeline=pipeline, direction=direction)
+
+    def _finish(self, trace: Trace, total_s: float):
+        self.stats["turns"] += 1
+        self.turn_latency.observe(total_s, pipeline=trace.pipeline)
+        summary = trace.to_dict(total_s)
+        if total_s >= self.slow_turn_s:
+            self.stats["slow_turns"] += 1
+            stages = ", ".join(f"{s['stage']}={s['duration_ms']:.0f}ms" for s in summary["spans"])
+            logger.warning(f"🐢 Slow {trace.pipeline} turn {trace.call_id}/{trace.trace_id}: "
+                           f"{total_s * 1000:.0f}ms ({stages})")
+
+        turns = self._recent.get(trace.call_id)
+        if turns is None:
+            turns = self._recent[trace.call_id] = deque(maxlen=self.turns_per_call)
+            while len(self._recent) > self.max_calls:
+                self._recent.popitem(last=False)
+        else:
+            self._recent.move_to_end(trace.call_id)
+        turns.append(summary)
+
+    def recent(self, call_id: str) -> List[Dict[str, Any]]:
+        return list(self._recent.get(call_id, ()))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "calls_tracked": len(self._recent),
+        }
+
+
+# Module-level singleton
+tracer = Tracer(
+    slow_turn_s=getattr(settings, 'TRACE_SLOW_TURN_S', 3.0)
+)
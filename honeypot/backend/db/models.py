@@ -27,6 +27,8 @@ class Message(BaseDoc):
     # Voice fields (NEW)
     is_voice: bool = False
     audio_file_path: Optional[str] = None
+    audio_url: Optional[str] = None  # Cloud copy, filled in by the upload queue
+    upload_status: Optional[str] = None  # pending | uploading | uploaded | failed
     transcription_confidence: Optional[float] = None
     speech_naturalized: bool = False  # For agent responses
 
@@ -0,0 +1,11 @@
+"""
+Fake Providers
+Local stand-ins for every paid API the backend calls: Groq chat and Whisper,
+Gemini, ElevenLabs TTS and voices, VirusTotal, urlscan.io and the GUVI
+callback. Each has its own latency distribution, error / 429 rates, request
+rate limit and streaming speed, so benchmarks and load tests run offline and
+repeat run to run. Point the app at them with the *_BASE_URL settings:
+
+    python -m fake_providers --port 9100 --env-file .env.fake
+    set -a; . ./.env.fake; set +a; uvicorn main:app
+"""
@@ -0,0 +1,72 @@
+"""
+Fake Providers CLI
+Serve every fake provider on one port and print (or write) the environment
+that points the backend at them.
+
+    python -m fake_providers --config fakes.json --set groq.error_rate=0.05 \\
+        --set gemini.latency.median_ms=1200 --env-file .env.fake
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+
+from fake_providers.server import create_app, provider_env
+
+
+def _apply_override(config: Dict[str, Any], assignment: str):
+    """`provider.field[.subfield]=value` into the nested config dict."""
+    path, sep, raw = assignment.partition("=")
+    if not sep or "." not in path:
+        raise argparse.ArgumentTypeError(f"expected provider.field=value, got {assignment!r}")
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    *parents, leaf = path.split(".")
+    node = config
+    for key in parents:
+        node = node.setdefault(key, {})
+    node[leaf] = value
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m fake_providers", description=__doc__.strip().splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--config", help="JSON file: {provider: {latency: {...}, error_rate, ...}, content: {...}}")
+    parser.add_argument("--set", action="append", default=[], metavar="PROVIDER.FIELD=VALUE",
+                        help="Override one behavior field, repeatable (e.g. groq.rpm=30)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency / fault draws")
+    parser.add_argument("--env-file", help="Write the backend environment overrides here")
+    parser.add_argument("--no-keys", action="store_true", help="Don't emit placeholder API keys")
+    args = parser.parse_args(argv)
+
+    config: Dict[str, Any] = {}
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    for assignment in args.set:
+        _apply_override(config, assignment)
+
+    app = create_app(config, seed=args.seed)
+    env = provider_env(f"http://{args.host}:{args.port}", keys=not args.no_keys)
+    lines = [f"{name}={value}" for name, value in env.items()]
+    if args.env_file:
+        with open(args.env_file, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        print(f"📄 Backend environment written to {args.env_file}")
+    else:
+        print("\n".join(lines))
+    print(f"🧪 Fake providers on http://{args.host}:{args.port} "
+          f"(GET /_fake/stats, GET|POST /_fake/config, POST /_fake/reset)")
+
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
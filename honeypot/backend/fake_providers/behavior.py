@@ -0,0 +1,151 @@
+"""
+Fake Provider Behavior
+How one fake provider misbehaves: response latency distribution, random
+500s / 429s / hangs, a requests-per-minute limit that answers 429 with
+Retry-After, and generation speed for streamed responses. Random draws come
+from seeded generators, one per route, so a run repeats exactly as long as
+each route sees its requests in the same order.
+"""
+
+import math
+import random
+import time
+from collections import Counter, deque
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
+from typing import Any, Deque, Dict, Optional
+
+DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal")
+
+
+@dataclass
+class Latency:
+    """
+    Response latency (time to headers / first token).
+
+    dist: fixed | uniform | normal | lognormal
+    median_ms: Centre of the distribution
+    spread: lognormal sigma; for normal / uniform, the stddev / half-width as
+        a fraction of median_ms
+    """
+
+    dist: str = "lognormal"
+    median_ms: float = 300.0
+    spread: float = 0.4
+    min_ms: float = 0.0
+    max_ms: float = 30000.0
+
+    def sample(self, rng: random.Random) -> float:
+        """One latency draw, in seconds."""
+        if self.dist == "fixed":
+            ms = self.median_ms
+        elif self.dist == "uniform":
+            ms = self.median_ms * (1 + rng.uniform(-self.spread, self.spread))
+        elif self.dist == "normal":
+            ms = rng.gauss(self.median_ms, self.median_ms * self.spread)
+        elif self.dist == "lognormal":
+            ms = self.median_ms * math.exp(rng.gauss(0.0, self.spread))
+        else:
+            raise ValueError(f"Unknown latency distribution {self.dist!r} (use {', '.join(DISTRIBUTIONS)})")
+        return min(max(ms, self.min_ms), self.max_ms) / 1000
+
+
+@dataclass
+class Behavior:
+    latency: Latency = field(default_factory=Latency)
+    error_rate: float = 0.0         # Fraction answered 500
+    rate_limit_rate: float = 0.0    # Fraction answered 429 regardless of load
+    rpm: float = 0.0                # Requests per minute before real 429s (0 = unlimited)
+    retry_after_s: float = 2.0      # Retry-After on 429s
+    hang_rate: float = 0.0          # Fraction that stall for hang_s (client timeouts)
+    hang_s: float = 60.0
+    tokens_per_s: float = 250.0     # LLM generation speed after the first token (0 = instant)
+    realtime_factor: float = 4.0    # TTS audio generated this many times faster than real time
+    stream_chunk_ms: float = 100.0  # Audio per streamed TTS chunk
+    audio_latency_ms_per_s: float = 0.0     # STT: extra latency per second of audio
+
+    def update(self, changes: Dict[str, Any]):
+        """Merge a (possibly nested) dict of field values."""
+        _merge(self, changes)
+        if self.latency.dist not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown latency distribution {self.latency.dist!r} (use {', '.join(DISTRIBUTIONS)})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _merge(target: Any, changes: Dict[str, Any]):
+    known = {f.name: f for f in fields(target)}
+    for key, value in changes.items():
+        if key not in known:
+            raise KeyError(f"{type(target).__name__} has no setting {key!r}")
+        current = getattr(target, key)
+        if is_dataclass(current):
+            if not isinstance(value, dict):
+                raise TypeError(f"{key} expects an object")
+            _merge(current, value)
+        elif isinstance(current, bool) or not isinstance(current, (int, float)):
+            setattr(target, key, value)
+        else:
+            setattr(target, key, float(value))
+
+
+class FaultInjector:
+    """Decides each request's fate for one provider and counts outcomes."""
+
+    def __init__(self, behavior: Behavior, seed: int = 0):
+        self.behavior = behavior
+        self.seed = seed
+        self._rngs: Dict[str, random.Random] = {}
+        self._window: Deque[float] = deque()
+        self.outcomes: Counter = Counter()
+        self.routes: Counter = Counter()
+
+    def decide(self, route: str) -> Optional[str]:
+        """
+        Returns "rate_limited", "error", "hang" or None (serve normally).
+        Draws happen in a fixed order so the sequence is seed-stable.
+        """
+        self.routes[route] += 1
+        b = self.behavior
+        rng = self._rng(route)
+        limited = rng.random() < b.rate_limit_rate
+        failed = rng.random() < b.error_rate
+        hung = rng.random() < b.hang_rate
+
+        if b.rpm:
+            now = time.monotonic()
+            while self._window and now - self._window[0] > 60.0:
+                self._window.popleft()
+            if len(self._window) >= b.rpm:
+                limited = True
+            else:
+                self._window.append(now)
+
+        outcome = "rate_limited" if limited else "error" if failed else "hang" if hung else None
+        self.outcomes[outcome or "ok"] += 1
+        return outcome
+
+    def reset(self, seed: int):
+        """Reseed and forget counts and the rpm window (start of a repeatable run)."""
+        self.seed = seed
+        self._rngs.clear()
+        self._window.clear()
+        self.outcomes.clear()
+        self.routes.clear()
+
+    def latency(self, route: str) -> float:
+        return self.behavior.latency.sample(self._rng(route))
+
+    def _rng(self, route: str) -> random.Random:
+        # Separate streams: Whisper draws don't shift when chat calls interleave differently
+        rng = self._rngs.get(route)
+        if rng is None:
+            rng = self._rngs[route] = random.Random(f"{self.seed}/{route}")
+        return rng
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": sum(self.routes.values()),
+            "outcomes": dict(self.outcomes),
+            "routes": dict(self.routes),
+        }
@@ -0,0 +1,196 @@
+"""
+Fake Provider Content
+Plausible, deterministic payloads: chat replies shaped for each chain's
+parser (agents/chains.py prompts name their JSON keys), Whisper transcripts,
+silent MP3 / tone PCM audio of a speech-like length, and URL verdicts.
+"""
+
+import hashlib
+import io
+import json
+import math
+import re
+import struct
+import wave
+from typing import Any, Dict, List, Optional
+
+# Scammer lines the fake Whisper cycles through unless a script is configured
+TRANSCRIPTS = [
+    "Hello sir, I am calling from SBI head office regarding your KYC.",
+    "Your account will be blocked today if you do not verify.",
+    "Please tell me the OTP you received on your mobile 9876543210.",
+    "Send one rupee to verify.kyc@oksbi to reactivate the account.",
+    "Open http://sbi-kyc-update.in/verify and enter your card details.",
+    "I am a senior officer, you can trust me, this is urgent.",
+]
+
+REPLIES = [
+    "Wait, uh... which branch did you say you are calling from?",
+    "Hmm, my app is taking forever to load... can you hold on a sec?",
+    "Sorry, I didn't catch that. Can you repeat the number slowly?",
+    "Oh no... is my money really stuck? What do I have to do?",
+    "Okay okay, but how do I know you're really from the bank?",
+]
+
+CHARS_PER_SECOND = 15           # Speaking rate used to size TTS audio
+SUSPICIOUS_WORDS = ("kyc", "verify", "login", "update", "secure", "bank", "reward", ".test")
+
+_PHONE = re.compile(r"(?<!\d)[6-9]\d{9}(?!\d)")
+_UPI = re.compile(r"\b[\w.-]+@(?:ok\w+|upi|ybl|paytm|ibl|axl)\b", re.IGNORECASE)
+_URL = re.compile(r"https?://\S+")
+_ACCOUNT = re.compile(r"(?<!\d)\d{11,18}(?!\d)")
+_KEYWORDS = ("blocked", "suspended", "verify", "kyc", "otp", "urgent", "lottery", "police")
+
+
+def _pick(options: List[str], key: str) -> str:
+    digest = hashlib.sha1(key.encode()).digest()
+    return options[digest[0] % len(options)]
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _entities(text: str) -> Dict[str, List[str]]:
+    lowered = text.lower()
+    return {
+        "phone_numbers": sorted(set(_PHONE.findall(text))),
+        "upi_ids": sorted(set(_UPI.findall(text))),
+        "urls": sorted(set(u.rstrip(".,)'\"") for u in _URL.findall(text))),
+        "bank_accounts": sorted(set(_ACCOUNT.findall(text))),
+        "scam_keywords": [k for k in _KEYWORDS if k in lowered],
+    }
+
+
+def _tactics(text: str) -> List[str]:
+    lowered = text.lower()
+    found = []
+    for tactic, words in (("urgency", ("urgent", "today", "immediately")),
+                          ("fear", ("blocked", "police", "suspended")),
+                          ("authority", ("officer", "head office", "bank"))):
+        if any(w in lowered for w in words):
+            found.append(tactic)
+    return found
+
+
+def chat_reply(system: str, user: str) -> str:
+    """
+    Reply text for one chat completion. JSON chains are recognised by the keys
+    their system prompt asks for; everything else gets a hesitant human line.
+    """
+    entities = _entities(user)
+    tactics = _tactics(user)
+    threat = min(1.0, 0.2 + 0.2 * len(tactics) + 0.1 * sum(map(len, entities.values())))
+
+    if "is_scam" in system:
+        return json.dumps({
+            "is_scam": threat >= 0.4,
+            "confidence": round(0.5 + threat / 2, 2),
+            "reasoning": "Requests credentials under time pressure." if tactics else "No clear scam signals.",
+            "risk_signals": tactics,
+        })
+    if "behavioral_tactics" in system:
+        return json.dumps({**entities, "behavioral_tactics": [t.capitalize() for t in tactics]})
+    if '"scripts"' in system:
+        return json.dumps({"scripts": [
+            {"text": "Sorry, which bank did you say this was?", "tone": "confused",
+             "reasoning": "Buys time and makes them repeat their claim."},
+            {"text": "Can you give me a number I can call you back on?", "tone": "cooperative",
+             "reasoning": "Extracts a contact detail."},
+            {"text": "My son handles this, can you send it in writing?", "tone": "worried",
+             "reasoning": "Seeks verification without refusing."},
+        ]})
+    if "extracted_data" in system:
+        return json.dumps({
+            "intent": "credential_phishing" if "otp" in user.lower() else "payment_redirection",
+            "emotion": "urgent" if "urgency" in tactics else "authoritative",
+            "threat_level": round(threat, 2),
+            "tactics": tactics,
+            "extracted_data": {
+                "phone_numbers": entities["phone_numbers"],
+                "bank_accounts": entities["bank_accounts"],
+                "upi_ids": entities["upi_ids"],
+                "urls": entities["urls"],
+                "names": [],
+                "organizations": ["SBI"] if "sbi" in user.lower() else [],
+                "amounts": [],
+            },
+        })
+    if "behavioral_notes" in system:
+        return json.dumps({
+            "intent": "payment_redirection",
+            "emotion": "urgent",
+            "strategy": "stalling",
+            "behavioral_notes": "They claim bank authority and push for quick action. "
+                                "They want a payment or credentials before the victim thinks.",
+        })
+    if "strategy name" in system:
+        return "CONFUSED_ELDER: Slow them down and make them repeat details."
+    if "JSON" in system:
+        return "{}"
+    return _pick(REPLIES, user)
+
+
+def transcript(index: int, script: Optional[List[str]] = None) -> str:
+    lines = script or TRANSCRIPTS
+    return lines[index % len(lines)]
+
+
+def audio_duration(data: bytes) -> float:
+    """Seconds of audio in an upload: the WAV header when there is one, else 16 kHz 16-bit."""
+    try:
+        with wave.open(io.BytesIO(data)) as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (wave.Error, EOFError):
+        return len(data) / 32000
+
+
+def speech_seconds(text: str) -> float:
+    return max(0.5, len(text) / CHARS_PER_SECOND)
+
+
+# MPEG-1 Layer III, 128 kbit/s, 44.1 kHz, mono: 417-byte frames of 1152 samples.
+# An all-zero side info / main data frame decodes as silence.
+_MP3_HEADER = bytes((0xFF, 0xFB, 0x90, 0xC4))
+_MP3_FRAME = _MP3_HEADER + bytes(417 - len(_MP3_HEADER))
+_MP3_FRAME_S = 1152 / 44100
+
+
+def mp3_silence(seconds: float) -> bytes:
+    return _MP3_FRAME * max(1, math.ceil(seconds / _MP3_FRAME_S))
+
+
+def pcm_tone(seconds: float, sample_rate: int = 16000) -> bytes:
+    """Quiet 220 Hz tone, 16-bit little-endian mono."""
+    count = int(seconds * sample_rate)
+    step = 2 * math.pi * 220 / sample_rate
+    return struct.pack(f"<{count}h", *(int(1500 * math.sin(i * step)) for i in range(count)))
+
+
+def tts_audio(text: str, output_format: str) -> bytes:
+    """Audio for text in an ElevenLabs output_format ("mp3_44100_128", "pcm_16000", ...)."""
+    seconds = speech_seconds(text)
+    kind, _, rate = output_format.partition("_")
+    if kind == "pcm":
+        return pcm_tone(seconds, int(rate.split("_")[0] or 16000))
+    return mp3_silence(seconds)
+
+
+def url_verdict(url: str, malicious_rate: float) -> Dict[str, Any]:
+    """Stable verdict per URL: suspicious words, or a hash draw under malicious_rate."""
+    digest = hashlib.sha1(url.encode()).digest()
+    malicious = any(w in url.lower() for w in SUSPICIOUS_WORDS) or digest[1] / 255 < malicious_rate
+    engines = 90
+    flagged = 8 + digest[2] % 20 if malicious else digest[2] % 2
+    suspicious = digest[3] % 4
+    return {
+        "malicious": malicious,
+        "score": min(100, flagged * 4) if malicious else 0,
+        "stats": {
+            "malicious": flagged,
+            "suspicious": suspicious,
+            "undetected": 10,
+            "harmless": engines - flagged - suspicious - 10,
+            "timeout": 0,
+        },
+    }
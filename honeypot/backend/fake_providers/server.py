@@ -0,0 +1,657 @@
+"""
+Fake Provider Server
+One FastAPI app serving every fake provider under its own path prefix
+(/groq, /gemini, /elevenlabs, /virustotal, /urlscan, /guvi), each with its
+own Behavior. /_fake/config and /_fake/stats inspect or change behavior while
+a benchmark runs; FakeProviders runs the app inside another asyncio program.
+"""
+
+import asyncio
+import base64
+import itertools
+import json
+import logging
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+import uvicorn
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from fake_providers import content
+from fake_providers.behavior import Behavior, FaultInjector, Latency
+
+logger = logging.getLogger("fake_providers")
+
+PROVIDERS = ("groq", "gemini", "elevenlabs", "virustotal", "urlscan", "guvi")
+
+# Per-provider defaults, roughly the real services' medians
+DEFAULTS: Dict[str, Dict[str, Any]] = {
+    "groq": {"latency": {"median_ms": 350, "spread": 0.4}, "tokens_per_s": 300},
+    "gemini": {"latency": {"median_ms": 600, "spread": 0.5}, "tokens_per_s": 150},
+    "elevenlabs": {"latency": {"median_ms": 300, "spread": 0.3}, "realtime_factor": 4.0},
+    "virustotal": {"latency": {"median_ms": 400, "spread": 0.3}},
+    "urlscan": {"latency": {"median_ms": 300, "spread": 0.3}},
+    "guvi": {"latency": {"median_ms": 150, "spread": 0.3}},
+}
+
+# Settings values that point the app at a server on `base` (see config.py)
+ENV_PATHS = {
+    "GROQ_BASE_URL": "/groq",
+    "GEMINI_BASE_URL": "/gemini",
+    "ELEVENLABS_BASE_URL": "/elevenlabs/v1",
+    "VIRUSTOTAL_BASE_URL": "/virustotal/api/v3",
+    "URLSCAN_BASE_URL": "/urlscan/api/v1",
+    "GUVI_CALLBACK_URL": "/guvi/api/updateHoneyPotFinalResult",
+}
+# Services skip a provider whose key is empty; any value works against the fakes
+FAKE_KEYS = {
+    "GROQ_API_KEY": "fake-groq",
+    "GEMINI_API_KEY": "fake-gemini",
+    "ELEVENLABS_API_KEY": "fake-elevenlabs",
+    "VIRUSTOTAL_API_KEY": "fake-virustotal",
+}
+
+
+def provider_env(base_url: str, keys: bool = True) -> Dict[str, str]:
+    """Environment overrides that route the app to fakes served at base_url."""
+    base = base_url.rstrip("/")
+    env = {name: base + path for name, path in ENV_PATHS.items()}
+    if keys:
+        env.update(FAKE_KEYS)
+    return env
+
+
+class FakeState:
+    """Behavior, fault injection and recorded side effects for all providers."""
+
+    def __init__(self, config: Optional[Dict[str, Dict[str, Any]]] = None, seed: int = 0):
+        self.seed = seed
+        self.faults: Dict[str, FaultInjector] = {}
+        for i, name in enumerate(PROVIDERS):
+            behavior = Behavior(latency=Latency())
+            behavior.update(DEFAULTS[name])
+            behavior.update((config or {}).get(name, {}))
+            self.faults[name] = FaultInjector(behavior, seed=seed * 100 + i)
+        extra = (config or {}).get("content", {})
+        self.transcripts: List[str] = list(extra.get("transcripts") or [])
+        self.malicious_rate: float = float(extra.get("malicious_rate", 0.1))
+        self.urlscan_ready_s: float = float(extra.get("urlscan_ready_s", 10.0))
+        self._stt_index = itertools.count()
+        self.vt_seen: Dict[str, Dict[str, Any]] = {}
+        self.urlscan_jobs: Dict[str, Tuple[float, str]] = {}
+        self.voices: Dict[str, str] = {"21m00Tcm4TlvDq8ikWAM": "Rachel"}
+        self.callbacks: List[Dict[str, Any]] = []
+
+    def configure(self, changes: Dict[str, Any]):
+        for name, values in changes.items():
+            if name == "content":
+                if "transcripts" in values:
+                    self.transcripts = list(values["transcripts"] or [])
+                    self._stt_index = itertools.count()
+                self.malicious_rate = float(values.get("malicious_rate", self.malicious_rate))
+                self.urlscan_ready_s = float(values.get("urlscan_ready_s", self.urlscan_ready_s))
+            elif name in self.faults:
+                self.faults[name].behavior.update(values)
+            else:
+                raise KeyError(f"Unknown provider {name!r}")
+
+    def reset(self, seed: Optional[int] = None):
+        """Reseed every provider and clear transcript position and side effects."""
+        if seed is not None:
+            self.seed = seed
+        for i, fault in enumerate(self.faults.values()):
+            fault.reset(self.seed * 100 + i)
+        self._stt_index = itertools.count()
+        self.vt_seen.clear()
+        self.urlscan_jobs.clear()
+        self.callbacks.clear()
+
+    def next_transcript(self) -> str:
+        return content.transcript(next(self._stt_index), self.transcripts)
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            **{name: fault.behavior.to_dict() for name, fault in self.faults.items()},
+            "content": {
+                "transcripts": self.transcripts,
+                "malicious_rate": self.malicious_rate,
+                "urlscan_ready_s": self.urlscan_ready_s,
+            },
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **{name: fault.get_stats() for name, fault in self.faults.items()},
+            "callbacks": len(self.callbacks),
+        }
+
+
+# ── Shared request handling ───────────────────────────────────
+
+ErrorBody = Callable[[int, str], Dict[str, Any]]
+
+
+def _openai_error(status: int, message: str) -> Dict[str, Any]:
+    code = "rate_limit_exceeded" if status == 429 else "internal_server_error"
+    return {"error": {"message": message, "type": "tokens" if status == 429 else "server_error", "code": code}}
+
+
+def _google_error(status: int, message: str) -> Dict[str, Any]:
+    return {"error": {"code": status, "message": message,
+                      "status": "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"}}
+
+
+def _plain_error(status: int, message: str) -> Dict[str, Any]:
+    return {"detail": {"status": "error", "message": message}}
+
+
+async def _gate(
+    fault: FaultInjector,
+    route: str,
+    error_body: ErrorBody = _plain_error,
+    extra_s: float = 0.0
+) -> Optional[Response]:
+    """
+    Apply the provider's behavior to one request.
+
+    Returns an error response to send instead, or None after sleeping the
+    sampled latency (the caller then serves the real payload).
+    """
+    outcome = fault.decide(route)
+    if outcome == "rate_limited":
+        retry = fault.behavior.retry_after_s
+        return JSONResponse(
+            error_body(429, f"Rate limit reached. Please try again in {retry:g}s."),
+            status_code=429,
+            headers={"retry-after": f"{retry:g}"}
+        )
+    if outcome == "hang":
+        await asyncio.sleep(fault.behavior.hang_s)
+    await asyncio.sleep(fault.latency(route) + extra_s)
+    if outcome == "error":
+        return JSONResponse(error_body(500, "Injected failure"), status_code=500)
+    return None
+
+
+def _sse(payload: Any) -> bytes:
+    return f"data: {payload if isinstance(payload, str) else json.dumps(payload)}\n\n".encode()
+
+
+def _split_tokens(text: str) -> List[str]:
+    words = text.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+async def _paced_tokens(text: str, tokens_per_s: float) -> AsyncIterator[str]:
+    for piece in _split_tokens(text):
+        if tokens_per_s > 0:
+            await asyncio.sleep(1 / tokens_per_s)
+        yield piece
+
+
+async def _generation_time(text: str, tokens_per_s: float):
+    if tokens_per_s > 0:
+        await asyncio.sleep(content.count_tokens(text) / tokens_per_s)
+
+
+# ── Groq (OpenAI-compatible chat + Whisper) ───────────────────
+
+def groq_router(state: FakeState) -> APIRouter:
+    router = APIRouter()
+    fault = state.faults["groq"]
+
+    @router.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        messages = body.get("messages", [])
+        system = "\n".join(str(m.get("content", "")) for m in messages if m.get("role") == "system")
+        user = "\n".join(str(m.get("content", "")) for m in messages if m.get("role") != "system")
+        reply = content.chat_reply(system, user)
+        model = body.get("model", "llama-3.3-70b-versatile")
+        usage = {
+            "prompt_tokens": content.count_tokens(system + user),
+            "completion_tokens": content.count_tokens(reply),
+        }
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        blocked = await _gate(fault, "chat", _openai_error)
+        if blocked is not None:
+            return blocked
+
+        if not body.get("stream"):
+            await _generation_time(reply, fault.behavior.tokens_per_s)
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": reply},
+                    "logprobs": None,
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+                "system_fingerprint": "fp_fake",
+                "x_groq": {"id": f"req_{uuid.uuid4().hex[:16]}"},
+            }
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None, **extra) -> bytes:
+            return _sse({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "logprobs": None, "finish_reason": finish}],
+                **extra,
+            })
+
+        async def stream() -> AsyncIterator[bytes]:
+            yield chunk({"role": "assistant", "content": ""})
+            async for piece in _paced_tokens(reply, fault.behavior.tokens_per_s):
+                yield chunk({"content": piece})
+            yield chunk({}, "stop", x_groq={"id": completion_id, "usage": usage}, usage=usage)
+            yield _sse("[DONE]")
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @router.post("/openai/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        form = await request.form()
+        upload = form.get("file")
+        data = await upload.read() if upload is not None else b""
+        duration = content.audio_duration(data)
+
+        blocked = await _gate(
+            fault, "transcriptions", _openai_error,
+            extra_s=duration * fault.behavior.audio_latency_ms_per_s / 1000
+        )
+        if blocked is not None:
+            return blocked
+
+        text = state.next_transcript()
+        language = form.get("language") or "en"
+        if form.get("response_format") == "text":
+            return Response(text, media_type="text/plain")
+        return {
+            "task": "transcribe",
+            "language": language,
+            "duration": round(duration, 3),
+            "text": text,
+            "segments": [{
+                "id": 0, "seek": 0, "start": 0.0, "end": round(duration, 3), "text": text,
+                "tokens": [], "temperature": 0.0, "avg_logprob": -0.2,
+                "compression_ratio": 1.0, "no_speech_prob": 0.01,
+            }],
+            "x_groq": {"id": f"req_{uuid.uuid4().hex[:16]}"},
+        }
+
+    return router
+
+
+# ── Gemini (generativelanguage v1beta) ────────────────────────
+
+def gemini_router(state: FakeState) -> APIRouter:
+    router = APIRouter()
+    fault = state.faults["gemini"]
+
+    def parts_text(item: Optional[Dict[str, Any]]) -> str:
+        return "\n".join(p.get("text", "") for p in (item or {}).get("parts", []))
+
+    @router.post("/{version}/models/{model}:{method}")
+    async def generate(version: str, model: str, method: str, request: Request):
+        if method not in ("generateContent", "streamGenerateContent"):
+            return JSONResponse(_google_error(404, f"Method {method} not found"), status_code=404)
+        body = await request.json()
+        system = parts_text(body.get("systemInstruction") or body.get("system_instruction"))
+        user = "\n".join(parts_text(c) for c in body.get("contents", []))
+        reply = content.chat_reply(system, user)
+        prompt_tokens = content.count_tokens(system + user)
+
+        def response(text: str, completion_tokens: int, finish: Optional[str]) -> Dict[str, Any]:
+            candidate: Dict[str, Any] = {"content": {"role": "model", "parts": [{"text": text}]}, "index": 0}
+            if finish:
+                candidate["finishReason"] = finish
+            return {
+                "candidates": [candidate],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": completion_tokens,
+                    "totalTokenCount": prompt_tokens + completion_tokens,
+                },
+                "modelVersion": model,
+                "responseId": uuid.uuid4().hex[:20],
+            }
+
+        blocked = await _gate(fault, method, _google_error)
+        if blocked is not None:
+            return blocked
+
+        if method == "generateContent":
+            await _generation_time(reply, fault.behavior.tokens_per_s)
+            return response(reply, content.count_tokens(reply), "STOP")
+
+        async def stream() -> AsyncIterator[bytes]:
+            sent = ""
+            async for piece in _paced_tokens(reply, fault.behavior.tokens_per_s):
+                sent += piece
+                finish = "STOP" if len(sent) == len(reply) else None
+                yield _sse(response(piece, content.count_tokens(sent), finish))
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    return router
+
+
+# ── ElevenLabs (TTS, voices, subscription) ────────────────────
+
+def elevenlabs_router(state: FakeState) -> APIRouter:
+    router = APIRouter(prefix="/v1")
+    fault = state.faults["elevenlabs"]
+
+    def voice(voice_id: str) -> Dict[str, Any]:
+        return {"voice_id": voice_id, "name": state.voices[voice_id],
+                "category": "cloned" if voice_id.startswith("fake-") else "premade", "labels": {}}
+
+    @router.post("/text-to-speech/{voice_id}")
+    async def text_to_speech(voice_id: str, request: Request):
+        body = await request.json()
+        output_format = request.query_params.get("output_format", "mp3_44100_128")
+        audio = content.tts_audio(body.get("text", ""), output_format)
+        blocked = await _gate(fault, "tts", _plain_error,
+                              extra_s=content.speech_seconds(body.get("text", "")) / fault.behavior.realtime_factor)
+        if blocked is not None:
+            return blocked
+        return Response(audio, media_type="audio/mpeg" if output_format.startswith("mp3") else "audio/pcm")
+
+    @router.post("/text-to-speech/{voice_id}/stream")
+    async def text_to_speech_stream(voice_id: str, request: Request):
+        body = await request.json()
+        output_format = request.query_params.get("output_format", "mp3_44100_128")
+        text = body.get("text", "")
+        audio = content.tts_audio(text, output_format)
+        blocked = await _gate(fault, "tts_stream", _plain_error)
+        if blocked is not None:
+            return blocked
+
+        seconds = content.speech_seconds(text)
+        chunk_s = fault.behavior.stream_chunk_ms / 1000
+        chunks = max(1, round(seconds / chunk_s))
+        size = -(-len(audio) // chunks)
+        size += size % 2                            # keep PCM sample-aligned
+
+        async def stream() -> AsyncIterator[bytes]:
+            for start in range(0, len(audio), size):
+                yield audio[start:start + size]
+                await asyncio.sleep(chunk_s / fault.behavior.realtime_factor)
+
+        return StreamingResponse(stream(), media_type="audio/mpeg" if output_format.startswith("mp3") else "audio/pcm")
+
+    @router.get("/voices")
+    async def list_voices():
+        blocked = await _gate(fault, "voices")
+        return blocked or {"voices": [voice(v) for v in state.voices]}
+
+    @router.post("/voices/add")
+    async def add_voice(request: Request):
+        form = await request.form()
+        blocked = await _gate(fault, "voices_add")
+        if blocked is not None:
+            return blocked
+        voice_id = f"fake-{uuid.uuid4().hex[:16]}"
+        state.voices[voice_id] = str(form.get("name") or "clone")
+        return {"voice_id": voice_id, "requires_verification": False}
+
+    @router.get("/voices/{voice_id}")
+    async def get_voice(voice_id: str):
+        blocked = await _gate(fault, "voice")
+        if blocked is not None:
+            return blocked
+        if voice_id not in state.voices:
+            return JSONResponse(_plain_error(404, "voice_not_found"), status_code=404)
+        return voice(voice_id)
+
+    @router.delete("/voices/{voice_id}")
+    async def delete_voice(voice_id: str):
+        blocked = await _gate(fault, "voice_delete")
+        if blocked is not None:
+            return blocked
+        state.voices.pop(voice_id, None)
+        return {"status": "ok"}
+
+    @router.get("/user/subscription")
+    async def subscription():
+        blocked = await _gate(fault, "subscription")
+        return blocked or {"tier": "fake", "character_count": 0, "character_limit": 1_000_000,
+                           "voice_limit": 30, "can_use_instant_voice_cloning": True}
+
+    return router
+
+
+# ── VirusTotal v3 ─────────────────────────────────────────────
+
+def virustotal_router(state: FakeState) -> APIRouter:
+    router = APIRouter(prefix="/api/v3")
+    fault = state.faults["virustotal"]
+
+    def vt_error(status: int, message: str) -> Dict[str, Any]:
+        code = "QuotaExceededError" if status == 429 else "TransientError"
+        return {"error": {"code": code, "message": message}}
+
+    @router.get("/urls/{url_id}")
+    async def url_report(url_id: str):
+        blocked = await _gate(fault, "url_report", vt_error)
+        if blocked is not None:
+            return blocked
+        verdict = state.vt_seen.get(url_id)
+        if verdict is None:
+            return JSONResponse({"error": {"code": "NotFoundError", "message": "URL not found"}}, status_code=404)
+        return {"data": {"id": url_id, "type": "url", "attributes": {
+            "last_analysis_stats": verdict["stats"],
+            "last_analysis_date": int(time.time()),
+        }}}
+
+    @router.post("/urls")
+    async def submit_url(request: Request):
+        form = await request.form()
+        url = str(form.get("url", ""))
+        blocked = await _gate(fault, "url_submit", vt_error)
+        if blocked is not None:
+            return blocked
+        url_id = base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
+        state.vt_seen[url_id] = content.url_verdict(url, state.malicious_rate)
+        return {"data": {"type": "analysis", "id": f"u-{url_id}-{int(time.time())}"}}
+
+    @router.get("/analyses/{analysis_id}")
+    async def analysis(analysis_id: str):
+        blocked = await _gate(fault, "analysis", vt_error)
+        if blocked is not None:
+            return blocked
+        url_id = analysis_id[2:].rsplit("-", 1)[0] if analysis_id.startswith("u-") else ""
+        verdict = state.vt_seen.get(url_id)
+        if verdict is None:
+            return JSONResponse({"error": {"code": "NotFoundError", "message": "Analysis not found"}},
+                                status_code=404)
+        return {"data": {"id": analysis_id, "type": "analysis",
+                         "attributes": {"status": "completed", "stats": verdict["stats"]}}}
+
+    return router
+
+
+# ── urlscan.io ────────────────────────────────────────────────
+
+def urlscan_router(state: FakeState) -> APIRouter:
+    router = APIRouter(prefix="/api/v1")
+    fault = state.faults["urlscan"]
+
+    @router.post("/scan/")
+    async def scan(request: Request):
+        body = await request.json()
+        blocked = await _gate(fault, "scan")
+        if blocked is not None:
+            return blocked
+        scan_id = str(uuid.uuid4())
+        state.urlscan_jobs[scan_id] = (time.monotonic() + state.urlscan_ready_s, body.get("url", ""))
+        api = str(request.url_for("urlscan_result", scan_id=scan_id))
+        return {"message": "Submission successful", "uuid": scan_id, "api": api,
+                "result": api.replace("/api/v1/result/", "/result/"), "visibility": "public"}
+
+    @router.get("/result/{scan_id}/", name="urlscan_result")
+    async def result(scan_id: str):
+        blocked = await _gate(fault, "result")
+        if blocked is not None:
+            return blocked
+        job = state.urlscan_jobs.get(scan_id)
+        if job is None or time.monotonic() < job[0]:
+            return JSONResponse({"message": "Scan is not finished yet", "status": 404}, status_code=404)
+        url = job[1]
+        verdict = content.url_verdict(url, state.malicious_rate)
+        return {
+            "verdicts": {"overall": {
+                "malicious": verdict["malicious"],
+                "score": verdict["score"],
+                "categories": ["phishing"] if verdict["malicious"] else [],
+                "brands": ["SBI"] if "sbi" in url.lower() else [],
+            }},
+            "page": {"url": url, "title": "Verify your account", "server": "nginx",
+                     "ip": "203.0.113.7", "country": "IN"},
+        }
+
+    return router
+
+
+# ── GUVI callback ─────────────────────────────────────────────
+
+def guvi_router(state: FakeState) -> APIRouter:
+    router = APIRouter()
+    fault = state.faults["guvi"]
+
+    @router.post("/{path:path}")
+    async def callback(path: str, request: Request):
+        payload = await request.json()
+        blocked = await _gate(fault, "callback")
+        if blocked is not None:
+            return blocked
+        state.callbacks.append(payload)
+        return {"status": "success", "message": "Result recorded"}
+
+    @router.get("/_callbacks")
+    async def callbacks():
+        return {"callbacks": state.callbacks}
+
+    return router
+
+
+ROUTERS = {
+    "groq": groq_router,
+    "gemini": gemini_router,
+    "elevenlabs": elevenlabs_router,
+    "virustotal": virustotal_router,
+    "urlscan": urlscan_router,
+    "guvi": guvi_router,
+}
+
+
+def create_app(config: Optional[Dict[str, Dict[str, Any]]] = None, seed: int = 0) -> FastAPI:
+    """
+    Build the fake provider app.
+
+    Args:
+        config: {provider: Behavior fields, "content": {transcripts,
+            malicious_rate, urlscan_ready_s}}; unset fields keep DEFAULTS
+        seed: Seed for latency / fault draws
+
+    Returns:
+        FastAPI app; the FakeState is at app.state.fake
+    """
+    state = FakeState(config, seed)
+    app = FastAPI(title="Fake Providers")
+    app.state.fake = state
+
+    @app.get("/_fake/config")
+    async def get_config():
+        return state.get_config()
+
+    @app.post("/_fake/config")
+    async def set_config(request: Request):
+        try:
+            state.configure(await request.json())
+        except (KeyError, TypeError, ValueError) as e:
+            return JSONResponse({"error": str(e)}, status_code=400)
+        return state.get_config()
+
+    @app.post("/_fake/reset")
+    async def reset(request: Request):
+        body = await request.body()
+        seed = json.loads(body).get("seed") if body else None
+        state.reset(None if seed is None else int(seed))
+        return {"seed": state.seed}
+
+    @app.get("/_fake/stats")
+    async def get_stats():
+        return state.get_stats()
+
+    for name, build in ROUTERS.items():
+        app.include_router(build(state), prefix=f"/{name}")
+    return app
+
+
+class FakeProviders:
+    """
+    Serve the fakes from inside an asyncio program (benchmarks, replay).
+
+        async with FakeProviders(port=9100) as fakes:
+            os.environ.update(fakes.env())
+    """
+
+    def __init__(
+        self,
+        config: Optional[Dict[str, Dict[str, Any]]] = None,
+        host: str = "127.0.0.1",
+        port: int = 9100,
+        seed: int = 0
+    ):
+        self.app = create_app(config, seed)
+        self.host = host
+        self.port = port
+        self._server: Optional[uvicorn.Server] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def state(self) -> FakeState:
+        return self.app.state.fake
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def env(self, keys: bool = True) -> Dict[str, str]:
+        return provider_env(self.base_url, keys)
+
+    async def start(self):
+        config = uvicorn.Config(self.app, host=self.host, port=self.port, log_level="warning", lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._task = asyncio.create_task(self._server.serve(), name="fake-providers")
+        while not self._server.started:
+            if self._task.done():
+                self._task.result()         # bind failure etc.
+                raise RuntimeError("Fake provider server exited during startup")
+            await asyncio.sleep(0.05)
+        logger.info(f"🧪 Fake providers on {self.base_url}")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._server = self._task = None
+
+    async def __aenter__(self) -> "FakeProviders":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
@@ -0,0 +1,246 @@
+"""
+Domain Reputation Index
+Offline phishing blocklist / allowlist lookups for the URL scanner.
+Domains are stored as a sorted array of 64-bit hashes (8 bytes per entry)
+and searched with bisect, so multi-million entry lists fit in a few tens of
+MB and a lookup costs a handful of hash + binary-search steps. Source files
+are watched by mtime and rebuilt in a background thread on change.
+"""
+
+import bisect
+import hashlib
+import logging
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger("live_takeover.domain_index")
+
+# Hosts where anyone can publish under a subdomain (or path); a wildcard
+# allowlist entry never reaches across them
+SHARED_HOSTING_SUFFIXES = {
+    "github.io", "gitlab.io", "sites.google.com", "docs.google.com", "forms.gle",
+    "blogspot.com", "appspot.com", "web.app", "firebaseapp.com", "pages.dev",
+    "workers.dev", "netlify.app", "vercel.app", "herokuapp.com", "azurewebsites.net",
+    "wixsite.com", "weebly.com", "000webhostapp.com", "glitch.me", "repl.co",
+    "ngrok.io", "s3.amazonaws.com", "storage.googleapis.com", "googleusercontent.com",
+}
+
+
+def _domain_hash(domain: str) -> int:
+    return int.from_bytes(hashlib.blake2b(domain.encode(), digest_size=8).digest(), "big")
+
+
+def _parse_domains(path: Path, keep_wildcards: bool = False) -> Iterator[str]:
+    """
+    Yield domains from a list file. Accepts plain "domain" lines, hosts-file
+    lines ("0.0.0.0 domain") and full URLs; '#' starts a comment. "*.domain"
+    is kept as written when keep_wildcards, otherwise read as "domain".
+    """
+    with path.open("r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip().lower()
+            if not line:
+                continue
+            token = line.split()[-1]
+            if "://" in token:
+                token = token.split("://", 1)[1]
+            token = token.split("/", 1)[0].split(":", 1)[0].strip(".")
+            if token.startswith("*.") and not keep_wildcards:
+                token = token[2:]
+            if "." in token:
+                yield token
+
+
+class DomainIndex:
+    """
+    Immutable-after-build hash index over one domain list file, with
+    mtime-based hot reload. A listed domain also matches its subdomains,
+    unless exact: then only the host itself matches, and subdomains need an
+    explicit "*.domain" entry (never honoured across SHARED_HOSTING_SUFFIXES).
+    """
+
+    RELOAD_CHECK_INTERVAL = 30.0  # seconds between mtime checks
+
+    def __init__(self, name: str, path: str, exact: bool = False):
+        self.name = name
+        self.path = Path(path) if path else None
+        self.exact = exact
+        self._hashes: array = array("Q")
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._reloading = False
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Any] = {
+            "entries": 0,
+            "lookups": 0,
+            "hits": 0,
+            "lookup_ns_total": 0,
+            "reloads": 0,
+            "load_seconds": 0.0,
+            "loaded_at": None,
+        }
+
+    # ── Loading ───────────────────────────────────────────────────
+
+    def load(self) -> bool:
+        """Build the index synchronously (startup / tests). Returns True if loaded."""
+        if self.path is None or not self.path.exists():
+            return False
+        mtime = self.path.stat().st_mtime
+        self._build(mtime)
+        return True
+
+    def _build(self, mtime: float):
+        started = time.perf_counter()
+        try:
+            hashes = sorted({_domain_hash(d) for d in _parse_domains(self.path, keep_wildcards=self.exact)})
+            index = array("Q", hashes)
+        except OSError as e:
+            logger.error(f"Failed to load {self.name} from {self.path}: {e}")
+            self._reloading = False
+            return
+
+        # Single reference swap; readers see either the old or new index
+        self._hashes = index
+        self._mtime = mtime
+        self._reloading = False
+        elapsed = time.perf_counter() - started
+        self.stats.update({
+            "entries": len(index),
+            "load_seconds": round(elapsed, 3),
+            "loaded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        })
+        self.stats["reloads"] += 1
+        logger.info(f"📚 {self.name}: {len(index):,} domains loaded in {elapsed:.2f}s "
+                    f"({self.memory_bytes / 1024 / 1024:.1f} MB)")
+
+    def maybe_reload(self):
+        """Rebuild in a background thread if the source file changed."""
+        if self.path is None:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.RELOAD_CHECK_INTERVAL:
+            return
+        self._last_check = now
+
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if self._reloading:
+                return
+            self._reloading = True
+        threading.Thread(
+            target=self._build, args=(mtime,), name=f"{self.name}-reload", daemon=True
+        ).start()
+
+    # ── Lookup ────────────────────────────────────────────────────
+
+    def match(self, hostname: str) -> Optional[str]:
+        """
+        Return the listed entry that covers `hostname` (itself, a parent
+        domain, or for exact indexes a "*.parent" wildcard), or None.
+        """
+        self.maybe_reload()
+        hashes = self._hashes
+        if not hashes or not hostname:
+            return None
+
+        started = time.perf_counter_ns()
+        host = hostname.lower().strip(".")
+        labels = host.split(".")
+        if self.exact:
+            candidates = [host]
+            # "*.bank.com" covers "net.bank.com"; stop at user-content hosts
+            if host not in SHARED_HOSTING_SUFFIXES:
+                for i in range(1, len(labels) - 1):
+                    parent = ".".join(labels[i:])
+                    if parent in SHARED_HOSTING_SUFFIXES:
+                        break
+                    candidates.append("*." + parent)
+        else:
+            # Check "a.b.evil.xyz", "b.evil.xyz", "evil.xyz" (never the bare TLD)
+            candidates = [".".join(labels[i:]) for i in range(len(labels) - 1)]
+
+        matched = None
+        for candidate in candidates:
+            h = _domain_hash(candidate)
+            pos = bisect.bisect_left(hashes, h)
+            if pos < len(hashes) and hashes[pos] == h:
+                matched = candidate
+                break
+
+        self.stats["lookups"] += 1
+        self.stats["lookup_ns_total"] += time.perf_counter_ns() - started
+        if matched:
+            self.stats["hits"] += 1
+        return matched
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._hashes.itemsize * len(self._hashes)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["lookups"]
+        return {
+            "source": str(self.path) if self.path else None,
+            "entries": self.stats["entries"],
+            "memory_bytes": self.memory_bytes,
+            "lookups": lookups,
+            "hits": self.stats["hits"],
+            "avg_lookup_us": round(self.stats["lookup_ns_total"] / lookups / 1000, 2) if lookups else 0.0,
+            "reloads": self.stats["reloads"],
+            "load_seconds": self.stats["load_seconds"],
+            "loaded_at": self.stats["loaded_at"],
+        }
+
+
+class DomainReputation:
+    """
+    Blocklist + allowlist pair. The allowlist wins when a domain is on both,
+    so a stray entry in a synced feed cannot flag a bank's real site. The
+    allowlist matches exact hosts (plus "*.domain" wildcards), so a listed
+    site does not vouch for whatever is hosted on its subdomains.
+    """
+
+    def __init__(self, blocklist_path: str, allowlist_path: str):
+        self.blocklist = DomainIndex("blocklist", blocklist_path)
+        self.allowlist = DomainIndex("allowlist", allowlist_path, exact=True)
+        for index in (self.blocklist, self.allowlist):
+            if not index.load() and index.path is not None:
+                logger.info(f"{index.name} file not found at {index.path} (will load when it appears)")
+
+    def check(self, hostname: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Returns:
+            ("allowed" | "blocked" | None, matched_domain)
+        """
+        allowed = self.allowlist.match(hostname)
+        if allowed:
+            return "allowed", allowed
+        blocked = self.blocklist.match(hostname)
+        if blocked:
+            return "blocked", blocked
+        return None, None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "blocklist": self.blocklist.get_stats(),
+            "allowlist": self.allowlist.get_stats(),
+        }
+
+
+# Module-level singleton
+domain_reputation = DomainReputation(
+    blocklist_path=getattr(settings, 'DOMAIN_BLOCKLIST_PATH', ''),
+    allowlist_path=getattr(settings, 'DOMAIN_ALLOWLIST_PATH', ''),
+)
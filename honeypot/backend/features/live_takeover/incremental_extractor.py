@@ -0,0 +1,313 @@
+"""
+Incremental Entity Extractor
+Per-session streaming extraction over live STT segments.
+Keeps a bounded tail of recent tokens so numbers read out across two
+transcription flushes ("nine eight seven… six five four…") are still caught,
+and normalizes spoken English/Hindi digits before matching.
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from features.live_takeover.session_manager import ExtractedEntity
+
+logger = logging.getLogger("live_takeover.incremental_extractor")
+
+
+class SpokenNumberNormalizer:
+    """
+    Collapses dictated digit runs into contiguous digit strings.
+
+    "nine eight seven, six five four three two one zero" -> "9876543210"
+    "double nine 12 345"                                   -> "9912345"
+    "nau aath saat ..."                                    -> "987..."
+
+    Only runs that look dictated are rewritten (two or more number words, or
+    several short digit groups), so ordinary speech like "do you have one"
+    is left untouched.
+    """
+
+    DIGIT_WORDS = {
+        # English
+        "zero": "0", "oh": "0", "one": "1", "two": "2", "three": "3",
+        "four": "4", "five": "5", "six": "6", "seven": "7", "eight": "8",
+        "nine": "9",
+        # Hindi (romanized)
+        "shunya": "0", "sunya": "0", "ek": "1", "do": "2", "teen": "3",
+        "char": "4", "chaar": "4", "paanch": "5", "panch": "5", "chhe": "6",
+        "chhah": "6", "che": "6", "saat": "7", "aath": "8", "aat": "8",
+        "nau": "9", "no": "9",
+        # Hindi (Devanagari)
+        "शून्य": "0", "एक": "1", "दो": "2", "तीन": "3", "चार": "4",
+        "पांच": "5", "पाँच": "5", "छह": "6", "छः": "6", "सात": "7",
+        "आठ": "8", "नौ": "9",
+    }
+
+    MULTIPLIERS = {"double": 2, "triple": 3, "डबल": 2, "ट्रिपल": 3}
+
+    # Tolerated inside a run without breaking it
+    FILLERS = {"uh", "um", "umm", "hmm", "haan", "ji", "aur", "and", "-", "…"}
+
+    # Everyday words that only count as digits next to another number word
+    AMBIGUOUS = {"oh", "do", "no", "one", "che", "aat"}
+
+    DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+    SPOKEN_SYMBOLS = [
+        (re.compile(r"\s+at\s+the\s+rate(?:\s+of)?\s+", re.IGNORECASE), "@"),
+        (re.compile(r"\s+at\s+rate\s+", re.IGNORECASE), "@"),
+    ]
+
+    _STRIP = ".,;:!?\"'()[]"
+    _GROUPED_DIGITS = re.compile(r"^\d+(?:-\d+)+$")
+
+    MAX_GROUP_LEN = 5  # digit tokens longer than this are already complete
+
+    def classify(self, token: str) -> Tuple[str, str]:
+        """Classify a raw token as ("digits"|"word"|"mult"|"filler"|"other", value)."""
+        core = token.strip(self._STRIP).translate(self.DEVANAGARI_DIGITS)
+        lowered = core.lower()
+        if core.isdigit():
+            return "digits", core
+        if self._GROUPED_DIGITS.match(core):
+            return "digits", core.replace("-", "")
+        if lowered in self.DIGIT_WORDS:
+            return "word", self.DIGIT_WORDS[lowered]
+        if lowered in self.MULTIPLIERS:
+            return "mult", str(self.MULTIPLIERS[lowered])
+        if lowered in self.FILLERS or not lowered:
+            return "filler", ""
+        return "other", ""
+
+    def find_runs(self, tokens: List[str]) -> List[Tuple[int, int, str]]:
+        """
+        Locate dictated digit runs in a token list.
+
+        Returns:
+            [(start, end_exclusive, digits), ...] for runs that should be collapsed
+        """
+        runs = []
+        kinds = [self.classify(t) for t in tokens]
+        i = 0
+        n = len(tokens)
+        while i < n:
+            if kinds[i][0] not in ("digits", "word", "mult"):
+                i += 1
+                continue
+            j = i
+            last_numeric = i
+            while j < n and kinds[j][0] in ("digits", "word", "mult", "filler"):
+                if kinds[j][0] != "filler":
+                    last_numeric = j
+                j += 1
+            end = last_numeric + 1
+            start, stop = self._trim_ambiguous(tokens, kinds, i, end)
+            digits = self._collapse(tokens[start:stop], kinds[start:stop])
+            if digits is not None:
+                runs.append((start, stop, digits))
+            i = end
+        return runs
+
+    def _trim_ambiguous(
+        self,
+        tokens: List[str],
+        kinds: List[Tuple[str, str]],
+        start: int,
+        end: int
+    ) -> Tuple[int, int]:
+        """Drop edge words like "do"/"no" that only border digit groups ("345 do you...")."""
+        numeric = [k for k in range(start, end) if kinds[k][0] != "filler"]
+
+        def ambiguous(k: int) -> bool:
+            return kinds[k][0] == "word" and tokens[k].strip(self._STRIP).lower() in self.AMBIGUOUS
+
+        while len(numeric) >= 2 and ambiguous(numeric[0]) and kinds[numeric[1]][0] != "word":
+            numeric.pop(0)
+        while len(numeric) >= 2 and ambiguous(numeric[-1]) and kinds[numeric[-2]][0] != "word":
+            numeric.pop()
+        return numeric[0], numeric[-1] + 1
+
+    def _collapse(self, tokens: List[str], kinds: List[Tuple[str, str]]) -> Optional[str]:
+        words = [tokens[k].strip(self._STRIP).lower() for k, (kind, _) in enumerate(kinds) if kind == "word"]
+        digit_groups = [v for kind, v in kinds if kind == "digits"]
+        numeric = len(words) + len(digit_groups)
+
+        dictated = (
+            len(words) >= 2
+            or (words and digit_groups)
+            or (len(digit_groups) >= 2 and all(len(g) <= self.MAX_GROUP_LEN for g in digit_groups))
+        )
+        if not dictated or numeric < 2:
+            return None
+        # A run made only of ambiguous words ("no no", "do one") is ordinary speech
+        if not digit_groups and all(w in self.AMBIGUOUS for w in words):
+            return None
+
+        out = []
+        repeat = 1
+        for kind, value in kinds:
+            if kind == "mult":
+                repeat = int(value)
+            elif kind in ("digits", "word"):
+                if repeat > 1 and value:
+                    out.append(value[0] * (repeat - 1))
+                out.append(value)
+                repeat = 1
+        return "".join(out)
+
+    def normalize_symbols(self, text: str) -> str:
+        """Rewrite spoken symbols ("rahul at the rate oksbi" -> "rahul@oksbi")."""
+        for pattern, replacement in self.SPOKEN_SYMBOLS:
+            text = pattern.sub(replacement, text)
+        return text
+
+
+class IncrementalExtractor:
+    """
+    Streaming regex extraction for one live session.
+
+    Each `update()` scans only the carried-over tail plus the new segment, so
+    work is O(segment) instead of O(transcript). A digit run that is still open
+    at the end of the window is held back until the next segment closes it (or
+    `flush()` is called), so a half-read account number is never emitted;
+    matches that no further digit could extend are emitted straight away.
+    """
+
+    TAIL_CONTEXT_TOKENS = 6     # plain context carried into the next window
+    MAX_TAIL_TOKENS = 48        # hard cap, even for very long dictated runs
+    MAX_SEEN = 512              # bounded dedup memory per session
+
+    def __init__(
+        self,
+        patterns: Dict[str, Pattern],
+        normalizer: Optional[SpokenNumberNormalizer] = None
+    ):
+        self.patterns = patterns
+        self.normalizer = normalizer or SpokenNumberNormalizer()
+        self._tail: List[str] = []
+        self._pending: List[ExtractedEntity] = []
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self.segments_processed = 0
+
+    def update(self, text: str) -> List[ExtractedEntity]:
+        """
+        Feed a new transcript segment.
+
+        Returns:
+            Entities completed by this segment that were not emitted before.
+        """
+        new_tokens = self.normalizer.normalize_symbols(" " + text + " ").split()
+        if not new_tokens:
+            return []
+        self.segments_processed += 1
+
+        tokens = self._tail + new_tokens
+        runs = self.normalizer.find_runs(tokens)
+
+        # Runs touching the end of the window may continue in the next segment
+        open_run = runs[-1] if runs and runs[-1][1] == len(tokens) else None
+        if open_run is None and tokens and self.normalizer.classify(tokens[-1])[0] in ("digits", "word", "mult"):
+            open_run = (len(tokens) - 1, len(tokens), "")
+
+        normalized, spans = self._render(tokens, runs)
+        open_from = spans[open_run[0]] if open_run else len(normalized)
+
+        # Anything previously held back is re-evaluated against the longer window
+        self._pending = []
+        completed = []
+        for entity_type, pattern in self.patterns.items():
+            for match in pattern.finditer(normalized):
+                entity = ExtractedEntity(
+                    entity_type=entity_type,
+                    value=match.group(0).strip(),
+                    confidence=0.9,
+                    context=text[:80]
+                )
+                if match.end() > open_from and open_run is not None and self._can_grow(pattern, normalized, match):
+                    self._pending.append(entity)
+                else:
+                    completed.append(entity)
+
+        self._tail = self._next_tail(tokens, runs, open_run)
+        return self._emit(completed)
+
+    def flush(self) -> List[ExtractedEntity]:
+        """Emit held-back entities (call when the speaker stops or the call ends)."""
+        pending, self._pending = self._pending, []
+        self._tail = []
+        return self._emit(pending)
+
+    def filter_new(self, entities: List[ExtractedEntity]) -> List[ExtractedEntity]:
+        """Dedup arbitrary entities (keywords, tactics) against this session's memory."""
+        return self._emit(entities)
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "segments_processed": self.segments_processed,
+            "tail_tokens": len(self._tail),
+            "pending_entities": len(self._pending),
+            "seen_entities": len(self._seen),
+        }
+
+    # ── internals ─────────────────────────────────────────────────
+
+    def _render(self, tokens: List[str], runs: List[Tuple[int, int, str]]) -> Tuple[str, Dict[int, int]]:
+        """Join tokens into text with runs collapsed; map token index -> char offset."""
+        parts = []
+        spans: Dict[int, int] = {}
+        offset = 0
+        run_at = {start: (end, digits) for start, end, digits in runs}
+        i = 0
+        while i < len(tokens):
+            if i in run_at:
+                end, piece = run_at[i]
+                for k in range(i, end):
+                    spans[k] = offset
+            else:
+                end, piece = i + 1, tokens[i]
+                spans[i] = offset
+            parts.append(piece)
+            offset += len(piece) + 1
+            i = end
+        return " ".join(parts), spans
+
+    @staticmethod
+    def _can_grow(pattern: Pattern, normalized: str, match: "re.Match") -> bool:
+        """
+        Whether one more dictated digit would still match, and match further.
+        A match already at its pattern's maximal length (a full 10-digit phone)
+        is complete, so it is emitted now rather than a segment later.
+        """
+        longer = pattern.match(normalized[:match.end()] + "0", match.start())
+        return longer is not None and longer.end() > match.end()
+
+    def _next_tail(
+        self,
+        tokens: List[str],
+        runs: List[Tuple[int, int, str]],
+        open_run: Optional[Tuple[int, int, str]]
+    ) -> List[str]:
+        start = len(tokens) - self.TAIL_CONTEXT_TOKENS
+        if open_run is not None:
+            start = min(start, open_run[0])
+        start = max(start, len(tokens) - self.MAX_TAIL_TOKENS, 0)
+        # Never carry half of a closed run; its digits would re-match as a new number
+        for run_start, run_end, _ in runs:
+            if run_start < start < run_end and run_end < len(tokens):
+                start = run_end
+        return tokens[start:]
+
+    def _emit(self, entities: List[ExtractedEntity]) -> List[ExtractedEntity]:
+        fresh = []
+        for entity in entities:
+            key = f"{entity.entity_type}:{entity.value}"
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                continue
+            self._seen[key] = None
+            if len(self._seen) > self.MAX_SEEN:
+                self._seen.popitem(last=False)
+            fresh.append(entity)
+        return fresh
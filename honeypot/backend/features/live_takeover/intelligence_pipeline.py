@@ -7,9 +7,11 @@ Wraps existing IntelligenceExtractor + ScamDetector for streaming use.
 import asyncio
 import logging
 import re
+from collections import OrderedDict
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
+from features.live_takeover.incremental_extractor import IncrementalExtractor
 from features.live_takeover.session_manager import (
     ExtractedEntity,
     LiveSessionState,
@@ -65,9 +67,29 @@ class IntelligencePipeline:
         "isolation": ["don't tell", "secret", "confidential", "between us", "no one should know"],
     }
 
+    MAX_TRACKED_SESSIONS = 500  # extractors for calls that never send an explicit end
+
     def __init__(self):
         self._processing = False
         self._queue: asyncio.Queue = asyncio.Queue()
+        self._compiled = {
+            entity_type: re.compile(pattern, re.IGNORECASE)
+            for entity_type, pattern in self.PATTERNS.items()
+        }
+        self._extractors: "OrderedDict[str, IncrementalExtractor]" = OrderedDict()
+
+    def _get_extractor(self, session_id: str) -> IncrementalExtractor:
+        """Get or create the streaming extractor for a session (LRU-bounded)."""
+        extractor = self._extractors.get(session_id)
+        if extractor is None:
+            extractor = IncrementalExtractor(self._compiled)
+            self._extractors[session_id] = extractor
+            if len(self._extractors) > self.MAX_TRACKED_SESSIONS:
+                evicted, _ = self._extractors.popitem(last=False)
+                logger.debug(f"Evicted idle extractor for {evicted}")
+        else:
+            self._extractors.move_to_end(session_id)
+        return extractor
     
     async def process_transcript(
         self,
@@ -97,9 +119,13 @@ class IntelligencePipeline:
             return {"new_entities": [], "threat_level": 0.0, "tactics": [], "urls_to_scan": []}
         
         text_lower = text.lower()
+        extractor = self._get_extractor(session_id)
         
-        # ── Phase 1: Regex extraction (instant) ───────────────
-        entities = self._regex_extract(text)
+        # ── Phase 1: Regex extraction (incremental) ───────────
+        # Only entities completed by this segment; digits read out across
+        # segment boundaries are stitched together by the extractor.
+        regex_entities = extractor.update(text)
+        entities: List[ExtractedEntity] = []
         
         # ── Phase 2: Keyword detection ────────────────────────
         keywords = self._detect_keywords(text_lower)
@@ -121,6 +147,8 @@ class IntelligencePipeline:
                 context=text[:100]
             ))
         
+        entities = regex_entities + entities
+        
         # ── Phase 4: Threat level computation ─────────────────
         threat_level = self._compute_threat_level(entities, tactics, keywords)
         
@@ -128,11 +156,9 @@ class IntelligencePipeline:
         urls_to_scan = [e.value for e in entities if e.entity_type == "url"]
         
         # ── Phase 6: Update session ───────────────────────────
-        new_entities = await live_session_manager.update_intelligence(
-            session_id=session_id,
-            entities=entities,
-            threat_level=threat_level,
-            tactics=tactics
+        new_entities = await self._record_entities(
+            session_id, extractor, regex_entities, entities[len(regex_entities):],
+            threat_level=threat_level, tactics=tactics
         )
         
         result = {
@@ -154,22 +180,51 @@ class IntelligencePipeline:
         
         return result
     
-    def _regex_extract(self, text: str) -> List[ExtractedEntity]:
-        """Extract entities using regex patterns."""
-        entities = []
+    async def _record_entities(
+        self,
+        session_id: str,
+        extractor: IncrementalExtractor,
+        regex_entities: List[ExtractedEntity],
+        other_entities: List[ExtractedEntity],
+        threat_level: Optional[float] = None,
+        tactics: Optional[List[str]] = None
+    ) -> List[ExtractedEntity]:
+        """
+        Store entities on the live session, or dedup them against the extractor
+        for call/room ids that are not tracked by live_session_manager.
+        """
+        if await live_session_manager.get_session(session_id):
+            return await live_session_manager.update_intelligence(
+                session_id=session_id,
+                entities=regex_entities + other_entities,
+                threat_level=threat_level,
+                tactics=tactics
+            )
+        # Regex entities were already deduped when the extractor emitted them
+        return regex_entities + extractor.filter_new(other_entities)
+
+    async def finalize_session(self, session_id: str) -> List[Dict[str, Any]]:
+        """
+        Flush held-back entities for a session and release its extractor.
+        Call before persisting the session/call so trailing numbers are kept.
         
-        for entity_type, pattern in self.PATTERNS.items():
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                # Skip if the match is part of a larger URL or email context
-                entities.append(ExtractedEntity(
-                    entity_type=entity_type,
-                    value=match.strip(),
-                    confidence=0.9,
-                    context=text[:80]
-                ))
+        Returns:
+            [{"type", "value", "confidence"}, ...] for newly completed entities
+        """
+        extractor = self._extractors.pop(session_id, None)
+        if extractor is None:
+            return []
         
-        return entities
+        flushed = extractor.flush()
+        if not flushed:
+            return []
+        
+        new_entities = await self._record_entities(session_id, extractor, flushed, [])
+        logger.info(f"Flushed {len(new_entities)} trailing entities for {session_id}")
+        return [
+            {"type": e.entity_type, "value": e.value, "confidence": e.confidence}
+            for e in new_entities
+        ]
     
     def _detect_keywords(self, text_lower: str) -> List[Dict[str, Any]]:
         """Detect scam keywords with severity levels."""
@@ -0,0 +1,224 @@
+"""
+Phrase Bank
+Pre-rendered filler, stall and backchannel clips per voice ("hmm", "one second
+beta", "haan ji"), kept in memory as ready-to-send audio so the takeover loop
+can cover 1-3 s of LLM / TTS latency without dead air. Rendered at startup for
+the default voice and whenever a voice clone is created or first used.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger("live_takeover.phrase_bank")
+
+DEFAULT_VOICE = "default"
+
+# Category -> phrases. Override with a JSON file of the same shape (PHRASE_BANK_FILE).
+DEFAULT_PHRASES: Dict[str, List[str]] = {
+    "handoff": [
+        "Hmm... haan, ek second...",
+        "Haan ji, boliye...",
+    ],
+    "filler": [
+        "Hmm...",
+        "Hmm, ek second...",
+        "Achha... ruko zara...",
+        "Haan haan, sun raha hoon...",
+    ],
+    "stall": [
+        "One second beta, let me find my glasses...",
+        "Hold on, hold on, I am writing it down...",
+        "Ek minute, koi door pe hai...",
+    ],
+    "backchannel": [
+        "Haan ji",
+        "Achha",
+        "Okay okay",
+        "Hmm hmm",
+    ],
+    "error": [
+        # Exact text of LiveTakeoverAgent's error fallback
+        "Uh... hold on, my phone is acting up. Can you say that again?",
+    ],
+}
+
+
+@dataclass
+class Phrase:
+    text: str
+    category: str
+    voice_id: str
+    audio: bytes
+    audio_b64: str
+    format: str = "mp3"
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class PhraseBank:
+    """
+    voice_id -> category -> list of rendered Phrase objects.
+
+    Rendering goes through TTSService.synthesize_to_bytes, so clips also land
+    in the shared TTS cache and re-warming after a restart costs no API quota.
+    """
+
+    def __init__(self, phrases: Dict[str, List[str]], enabled: bool = True, concurrency: int = 3):
+        self.phrases = phrases
+        self.enabled = enabled
+        self.concurrency = concurrency
+        self._bank: Dict[str, Dict[str, List[Phrase]]] = {}
+        self._by_text: Dict[str, Dict[str, Phrase]] = {}        # voice_id -> normalized text -> Phrase
+        self._last: Dict[tuple, str] = {}                       # (voice_id, category) -> last text served
+        self._warming: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "rendered": 0,
+            "render_failures": 0,
+            "served": 0,
+            "misses": 0,
+        }
+
+    # ── Warming ───────────────────────────────────────────────────
+
+    def start(self):
+        """Warm the default voice in the background (app startup)."""
+        self.warm_in_background(DEFAULT_VOICE)
+
+    def warm_in_background(self, voice_id: Optional[str]):
+        """Render every phrase for a voice without blocking the caller."""
+        voice_id = voice_id or DEFAULT_VOICE
+        if not self.enabled or voice_id in self._bank or voice_id in self._warming:
+            return
+        if not getattr(settings, 'ELEVENLABS_API_KEY', ''):
+            logger.info("Phrase bank disabled: ElevenLabs API key not configured")
+            self.enabled = False
+            return
+        task = asyncio.create_task(self.warm(voice_id), name=f"phrase-bank-{voice_id}")
+        self._warming[voice_id] = task
+        task.add_done_callback(lambda _: self._warming.pop(voice_id, None))
+
+    async def warm(self, voice_id: str = DEFAULT_VOICE):
+        """Render (or load from the TTS cache) every configured phrase for a voice."""
+        from services.tts_service import tts_service
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        start = time.monotonic()
+
+        async def render(category: str, text: str) -> Optional[Phrase]:
+            async with semaphore:
+                try:
+                    audio = await tts_service.synthesize_to_bytes(
+                        text=text,
+                        voice_id=None if voice_id == DEFAULT_VOICE else voice_id
+                    )
+                except Exception as e:
+                    logger.warning(f"Phrase render failed ({voice_id}, {text!r}): {e}")
+                    audio = None
+            if not audio:
+                self.stats["render_failures"] += 1
+                return None
+            self.stats["rendered"] += 1
+            return Phrase(
+                text=text,
+                category=category,
+                voice_id=voice_id,
+                audio=audio,
+                audio_b64=base64.b64encode(audio).decode()
+            )
+
+        jobs = [
+            render(category, text)
+            for category, texts in self.phrases.items()
+            for text in texts
+        ]
+        rendered = [p for p in await asyncio.gather(*jobs) if p is not None]
+
+        bank: Dict[str, List[Phrase]] = {}
+        for phrase in rendered:
+            bank.setdefault(phrase.category, []).append(phrase)
+        self._bank[voice_id] = bank
+        self._by_text[voice_id] = {_normalize(p.text): p for p in rendered}
+        logger.info(f"🗣️ Phrase bank ready for {voice_id}: {len(rendered)}/{len(jobs)} clips "
+                    f"in {time.monotonic() - start:.1f}s")
+
+    def forget(self, voice_id: str):
+        """Drop a voice's clips (e.g. the clone was deleted)."""
+        self._bank.pop(voice_id, None)
+        self._by_text.pop(voice_id, None)
+
+    # ── Lookup (never blocks) ─────────────────────────────────────
+
+    def get(self, category: str, voice_id: Optional[str] = None) -> Optional[Phrase]:
+        """
+        A ready clip from a category, avoiding an immediate repeat. Falls back to
+        the default voice while a clone is still warming. None if nothing is ready.
+        """
+        for vid in self._candidates(voice_id):
+            choices = self._bank.get(vid, {}).get(category)
+            if not choices:
+                continue
+            last = self._last.get((vid, category))
+            pool = [p for p in choices if p.text != last] or choices
+            phrase = random.choice(pool)
+            self._last[(vid, category)] = phrase.text
+            self.stats["served"] += 1
+            return phrase
+        self.stats["misses"] += 1
+        return None
+
+    def lookup(self, text: str, voice_id: Optional[str] = None) -> Optional[Phrase]:
+        """Pre-rendered clip for an exact response text (e.g. the agent's error fallback)."""
+        key = _normalize(text)
+        for vid in self._candidates(voice_id, fallback=False):
+            phrase = self._by_text.get(vid, {}).get(key)
+            if phrase is not None:
+                self.stats["served"] += 1
+                return phrase
+        return None
+
+    @staticmethod
+    def _candidates(voice_id: Optional[str], fallback: bool = True) -> List[str]:
+        if voice_id and voice_id != DEFAULT_VOICE:
+            return [voice_id, DEFAULT_VOICE] if fallback else [voice_id]
+        return [DEFAULT_VOICE]
+
+    def get_stats(self) -> Dict[str, object]:
+        return {
+            **self.stats,
+            "enabled": self.enabled,
+            "voices": {
+                vid: sum(len(v) for v in bank.values()) for vid, bank in self._bank.items()
+            },
+            "warming": list(self._warming),
+        }
+
+
+def _load_phrases() -> Dict[str, List[str]]:
+    path = getattr(settings, 'PHRASE_BANK_FILE', '')
+    if not path:
+        return DEFAULT_PHRASES
+    try:
+        phrases = json.loads(Path(path).read_text(encoding="utf-8"))
+        logger.info(f"Loaded phrase bank from {path}")
+        return {category: list(texts) for category, texts in phrases.items()}
+    except (OSError, ValueError, AttributeError) as e:
+        logger.error(f"Could not load PHRASE_BANK_FILE {path} ({e}), using defaults")
+        return DEFAULT_PHRASES
+
+
+# Module-level singleton
+phrase_bank = PhraseBank(
+    _load_phrases(),
+    enabled=getattr(settings, 'PHRASE_BANK_ENABLED', True)
+)
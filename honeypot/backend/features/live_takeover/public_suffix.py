@@ -0,0 +1,192 @@
+"""
+Public Suffix Handling
+Maps hostnames to their registrable domain ("login.sbi.co.in" -> "sbi.co.in")
+using a bundled subset of the Public Suffix List (ICANN section), so WHOIS and
+domain reputation lookups are keyed per owner rather than per hostname.
+A full list can be loaded from PUBLIC_SUFFIX_LIST_PATH (standard PSL format).
+"""
+
+import logging
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from config import settings
+
+logger = logging.getLogger("live_takeover.public_suffix")
+
+# Subset of https://publicsuffix.org/list/ — generic TLDs are covered by the
+# implicit "*" rule; only multi-label suffixes and wildcard/exception rules
+# need listing. Weighted towards the regions our callers target.
+BUNDLED_RULES = """
+// India
+co.in
+net.in
+org.in
+gen.in
+firm.in
+ind.in
+gov.in
+nic.in
+ac.in
+edu.in
+res.in
+mil.in
+// United Kingdom
+co.uk
+org.uk
+me.uk
+ltd.uk
+plc.uk
+net.uk
+ac.uk
+gov.uk
+nhs.uk
+police.uk
+// Other commonly abused ccTLD second levels
+com.au
+net.au
+org.au
+edu.au
+gov.au
+com.br
+net.br
+org.br
+com.cn
+net.cn
+org.cn
+gov.cn
+co.jp
+ne.jp
+or.jp
+ac.jp
+co.kr
+or.kr
+com.sg
+edu.sg
+gov.sg
+com.my
+com.pk
+net.pk
+org.pk
+gov.pk
+com.bd
+com.np
+com.lk
+com.ng
+co.za
+org.za
+com.mx
+com.tr
+com.ua
+com.ru
+co.id
+or.id
+co.nz
+org.nz
+com.hk
+com.tw
+com.vn
+com.ph
+ae.org
+com.sa
+co.ke
+co.tz
+co.ug
+// Wildcard and exception rules
+*.ck
+!www.ck
+*.bd
+*.er
+*.fk
+*.jm
+*.kh
+*.mm
+*.np
+*.pg
+"""
+
+
+class PublicSuffixList:
+    """
+    Minimal PSL matcher supporting exact, wildcard (*.x) and exception (!y.x)
+    rules, plus the implicit "*" default rule.
+    """
+
+    def __init__(self, rules: Iterable[str]):
+        self.exact: Set[str] = set()
+        self.wildcards: Set[str] = set()    # stored without the "*." prefix
+        self.exceptions: Set[str] = set()   # stored without the "!" prefix
+
+        for line in rules:
+            rule = line.strip().lower()
+            if not rule or rule.startswith("//"):
+                continue
+            rule = rule.split()[0]
+            if rule.startswith("!"):
+                self.exceptions.add(rule[1:])
+            elif rule.startswith("*."):
+                self.wildcards.add(rule[2:])
+            else:
+                self.exact.add(rule)
+
+    def public_suffix(self, hostname: str) -> str:
+        labels = hostname.lower().strip(".").split(".")
+
+        # Scan from the longest candidate; the first match is the longest rule
+        for i in range(len(labels)):
+            candidate = ".".join(labels[i:])
+            if candidate in self.exceptions:
+                # Exception rules: the suffix is the rule minus its leftmost label
+                return ".".join(labels[i + 1:])
+            if candidate in self.exact:
+                return candidate
+            parent = ".".join(labels[i + 1:])
+            if parent and parent in self.wildcards:
+                return candidate
+
+        return labels[-1]  # implicit "*" rule
+
+    def registrable_domain(self, hostname: str) -> Optional[str]:
+        """
+        Registrable domain (public suffix + one label), or None when the host
+        is itself a public suffix, an IP literal or empty.
+        """
+        host = (hostname or "").lower().strip(".")
+        if not host or _is_ip(host):
+            return None
+
+        suffix = self.public_suffix(host)
+        if host == suffix:
+            return None
+
+        rest = host[: -len(suffix) - 1]
+        return f"{rest.rsplit('.', 1)[-1]}.{suffix}"
+
+
+def _is_ip(host: str) -> bool:
+    if ":" in host:  # IPv6 literal
+        return True
+    parts = host.split(".")
+    return len(parts) == 4 and all(p.isdigit() for p in parts)
+
+
+def _load_default() -> PublicSuffixList:
+    path = getattr(settings, 'PUBLIC_SUFFIX_LIST_PATH', '')
+    if path:
+        try:
+            rules = Path(path).read_text(encoding="utf-8").splitlines()
+            psl = PublicSuffixList(rules)
+            logger.info(f"Loaded public suffix list from {path} "
+                        f"({len(psl.exact) + len(psl.wildcards) + len(psl.exceptions)} rules)")
+            return psl
+        except OSError as e:
+            logger.warning(f"Could not read PUBLIC_SUFFIX_LIST_PATH ({e}); using bundled subset")
+    return PublicSuffixList(BUNDLED_RULES.splitlines())
+
+
+# Module-level singleton
+public_suffixes = _load_default()
+
+
+def registrable_domain(hostname: str) -> Optional[str]:
+    return public_suffixes.registrable_domain(hostname)
@@ -2,16 +2,21 @@
 Report Generator
 Creates police-ready reports in JSON, PDF, and CSV formats.
 Includes all extracted intelligence, transcript, URL scan results, and timeline.
+Rendering runs in a process pool so PDF builds never stall live calls.
 """
 
-import csv
-import io
-import json
+import asyncio
+import importlib.util
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+from config import settings
+from features.live_takeover.report_render import RENDERERS, render
 from features.live_takeover.session_manager import (
     LiveSessionState,
     live_session_manager,
@@ -19,6 +24,8 @@ from features.live_takeover.session_manager import (
 
 logger = logging.getLogger("live_takeover.report")
 
+_HAS_REPORTLAB = importlib.util.find_spec("reportlab") is not None
+
 
 class ReportGenerator:
     """
@@ -28,8 +35,11 @@ class ReportGenerator:
     
     REPORT_DIR = Path("storage/reports")
     
-    def __init__(self):
+    def __init__(self, render_workers: int = 2):
         self.REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        self.render_workers = render_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_disabled = False
     
     async def generate_report(
         self,
@@ -53,26 +63,27 @@ class ReportGenerator:
                 "data": dict (for JSON)
             }
         """
-        session = await live_session_manager.get_session(session_id)
-        if not session:
-            raise ValueError(f"Session {session_id} not found")
-        
-        report_data = self._build_report_data(session, include_audio_refs)
+        report_data = await self._load_report_data(session_id, include_audio_refs)
         report_id = f"report-{session_id}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
         
-        if format == "json":
-            return self._generate_json(report_id, report_data)
-        elif format == "pdf":
-            return await self._generate_pdf(report_id, report_data)
-        elif format == "csv":
-            return self._generate_csv(report_id, report_data)
-        else:
-            raise ValueError(f"Unsupported format: {format}")
+        return await self._generate(report_id, format, report_data)
     
-    def _build_report_data(
+    async def _load_report_data(self, session_id: str, include_audio_refs: bool = True) -> Dict[str, Any]:
+        """Report data from the live session, or its snapshot once it has ended."""
+        session = await live_session_manager.get_session(session_id)
+        if session:
+            return self.build_report_data(session, include_audio_refs)
+        
+        from features.live_takeover.report_store import report_store
+        snapshot = await report_store.get_snapshot(session_id)
+        if snapshot and snapshot.get("report"):
+            return snapshot["report"]
+        raise ValueError(f"Session {session_id} not found")
+    
+    def build_report_data(
         self,
         session: LiveSessionState,
-        include_audio_refs: bool
+        include_audio_refs: bool = True
     ) -> Dict[str, Any]:
         """Build structured report data from session."""
         
@@ -137,6 +148,92 @@ class ReportGenerator:
         
         return report
     
+    def build_call_report_data(self, call_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build report data for a two-way / WebRTC call from its live_calls
+        document (or the equivalent in-memory fields). Same layout as
+        build_report_data so every renderer works unchanged.
+        """
+        start = call_data.get("start_time") or datetime.utcnow()
+        end = call_data.get("end_time") or datetime.utcnow()
+        entities = call_data.get("entities", [])
+        tactics = list(dict.fromkeys(call_data.get("tactics", [])))
+        transcript = call_data.get("final_transcript") or call_data.get("transcript", [])
+        
+        entities_by_type: Dict[str, list] = {}
+        for e in entities:
+            entities_by_type.setdefault(e.get("type", "unknown"), []).append({
+                "value": e.get("value", ""),
+                "confidence": e.get("confidence", 1.0),
+                "context": e.get("context", ""),
+                "extracted_at": e.get("timestamp", "")
+            })
+        
+        def _values(entity_type: str) -> List[str]:
+            return sorted({e["value"] for e in entities_by_type.get(entity_type, [])})
+        
+        return {
+            "report_header": {
+                "title": "Scam Engagement Intelligence Report",
+                "generated_at": datetime.utcnow().isoformat(),
+                "session_id": call_data.get("call_id"),
+                "original_session_id": None,
+                "classification": "CONFIDENTIAL — FOR LAW ENFORCEMENT USE",
+                "disclaimer": (
+                    "This report was generated by an AI-assisted honeypot system. "
+                    "All engagement was conducted to extract intelligence from a suspected scammer. "
+                    "No real personal/financial data was shared."
+                )
+            },
+            "session_overview": {
+                "started_at": start.isoformat() if hasattr(start, "isoformat") else str(start),
+                "ended_at": end.isoformat() if hasattr(end, "isoformat") else str(end),
+                "duration_seconds": call_data.get("duration_seconds") or (
+                    (end - start).total_seconds() if isinstance(end, datetime) and isinstance(start, datetime) else 0
+                ),
+                "status": call_data.get("status", "unknown"),
+                "mode_switches": 0,
+                "mode_history": [],
+                "final_mode": None,
+                "turn_count": sum(1 for t in transcript if t.get("speaker") == "scammer"),
+                "threat_level": call_data.get("threat_level", 0.0)
+            },
+            "scammer_profile": {
+                "phone_numbers": _values("phone"),
+                "names": _values("name"),
+                "organizations": _values("organization"),
+                "claimed_titles": []
+            },
+            "intelligence": {
+                "total_entities": len(entities),
+                "entity_types": list(entities_by_type.keys()),
+                "entities": entities_by_type,
+                "high_value_entities": [
+                    {
+                        "type": e.get("type"),
+                        "value": e.get("value", ""),
+                        "confidence": e.get("confidence", 1.0)
+                    }
+                    for e in entities
+                    if e.get("type") in ("bank_account", "upi_id", "aadhaar", "pan", "ifsc")
+                ]
+            },
+            "url_analysis": {"urls_scanned": 0, "malicious_urls": 0, "results": []},
+            "transcript": [
+                {
+                    "speaker": t.get("speaker", "unknown"),
+                    "text": t.get("text", ""),
+                    "timestamp": str(t.get("timestamp", "")),
+                }
+                for t in transcript
+            ],
+            "tactical_analysis": {
+                "detected_tactics": tactics,
+                "tactic_count": len(tactics),
+                "threat_escalation": call_data.get("threat_level", 0.0) > 0.7
+            }
+        }
+    
     def _build_scammer_profile(self, session: LiveSessionState) -> Dict[str, Any]:
         """Build scammer profile from extracted entities."""
         profile = {
@@ -222,342 +319,122 @@ class ReportGenerator:
         
         return transcript
     
-    # ── JSON Output ───────────────────────────────────────────
+    # ── Rendering ─────────────────────────────────────────────
     
-    def _generate_json(
-        self,
-        report_id: str,
-        data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Generate JSON report."""
-        file_path = self.REPORT_DIR / f"{report_id}.json"
-        
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, default=str, ensure_ascii=False)
-        
-        logger.info(f"JSON report generated: {file_path}")
-        
-        # Upload to Cloudinary
-        cloudinary_url = self._upload_to_cloudinary(file_path)
-        
-        return {
-            "report_id": report_id,
-            "format": "json",
-            "file_path": str(file_path),
-            "cloudinary_url": cloudinary_url,
-            "data": data
-        }
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Lazily start the render process pool (None if processes are unavailable)."""
+        if self._pool is None and not self._pool_disabled:
+            try:
+                # spawn: never fork the running event loop / driver threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.render_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+                logger.info(f"🖨️ Report render pool started ({self.render_workers} processes)")
+            except (OSError, NotImplementedError) as e:
+                logger.warning(f"Report process pool unavailable, rendering in threads: {e}")
+                self._pool_disabled = True
+        return self._pool
     
-    # ── PDF Output ────────────────────────────────────────────
+    async def _render(self, format: str, report_id: str, data: Dict[str, Any]) -> bytes:
+        """Render off the event loop: process pool, or a thread as fallback."""
+        pool = self._get_pool()
+        if pool is not None:
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(pool, render, format, report_id, data)
+            except BrokenProcessPool:
+                logger.error("Report render pool crashed, restarting it")
+                pool.shutdown(wait=False, cancel_futures=True)
+                # Concurrent renders see the same crash; only the first swaps the pool
+                if self._pool is pool:
+                    self._pool = None
+        return await asyncio.to_thread(render, format, report_id, data)
     
-    async def _generate_pdf(
+    async def render_bytes(
         self,
+        format: str,
         report_id: str,
         data: Dict[str, Any]
-    ) -> Dict[str, Any]:
-        """Generate PDF report using reportlab."""
-        try:
-            from reportlab.lib import colors
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT
-            from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-            from reportlab.lib.units import cm, mm
-            from reportlab.platypus import (
-                Paragraph,
-                SimpleDocTemplate,
-                Spacer,
-                Table,
-                TableStyle,
-            )
-        except ImportError:
-            logger.warning("reportlab not installed, falling back to JSON")
-            return self._generate_json(report_id, data)
-        
-        file_path = self.REPORT_DIR / f"{report_id}.pdf"
-        
-        doc = SimpleDocTemplate(
-            str(file_path),
-            pagesize=A4,
-            topMargin=2 * cm,
-            bottomMargin=2 * cm
-        )
-        
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            "ReportTitle",
-            parent=styles["Title"],
-            fontSize=18,
-            alignment=TA_CENTER,
-            spaceAfter=12
-        )
-        heading_style = ParagraphStyle(
-            "SectionHeading",
-            parent=styles["Heading2"],
-            fontSize=14,
-            textColor=colors.HexColor("#1a1a2e"),
-            spaceAfter=8
-        )
-        body_style = ParagraphStyle(
-            "ReportBody",
-            parent=styles["Normal"],
-            fontSize=10,
-            spaceAfter=4
-        )
-        
-        elements = []
-        header = data.get("report_header", {})
-        overview = data.get("session_overview", {})
-        intel = data.get("intelligence", {})
-        urls = data.get("url_analysis", {})
-        
-        # ── Title ─────────────────────────────────────────
-        elements.append(Paragraph(header.get("title", "Report"), title_style))
-        elements.append(Paragraph(
-            f"Generated: {header.get('generated_at', '')}",
-            body_style
-        ))
-        elements.append(Paragraph(
-            header.get("classification", ""),
-            ParagraphStyle("Classification", parent=body_style, textColor=colors.red, fontSize=11)
-        ))
-        elements.append(Spacer(1, 12))
-        
-        # ── Disclaimer ────────────────────────────────────
-        elements.append(Paragraph(header.get("disclaimer", ""), body_style))
-        elements.append(Spacer(1, 20))
-        
-        # ── Session Overview ──────────────────────────────
-        elements.append(Paragraph("Session Overview", heading_style))
-        overview_data = [
-            ["Session ID", overview.get("started_at", "")[:19]],
-            ["Duration", f"{overview.get('duration_seconds', 0):.0f} seconds"],
-            ["Turns", str(overview.get("turn_count", 0))],
-            ["Threat Level", f"{overview.get('threat_level', 0):.1%}"],
-            ["Mode Switches", str(overview.get("mode_switches", 0))],
-        ]
-        t = Table(overview_data, colWidths=[5 * cm, 10 * cm])
-        t.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#e8e8e8")),
-            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-            ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ("PADDING", (0, 0), (-1, -1), 6),
-        ]))
-        elements.append(t)
-        elements.append(Spacer(1, 16))
-        
-        # ── Intelligence Summary ──────────────────────────
-        elements.append(Paragraph("Extracted Intelligence", heading_style))
-        elements.append(Paragraph(
-            f"Total entities extracted: {intel.get('total_entities', 0)}",
-            body_style
-        ))
-        
-        high_value = intel.get("high_value_entities", [])
-        if high_value:
-            elements.append(Paragraph("High-Value Entities:", body_style))
-            hv_data = [["Type", "Value", "Confidence"]]
-            for e in high_value:
-                hv_data.append([e["type"], e["value"], f"{e['confidence']:.0%}"])
-            t = Table(hv_data, colWidths=[4 * cm, 8 * cm, 3 * cm])
-            t.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1a1a2e")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("PADDING", (0, 0), (-1, -1), 4),
-            ]))
-            elements.append(t)
-        
-        elements.append(Spacer(1, 16))
-        
-        # ── URL Analysis ──────────────────────────────────
-        url_results = urls.get("results", [])
-        if url_results:
-            elements.append(Paragraph("URL Analysis", heading_style))
-            url_data = [["URL", "Safe?", "Risk"]]
-            for r in url_results:
-                url_display = r["url"][:50] + ("..." if len(r["url"]) > 50 else "")
-                url_data.append([
-                    url_display,
-                    "Yes" if r["is_safe"] else "NO",
-                    f"{r['risk_score']:.0%}"
-                ])
-            t = Table(url_data, colWidths=[9 * cm, 3 * cm, 3 * cm])
-            t.setStyle(TableStyle([
-                ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1a1a2e")),
-                ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
-                ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ("PADDING", (0, 0), (-1, -1), 4),
-            ]))
-            elements.append(t)
-            elements.append(Spacer(1, 16))
-        
-        # ── Tactical Analysis ─────────────────────────────
-        tactics = data.get("tactical_analysis", {})
-        detected = tactics.get("detected_tactics", [])
-        if detected:
-            elements.append(Paragraph("Detected Scam Tactics", heading_style))
-            for tactic in detected:
-                elements.append(Paragraph(f"• {tactic.replace('_', ' ').title()}", body_style))
-            elements.append(Spacer(1, 16))
-        
-        # ── Transcript ────────────────────────────────────
-        transcript = data.get("transcript", [])
-        if transcript:
-            elements.append(Paragraph("Conversation Transcript", heading_style))
-            for entry in transcript[:100]:  # Limit to 100 entries for PDF
-                speaker = entry.get("speaker", "?").upper()
-                text = entry.get("text", "")[:200]
-                ts = entry.get("timestamp", "")[:19]
-                elements.append(Paragraph(
-                    f"<b>[{ts}] {speaker}:</b> {text}",
-                    body_style
-                ))
-            
-            if len(transcript) > 100:
-                elements.append(Paragraph(
-                    f"... and {len(transcript) - 100} more entries (see full JSON report)",
-                    body_style
-                ))
-        
-        # ── Build PDF ─────────────────────────────────────
-        doc.build(elements)
-        
-        logger.info(f"PDF report generated: {file_path}")
-        
-        # Upload to Cloudinary
-        cloudinary_url = self._upload_to_cloudinary(file_path)
+    ) -> Tuple[str, bytes]:
+        """
+        Render report data off the event loop.
         
-        return {
-            "report_id": report_id,
-            "format": "pdf",
-            "file_path": str(file_path),
-            "cloudinary_url": cloudinary_url,
-            "data": None  # PDF is file-only
-        }
-    
-    # ── CSV Output (Cybercrime Portal Format) ─────────────────
+        Returns:
+            (actual_format, content) — PDF falls back to JSON without reportlab
+        """
+        if format not in RENDERERS:
+            raise ValueError(f"Unsupported format: {format}")
+        if format == "pdf" and not _HAS_REPORTLAB:
+            logger.warning("reportlab not installed, falling back to JSON")
+            format = "json"
+        return format, await self._render(format, report_id, data)
     
-    def _generate_csv(
+    async def _generate(
         self,
         report_id: str,
+        format: str,
         data: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """
-        Generate CSV for cybercrime portal submission.
-        Follows Indian Cybercrime Portal format where applicable.
-        """
-        file_path = self.REPORT_DIR / f"{report_id}.csv"
-        
-        rows = []
-        header = data.get("report_header", {})
-        overview = data.get("session_overview", {})
-        intel = data.get("intelligence", {})
-        profile = data.get("scammer_profile", {})
-        
-        # ── Incident Details ──────────────────────────────
-        rows.append(["INCIDENT REPORT"])
-        rows.append(["Report ID", report_id])
-        rows.append(["Generated At", header.get("generated_at", "")])
-        rows.append(["Session Started", overview.get("started_at", "")])
-        rows.append(["Duration (s)", str(overview.get("duration_seconds", 0))])
-        rows.append(["Threat Level", f"{overview.get('threat_level', 0):.1%}"])
-        rows.append([])
-        
-        # ── Scammer Details ───────────────────────────────
-        rows.append(["SCAMMER DETAILS"])
-        for phone in profile.get("phone_numbers", []):
-            rows.append(["Phone Number", phone])
-        for name in profile.get("names", []):
-            rows.append(["Claimed Name", name])
-        for org in profile.get("organizations", []):
-            rows.append(["Claimed Organization", org])
-        rows.append([])
+        """Render one format, write it to disk and queue its upload."""
+        format, content = await self.render_bytes(format, report_id, data)
         
-        # ── Financial Intelligence ────────────────────────
-        rows.append(["FINANCIAL INTELLIGENCE"])
-        entities = intel.get("entities", {})
-        for acct in entities.get("bank_account", []):
-            rows.append(["Bank Account", acct["value"], f"Confidence: {acct['confidence']:.0%}"])
-        for upi in entities.get("upi_id", []):
-            rows.append(["UPI ID", upi["value"], f"Confidence: {upi['confidence']:.0%}"])
-        for ifsc in entities.get("ifsc", []):
-            rows.append(["IFSC Code", ifsc["value"], f"Confidence: {ifsc['confidence']:.0%}"])
-        rows.append([])
+        file_path = self.REPORT_DIR / f"{report_id}.{format}"
+        await asyncio.to_thread(file_path.write_bytes, content)
+        logger.info(f"{format.upper()} report generated: {file_path}")
         
-        # ── Identity Intelligence ─────────────────────────
-        rows.append(["IDENTITY MARKERS"])
-        for aadhaar in entities.get("aadhaar", []):
-            rows.append(["Aadhaar Number", aadhaar["value"]])
-        for pan in entities.get("pan", []):
-            rows.append(["PAN Number", pan["value"]])
-        for email in entities.get("email", []):
-            rows.append(["Email", email["value"]])
-        rows.append([])
-        
-        # ── URLs ──────────────────────────────────────────
-        url_results = data.get("url_analysis", {}).get("results", [])
-        if url_results:
-            rows.append(["MALICIOUS URLS"])
-            rows.append(["URL", "Safe", "Risk Score", "Findings"])
-            for r in url_results:
-                rows.append([
-                    r["url"],
-                    "Yes" if r["is_safe"] else "No",
-                    f"{r['risk_score']:.0%}",
-                    "; ".join(r.get("findings", [])[:3])
-                ])
-            rows.append([])
-        
-        # ── Tactics ───────────────────────────────────────
-        tactics = data.get("tactical_analysis", {}).get("detected_tactics", [])
-        if tactics:
-            rows.append(["SCAM TACTICS DETECTED"])
-            for tactic in tactics:
-                rows.append([tactic])
-            rows.append([])
-        
-        # ── Write CSV ─────────────────────────────────────
-        with open(file_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerows(rows)
-        
-        logger.info(f"CSV report generated: {file_path}")
-        
-        # Upload to Cloudinary
-        cloudinary_url = self._upload_to_cloudinary(file_path)
+        # Upload to Cloudinary in the background
+        upload_job_id = await self._queue_upload(file_path)
         
         return {
             "report_id": report_id,
-            "format": "csv",
+            "format": format,
             "file_path": str(file_path),
-            "cloudinary_url": cloudinary_url,
-            "data": None
+            "cloudinary_url": None,
+            "upload_job_id": upload_job_id,
+            "data": data if format == "json" else None  # PDF / CSV are file-only
         }
     
-    def _upload_to_cloudinary(self, file_path: Path) -> Optional[str]:
-        """Upload a report file to Cloudinary and return the secure URL."""
+    async def _queue_upload(self, file_path: Path) -> Optional[str]:
+        """Queue a report file for Cloudinary upload; returns the upload job id."""
         try:
-            from services.cloudinary_service import cloudinary_service
-            with open(file_path, "rb") as f:
-                data = f.read()
-            return cloudinary_service.upload_report(data, file_path.name)
+            from services.upload_queue import upload_queue
+            return await upload_queue.enqueue(str(file_path), kind="report")
         except Exception as e:
-            logger.error(f"Report Cloudinary upload failed: {e}")
+            logger.error(f"Could not queue report upload: {e}")
             return None
     
     async def generate_all_formats(self, session_id: str) -> Dict[str, Any]:
-        """Generate report in all formats at once."""
+        """Generate report in all formats at once (rendered concurrently)."""
+        report_data = await self._load_report_data(session_id)
+        report_id = f"report-{session_id}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+        
+        # Without reportlab the PDF would just be the JSON artifact again
+        formats = ("json", "pdf", "csv") if _HAS_REPORTLAB else ("json", "csv")
+        outcomes = await asyncio.gather(
+            *(self._generate(report_id, fmt, report_data) for fmt in formats),
+            return_exceptions=True
+        )
+        
         results = {}
-        for fmt in ("json", "pdf", "csv"):
-            try:
-                results[fmt] = await self.generate_report(session_id, format=fmt)
-            except Exception as e:
-                logger.error(f"Report generation failed ({fmt}): {e}")
-                results[fmt] = {"error": str(e)}
+        for fmt, outcome in zip(formats, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Report generation failed ({fmt}): {outcome}")
+                results[fmt] = {"error": str(outcome)}
+            else:
+                results[fmt] = outcome
+        if not _HAS_REPORTLAB:
+            results["pdf"] = results["json"]
         return results
+    
+    def shutdown(self):
+        """Stop the render pool (app shutdown)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
 
 
 # Module-level singleton
-report_generator = ReportGenerator()
+report_generator = ReportGenerator(
+    render_workers=getattr(settings, 'REPORT_RENDER_WORKERS', 2)
+)
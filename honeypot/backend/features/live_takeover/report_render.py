@@ -0,0 +1,276 @@
+"""
+Report Rendering
+Pure functions turning report data (plain dicts) into JSON / PDF / CSV bytes.
+Kept free of app imports so they can run in a worker process: the parent only
+pickles the report dict over and gets the rendered bytes back.
+"""
+
+import csv
+import io
+import json
+from typing import Any, Callable, Dict
+
+# PDF transcript is capped; the JSON report always carries the full transcript
+PDF_TRANSCRIPT_LIMIT = 100
+
+
+def render_json(report_id: str, data: Dict[str, Any]) -> bytes:
+    """Render the machine-readable JSON report."""
+    return json.dumps(data, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+
+
+def render_pdf(report_id: str, data: Dict[str, Any]) -> bytes:
+    """Render the police-ready PDF report using reportlab."""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+    from reportlab.lib.units import cm
+    from reportlab.platypus import (
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        topMargin=2 * cm,
+        bottomMargin=2 * cm
+    )
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle(
+        "ReportTitle",
+        parent=styles["Title"],
+        fontSize=18,
+        alignment=TA_CENTER,
+        spaceAfter=12
+    )
+    heading_style = ParagraphStyle(
+        "SectionHeading",
+        parent=styles["Heading2"],
+        fontSize=14,
+        textColor=colors.HexColor("#1a1a2e"),
+        spaceAfter=8
+    )
+    body_style = ParagraphStyle(
+        "ReportBody",
+        parent=styles["Normal"],
+        fontSize=10,
+        spaceAfter=4
+    )
+
+    elements = []
+    header = data.get("report_header", {})
+    overview = data.get("session_overview", {})
+    intel = data.get("intelligence", {})
+    urls = data.get("url_analysis", {})
+
+    # ── Title ─────────────────────────────────────────
+    elements.append(Paragraph(header.get("title", "Report"), title_style))
+    elements.append(Paragraph(
+        f"Generated: {header.get('generated_at', '')}",
+        body_style
+    ))
+    elements.append(Paragraph(
+        header.get("classification", ""),
+        ParagraphStyle("Classification", parent=body_style, textColor=colors.red, fontSize=11)
+    ))
+    elements.append(Spacer(1, 12))
+
+    # ── Disclaimer ────────────────────────────────────
+    elements.append(Paragraph(header.get("disclaimer", ""), body_style))
+    elements.append(Spacer(1, 20))
+
+    # ── Session Overview ──────────────────────────────
+    elements.append(Paragraph("Session Overview", heading_style))
+    overview_data = [
+        ["Session ID", overview.get("started_at", "")[:19]],
+        ["Duration", f"{overview.get('duration_seconds', 0):.0f} seconds"],
+        ["Turns", str(overview.get("turn_count", 0))],
+        ["Threat Level", f"{overview.get('threat_level', 0):.1%}"],
+        ["Mode Switches", str(overview.get("mode_switches", 0))],
+    ]
+    t = Table(overview_data, colWidths=[5 * cm, 10 * cm])
+    t.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (0, -1), colors.HexColor("#e8e8e8")),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("FONTSIZE", (0, 0), (-1, -1), 10),
+        ("PADDING", (0, 0), (-1, -1), 6),
+    ]))
+    elements.append(t)
+    elements.append(Spacer(1, 16))
+
+    # ── Intelligence Summary ──────────────────────────
+    elements.append(Paragraph("Extracted Intelligence", heading_style))
+    elements.append(Paragraph(
+        f"Total entities extracted: {intel.get('total_entities', 0)}",
+        body_style
+    ))
+
+    high_value = intel.get("high_value_entities", [])
+    if high_value:
+        elements.append(Paragraph("High-Value Entities:", body_style))
+        hv_data = [["Type", "Value", "Confidence"]]
+        for e in high_value:
+            hv_data.append([e["type"], e["value"], f"{e['confidence']:.0%}"])
+        t = Table(hv_data, colWidths=[4 * cm, 8 * cm, 3 * cm])
+        t.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1a1a2e")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("FONTSIZE", (0, 0), (-1, -1), 9),
+            ("PADDING", (0, 0), (-1, -1), 4),
+        ]))
+        elements.append(t)
+
+    elements.append(Spacer(1, 16))
+
+    # ── URL Analysis ──────────────────────────────────
+    url_results = urls.get("results", [])
+    if url_results:
+        elements.append(Paragraph("URL Analysis", heading_style))
+        url_data = [["URL", "Safe?", "Risk"]]
+        for r in url_results:
+            url_display = r["url"][:50] + ("..." if len(r["url"]) > 50 else "")
+            url_data.append([
+                url_display,
+                "Yes" if r["is_safe"] else "NO",
+                f"{r['risk_score']:.0%}"
+            ])
+        t = Table(url_data, colWidths=[9 * cm, 3 * cm, 3 * cm])
+        t.setStyle(TableStyle([
+            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#1a1a2e")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+            ("FONTSIZE", (0, 0), (-1, -1), 9),
+            ("PADDING", (0, 0), (-1, -1), 4),
+        ]))
+        elements.append(t)
+        elements.append(Spacer(1, 16))
+
+    # ── Tactical Analysis ─────────────────────────────
+    tactics = data.get("tactical_analysis", {})
+    detected = tactics.get("detected_tactics", [])
+    if detected:
+        elements.append(Paragraph("Detected Scam Tactics", heading_style))
+        for tactic in detected:
+            elements.append(Paragraph(f"• {tactic.replace('_', ' ').title()}", body_style))
+        elements.append(Spacer(1, 16))
+
+    # ── Transcript ────────────────────────────────────
+    transcript = data.get("transcript", [])
+    if transcript:
+        elements.append(Paragraph("Conversation Transcript", heading_style))
+        for entry in transcript[:PDF_TRANSCRIPT_LIMIT]:
+            speaker = entry.get("speaker", "?").upper()
+            text = entry.get("text", "")[:200]
+            ts = entry.get("timestamp", "")[:19]
+            elements.append(Paragraph(
+                f"<b>[{ts}] {speaker}:</b> {text}",
+                body_style
+            ))
+
+        if len(transcript) > PDF_TRANSCRIPT_LIMIT:
+            elements.append(Paragraph(
+                f"... and {len(transcript) - PDF_TRANSCRIPT_LIMIT} more entries (see full JSON report)",
+                body_style
+            ))
+
+    # ── Build PDF ─────────────────────────────────────
+    doc.build(elements)
+    return buffer.getvalue()
+
+
+def render_csv(report_id: str, data: Dict[str, Any]) -> bytes:
+    """
+    Render CSV for cybercrime portal submission.
+    Follows Indian Cybercrime Portal format where applicable.
+    """
+    rows = []
+    header = data.get("report_header", {})
+    overview = data.get("session_overview", {})
+    intel = data.get("intelligence", {})
+    profile = data.get("scammer_profile", {})
+
+    # ── Incident Details ──────────────────────────────
+    rows.append(["INCIDENT REPORT"])
+    rows.append(["Report ID", report_id])
+    rows.append(["Generated At", header.get("generated_at", "")])
+    rows.append(["Session Started", overview.get("started_at", "")])
+    rows.append(["Duration (s)", str(overview.get("duration_seconds", 0))])
+    rows.append(["Threat Level", f"{overview.get('threat_level', 0):.1%}"])
+    rows.append([])
+
+    # ── Scammer Details ───────────────────────────────
+    rows.append(["SCAMMER DETAILS"])
+    for phone in profile.get("phone_numbers", []):
+        rows.append(["Phone Number", phone])
+    for name in profile.get("names", []):
+        rows.append(["Claimed Name", name])
+    for org in profile.get("organizations", []):
+        rows.append(["Claimed Organization", org])
+    rows.append([])
+
+    # ── Financial Intelligence ────────────────────────
+    rows.append(["FINANCIAL INTELLIGENCE"])
+    entities = intel.get("entities", {})
+    for acct in entities.get("bank_account", []):
+        rows.append(["Bank Account", acct["value"], f"Confidence: {acct['confidence']:.0%}"])
+    for upi in entities.get("upi_id", []):
+        rows.append(["UPI ID", upi["value"], f"Confidence: {upi['confidence']:.0%}"])
+    for ifsc in entities.get("ifsc", []):
+        rows.append(["IFSC Code", ifsc["value"], f"Confidence: {ifsc['confidence']:.0%}"])
+    rows.append([])
+
+    # ── Identity Intelligence ─────────────────────────
+    rows.append(["IDENTITY MARKERS"])
+    for aadhaar in entities.get("aadhaar", []):
+        rows.append(["Aadhaar Number", aadhaar["value"]])
+    for pan in entities.get("pan", []):
+        rows.append(["PAN Number", pan["value"]])
+    for email in entities.get("email", []):
+        rows.append(["Email", email["value"]])
+    rows.append([])
+
+    # ── URLs ──────────────────────────────────────────
+    url_results = data.get("url_analysis", {}).get("results", [])
+    if url_results:
+        rows.append(["MALICIOUS URLS"])
+        rows.append(["URL", "Safe", "Risk Score", "Findings"])
+        for r in url_results:
+            rows.append([
+                r["url"],
+                "Yes" if r["is_safe"] else "No",
+                f"{r['risk_score']:.0%}",
+                "; ".join(r.get("findings", [])[:3])
+            ])
+        rows.append([])
+
+    # ── Tactics ───────────────────────────────────────
+    tactics = data.get("tactical_analysis", {}).get("detected_tactics", [])
+    if tactics:
+        rows.append(["SCAM TACTICS DETECTED"])
+        for tactic in tactics:
+            rows.append([tactic])
+        rows.append([])
+
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+RENDERERS: Dict[str, Callable[[str, Dict[str, Any]], bytes]] = {
+    "json": render_json,
+    "pdf": render_pdf,
+    "csv": render_csv,
+}
+
+
+def render(format: str, report_id: str, data: Dict[str, Any]) -> bytes:
+    """Process-pool entry point (module-level so it pickles by reference)."""
+    return RENDERERS[format](report_id, data)
@@ -0,0 +1,268 @@
+"""
+Report Store
+Persists a report snapshot when a session / call ends, so reports outlive the
+in-memory state. PDF/CSV/JSON artifacts are rendered once in the background,
+stored content-addressed (sha256) and served with ETag / If-None-Match.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+
+from db.mongo import db
+from features.live_takeover.report_generator import ReportGenerator, report_generator
+
+logger = logging.getLogger("live_takeover.report_store")
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "pdf": "application/pdf",
+    "csv": "text/csv",
+}
+
+# Clients may keep a copy but must revalidate; a 304 costs one header check
+CACHE_CONTROL = "private, max-age=0, must-revalidate"
+
+
+def make_etag(content: bytes) -> str:
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return etag in candidates
+
+
+def json_response(request: Request, payload: Dict[str, Any], etag: Optional[str] = None) -> Response:
+    """JSON response with an ETag; 304 if the client already has it."""
+    body = json.dumps(payload, default=str, ensure_ascii=False).encode("utf-8")
+    etag = etag or make_etag(body)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def artifact_response(request: Request, artifact: Dict[str, Any], filename: str) -> Response:
+    """Serve a stored artifact file; 304 if the client's copy is current."""
+    headers = {"ETag": artifact["etag"], "Cache-Control": CACHE_CONTROL}
+    if _etag_matches(request, artifact["etag"]):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(
+        artifact["file_path"],
+        media_type=artifact["media_type"],
+        filename=f"{filename}.{artifact['format']}",
+        headers=headers
+    )
+
+
+class ReportStore:
+    """
+    Report snapshots (MongoDB `report_snapshots`) plus content-addressed
+    artifact files under storage/reports/artifacts.
+    """
+
+    ARTIFACT_DIR = ReportGenerator.REPORT_DIR / "artifacts"
+    FORMATS = ("json", "pdf", "csv")
+    MAX_CACHED_ARTIFACTS = 1024
+
+    def __init__(self):
+        self.ARTIFACT_DIR.mkdir(parents=True, exist_ok=True)
+        # (key, format) -> artifact metadata, so repeat downloads skip MongoDB
+        self._artifacts: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._background: Set[asyncio.Task] = set()
+        self.stats = {
+            "snapshots_saved": 0,
+            "artifacts_rendered": 0,
+            "artifacts_deduplicated": 0,
+            "artifact_hits": 0,
+            "render_errors": 0,
+        }
+
+    # ── Snapshots ─────────────────────────────────────────────────
+
+    async def save_snapshot(
+        self,
+        key: str,
+        report: Dict[str, Any],
+        summary: Optional[Dict[str, Any]] = None,
+        source: str = "live_session"
+    ):
+        """
+        Persist the final report data for an ended session / call and start
+        rendering its artifacts in the background.
+
+        Args:
+            key: Session, call or room id
+            report: Report data (ReportGenerator.build_report_data layout)
+            summary: Endpoint-specific JSON summary served as-is
+            source: "live_session" | "live_call" | "webrtc"
+        """
+        doc = {
+            "_id": key,
+            "source": source,
+            "report": report,
+            "summary": summary,
+            "summary_etag": make_etag(json.dumps(summary, default=str, sort_keys=True).encode()) if summary else None,
+            "artifacts": {},
+            "created_at": datetime.utcnow(),
+        }
+        try:
+            await db.report_snapshots.replace_one({"_id": key}, doc, upsert=True)
+        except Exception as e:
+            logger.error(f"Failed to persist report snapshot for {key}: {e}")
+            return
+        for fmt in self.FORMATS:
+            self._artifacts.pop((key, fmt), None)
+        self.stats["snapshots_saved"] += 1
+        logger.info(f"📸 Report snapshot saved: {key} ({source})")
+
+        task = asyncio.create_task(self._render_all(key), name=f"report-artifacts-{key}")
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def get_snapshot(self, key: str, with_report: bool = True) -> Optional[Dict[str, Any]]:
+        projection = None if with_report else {"report": 0}
+        try:
+            return await db.report_snapshots.find_one({"_id": key}, projection)
+        except Exception as e:
+            logger.error(f"Report snapshot lookup failed for {key}: {e}")
+            return None
+
+    # ── Artifacts ─────────────────────────────────────────────────
+
+    async def _render_all(self, key: str):
+        results = await asyncio.gather(
+            *(self.get_artifact(key, fmt) for fmt in self.FORMATS),
+            return_exceptions=True
+        )
+        for fmt, result in zip(self.FORMATS, results):
+            if isinstance(result, Exception):
+                logger.error(f"Background {fmt} render failed for {key}: {result}")
+
+    async def get_artifact(self, key: str, format: str) -> Optional[Dict[str, Any]]:
+        """
+        Return artifact metadata for a snapshot, rendering it once if needed.
+
+        Returns:
+            {"format", "media_type", "etag", "sha256", "file_path", "size",
+             "cloudinary_url", "upload_status", "generated_at"} or None if there is no snapshot
+        """
+        if format not in self.FORMATS:
+            raise ValueError(f"Unsupported format: {format}")
+
+        cache_key = (key, format)
+        artifact = self._artifacts.get(cache_key)
+        if artifact and Path(artifact["file_path"]).exists():
+            self._artifacts.move_to_end(cache_key)
+            self.stats["artifact_hits"] += 1
+            return artifact
+
+        # Single-flight: a download arriving mid-render waits for that render
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(self._load_or_render(key, format))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        artifact = await asyncio.shield(task)
+
+        if artifact:
+            self._remember(cache_key, artifact)
+        return artifact
+
+    async def _load_or_render(self, key: str, format: str) -> Optional[Dict[str, Any]]:
+        snapshot = await self.get_snapshot(key)
+        if not snapshot:
+            return None
+
+        artifact = (snapshot.get("artifacts") or {}).get(format)
+        if artifact and Path(artifact["file_path"]).exists():
+            self.stats["artifact_hits"] += 1
+            return artifact
+
+        try:
+            actual, content = await report_generator.render_bytes(
+                format, f"report-{key}", snapshot["report"]
+            )
+        except Exception:
+            self.stats["render_errors"] += 1
+            raise
+
+        sha256 = hashlib.sha256(content).hexdigest()
+        file_path = self.ARTIFACT_DIR / f"{sha256}.{actual}"
+        if file_path.exists():
+            self.stats["artifacts_deduplicated"] += 1
+        else:
+            await asyncio.to_thread(file_path.write_bytes, content)
+            self.stats["artifacts_rendered"] += 1
+
+        artifact = {
+            "format": actual,
+            "media_type": MEDIA_TYPES[actual],
+            "etag": f'"{sha256[:32]}"',
+            "sha256": sha256,
+            "file_path": str(file_path),
+            "size": len(content),
+            "cloudinary_url": None,     # filled in by the upload queue
+            "upload_status": "pending",
+            "generated_at": datetime.utcnow().isoformat(),
+        }
+        try:
+            await db.report_snapshots.update_one(
+                {"_id": key}, {"$set": {f"artifacts.{format}": artifact}}
+            )
+        except Exception as e:
+            logger.warning(f"Could not record {format} artifact for {key}: {e}")
+
+        # Queued only after the artifact is recorded, so the URL lands on it
+        await self._queue_upload(key, format, file_path)
+
+        logger.info(f"🗂️ Report artifact ready: {key} {format} ({len(content):,} bytes)")
+        return artifact
+
+    async def _queue_upload(self, key: str, format: str, file_path: Path):
+        try:
+            from services.upload_queue import upload_queue
+            await upload_queue.enqueue(
+                str(file_path),
+                kind="report",
+                record={
+                    "collection": "report_snapshots",
+                    "filter": {"_id": key},
+                    "url_field": f"artifacts.{format}.cloudinary_url",
+                    "status_field": f"artifacts.{format}.upload_status",
+                }
+            )
+        except Exception as e:
+            logger.error(f"Could not queue report artifact upload: {e}")
+
+    def _remember(self, cache_key: Tuple[str, str], artifact: Dict[str, Any]):
+        self._artifacts[cache_key] = artifact
+        self._artifacts.move_to_end(cache_key)
+        while len(self._artifacts) > self.MAX_CACHED_ARTIFACTS:
+            self._artifacts.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "cached_artifacts": len(self._artifacts),
+            "rendering": len(self._inflight),
+        }
+
+
+# Module-level singleton
+report_store = ReportStore()
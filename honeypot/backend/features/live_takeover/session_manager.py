@@ -326,6 +326,7 @@ class LiveSessionManager:
                 return None
             
             session.status = SessionStatus.ENDED
+            session.ended_at = datetime.utcnow()
             report_data = session.to_report_dict()
             
             # Persist final state
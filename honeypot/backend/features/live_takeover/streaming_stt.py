@@ -36,8 +36,17 @@ class StreamingTranscriber:
         # Use Groq Whisper API instead of local faster-whisper model
         from groq import Groq
         from config import settings
+        from core.rate_limiter import get_rate_limiter
         
-        self._groq_client = Groq(api_key=settings.GROQ_API_KEY)
+        # No SDK retries: a 429 penalizes the shared limiter, which owns the backoff
+        self._groq_client = Groq(api_key=settings.GROQ_API_KEY, base_url=settings.GROQ_BASE_URL or None,
+                                 max_retries=0)
+        # Shared across all transcribers: the quota is per API key
+        self._limiter = get_rate_limiter(
+            "groq_stt",
+            rate_per_minute=getattr(settings, 'GROQ_STT_RATE_PER_MIN', 20),
+            burst=getattr(settings, 'GROQ_STT_BURST', 5)
+        )
         self.buffer_threshold_ms = buffer_threshold_ms
         # Restrict to English/Hindi only (Hinglish = code-switching between en/hi)
         self.language = language          # None = auto-detect on first chunk
@@ -93,6 +102,12 @@ class StreamingTranscriber:
         if not self._chunks:
             return None
         
+        # Wait for Groq quota before merging: chunks that arrive meanwhile
+        # ride along in the same request instead of costing another one.
+        await self._limiter.acquire()
+        if not self._chunks:
+            return None
+        
         # Merge all chunks
         merged = self._merge_chunks()
         
@@ -110,6 +125,9 @@ class StreamingTranscriber:
             merged
         )
         
+        if result and result.get("retry_after") is not None:
+            self._limiter.penalize(result["retry_after"])
+        
         if result and result.get("text"):
             logger.info(f"✅ [TRANSCRIBE] Groq returned text: \"{result['text'][:80]}{'...' if len(result['text']) > 80 else ''}\"")
             # Lock language after first successful detection (only English/Hindi allowed)
@@ -179,6 +197,9 @@ class StreamingTranscriber:
     
     def _do_transcribe(self, audio_data: bytes) -> Dict[str, Any]:
         """Synchronous transcription via Groq Whisper API (runs in thread pool)."""
+        from groq import RateLimitError
+        from core.rate_limiter import parse_retry_after
+        
         try:
             file_ext = self._chunk_format  # "wav" or "webm"
             
@@ -210,6 +231,17 @@ class StreamingTranscriber:
                 "confidence": 0.9,
                 "duration": getattr(transcription, "duration", 0.0) or 0.0,
             }
+        except RateLimitError as e:
+            # Reported back to the event loop, which pauses the shared bucket
+            retry_after = parse_retry_after(e.response.headers.get("retry-after"), default=10.0)
+            logger.warning(f"Groq Whisper rate limited (retry after {retry_after:.1f}s)")
+            return {
+                "text": "",
+                "language": self.language or "en",
+                "confidence": 0.0,
+                "duration": 0.0,
+                "retry_after": retry_after,
+            }
         except Exception as e:
             logger.error(f"Groq Whisper transcription failed: {e}", exc_info=True)
             return {
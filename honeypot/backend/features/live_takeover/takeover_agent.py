@@ -12,12 +12,13 @@ import logging
 from typing import Annotated, Any, Dict, List, Optional, Sequence, TypedDict
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
-from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from langchain_core.prompts import ChatPromptTemplate
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langgraph.graph import END, StateGraph
 
+from agents.chains import chain_registry
+from agents.llm_router import PROVIDER_MAX_RETRIES, llm_router
+from agents.llm_scheduler import estimate_tokens
 from config import settings
 from features.live_takeover.takeover_prompts import (
     LIVE_TAKEOVER_SYSTEM_PROMPT,
@@ -30,6 +31,50 @@ from features.live_takeover.takeover_prompts import (
 
 logger = logging.getLogger("live_takeover.agent")
 
+# ── Prompt Chains (compiled once, see agents/chains.py) ───────────────
+
+_TURN_TEMPLATE = (
+    "Conversation:\n{history}\n\n"
+    "Strategy: {strategy}\n"
+    "Language: {language}\n"
+    "Scammer said: {scammer_text}"
+)
+
+chain_registry.register(
+    "takeover.analyze",
+    SCAMMER_ANALYSIS_PROMPT,
+    "Conversation:\n{history}\n\nLatest scammer message: {latest}",
+    parser="json"
+)
+chain_registry.register(
+    "takeover.strategy",
+    STALL_STRATEGY_PROMPT,
+    (
+        "Scammer intent: {intent}\n"
+        "Emotion: {emotion}\n"
+        "Threat level: {threat_level}\n"
+        "Tactics used: {tactics}\n"
+        "Turn count: {turn_count}\n"
+        "Language: {language}"
+    )
+)
+chain_registry.register(
+    "takeover.response",
+    LIVE_TAKEOVER_SYSTEM_PROMPT + "\n\n" + AI_RESPONSE_PROMPT,
+    _TURN_TEMPLATE
+)
+chain_registry.register(
+    "takeover.coaching",
+    LIVE_TAKEOVER_SYSTEM_PROMPT + "\n\n" + COACHING_SCRIPT_PROMPT,
+    _TURN_TEMPLATE,
+    parser="json"
+)
+chain_registry.register(
+    "takeover.naturalize",
+    URGENCY_NATURALIZER_PROMPT,
+    "Language: {language}\nThreat level: {threat_level}\nText: {text}"
+)
+
 
 # ── State Definition ──────────────────────────────────────────────────
 
@@ -66,12 +111,16 @@ class LiveTakeoverAgent:
             self.llm = ChatGroq(
                 temperature=0.7,
                 model_name="llama-3.3-70b-versatile",
-                api_key=self.groq_key
+                api_key=self.groq_key,
+                base_url=settings.GROQ_BASE_URL or None,
+                max_retries=PROVIDER_MAX_RETRIES
             )
             self.fast_llm = ChatGroq(
                 temperature=0.5,
                 model_name="llama-3.3-70b-versatile",
-                api_key=self.groq_key
+                api_key=self.groq_key,
+                base_url=settings.GROQ_BASE_URL or None,
+                max_retries=PROVIDER_MAX_RETRIES
             )
         else:
             self.llm = None
@@ -81,24 +130,25 @@ class LiveTakeoverAgent:
         if self.gemini_key:
             self.fallback_llm = ChatGoogleGenerativeAI(
                 model="gemini-2.5-flash-lite",
-                google_api_key=self.gemini_key
+                google_api_key=self.gemini_key,
+                base_url=settings.GEMINI_BASE_URL or None,
+                max_retries=PROVIDER_MAX_RETRIES
             )
         else:
             self.fallback_llm = None
         
+        # Candidates in preference order; llm_router picks the healthiest per call
+        self.llms = [llm for llm in (self.llm, self.fallback_llm) if llm]
+        self.fast_llms = [llm for llm in (self.fast_llm, self.fallback_llm) if llm]
+        chain_registry.prepare(self.fast_llms, "takeover.analyze", "takeover.strategy", "takeover.naturalize")
+        chain_registry.prepare(self.llms, "takeover.response", "takeover.coaching")
         self.workflow = self._build_graph()
     
-    def _get_llm(self, fast: bool = False):
-        if fast and self.fast_llm:
-            return self.fast_llm
-        return self.llm if self.llm else self.fallback_llm
-    
     # ── Graph Nodes ───────────────────────────────────────────────
 
-    def _analyze_scammer(self, state: TakeoverState) -> dict:
+    async def _analyze_scammer(self, state: TakeoverState) -> dict:
         """Node 1: Deep analysis of scammer's latest message."""
-        llm = self._get_llm(fast=True)
-        if not llm:
+        if not self.fast_llms:
             return {
                 "intent": "suspicious",
                 "emotion": "unknown",
@@ -108,23 +158,17 @@ class LiveTakeoverAgent:
             }
         
         messages = state["messages"]
+        # History is already bounded by the AgentMemory token budget
         history_text = "\n".join(
             [f"{'Scammer' if isinstance(m, HumanMessage) else 'You'}: {m.content}" 
-             for m in messages[-8:]]
+             for m in messages]
         )
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", SCAMMER_ANALYSIS_PROMPT),
-            ("user", "Conversation:\n{history}\n\nLatest scammer message: {latest}")
-        ])
-        
-        chain = prompt | llm | JsonOutputParser()
-        
         try:
-            result = chain.invoke({
+            result = await llm_router.ainvoke("takeover.analyze", {
                 "history": history_text,
                 "latest": state["scammer_text"]
-            })
+            }, self.fast_llms, "live")
             return {
                 "intent": result.get("intent", "suspicious"),
                 "emotion": result.get("emotion", "neutral"),
@@ -142,44 +186,28 @@ class LiveTakeoverAgent:
                 "extracted_data": {}
             }
     
-    def _plan_strategy(self, state: TakeoverState) -> dict:
+    async def _plan_strategy(self, state: TakeoverState) -> dict:
         """Node 2: Choose stalling/engagement strategy."""
-        llm = self._get_llm(fast=True)
-        if not llm:
+        if not self.fast_llms:
             return {"stall_strategy": "confusion"}
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", STALL_STRATEGY_PROMPT),
-            ("user", (
-                "Scammer intent: {intent}\n"
-                "Emotion: {emotion}\n"
-                "Threat level: {threat_level}\n"
-                "Tactics used: {tactics}\n"
-                "Turn count: {turn_count}\n"
-                "Language: {language}"
-            ))
-        ])
-        
-        chain = prompt | llm | StrOutputParser()
-        
         try:
-            strategy = chain.invoke({
+            strategy = await llm_router.ainvoke("takeover.strategy", {
                 "intent": state["intent"],
                 "emotion": state["emotion"],
                 "threat_level": state["threat_level"],
                 "tactics": ", ".join(state["scam_tactics"]),
                 "turn_count": state["turn_count"],
                 "language": state["language"]
-            })
+            }, self.fast_llms, "live")
             return {"stall_strategy": strategy.strip()}
         except Exception as e:
             logger.error(f"Strategy planning failed: {e}")
             return {"stall_strategy": "Ask for clarification and express confusion."}
     
-    def _generate_ai_response(self, state: TakeoverState) -> dict:
+    async def _generate_ai_response(self, state: TakeoverState) -> dict:
         """Node 3a: Generate direct AI response (for ai_takeover mode)."""
-        llm = self._get_llm()
-        if not llm:
+        if not self.llms:
             return {
                 "ai_response": "Hmm... I'm not sure about that. Can you explain again?",
                 "turn_count": state["turn_count"] + 1
@@ -187,28 +215,16 @@ class LiveTakeoverAgent:
         
         history_text = "\n".join(
             [f"{'Scammer' if isinstance(m, HumanMessage) else 'You'}: {m.content}" 
-             for m in state["messages"][-10:]]
+             for m in state["messages"]]
         )
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", LIVE_TAKEOVER_SYSTEM_PROMPT + "\n\n" + AI_RESPONSE_PROMPT),
-            ("user", (
-                "Conversation:\n{history}\n\n"
-                "Strategy: {strategy}\n"
-                "Language: {language}\n"
-                "Scammer said: {scammer_text}"
-            ))
-        ])
-        
-        chain = prompt | llm | StrOutputParser()
-        
         try:
-            response = chain.invoke({
+            response = await llm_router.ainvoke("takeover.response", {
                 "history": history_text,
                 "strategy": state["stall_strategy"],
                 "language": state["language"],
                 "scammer_text": state["scammer_text"]
-            })
+            }, self.llms, "live", hedge=True)
             return {
                 "ai_response": response.strip(),
                 "turn_count": state["turn_count"] + 1
@@ -220,10 +236,9 @@ class LiveTakeoverAgent:
                 "turn_count": state["turn_count"] + 1
             }
     
-    def _generate_coaching_scripts(self, state: TakeoverState) -> dict:
+    async def _generate_coaching_scripts(self, state: TakeoverState) -> dict:
         """Node 3b: Generate script options for user (for ai_coached mode)."""
-        llm = self._get_llm()
-        if not llm:
+        if not self.llms:
             return {
                 "coaching_scripts": [
                     {"text": "I don't understand. Can you explain?", "tone": "confused", "reasoning": "Stall"},
@@ -234,28 +249,16 @@ class LiveTakeoverAgent:
         
         history_text = "\n".join(
             [f"{'Scammer' if isinstance(m, HumanMessage) else 'You'}: {m.content}" 
-             for m in state["messages"][-8:]]
+             for m in state["messages"]]
         )
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", LIVE_TAKEOVER_SYSTEM_PROMPT + "\n\n" + COACHING_SCRIPT_PROMPT),
-            ("user", (
-                "Conversation:\n{history}\n\n"
-                "Strategy: {strategy}\n"
-                "Language: {language}\n"
-                "Scammer said: {scammer_text}"
-            ))
-        ])
-        
-        chain = prompt | llm | JsonOutputParser()
-        
         try:
-            result = chain.invoke({
+            result = await llm_router.ainvoke("takeover.coaching", {
                 "history": history_text,
                 "strategy": state["stall_strategy"],
                 "language": state["language"],
                 "scammer_text": state["scammer_text"]
-            })
+            }, self.llms, "live")
             
             scripts = result.get("scripts", [])
             if not scripts:
@@ -278,28 +281,20 @@ class LiveTakeoverAgent:
                 "turn_count": state["turn_count"] + 1
             }
     
-    def _naturalize_response(self, state: TakeoverState) -> dict:
+    async def _naturalize_response(self, state: TakeoverState) -> dict:
         """Node 4: Add natural speech patterns (only for ai_takeover mode)."""
         if state["mode"] != "ai_takeover":
             return {}
         
-        llm = self._get_llm(fast=True)
-        if not llm:
+        if not self.fast_llms:
             return {}
         
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", URGENCY_NATURALIZER_PROMPT),
-            ("user", "Language: {language}\nThreat level: {threat_level}\nText: {text}")
-        ])
-        
-        chain = prompt | llm | StrOutputParser()
-        
         try:
-            naturalized = chain.invoke({
+            naturalized = await llm_router.ainvoke("takeover.naturalize", {
                 "language": state["language"],
                 "threat_level": state["threat_level"],
                 "text": state["ai_response"]
-            })
+            }, self.fast_llms, "live")
             return {"ai_response": naturalized.strip()}
         except Exception:
             return {}  # Keep original response  
@@ -361,7 +356,8 @@ class LiveTakeoverAgent:
         
         Args:
             scammer_text: Latest scammer message
-            history: Conversation history [{"role": "scammer"|"agent", "content": "..."}]
+            history: Conversation history [{"role": "scammer"|"agent", "content": "..."}],
+                     token-budgeted by AgentMemory.context()
             mode: "ai_takeover" or "ai_coached"
             language: Detected language code
             turn_count: Current turn number
@@ -475,8 +471,6 @@ class LiveTakeoverAgent:
             }
         """
         try:
-            llm = self._get_llm()
-            
             # Format entities for prompt
             entities_str = "\n".join([
                 f"- {e.get('type', 'unknown')}: {e.get('value', 'N/A')}"
@@ -518,7 +512,14 @@ class LiveTakeoverAgent:
     "warning": "Optional warning if needed"
 }}"""
 
-            response = await llm.ainvoke([HumanMessage(content=prompt)])
+            response = await llm_router.arun(
+                self.llms,
+                lambda llm: llm.ainvoke([HumanMessage(content=prompt)]),
+                request_class="live",
+                hedge=True,
+                tokens=estimate_tokens(prompt),
+                node="takeover.coaching_suggestions"
+            )
             
             # Parse JSON response
             try:
@@ -11,6 +11,9 @@ CRITICAL RULES:
 - Responses must match the user's speaking style
 - Natural hesitation and confusion are weapons
 - Intelligence extraction is passive, never aggressive
+
+These are system prompts compiled as ChatPromptTemplates (agents/chains.py):
+literal braces in JSON examples must be doubled.
 """
 
 # ── SYSTEM PROMPT (Core Behavior) ────────────────────────────────────
@@ -62,12 +65,12 @@ in the context of the full conversation.
 
 Return ONLY valid JSON with these keys:
 
-{
+{{
     "intent": "string - what the scammer wants (e.g. 'get_bank_details', 'redirect_payment', 'install_app', 'get_otp', 'create_urgency', 'build_trust')",
     "emotion": "string - scammer's emotional approach (e.g. 'authoritative', 'urgent', 'friendly', 'threatening', 'sympathetic')",
     "threat_level": "float 0.0-1.0 - how dangerous this interaction is",
     "tactics": ["list of manipulation tactics detected: 'fear', 'authority', 'urgency', 'sympathy', 'greed', 'impersonation', 'isolation', 'time_pressure'"],
-    "extracted_data": {
+    "extracted_data": {{
         "phone_numbers": ["any phone numbers mentioned"],
         "bank_accounts": ["any account numbers"],
         "upi_ids": ["any UPI IDs"],
@@ -75,8 +78,8 @@ Return ONLY valid JSON with these keys:
         "names": ["any names mentioned"],
         "organizations": ["any organization names"],
         "amounts": ["any monetary amounts"]
-    }
-}
+    }}
+}}
 
 Be precise. Do NOT fabricate data. Only extract what is explicitly stated.
 """
@@ -159,15 +162,15 @@ These scripts should feel natural when read aloud by a non-technical person.
 
 Return ONLY valid JSON:
 
-{
+{{
     "scripts": [
-        {
+        {{
             "text": "The exact words the user should say",
             "tone": "How to say it (e.g. 'confused', 'worried', 'cooperative', 'distracted')",
             "reasoning": "Brief explanation of why this script works (hidden from scammer)"
-        }
+        }}
     ]
-}
+}}
 
 SCRIPT RULES:
 - Each script should be 1-2 sentences
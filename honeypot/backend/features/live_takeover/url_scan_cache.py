@@ -0,0 +1,165 @@
+"""
+URL Scan Cache
+Two-tier cache for aggregated URL verdicts: a bounded in-process LRU in front
+of a MongoDB collection that survives restarts and is shared across workers.
+Entries expire on a verdict-dependent TTL (malicious links are stable, clean
+or inconclusive ones are re-checked sooner).
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import asdict, fields
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from db.mongo import db
+from features.live_takeover.session_manager import URLScanResult
+
+logger = logging.getLogger("live_takeover.url_scan_cache")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form used for cache keys (case-insensitive host, no fragment)."""
+    try:
+        parts = urlsplit(url.strip())
+        path = parts.path.rstrip("/") or "/"
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+    except ValueError:
+        return url.strip()
+
+
+def url_cache_key(url: str) -> str:
+    return hashlib.sha256(normalize_url(url).encode()).hexdigest()
+
+
+class URLScanCache:
+    """
+    LRU (memory) + MongoDB (persistent) cache for URLScanResult objects.
+    """
+
+    # Verdict-dependent TTLs
+    TTL_MALICIOUS = timedelta(hours=24)
+    TTL_SUSPICIOUS = timedelta(hours=6)
+    TTL_SAFE = timedelta(hours=1)
+    TTL_INCONCLUSIVE = timedelta(minutes=10)
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[URLScanResult, datetime]]" = OrderedDict()
+        self._index_ready = False
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "persistent_errors": 0,
+        }
+
+    # ── TTL policy ────────────────────────────────────────────────
+
+    def ttl_for(self, result: URLScanResult) -> timedelta:
+        """Pick a TTL from the verdict and how many external scanners answered."""
+        external = [
+            name for name, r in result.scanner_results.items()
+            if name != "pattern" and not r.get("pending")
+        ]
+        if not external or any(r.get("pending") for r in result.scanner_results.values()):
+            return self.TTL_INCONCLUSIVE
+        if result.risk_score >= 0.7:
+            return self.TTL_MALICIOUS
+        if not result.is_safe:
+            return self.TTL_SUSPICIOUS
+        return self.TTL_SAFE
+
+    # ── Lookup / store ────────────────────────────────────────────
+
+    async def get(self, key: str) -> Optional[URLScanResult]:
+        """Return a fresh cached result from memory, then MongoDB, else None."""
+        now = datetime.utcnow()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            result, expires_at = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return result
+            del self._entries[key]
+
+        result, expires_at = await self._load(key, now)
+        if result is not None:
+            self._remember(key, result, expires_at)
+            self.stats["persistent_hits"] += 1
+            return result
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, key: str, result: URLScanResult):
+        """Store a result in both tiers."""
+        expires_at = datetime.utcnow() + self.ttl_for(result)
+        self._remember(key, result, expires_at)
+        await self._store(key, result, expires_at)
+
+    def _remember(self, key: str, result: URLScanResult, expires_at: datetime):
+        self._entries[key] = (result, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    # ── MongoDB tier ──────────────────────────────────────────────
+
+    async def _ensure_index(self):
+        if self._index_ready:
+            return
+        # Mongo's TTL monitor removes documents once expires_at has passed
+        await db.url_scan_cache.create_index("expires_at", expireAfterSeconds=0)
+        self._index_ready = True
+
+    async def _load(self, key: str, now: datetime) -> Tuple[Optional[URLScanResult], Optional[datetime]]:
+        try:
+            doc = await db.url_scan_cache.find_one({"_id": key, "expires_at": {"$gt": now}})
+        except Exception as e:
+            self.stats["persistent_errors"] += 1
+            logger.debug(f"URL scan cache lookup skipped: {e}")
+            return None, None
+
+        if not doc:
+            return None, None
+        try:
+            known = {f.name for f in fields(URLScanResult)}
+            result = URLScanResult(**{k: v for k, v in doc["result"].items() if k in known})
+        except Exception as e:
+            logger.warning(f"Discarding unreadable URL scan cache entry {key[:12]}: {e}")
+            return None, None
+        return result, doc["expires_at"]
+
+    async def _store(self, key: str, result: URLScanResult, expires_at: datetime):
+        try:
+            await self._ensure_index()
+            await db.url_scan_cache.replace_one(
+                {"_id": key},
+                {
+                    "_id": key,
+                    "url": result.url,
+                    "result": asdict(result),
+                    "expires_at": expires_at,
+                },
+                upsert=True
+            )
+        except Exception as e:
+            self.stats["persistent_errors"] += 1
+            logger.debug(f"URL scan cache write skipped: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["persistent_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,255 @@
+"""
+URL Scan Queue
+Bounded, prioritized background scanning for URLs seen on live calls.
+A fixed pool of workers drains the queue; URLs from high-threat calls jump
+ahead, slow providers (urlscan.io) are polled via delayed follow-up jobs
+instead of parking a worker, and results are pushed to each subscriber.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from config import settings
+from features.live_takeover.session_manager import URLScanResult
+from features.live_takeover.url_scan_cache import url_cache_key
+from features.live_takeover.url_scanner import url_scanner
+
+logger = logging.getLogger("live_takeover.url_scan_queue")
+
+# Receives every result for a URL: the first verdict, then updates as deferred
+# scanners (urlscan.io) finish.
+ScanNotifier = Callable[[URLScanResult], Awaitable[None]]
+
+
+@dataclass(order=True)
+class ScanJob:
+    sort_key: Tuple[float, int]
+    url: str = field(compare=False)
+    kind: str = field(default="scan", compare=False)  # "scan" | "poll"
+    notifiers: List[ScanNotifier] = field(default_factory=list, compare=False)
+    owners: List[str] = field(default_factory=list, compare=False)
+    enqueued_at: float = field(default_factory=time.monotonic, compare=False)
+    # poll jobs only
+    scanner_name: str = field(default="", compare=False)
+    handle: str = field(default="", compare=False)
+    attempt: int = field(default=0, compare=False)
+    base: Optional[URLScanResult] = field(default=None, compare=False)
+
+
+class URLScanQueue:
+    """
+    Priority work queue in front of MultiScanner.
+
+    - Bounded: submissions beyond `max_size` are rejected (backpressure)
+    - Deduplicated: a URL already waiting gains extra subscribers, not a job
+    - Prioritized: higher call threat level is scanned first
+    - Provider quotas are enforced inside MultiScanner's ProviderBudgets
+    """
+
+    def __init__(self, workers: int = 4, max_size: int = 256):
+        self.worker_count = workers
+        self.max_size = max_size
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: List[asyncio.Task] = []
+        self._waiting: Dict[str, ScanJob] = {}   # cache_key -> queued scan job
+        self._timers: Set[asyncio.TimerHandle] = set()
+        self._seq = itertools.count()
+        self.stats = {
+            "submitted": 0,
+            "deduplicated": 0,
+            "rejected": 0,
+            "scanned": 0,
+            "polls": 0,
+            "poll_timeouts": 0,
+            "notify_errors": 0,
+            "max_wait_s": 0.0,
+        }
+
+    # ── Lifecycle ─────────────────────────────────────────────────
+
+    def _ensure_started(self):
+        if self._workers:
+            return
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_size)
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"url-scan-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"🔗 URL scan queue started ({self.worker_count} workers, max {self.max_size})")
+
+    async def stop(self):
+        """Cancel workers and pending poll timers (app shutdown)."""
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            logger.info("URL scan queue stopped")
+        self._workers = []
+        self._queue = None
+        self._waiting.clear()
+
+    # ── Submission ────────────────────────────────────────────────
+
+    def submit(
+        self,
+        urls: List[str],
+        notify: ScanNotifier,
+        priority: float = 0.0,
+        owner_id: str = ""
+    ) -> int:
+        """
+        Queue URLs for scanning. Non-blocking.
+
+        Args:
+            urls: URLs to scan
+            notify: Async callback invoked with each URLScanResult
+            priority: 0.0-1.0, typically the call's current threat level
+            owner_id: Session / room id (for logging)
+
+        Returns:
+            Number of URLs accepted (queued or attached to a waiting job)
+        """
+        self._ensure_started()
+        accepted = 0
+
+        for url in urls:
+            self.stats["submitted"] += 1
+            key = url_cache_key(url)
+
+            waiting = self._waiting.get(key)
+            if waiting is not None:
+                waiting.notifiers.append(notify)
+                waiting.owners.append(owner_id)
+                self.stats["deduplicated"] += 1
+                accepted += 1
+                continue
+
+            job = ScanJob(
+                sort_key=(-priority, next(self._seq)),
+                url=url,
+                notifiers=[notify],
+                owners=[owner_id]
+            )
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                self.stats["rejected"] += 1
+                logger.warning(f"⚠️ URL scan queue full, dropping {url[:60]} ({owner_id})")
+                continue
+
+            self._waiting[key] = job
+            accepted += 1
+
+        return accepted
+
+    def _schedule_poll(self, job: ScanJob, delay: float):
+        def _enqueue():
+            self._timers.discard(timer)
+            if self._queue is None:
+                return
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                # Queue is saturated with fresh scans; retry the poll later
+                self._schedule_poll(job, delay)
+
+        timer = asyncio.get_running_loop().call_later(delay, _enqueue)
+        self._timers.add(timer)
+
+    # ── Workers ───────────────────────────────────────────────────
+
+    async def _worker(self, index: int):
+        while True:
+            job = await self._queue.get()
+            try:
+                if job.kind == "poll":
+                    await self._run_poll(job)
+                else:
+                    await self._run_scan(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"URL scan worker {index} failed on {job.url[:60]}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run_scan(self, job: ScanJob):
+        self._waiting.pop(url_cache_key(job.url), None)
+        waited = time.monotonic() - job.enqueued_at
+        self.stats["max_wait_s"] = max(self.stats["max_wait_s"], round(waited, 3))
+
+        result = await url_scanner.scan_url(job.url, defer_slow=True)
+        self.stats["scanned"] += 1
+        await self._deliver(job, result)
+
+        for name, entry in result.scanner_results.items():
+            if entry.get("pending"):
+                scanner = url_scanner.get_scanner(name)
+                self._schedule_poll(
+                    ScanJob(
+                        sort_key=job.sort_key,
+                        url=job.url,
+                        kind="poll",
+                        notifiers=job.notifiers,
+                        owners=job.owners,
+                        scanner_name=name,
+                        handle=entry.get("handle", ""),
+                        attempt=1,
+                        base=result
+                    ),
+                    delay=getattr(scanner, "POLL_INTERVAL", 5.0)
+                )
+
+    async def _run_poll(self, job: ScanJob):
+        self.stats["polls"] += 1
+        scanner = url_scanner.get_scanner(job.scanner_name)
+        data = await scanner.poll(job.handle) if scanner else None
+
+        if data is None:
+            max_polls = getattr(scanner, "MAX_POLLS", 6)
+            if scanner and job.attempt < max_polls:
+                job.attempt += 1
+                self._schedule_poll(job, delay=getattr(scanner, "POLL_INTERVAL", 5.0))
+                return
+            # Give up: drop the pending marker so the verdict stands on the rest
+            self.stats["poll_timeouts"] += 1
+            logger.warning(f"{job.scanner_name} result timed out for {job.url[:60]}")
+            updated = await url_scanner.complete_deferred(job.base, job.scanner_name, None)
+            await self._deliver(job, updated)
+            return
+
+        updated = await url_scanner.complete_deferred(job.base, job.scanner_name, data)
+        await self._deliver(job, updated)
+
+    async def _deliver(self, job: ScanJob, result: URLScanResult):
+        for notify, owner in zip(job.notifiers, job.owners):
+            try:
+                await notify(result)
+            except Exception as e:
+                self.stats["notify_errors"] += 1
+                logger.error(f"URL scan notify failed ({owner}): {e}")
+
+    # ── Introspection ─────────────────────────────────────────────
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "depth": self._queue.qsize() if self._queue else 0,
+            "max_size": self.max_size,
+            "workers": len(self._workers),
+            "scheduled_polls": len(self._timers),
+        }
+
+
+# Module-level singleton
+url_scan_queue = URLScanQueue(
+    workers=getattr(settings, 'URL_SCAN_WORKERS', 4),
+    max_size=getattr(settings, 'URL_SCAN_QUEUE_SIZE', 256)
+)
@@ -5,19 +5,26 @@ Supports VirusTotal (free tier), urlscan.io (free), WHOIS, and pattern analysis.
 """
 
 import asyncio
-import hashlib
+import base64
+import importlib.util
 import json
 import logging
 import re
 import socket
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import httpx
 
 from config import settings
+from core.rate_limiter import TokenBucket, get_rate_limiter, request_with_limit
+from features.live_takeover.domain_index import domain_reputation
+from features.live_takeover.public_suffix import registrable_domain
 from features.live_takeover.session_manager import URLScanResult
+from features.live_takeover.url_scan_cache import URLScanCache, url_cache_key
 
 logger = logging.getLogger("live_takeover.url_scanner")
 
@@ -26,6 +33,8 @@ class BaseScanner:
     """Abstract base for URL scanners."""
     
     name: str = "base"
+    # Deferred scanners expose submit()/poll() so callers need not wait on them
+    deferred: bool = False
     
     async def scan(self, url: str) -> Optional[Dict[str, Any]]:
         raise NotImplementedError
@@ -57,6 +66,8 @@ class PatternScanner(BaseScanner):
         r"paypal", r"netflix", r"amazon", r"microsoft",
         r"support", r"helpdesk", r"wallet"
     ]
+    # One pass over the URL instead of one re.search per indicator
+    PHISHING_RE = re.compile("|".join(PHISHING_INDICATORS))
     
     HOMOGRAPH_CHARS = {
         'а': 'a', 'е': 'e', 'о': 'o', 'р': 'p',
@@ -85,8 +96,9 @@ class PatternScanner(BaseScanner):
             risk_score += 0.4
         
         # ── Phishing path indicators ─────────────────────────
+        found = set(self.PHISHING_RE.findall(full))
         for pattern in self.PHISHING_INDICATORS:
-            if re.search(pattern, full):
+            if pattern in found:
                 findings.append(f"Phishing keyword in URL: '{pattern}'")
                 risk_score += 0.15
         
@@ -143,237 +155,410 @@ class PatternScanner(BaseScanner):
 class VirusTotalScanner(BaseScanner):
     """
     VirusTotal API v3 — free tier (4 req/min).
+    Looks up an existing report first; only unknown URLs are submitted.
     """
     
     name = "virustotal"
-    BASE_URL = "https://www.virustotal.com/api/v3"
+    BASE_URL = settings.VIRUSTOTAL_BASE_URL
+    MAX_WAIT = 20.0  # longest we queue for quota before skipping VT for this URL
     
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key or getattr(settings, "VIRUSTOTAL_API_KEY", "")
-        self._rate_semaphore = asyncio.Semaphore(4)
-        self._last_request = datetime.min
+        # Every API request counts against the quota, so the bucket is per request
+        self.limiter = get_rate_limiter(
+            "virustotal",
+            rate_per_minute=getattr(settings, "VIRUSTOTAL_RATE_PER_MIN", 4),
+            burst=1
+        )
+    
+    @staticmethod
+    def url_id(url: str) -> str:
+        """VT v3 URL identifier: unpadded urlsafe base64 of the URL."""
+        return base64.urlsafe_b64encode(url.encode()).decode().rstrip("=")
     
     async def scan(self, url: str) -> Optional[Dict[str, Any]]:
         if not self.api_key:
             logger.debug("VirusTotal API key not configured, skipping")
             return None
         
-        # Rate limiting: 4 requests/minute
-        async with self._rate_semaphore:
-            now = datetime.utcnow()
-            elapsed = (now - self._last_request).total_seconds()
-            if elapsed < 15:  # ~4/min
-                await asyncio.sleep(15 - elapsed)
-            
-            self._last_request = datetime.utcnow()
-            
-            try:
-                url_id = hashlib.sha256(url.encode()).hexdigest()
+        headers = {"x-apikey": self.api_key}
+        
+        try:
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                # ── Existing report (one request, no new analysis) ──
+                url_id = self.url_id(url)
+                report_resp = await request_with_limit(
+                    self.limiter,
+                    lambda: client.get(f"{self.BASE_URL}/urls/{url_id}", headers=headers),
+                    max_wait=self.MAX_WAIT
+                )
+                if report_resp is None:
+                    return None  # over quota / rate limited
                 
-                async with httpx.AsyncClient(timeout=15.0) as client:
-                    # Submit URL for scanning
-                    submit_resp = await client.post(
-                        f"{self.BASE_URL}/urls",
-                        headers={"x-apikey": self.api_key},
-                        data={"url": url}
-                    )
-                    
-                    if submit_resp.status_code != 200:
-                        logger.warning(f"VT submit failed: {submit_resp.status_code}")
-                        return None
-                    
-                    analysis_id = submit_resp.json().get("data", {}).get("id", "")
-                    
-                    # Wait briefly then get results
-                    await asyncio.sleep(3)
-                    
-                    result_resp = await client.get(
-                        f"{self.BASE_URL}/analyses/{analysis_id}",
-                        headers={"x-apikey": self.api_key}
-                    )
-                    
-                    if result_resp.status_code != 200:
-                        return None
-                    
-                    data = result_resp.json().get("data", {}).get("attributes", {})
-                    stats = data.get("stats", {})
-                    
-                    malicious = stats.get("malicious", 0)
-                    suspicious = stats.get("suspicious", 0)
-                    total = sum(stats.values()) or 1
-                    
-                    risk_score = (malicious * 2 + suspicious) / (total * 2)
-                    
-                    return {
-                        "scanner": self.name,
-                        "risk_score": min(risk_score, 1.0),
-                        "is_malicious": malicious > 2,
-                        "findings": [
-                            f"{malicious} engines flagged as malicious",
-                            f"{suspicious} engines flagged as suspicious",
-                            f"Status: {data.get('status', 'unknown')}"
-                        ],
-                        "details": {
+                if report_resp.status_code == 200:
+                    attrs = report_resp.json().get("data", {}).get("attributes", {})
+                    stats = attrs.get("last_analysis_stats", {})
+                    if stats:
+                        return self._build_result(stats, "completed (existing report)", {
                             "stats": stats,
-                            "analysis_id": analysis_id
-                        }
-                    }
-                    
-            except Exception as e:
-                logger.error(f"VirusTotal scan error: {e}")
-                return None
+                            "url_id": url_id,
+                            "last_analysis_date": attrs.get("last_analysis_date")
+                        })
+                elif report_resp.status_code != 404:
+                    logger.warning(f"VT report lookup failed: {report_resp.status_code}")
+                
+                # ── Submit URL for scanning ───────────────────
+                submit_resp = await request_with_limit(
+                    self.limiter,
+                    lambda: client.post(f"{self.BASE_URL}/urls", headers=headers, data={"url": url}),
+                    max_wait=self.MAX_WAIT
+                )
+                
+                if submit_resp is None or submit_resp.status_code != 200:
+                    if submit_resp is not None:
+                        logger.warning(f"VT submit failed: {submit_resp.status_code}")
+                    return None
+                
+                analysis_id = submit_resp.json().get("data", {}).get("id", "")
+                
+                # Wait briefly then get results
+                await asyncio.sleep(3)
+                
+                result_resp = await request_with_limit(
+                    self.limiter,
+                    lambda: client.get(f"{self.BASE_URL}/analyses/{analysis_id}", headers=headers),
+                    max_wait=self.MAX_WAIT
+                )
+                
+                if result_resp is None or result_resp.status_code != 200:
+                    return None
+                
+                data = result_resp.json().get("data", {}).get("attributes", {})
+                stats = data.get("stats", {})
+                
+                return self._build_result(stats, data.get("status", "unknown"), {
+                    "stats": stats,
+                    "analysis_id": analysis_id
+                })
+                
+        except Exception as e:
+            logger.error(f"VirusTotal scan error: {e}")
+            return None
+    
+    def _build_result(self, stats: Dict[str, int], status: str, details: Dict[str, Any]) -> Dict[str, Any]:
+        malicious = stats.get("malicious", 0)
+        suspicious = stats.get("suspicious", 0)
+        total = sum(stats.values()) or 1
+        
+        risk_score = (malicious * 2 + suspicious) / (total * 2)
+        
+        return {
+            "scanner": self.name,
+            "risk_score": min(risk_score, 1.0),
+            "is_malicious": malicious > 2,
+            "findings": [
+                f"{malicious} engines flagged as malicious",
+                f"{suspicious} engines flagged as suspicious",
+                f"Status: {status}"
+            ],
+            "details": details
+        }
 
 
 class URLScanIOScanner(BaseScanner):
     """
     urlscan.io — free tier (unlimited public scans).
+    Results take 10-30s, so the scanner is deferred: submit() returns the
+    result URL immediately and poll() checks it once per call.
     """
     
     name = "urlscan_io"
-    BASE_URL = "https://urlscan.io/api/v1"
+    BASE_URL = settings.URLSCAN_BASE_URL
+    deferred = True
+    POLL_INTERVAL = 5.0
+    MAX_POLLS = 6
     
     async def scan(self, url: str) -> Optional[Dict[str, Any]]:
+        """Blocking scan: submit, then poll until ready (up to ~30s)."""
+        result_url = await self.submit(url)
+        if not result_url:
+            return None
+        
+        for _ in range(self.MAX_POLLS):
+            await asyncio.sleep(self.POLL_INTERVAL)
+            result = await self.poll(result_url)
+            if result is not None:
+                return result
+        
+        logger.warning("urlscan.io scan timed out")
+        return None
+    
+    async def submit(self, url: str) -> Optional[str]:
+        """Submit a scan. Returns the result API URL to poll, or None."""
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                # Submit scan
+            async with httpx.AsyncClient(timeout=15.0) as client:
                 submit_resp = await client.post(
                     f"{self.BASE_URL}/scan/",
                     json={"url": url, "visibility": "public"},
                     headers={"Content-Type": "application/json"}
                 )
-                
-                if submit_resp.status_code not in (200, 201):
-                    logger.warning(f"urlscan.io submit failed: {submit_resp.status_code}")
-                    return None
-                
-                result_url = submit_resp.json().get("api", "")
-                
-                if not result_url:
-                    return None
-                
-                # Poll for results (takes 10-30s)
-                for _ in range(6):
-                    await asyncio.sleep(5)
-                    
-                    result_resp = await client.get(result_url)
-                    
-                    if result_resp.status_code == 200:
-                        data = result_resp.json()
-                        verdicts = data.get("verdicts", {}).get("overall", {})
-                        page = data.get("page", {})
-                        
-                        is_malicious = verdicts.get("malicious", False)
-                        score = verdicts.get("score", 0)
-                        
-                        findings = []
-                        if is_malicious:
-                            findings.append("Flagged as malicious by urlscan.io")
-                        
-                        categories = verdicts.get("categories", [])
-                        if categories:
-                            findings.append(f"Categories: {', '.join(categories)}")
-                        
-                        brands = verdicts.get("brands", [])
-                        if brands:
-                            findings.append(f"Impersonated brands: {', '.join(brands)}")
-                        
-                        return {
-                            "scanner": self.name,
-                            "risk_score": min(score / 100, 1.0) if score else (0.9 if is_malicious else 0.1),
-                            "is_malicious": is_malicious,
-                            "findings": findings,
-                            "details": {
-                                "page_title": page.get("title", ""),
-                                "server": page.get("server", ""),
-                                "ip": page.get("ip", ""),
-                                "country": page.get("country", ""),
-                                "result_url": result_url
-                            }
-                        }
-                
-                logger.warning("urlscan.io scan timed out")
+            
+            if submit_resp.status_code not in (200, 201):
+                logger.warning(f"urlscan.io submit failed: {submit_resp.status_code}")
                 return None
-                
+            
+            return submit_resp.json().get("api", "") or None
         except Exception as e:
-            logger.error(f"urlscan.io scan error: {e}")
+            logger.error(f"urlscan.io submit error: {e}")
             return None
+    
+    async def poll(self, result_url: str) -> Optional[Dict[str, Any]]:
+        """Single result check. Returns None while the scan is still running."""
+        try:
+            async with httpx.AsyncClient(timeout=15.0) as client:
+                result_resp = await client.get(result_url)
+            
+            if result_resp.status_code != 200:
+                return None
+            
+            data = result_resp.json()
+        except Exception as e:
+            logger.error(f"urlscan.io poll error: {e}")
+            return None
+        
+        verdicts = data.get("verdicts", {}).get("overall", {})
+        page = data.get("page", {})
+        
+        is_malicious = verdicts.get("malicious", False)
+        score = verdicts.get("score", 0)
+        
+        findings = []
+        if is_malicious:
+            findings.append("Flagged as malicious by urlscan.io")
+        
+        categories = verdicts.get("categories", [])
+        if categories:
+            findings.append(f"Categories: {', '.join(categories)}")
+        
+        brands = verdicts.get("brands", [])
+        if brands:
+            findings.append(f"Impersonated brands: {', '.join(brands)}")
+        
+        return {
+            "scanner": self.name,
+            "risk_score": min(score / 100, 1.0) if score else (0.9 if is_malicious else 0.1),
+            "is_malicious": is_malicious,
+            "findings": findings,
+            "details": {
+                "page_title": page.get("title", ""),
+                "server": page.get("server", ""),
+                "ip": page.get("ip", ""),
+                "country": page.get("country", ""),
+                "result_url": result_url
+            }
+        }
 
 
 class WHOISScanner(BaseScanner):
     """
     WHOIS-based domain age check. Young domains are suspicious.
     Uses python-whois (free, no API key needed).
+    
+    Lookups are keyed by registrable domain (a.evil.xyz and b.evil.xyz share
+    one query), cached for days on success and minutes on failure, and run on
+    a dedicated bounded thread pool so slow WHOIS servers cannot starve the
+    default executor used by STT and other blocking work.
     """
     
     name = "whois"
+    MAX_CACHE_ENTRIES = 4096
+    POSITIVE_TTL = timedelta(days=7)
+    NEGATIVE_TTL = timedelta(minutes=15)
+    
+    def __init__(self):
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cache: "OrderedDict[str, Tuple[datetime, Optional[Dict[str, Any]]]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.timeout = getattr(settings, 'WHOIS_TIMEOUT_S', 15.0)
+        self.stats = {"lookups": 0, "hits": 0, "negative_hits": 0, "failures": 0, "coalesced": 0}
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'WHOIS_MAX_WORKERS', 4),
+                thread_name_prefix="whois"
+            )
+        return self._executor
     
     async def scan(self, url: str) -> Optional[Dict[str, Any]]:
-        try:
-            import whois
-        except ImportError:
+        if importlib.util.find_spec("whois") is None:
             logger.debug("python-whois not installed, skipping WHOIS scan")
             return None
         
-        try:
-            parsed = urlparse(url)
-            domain = parsed.hostname or ""
-            
-            if not domain:
-                return None
-            
-            # Run WHOIS in thread pool (blocking I/O)
-            loop = asyncio.get_event_loop()
-            w = await loop.run_in_executor(None, whois.whois, domain)
-            
-            findings = []
-            risk_score = 0.0
-            
-            # Domain age analysis
-            creation_date = w.creation_date
-            if isinstance(creation_date, list):
-                creation_date = creation_date[0]
-            
-            if creation_date:
-                age_days = (datetime.utcnow() - creation_date).days
-                
-                if age_days < 30:
-                    findings.append(f"Very new domain: {age_days} days old")
-                    risk_score += 0.6
-                elif age_days < 90:
-                    findings.append(f"Recent domain: {age_days} days old")
-                    risk_score += 0.3
-                elif age_days < 365:
-                    findings.append(f"Domain age: {age_days} days")
-                    risk_score += 0.1
-                else:
-                    findings.append(f"Established domain: {age_days // 365} years old")
-            
-            # Registrar info
-            registrar = w.registrar
-            if registrar:
-                findings.append(f"Registrar: {registrar}")
+        hostname = urlparse(url).hostname or ""
+        domain = registrable_domain(hostname)
+        if not domain:
+            return None
+        
+        record = await self._lookup(domain)
+        if record is None:
+            return None
+        
+        findings = []
+        risk_score = 0.0
+        
+        # Domain age analysis
+        creation_date = record["creation_date"]
+        if creation_date:
+            age_days = (datetime.utcnow() - creation_date).days
             
-            # Privacy protection check
-            if w.org and "privacy" in str(w.org).lower():
-                findings.append("WHOIS privacy protection enabled")
+            if age_days < 30:
+                findings.append(f"Very new domain: {age_days} days old")
+                risk_score += 0.6
+            elif age_days < 90:
+                findings.append(f"Recent domain: {age_days} days old")
+                risk_score += 0.3
+            elif age_days < 365:
+                findings.append(f"Domain age: {age_days} days")
                 risk_score += 0.1
-            
-            return {
-                "scanner": self.name,
-                "risk_score": min(risk_score, 1.0),
-                "is_malicious": risk_score >= 0.5,
-                "findings": findings,
-                "details": {
-                    "domain": domain,
-                    "registrar": registrar,
-                    "creation_date": str(creation_date) if creation_date else None,
-                    "country": w.country
-                }
+            else:
+                findings.append(f"Established domain: {age_days // 365} years old")
+        
+        # Registrar info
+        registrar = record["registrar"]
+        if registrar:
+            findings.append(f"Registrar: {registrar}")
+        
+        # Privacy protection check
+        if record["org"] and "privacy" in str(record["org"]).lower():
+            findings.append("WHOIS privacy protection enabled")
+            risk_score += 0.1
+        
+        return {
+            "scanner": self.name,
+            "risk_score": min(risk_score, 1.0),
+            "is_malicious": risk_score >= 0.5,
+            "findings": findings,
+            "details": {
+                "domain": domain,
+                "hostname": hostname,
+                "registrar": registrar,
+                "creation_date": str(creation_date) if creation_date else None,
+                "country": record["country"]
             }
-            
+        }
+    
+    async def _lookup(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Cached, coalesced WHOIS record for a registrable domain (None on failure)."""
+        now = datetime.utcnow()
+        entry = self._cache.get(domain)
+        if entry is not None:
+            expires_at, record = entry
+            if expires_at > now:
+                self._cache.move_to_end(domain)
+                self.stats["hits" if record is not None else "negative_hits"] += 1
+                return record
+            del self._cache[domain]
+        
+        pending = self._inflight.get(domain)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+            return await asyncio.shield(pending)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[domain] = future
+        try:
+            record = await self._query(domain)
+            ttl = self.POSITIVE_TTL if record is not None else self.NEGATIVE_TTL
+            self._cache[domain] = (datetime.utcnow() + ttl, record)
+            while len(self._cache) > self.MAX_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+            future.set_result(record)
+            return record
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        finally:
+            self._inflight.pop(domain, None)
+    
+    async def _query(self, domain: str) -> Optional[Dict[str, Any]]:
+        import whois
+        
+        self.stats["lookups"] += 1
+        loop = asyncio.get_running_loop()
+        try:
+            w = await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), whois.whois, domain),
+                timeout=self.timeout
+            )
         except Exception as e:
-            logger.error(f"WHOIS scan error: {e}")
+            self.stats["failures"] += 1
+            logger.error(f"WHOIS scan error for {domain}: {type(e).__name__}: {e}")
+            return None
+        
+        creation_date = w.creation_date
+        if isinstance(creation_date, list):
+            creation_date = creation_date[0]
+        if not isinstance(creation_date, datetime):
+            creation_date = None
+        elif creation_date.tzinfo is not None:
+            creation_date = creation_date.replace(tzinfo=None)
+        
+        return {
+            "creation_date": creation_date,
+            "registrar": w.registrar,
+            "org": w.org,
+            "country": w.country,
+        }
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cached_domains": len(self._cache)}
+
+
+class ProviderBudget:
+    """
+    Per-provider call budget: a concurrency cap plus an optional token bucket.
+    A call that cannot get both within `max_wait` is skipped rather than left
+    sleeping — the verdict is built from the other scanners instead.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        bucket: Optional[TokenBucket] = None,
+        max_wait: float = 10.0
+    ):
+        self.name = name
+        self.bucket = bucket
+        self.max_wait = max_wait
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self.stats = {"calls": 0, "skipped": 0, "waited_s": 0.0}
+    
+    async def run(self, factory: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        """Run factory() inside the budget, or return None if over budget."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            self.stats["skipped"] += 1
             return None
+        
+        try:
+            if self.bucket is not None:
+                remaining = self.max_wait - (loop.time() - started)
+                if not await self.bucket.acquire(max_wait=max(remaining, 0.0)):
+                    self.stats["skipped"] += 1
+                    logger.debug(f"{self.name} budget exhausted, skipping")
+                    return None
+            
+            self.stats["calls"] += 1
+            self.stats["waited_s"] = round(self.stats["waited_s"] + loop.time() - started, 3)
+            return await factory()
+        finally:
+            self._semaphore.release()
 
 
 class MultiScanner:
@@ -389,33 +574,128 @@ class MultiScanner:
             URLScanIOScanner(),
             WHOISScanner(),
         ]
-        self._cache: Dict[str, URLScanResult] = {}
-        self._cache_ttl = timedelta(hours=1)
+        # Provider concurrency; VirusTotal meters each request itself (see VirusTotalScanner)
+        self.budgets: Dict[str, ProviderBudget] = {
+            "virustotal": ProviderBudget("virustotal", concurrency=2, max_wait=30.0),
+            "urlscan_io": ProviderBudget(
+                "urlscan_io", concurrency=2,
+                bucket=get_rate_limiter("urlscan_io", rate_per_minute=30, burst=2),
+                max_wait=10.0
+            ),
+            "whois": ProviderBudget("whois", concurrency=4, max_wait=10.0),
+        }
+        self._cache = URLScanCache(
+            max_entries=getattr(settings, 'URL_SCAN_CACHE_SIZE', 2048)
+        )
+        # Single-flight: concurrent scans of one URL share a single task
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._stats = {
+            "scans_requested": 0,
+            "scans_executed": 0,
+            "coalesced": 0,
+            "list_verdicts": 0,
+            "external_calls_avoided": 0,
+        }
     
-    async def scan_url(self, url: str) -> URLScanResult:
+    @property
+    def _external_scanner_count(self) -> int:
+        """External providers a full scan would call (VirusTotal only when keyed)."""
+        return sum(
+            1 for s in self.scanners
+            if s.name != "pattern" and getattr(s, "api_key", True)
+        )
+    
+    def get_scanner(self, name: str) -> Optional[BaseScanner]:
+        return next((s for s in self.scanners if s.name == name), None)
+    
+    async def scan_url(self, url: str, defer_slow: bool = False) -> URLScanResult:
         """
         Scan a URL with all available scanners.
-        Returns aggregated URLScanResult.
+        Returns aggregated URLScanResult (cached / coalesced when possible).
+        
+        Args:
+            url: URL to scan
+            defer_slow: Submit deferred scanners (urlscan.io) instead of waiting
+                        for them. Their entries in scanner_results are marked
+                        {"pending": True, "handle": ...} until complete_deferred().
         """
-        # ── Cache check ───────────────────────────────────────
-        cache_key = hashlib.md5(url.encode()).hexdigest()
+        self._stats["scans_requested"] += 1
+        
+        # ── Offline blocklist / allowlist: instant verdict ─────
+        listed = self._listed_verdict(url)
+        if listed is not None:
+            self._stats["list_verdicts"] += 1
+            self._stats["external_calls_avoided"] += self._external_scanner_count
+            return listed
+        
+        cache_key = url_cache_key(url)
+        
+        # ── Join an identical lookup/scan that is already running ──
+        task = self._inflight.get(cache_key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            self._stats["external_calls_avoided"] += self._external_scanner_count
+            logger.debug(f"URL scan coalesced: {url[:60]}")
+            return await asyncio.shield(task)
+        
+        task = asyncio.create_task(self._lookup_or_scan(url, cache_key, defer_slow))
+        self._inflight[cache_key] = task
+        task.add_done_callback(lambda _t: self._inflight.pop(cache_key, None))
+        return await asyncio.shield(task)
+    
+    def _listed_verdict(self, url: str) -> Optional[URLScanResult]:
+        """Verdict from the local domain lists, or None if the domain is unlisted."""
+        hostname = urlparse(url).hostname or ""
+        status, matched = domain_reputation.check(hostname)
+        if status is None:
+            return None
+        
+        blocked = status == "blocked"
+        finding = (
+            f"Domain on phishing blocklist ({matched})" if blocked
+            else f"Domain on allowlist ({matched})"
+        )
+        return self._aggregate(url, {
+            "domain_list": {
+                "scanner": "domain_list",
+                "risk_score": 1.0 if blocked else 0.0,
+                "is_malicious": blocked,
+                "findings": [finding],
+                "details": {"list": status, "matched_domain": matched},
+            }
+        })
+    
+    async def _lookup_or_scan(self, url: str, cache_key: str, defer_slow: bool) -> URLScanResult:
+        # ── Cache check (memory → MongoDB) ────────────────────
+        cached = await self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug(f"URL scan cache hit: {url[:60]}")
+            self._stats["external_calls_avoided"] += self._external_scanner_count
+            return cached
         
-        if cache_key in self._cache:
-            cached = self._cache[cache_key]
-            if (datetime.utcnow() - cached.scanned_at) < self._cache_ttl:
-                logger.debug(f"URL scan cache hit: {url[:60]}")
-                return cached
+        scan_result = await self._run_scanners(url, defer_slow)
+        await self._cache.put(cache_key, scan_result)
+        return scan_result
+    
+    async def _run_scanners(self, url: str, defer_slow: bool = False) -> URLScanResult:
+        """Fan out to every scanner (within provider budgets) and aggregate."""
+        self._stats["scans_executed"] += 1
+        
+        async def _call(scanner: BaseScanner) -> Optional[Dict[str, Any]]:
+            if defer_slow and scanner.deferred:
+                handle = await self._budgeted(scanner.name, lambda: scanner.submit(url))
+                if not handle:
+                    return None
+                return {"scanner": scanner.name, "pending": True, "handle": handle}
+            return await self._budgeted(scanner.name, lambda: scanner.scan(url))
         
         # ── Run all scanners in parallel ──────────────────────
-        tasks = [scanner.scan(url) for scanner in self.scanners]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        results = await asyncio.gather(
+            *[_call(scanner) for scanner in self.scanners],
+            return_exceptions=True
+        )
         
-        # ── Aggregate results ─────────────────────────────────
-        all_findings = []
-        risk_scores = []
-        malicious_votes = 0
         scanner_results = {}
-        
         for i, result in enumerate(results):
             # Skip errors and None results
             if isinstance(result, Exception):
@@ -425,9 +705,25 @@ class MultiScanner:
             if result is None or not isinstance(result, dict):
                 continue
             
-            # Now we know result is a dict
-            scanner_name = result.get("scanner", "unknown")
-            scanner_results[scanner_name] = result
+            scanner_results[result.get("scanner", "unknown")] = result
+        
+        return self._aggregate(url, scanner_results)
+    
+    async def _budgeted(self, name: str, factory: Callable[[], Awaitable[Any]]) -> Optional[Any]:
+        budget = self.budgets.get(name)
+        if budget is None:
+            return await factory()
+        return await budget.run(factory)
+    
+    def _aggregate(self, url: str, scanner_results: Dict[str, Dict[str, Any]]) -> URLScanResult:
+        """Combine per-scanner results (pending entries are ignored) into a verdict."""
+        all_findings = []
+        risk_scores = []
+        malicious_votes = 0
+        
+        for result in scanner_results.values():
+            if result.get("pending"):
+                continue
             risk_scores.append(result.get("risk_score", 0.0))
             all_findings.extend(result.get("findings", []))
             
@@ -447,7 +743,7 @@ class MultiScanner:
         
         is_safe = final_score < 0.4
         
-        scan_result = URLScanResult(
+        return URLScanResult(
             url=url,
             is_safe=is_safe,
             risk_score=final_score,
@@ -455,22 +751,45 @@ class MultiScanner:
             scanner_results=scanner_results,
             scanned_at=datetime.utcnow()
         )
+    
+    async def complete_deferred(
+        self,
+        base: URLScanResult,
+        scanner_name: str,
+        result: Optional[Dict[str, Any]]
+    ) -> URLScanResult:
+        """
+        Fold a finished (or abandoned, result=None) deferred scan into the
+        verdict and refresh the cache.
+        """
+        cache_key = url_cache_key(base.url)
+        current = await self._cache.get(cache_key) or base
         
-        # ── Cache result ──────────────────────────────────────
-        self._cache[cache_key] = scan_result
-        
-        # ── Clean old cache entries ───────────────────────────
-        now = datetime.utcnow()
-        expired = [k for k, v in self._cache.items() if (now - v.scanned_at) > self._cache_ttl]
-        for k in expired:
-            del self._cache[k]
+        scanner_results = dict(current.scanner_results)
+        if result is None:
+            scanner_results.pop(scanner_name, None)
+        else:
+            scanner_results[scanner_name] = result
         
-        return scan_result
+        updated = self._aggregate(base.url, scanner_results)
+        await self._cache.put(cache_key, updated)
+        return updated
     
     async def scan_urls(self, urls: List[str]) -> List[URLScanResult]:
         """Scan multiple URLs in parallel."""
         tasks = [self.scan_url(url) for url in urls]
         return await asyncio.gather(*tasks)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache hit rate, coalescing, provider budgets and external API calls avoided."""
+        return {
+            **self._stats,
+            "inflight": len(self._inflight),
+            "cache": self._cache.get_stats(),
+            "budgets": {name: dict(b.stats) for name, b in self.budgets.items()},
+            "whois": self.get_scanner("whois").get_stats(),
+            "domain_lists": domain_reputation.get_stats(),
+        }
 
 
 # Module-level singleton
@@ -5,7 +5,6 @@ Falls back to existing TTS service if ElevenLabs is unavailable.
 """
 
 import asyncio
-import hashlib
 import io
 import logging
 import os
@@ -15,6 +14,8 @@ from typing import Dict, List, Optional, Any
 import httpx
 
 from config import settings
+from core.rate_limiter import get_rate_limiter, request_with_limit
+from services.tts_cache import tts_cache, tts_cache_key
 
 logger = logging.getLogger("live_takeover.voice_clone")
 
@@ -32,14 +33,18 @@ class VoiceCloneService:
     Falls back to existing TTS if ElevenLabs API key not set.
     """
     
-    ELEVENLABS_BASE_URL = "https://api.elevenlabs.io/v1"
+    ELEVENLABS_BASE_URL = settings.ELEVENLABS_BASE_URL
     
     def __init__(self):
         self.api_key = getattr(settings, 'ELEVENLABS_API_KEY', '')
         self.model_id = getattr(settings, 'ELEVENLABS_MODEL', 'eleven_turbo_v2_5')
         self._available = bool(self.api_key)
+        self.limiter = get_rate_limiter(
+            "elevenlabs",
+            rate_per_minute=getattr(settings, 'ELEVENLABS_RATE_PER_MIN', 120),
+            burst=getattr(settings, 'ELEVENLABS_BURST', 5)
+        )
         self._voice_cache: Dict[str, Dict[str, Any]] = {}  # voice_id -> metadata
-        self._audio_cache: Dict[str, bytes] = {}  # text_hash -> audio bytes
         
         if not self._available:
             logger.warning("ElevenLabs API key not set. Voice cloning disabled. "
@@ -150,12 +155,19 @@ class VoiceCloneService:
         if not self._available:
             return await self._fallback_synthesize(text, session_id)
         
-        # Check cache first
-        cache_key = hashlib.md5(f"{text}:{voice_id}".encode()).hexdigest()
-        if cache_key in self._audio_cache:
+        voice_settings = {
+            "stability": stability,
+            "similarity_boost": similarity_boost,
+            "style": style,
+            "use_speaker_boost": True
+        }
+        
+        # Check cache first (shared with the other TTS services)
+        cache_key = tts_cache_key(text, voice_id, self.model_id, voice_settings)
+        audio_data = await tts_cache.get(cache_key)
+        if audio_data is not None:
             logger.debug("TTS cache hit")
-            audio_data = self._audio_cache[cache_key]
-            audio_path = self._save_audio(audio_data, cache_key, session_id)
+            audio_path = await self._save_audio(audio_data, cache_key[:32], session_id)
             return {
                 "audio_data": audio_data,
                 "audio_path": audio_path,
@@ -168,32 +180,35 @@ class VoiceCloneService:
                 payload = {
                     "text": text,
                     "model_id": self.model_id,
-                    "voice_settings": {
-                        "stability": stability,
-                        "similarity_boost": similarity_boost,
-                        "style": style,
-                        "use_speaker_boost": True
-                    }
+                    "voice_settings": voice_settings
                 }
                 
-                response = await client.post(
-                    f"{self.ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}",
-                    headers={
-                        "xi-api-key": self.api_key,
-                        "Content-Type": "application/json",
-                        "Accept": "audio/mpeg"
-                    },
-                    json=payload
+                response = await request_with_limit(
+                    self.limiter,
+                    lambda: client.post(
+                        f"{self.ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}",
+                        headers={
+                            "xi-api-key": self.api_key,
+                            "Content-Type": "application/json",
+                            "Accept": "audio/mpeg"
+                        },
+                        json=payload
+                    ),
+                    max_wait=5.0
                 )
                 
+                if response is None:
+                    logger.warning("ElevenLabs quota exhausted, using fallback TTS")
+                    return await self._fallback_synthesize(text, session_id)
+                
                 if response.status_code == 200:
                     audio_data = response.content
                     
                     # Cache the result
-                    self._audio_cache[cache_key] = audio_data
+                    await tts_cache.put(cache_key, audio_data, "mp3")
                     
                     # Save to disk
-                    audio_path = self._save_audio(audio_data, cache_key, session_id)
+                    audio_path = await self._save_audio(audio_data, cache_key[:32], session_id)
                     
                     duration = self._estimate_duration(audio_data)
                     
@@ -300,29 +315,29 @@ class VoiceCloneService:
             return result["audio_data"]
         return None
     
-    def _save_audio(
+    async def _save_audio(
         self, 
         audio_data: bytes, 
         filename_base: str, 
         session_id: Optional[str] = None
     ) -> str:
-        """Upload audio bytes to Cloudinary and return secure URL."""
+        """Save audio locally, queue the Cloudinary upload and return the local path."""
+        if session_id:
+            output_dir = CLONE_AUDIO_DIR / session_id
+            output_dir.mkdir(parents=True, exist_ok=True)
+        else:
+            output_dir = CLONE_AUDIO_DIR
+        filepath = output_dir / f"clone_{filename_base}.mp3"
+        await asyncio.to_thread(filepath.write_bytes, audio_data)
+        
         try:
-            from services.cloudinary_service import cloudinary_service, FOLDER_AUDIO_SYNTHESIZED
-            filename = f"clone_{filename_base}.mp3"
+            from services.cloudinary_service import FOLDER_AUDIO_SYNTHESIZED
+            from services.upload_queue import upload_queue
             folder = f"{FOLDER_AUDIO_SYNTHESIZED}/{session_id}" if session_id else FOLDER_AUDIO_SYNTHESIZED
-            return cloudinary_service.upload_audio(audio_data, filename, folder=folder)
+            await upload_queue.enqueue(str(filepath), folder=folder)
         except Exception as e:
-            logger.error(f"Cloudinary upload failed, falling back to local: {e}")
-            # Fallback: save locally so the call doesn't break
-            if session_id:
-                output_dir = CLONE_AUDIO_DIR / session_id
-                output_dir.mkdir(parents=True, exist_ok=True)
-            else:
-                output_dir = CLONE_AUDIO_DIR
-            filepath = output_dir / f"clone_{filename_base}.mp3"
-            filepath.write_bytes(audio_data)
-            return str(filepath)
+            logger.error(f"Could not queue clone audio upload: {e}")
+        return str(filepath)
     
     def _estimate_duration(self, audio_data: bytes) -> float:
         """Estimate audio duration from MP3 data."""
@@ -369,9 +384,9 @@ class VoiceCloneService:
             return None
     
     def clear_cache(self):
-        """Clear the audio cache."""
-        self._audio_cache.clear()
-        logger.info("Voice clone audio cache cleared")
+        """Clear the in-memory tier of the shared TTS cache."""
+        tts_cache.clear_memory()
+        logger.info("TTS audio memory cache cleared")
 
 
 # Module-level singleton
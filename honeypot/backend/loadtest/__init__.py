@@ -0,0 +1,11 @@
+"""
+Load Test
+Drives a running backend over its public interfaces: /api/message chat
+sessions, /api/live/connect takeover sockets, /api/call/connect operator /
+scammer pairs and Socket.IO WebRTC rooms, at a chosen concurrency with audio
+paced in real time. Writes a JSON report (client latency percentiles,
+throughput, errors, server CPU / memory from /metrics) that `compare` diffs.
+
+    python -m loadtest run -s chat:20 -s live:4 --duration 120 --out before.json
+    python -m loadtest compare before.json after.json
+"""
@@ -0,0 +1,206 @@
+"""
+Load Test CLI
+`run` drives a backend and writes a JSON report; `compare` diffs two reports
+and exits non-zero on regressions with --fail-on-regression.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from loadtest.audio import AudioSource
+from loadtest.scenarios import SCENARIOS, RunContext, virtual_user
+from loadtest.stats import Recorder, ServerSampler, compare
+
+logger = logging.getLogger("loadtest")
+
+
+def _scenario(value: str) -> Tuple[str, int]:
+    name, _, count = value.partition(":")
+    if name not in SCENARIOS:
+        raise argparse.ArgumentTypeError(f"unknown scenario {name!r} (choose from {', '.join(SCENARIOS)})")
+    try:
+        return name, int(count or 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad concurrency in {value!r}")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    recorder = Recorder()
+    audio = AudioSource.from_args(args.audio, args.chunk_ms, args.utterance)
+    scenarios: List[Tuple[str, int]] = args.scenario or [("chat", 1)]
+    headers = {"x-api-key": args.api_key} if args.api_key else {}
+    started_at = datetime.now(timezone.utc).isoformat()
+
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=100)
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, timeout=args.reply_timeout,
+                                 limits=limits) as http:
+        start = time.monotonic()
+        ctx = RunContext(
+            http=http,
+            base_url=args.url.rstrip("/"),
+            api_key=args.api_key,
+            recorder=recorder,
+            audio=audio,
+            run_id=uuid.uuid4().hex[:6],
+            deadline=start + args.ramp + args.duration,
+            speed=args.speed,
+            turns=args.turns,
+            think_s=args.think,
+            buffer_ms=args.buffer_ms,
+            reply_timeout_s=args.reply_timeout,
+            live_mode=args.live_mode,
+            webrtc_ai=args.webrtc_ai,
+        )
+
+        stop = asyncio.Event()
+        sampler = ServerSampler(http, args.scrape_interval)
+        sampling = asyncio.create_task(sampler.run(stop))
+
+        users = [
+            asyncio.create_task(virtual_user(ctx, name, vu, args.ramp * vu / count))
+            for name, count in scenarios
+            for vu in range(count)
+        ]
+        logger.info(f"▶️  {len(users)} virtual users for {args.duration:.0f}s "
+                    f"({', '.join(f'{n}×{c}' for n, c in scenarios)}) against {args.url}")
+
+        # Sessions in flight at the deadline get reply_timeout to finish
+        _, pending = await asyncio.wait(users, timeout=args.ramp + args.duration + args.reply_timeout)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*users, return_exceptions=True)
+        elapsed = time.monotonic() - start
+
+        stop.set()
+        await sampling
+
+    return {
+        "label": args.label,
+        "started_at": started_at,
+        "git_commit": _git_commit(),
+        "config": {
+            "url": args.url,
+            "scenarios": dict(scenarios),
+            "duration_s": args.duration,
+            "ramp_s": args.ramp,
+            "speed": args.speed,
+            "turns": args.turns,
+            "think_s": args.think,
+            "audio": args.audio or "synthetic",
+            "chunk_ms": args.chunk_ms,
+            "utterance_s": args.utterance,
+            "buffer_ms": args.buffer_ms,
+            "live_mode": args.live_mode,
+            "webrtc_ai": args.webrtc_ai,
+        },
+        "elapsed_s": round(elapsed, 2),
+        "operations": recorder.report(elapsed),
+        "server": sampler.report(),
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n{'operation':22} {'count':>6} {'err%':>6} {'/s':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for op, s in report["operations"].items():
+        cells = [f"{s[k]:8.0f}" if s[k] is not None else f"{'-':>8}" for k in ("p50_ms", "p95_ms", "p99_ms")]
+        print(f"{op:22} {s['count']:6d} {s['error_rate'] * 100:6.1f} {s['throughput_per_s']:7.2f} {' '.join(cells)}")
+    server = report["server"]
+    if server.get("available"):
+        p = server["process"]
+        print(f"\nserver: cpu {p['cpu_percent']}%  rss max {p['rss_mb_max']} MB  "
+              f"fds max {p['open_fds_max']}  tasks max {p['asyncio_tasks_max']}  "
+              f"llm cost ${server['llm_cost_usd']}")
+    else:
+        print("\nserver: /metrics unavailable")
+
+
+def print_comparison(result: Dict[str, Any]):
+    print(f"{'metric':60} {'base':>10} {'new':>10} {'change':>8}")
+    for path, change in result["changes"].items():
+        flag = "  ⚠️" if path in result["regressions"] else ""
+        pct = f"{change['change']:+.0%}" if change["change"] is not None else "-"
+        print(f"{path:60} {change['base']!s:>10} {change['new']!s:>10} {pct:>8}{flag}")
+    print(f"\n{len(result['regressions'])} regression(s)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description=__doc__.strip().splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    r = commands.add_parser("run", help="Generate load and write a JSON report")
+    r.add_argument("--url", default="http://localhost:8000", help="Backend base URL")
+    r.add_argument("--api-key", default=os.environ.get("API_SECRET_KEY", ""),
+                   help="x-api-key value (default: $API_SECRET_KEY)")
+    r.add_argument("-s", "--scenario", action="append", type=_scenario, metavar="NAME[:N]",
+                   help=f"Scenario and virtual-user count, repeatable ({', '.join(SCENARIOS)}); default chat:1")
+    r.add_argument("--duration", type=float, default=60.0, help="Seconds of steady load after ramp-up")
+    r.add_argument("--ramp", type=float, default=5.0, help="Seconds over which virtual users start")
+    r.add_argument("--speed", type=float, default=1.0, help="Audio / think-time pacing (2 = twice real time)")
+    r.add_argument("--turns", type=int, default=6, help="Messages or utterances per session")
+    r.add_argument("--think", type=float, default=2.0, help="Mean pause between turns, seconds")
+    r.add_argument("--audio", help="Recording to stream (any format pydub reads); default synthetic")
+    r.add_argument("--chunk-ms", type=int, default=250, help="Audio chunk size, like MediaRecorder timeslice")
+    r.add_argument("--utterance", type=float, default=3.0, help="Seconds of audio per scammer turn")
+    r.add_argument("--buffer-ms", type=float, default=2500.0,
+                   help="Server transcription buffer (StreamingTranscriber threshold)")
+    r.add_argument("--reply-timeout", type=float, default=30.0, help="Per-request / per-turn timeout")
+    r.add_argument("--live-mode", default="ai_takeover", choices=("ai_takeover", "ai_coached"))
+    r.add_argument("--webrtc-ai", action="store_true", help="Put WebRTC rooms in ai_only mode")
+    r.add_argument("--scrape-interval", type=float, default=2.0, help="Seconds between /metrics scrapes")
+    r.add_argument("--label", default="", help="Free-form run label stored in the report")
+    r.add_argument("--out", help="Report path (default loadtest-<timestamp>.json)")
+    r.add_argument("-v", "--verbose", action="store_true")
+
+    c = commands.add_parser("compare", help="Diff two reports")
+    c.add_argument("base")
+    c.add_argument("new")
+    c.add_argument("--threshold", type=float, default=0.10,
+                   help="Relative increase counted as a regression (default 0.10)")
+    c.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if anything regressed")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        result = compare(base, new, args.threshold)
+        print_comparison(result)
+        return 1 if args.fail_on_regression and result["regressions"] else 0
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(levelname)s:%(name)s:%(message)s")
+    if not args.verbose:
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    report = asyncio.run(run(args))
+    out = args.out or f"loadtest-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report)
+    print(f"\n📄 Report written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
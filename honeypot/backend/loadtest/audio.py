@@ -0,0 +1,114 @@
+"""
+Load Test Audio
+Splits a recording (or a generated speech-like signal) into self-contained
+WAV chunks, 16 kHz mono 16-bit like the browser pipeline sends after
+AudioNormalizer, and streams them at real time (or `speed` times faster).
+"""
+
+import asyncio
+import io
+import time
+import wave
+from dataclasses import dataclass
+from typing import AsyncIterator, List, Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+SAMPLE_WIDTH = 2
+
+
+@dataclass
+class AudioChunk:
+    data: bytes             # complete WAV file
+    duration_s: float
+    last_in_utterance: bool
+
+
+def _wav(pcm: bytes) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as out:
+        out.setnchannels(1)
+        out.setsampwidth(SAMPLE_WIDTH)
+        out.setframerate(SAMPLE_RATE)
+        out.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def load_pcm(path: str) -> bytes:
+    """Any recording pydub can read (WAV natively, others via ffmpeg) → 16 kHz mono 16-bit."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(path)
+    return audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(SAMPLE_WIDTH).raw_data
+
+
+def synth_pcm(seconds: float, seed: int = 0) -> bytes:
+    """
+    Voiced-sounding test signal: a wandering 110-220 Hz tone with harmonics,
+    syllable-rate amplitude modulation and short pauses. Deterministic per seed.
+    """
+    rng = np.random.default_rng(seed)
+    n = int(seconds * SAMPLE_RATE)
+    steps = n // 800 + 1                                    # pitch moves every 50 ms
+    pitch = np.clip(160 + np.cumsum(rng.uniform(-15, 15, steps)), 110, 220)
+    phase = np.cumsum(2 * np.pi * np.repeat(pitch, 800)[:n] / SAMPLE_RATE)
+    i = np.arange(n)
+    envelope = np.abs(np.sin(np.pi * (i % 3200) / 3200))     # 200 ms syllables
+    envelope[(i // 3200) % 9 == 8] = 0.0                     # and a pause every ~1.8 s
+    value = np.sin(phase) + 0.5 * np.sin(2 * phase) + 0.25 * np.sin(3 * phase)
+    return (envelope * value * 9000).astype("<i2").tobytes()
+
+
+class AudioSource:
+    """
+    A fixed PCM clip cut into utterances of `utterance_s`, each sent as
+    `chunk_ms` WAV chunks. Sessions loop over the clip from a per-session offset.
+    """
+
+    def __init__(self, pcm: bytes, chunk_ms: int = 250, utterance_s: float = 3.0):
+        self.pcm = pcm
+        self.chunk_bytes = int(SAMPLE_RATE * chunk_ms / 1000) * SAMPLE_WIDTH
+        self.utterance_chunks = max(1, round(utterance_s * 1000 / chunk_ms))
+        self._chunks: List[bytes] = [
+            _wav(pcm[i:i + self.chunk_bytes])
+            for i in range(0, len(pcm) - self.chunk_bytes + 1, self.chunk_bytes)
+        ]
+        if not self._chunks:
+            raise ValueError("Audio shorter than one chunk")
+
+    @classmethod
+    def from_args(cls, path: Optional[str], chunk_ms: int, utterance_s: float) -> "AudioSource":
+        pcm = load_pcm(path) if path else synth_pcm(30.0)
+        return cls(pcm, chunk_ms, utterance_s)
+
+    @property
+    def chunk_s(self) -> float:
+        return self.chunk_bytes / SAMPLE_WIDTH / SAMPLE_RATE
+
+    def utterance(self, index: int) -> List[AudioChunk]:
+        """The index-th utterance (wrapping around the clip)."""
+        start = index * self.utterance_chunks
+        return [
+            AudioChunk(
+                self._chunks[(start + i) % len(self._chunks)],
+                self.chunk_s,
+                i == self.utterance_chunks - 1
+            )
+            for i in range(self.utterance_chunks)
+        ]
+
+
+async def paced(chunks: List[AudioChunk], speed: float = 1.0) -> AsyncIterator[Tuple[AudioChunk, float]]:
+    """
+    Yield chunks on the clock a microphone would produce them (each after its
+    audio has "happened"), compressed by `speed`. Yields (chunk, send time).
+    """
+    start = time.monotonic()
+    elapsed_audio = 0.0
+    for chunk in chunks:
+        elapsed_audio += chunk.duration_s
+        delay = start + elapsed_audio / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield chunk, time.monotonic()
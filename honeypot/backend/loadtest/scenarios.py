@@ -0,0 +1,336 @@
+"""
+Load Test Scenarios
+One coroutine per virtual-user session for each interface: chat over
+/api/message, live takeover over /api/live/connect, two-party calls over
+/api/call/connect and WebRTC rooms over Socket.IO. Audio latencies are timed
+from the chunk that filled the server's transcription buffer.
+"""
+
+import asyncio
+import base64
+import json
+import logging
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+import httpx
+import socketio
+import websockets
+
+from loadtest.audio import AudioSource, paced
+from loadtest.stats import Recorder
+
+logger = logging.getLogger("loadtest.scenarios")
+
+SCAM_LINES = [
+    "Hello sir, I am calling from SBI head office, your KYC is pending.",
+    "Your account will be blocked today if you don't update the details.",
+    "Please share the OTP you just received so I can verify your identity.",
+    "Sir it is urgent, send Rs 10 to this UPI id verify.kyc@oksbi to reactivate.",
+    "Click the link http://sbi-kyc-update.in/verify and enter your card number.",
+    "I am a senior officer, badge number 4471, you can trust me completely.",
+    "If you don't cooperate the police will come to your house this evening.",
+    "Just tell me the last four digits and the expiry date of your card.",
+]
+
+
+@dataclass
+class RunContext:
+    http: httpx.AsyncClient
+    base_url: str
+    api_key: str
+    recorder: Recorder
+    audio: AudioSource
+    run_id: str
+    deadline: float
+    speed: float = 1.0
+    turns: int = 6
+    think_s: float = 2.0
+    buffer_ms: float = 2500.0
+    reply_timeout_s: float = 30.0
+    live_mode: str = "ai_takeover"
+    webrtc_ai: bool = False
+
+    @property
+    def ws_url(self) -> str:
+        return "ws" + self.base_url[len("http"):]
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.deadline
+
+    async def think(self):
+        """Pause between turns: think_s ±50%, compressed by speed like the audio."""
+        if self.think_s > 0:
+            await asyncio.sleep(self.think_s * random.uniform(0.5, 1.5) / self.speed)
+
+    async def post(self, op: str, path: str, body: Optional[dict] = None) -> Dict[str, Any]:
+        with self.recorder.measure(op):
+            response = await self.http.post(path, json=body or {})
+            response.raise_for_status()
+        return response.json()
+
+
+class TurnTracker:
+    """
+    Times server events against the audio that caused them.
+
+    The server transcribes once `buffer_ms` of audio is buffered, so each
+    chunk that crosses a multiple of it starts a turn. The next scammer
+    transcription closes that turn's STT wait (`<prefix>.stt`), and the first
+    event of each reply kind after it is timed from the same start
+    (`<prefix>.<kind>`). Turns with no transcription within `timeout_s`
+    count as `no_transcription` errors.
+    """
+
+    def __init__(self, recorder: Recorder, prefix: str, buffer_ms: float, timeout_s: float):
+        self.recorder = recorder
+        self.prefix = prefix
+        self.buffer_s = buffer_ms / 1000
+        self.timeout_s = timeout_s
+        self._buffered_s = 0.0
+        self._pending: Deque[float] = deque()
+        self._turn_start: Optional[float] = None
+        self._replied: set = set()
+
+    def sent(self, duration_s: float, at: float):
+        self._buffered_s += duration_s
+        if self._buffered_s >= self.buffer_s - 1e-6:
+            self._buffered_s = 0.0
+            self._pending.append(at)
+
+    def transcription(self):
+        now = time.monotonic()
+        self._expire(now)
+        if not self._pending:
+            return                  # flush of a partial buffer; not a timed turn
+        start = self._pending.popleft()
+        self.recorder.record(f"{self.prefix}.stt", now - start)
+        self._turn_start, self._replied = start, set()
+
+    def reply(self, kind: str):
+        if self._turn_start is None or kind in self._replied:
+            return
+        self._replied.add(kind)
+        self.recorder.record(f"{self.prefix}.{kind}", time.monotonic() - self._turn_start)
+
+    def _expire(self, now: float):
+        while self._pending and now - self._pending[0] > self.timeout_s:
+            self._pending.popleft()
+            self.recorder.record(f"{self.prefix}.stt", error="no_transcription")
+
+    async def drain(self):
+        """Wait (up to timeout_s) for the transcriptions still owed, then expire the rest."""
+        give_up = time.monotonic() + self.timeout_s
+        while self._pending and time.monotonic() < give_up:
+            await asyncio.sleep(0.1)
+        self._expire(float("inf"))
+
+
+def _b64(data: bytes) -> str:
+    return base64.b64encode(data).decode()
+
+
+async def _read_ws(ws, handle: Callable[[Dict[str, Any]], None]):
+    async for raw in ws:
+        try:
+            message = json.loads(raw)
+        except (TypeError, ValueError):
+            continue
+        handle(message)
+
+
+# ── Chat ──────────────────────────────────────────────────────
+
+async def chat_session(ctx: RunContext, vu: int, n: int):
+    """One scammer conversation of ctx.turns messages over POST /api/message."""
+    session_id = f"loadtest-{ctx.run_id}-{vu}-{n}"
+    history: List[Dict[str, Any]] = []
+    for turn in range(ctx.turns):
+        if ctx.expired:
+            break
+        text = SCAM_LINES[(vu + turn) % len(SCAM_LINES)]
+        timestamp = int(time.time() * 1000)
+        data = await ctx.post("chat.message", "/api/message", {
+            "sessionId": session_id,
+            "message": {"sender": "scammer", "text": text, "timestamp": timestamp},
+            "conversationHistory": list(history),
+            "metadata": {"channel": "loadtest"},
+        })
+        if not data.get("reply"):
+            ctx.recorder.record("chat.reply", error="empty_reply")
+        history.append({"sender": "scammer", "text": text, "timestamp": timestamp})
+        history.append({"sender": "user", "text": data.get("reply") or "", "timestamp": timestamp})
+        await ctx.think()
+
+
+# ── Live takeover ─────────────────────────────────────────────
+
+async def live_session(ctx: RunContext, vu: int, n: int):
+    """Start a takeover session and stream ctx.turns utterances into its WebSocket."""
+    data = await ctx.post("live.start", "/api/live/start", {"mode": ctx.live_mode})
+    session_id = data["session_id"]
+    tracker = TurnTracker(ctx.recorder, "live", ctx.buffer_ms, ctx.reply_timeout_s)
+
+    def handle(message: Dict[str, Any]):
+        kind = message.get("type")
+        if kind == "transcription":
+            tracker.transcription()
+        elif kind in ("ai_response", "coaching_scripts"):
+            tracker.reply("reply")
+        elif kind == "threat_update":
+            tracker.reply("threat_update")
+        elif kind == "error":
+            ctx.recorder.record("live.server_error", error="error")
+
+    try:
+        with ctx.recorder.measure("live.connect"):
+            ws = await websockets.connect(f"{ctx.ws_url}/api/live/connect/{session_id}", max_size=None)
+            first = json.loads(await asyncio.wait_for(ws.recv(), timeout=ctx.reply_timeout_s))
+            if first.get("type") != "connected":
+                await ws.close()
+                raise ConnectionError(f"unexpected first message {first.get('type')}")
+        async with ws:
+            reader = asyncio.create_task(_read_ws(ws, handle))
+            try:
+                for turn in range(ctx.turns):
+                    if ctx.expired:
+                        break
+                    async for chunk, at in paced(ctx.audio.utterance(vu * ctx.turns + turn), ctx.speed):
+                        await ws.send(json.dumps({
+                            "type": "audio_chunk", "data": _b64(chunk.data), "format": "wav"
+                        }))
+                        tracker.sent(chunk.duration_s, at)
+                    await ctx.think()
+                await tracker.drain()
+            finally:
+                reader.cancel()
+                await asyncio.gather(reader, return_exceptions=True)
+    finally:
+        await ctx.post("live.end", f"/api/live/end/{session_id}")
+
+
+# ── Live call (operator + scammer WebSockets) ─────────────────
+
+async def call_session(ctx: RunContext, vu: int, n: int):
+    """Open an operator / scammer pair on /api/call/connect; the scammer streams audio."""
+    data = await ctx.post("call.start", "/api/call/start", {"operator_name": f"loadtest-{vu}"})
+    call_id = data["call_id"]
+    tracker = TurnTracker(ctx.recorder, "call", ctx.buffer_ms, ctx.reply_timeout_s)
+
+    def handle(message: Dict[str, Any]):
+        kind = message.get("type")
+        if kind == "transcription" and message.get("speaker") == "scammer":
+            tracker.transcription()
+        elif kind == "ai_coaching":
+            tracker.reply("coaching")
+        elif kind == "intelligence_update":
+            tracker.reply("intelligence")
+        elif kind == "error":
+            ctx.recorder.record("call.server_error", error="error")
+
+    url = f"{ctx.ws_url}/api/call/connect?call_id={call_id}&role="
+    try:
+        with ctx.recorder.measure("call.connect"):
+            operator = await websockets.connect(url + "operator", max_size=None)
+            scammer = await websockets.connect(url + "scammer", max_size=None)
+        async with operator, scammer:
+            readers = [
+                asyncio.create_task(_read_ws(operator, handle)),
+                asyncio.create_task(_read_ws(scammer, lambda message: None)),
+            ]
+            try:
+                for turn in range(ctx.turns):
+                    if ctx.expired:
+                        break
+                    async for chunk, at in paced(ctx.audio.utterance(vu * ctx.turns + turn), ctx.speed):
+                        await scammer.send(json.dumps({
+                            "type": "audio_chunk", "audio": _b64(chunk.data), "format": "wav"
+                        }))
+                        tracker.sent(chunk.duration_s, at)
+                    await ctx.think()
+                await tracker.drain()
+            finally:
+                for reader in readers:
+                    reader.cancel()
+                await asyncio.gather(*readers, return_exceptions=True)
+    finally:
+        await ctx.post("call.end", f"/api/call/end/{call_id}")
+
+
+# ── WebRTC room (Socket.IO) ───────────────────────────────────
+
+async def _join(ctx: RunContext, client: socketio.AsyncClient, room_id: str, role: str):
+    joined = asyncio.get_running_loop().create_future()
+    client.on("joined_room", lambda data: joined.done() or joined.set_result(data))
+    await client.connect(ctx.base_url, transports=["websocket"], socketio_path="socket.io")
+    await client.emit("join_room", {"room_id": room_id, "role": role})
+    await asyncio.wait_for(joined, timeout=ctx.reply_timeout_s)
+
+
+async def webrtc_session(ctx: RunContext, vu: int, n: int):
+    """Join a room as operator and scammer; the scammer emits transcription_chunk audio."""
+    data = await ctx.post("webrtc.create", "/api/webrtc/room/create", {"operator_name": f"loadtest-{vu}"})
+    room_id = data["room_id"]
+    tracker = TurnTracker(ctx.recorder, "webrtc", ctx.buffer_ms, ctx.reply_timeout_s)
+    operator, scammer = socketio.AsyncClient(), socketio.AsyncClient()
+
+    @operator.on("transcription")
+    def on_transcription(data):
+        if data.get("speaker") == "scammer":
+            tracker.transcription()
+
+    operator.on("ai_coaching", lambda data: tracker.reply("coaching"))
+    operator.on("audio_response", lambda data: tracker.reply("first_audio"))
+    operator.on("ai_error", lambda data: ctx.recorder.record("webrtc.server_error", error="ai_error"))
+
+    try:
+        with ctx.recorder.measure("webrtc.connect"):
+            await _join(ctx, operator, room_id, "operator")
+            await _join(ctx, scammer, room_id, "scammer")
+        if ctx.webrtc_ai:
+            await operator.emit("set_ai_mode", {"room_id": room_id, "mode": "ai_only"})
+
+        for turn in range(ctx.turns):
+            if ctx.expired:
+                break
+            async for chunk, at in paced(ctx.audio.utterance(vu * ctx.turns + turn), ctx.speed):
+                await scammer.emit("transcription_chunk", {
+                    "audio": _b64(chunk.data), "format": "wav", "speaker": "scammer", "room_id": room_id
+                })
+                tracker.sent(chunk.duration_s, at)
+            await ctx.think()
+        await tracker.drain()
+    finally:
+        try:
+            await ctx.post("webrtc.end", f"/api/webrtc/room/{room_id}/end")
+        finally:
+            await asyncio.gather(operator.disconnect(), scammer.disconnect(), return_exceptions=True)
+
+
+SCENARIOS: Dict[str, Callable[[RunContext, int, int], Awaitable[None]]] = {
+    "chat": chat_session,
+    "live": live_session,
+    "call": call_session,
+    "webrtc": webrtc_session,
+}
+
+
+async def virtual_user(ctx: RunContext, scenario: str, vu: int, ramp_s: float):
+    """Run back-to-back sessions of one scenario until the deadline."""
+    await asyncio.sleep(ramp_s)
+    session = SCENARIOS[scenario]
+    n = 0
+    while not ctx.expired:
+        try:
+            with ctx.recorder.measure(f"{scenario}.session"):
+                await session(ctx, vu, n)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.debug(f"{scenario} vu={vu} session {n} failed: {e!r}")
+            await asyncio.sleep(1.0)        # don't hot-loop against a down server
+        n += 1
@@ -0,0 +1,249 @@
+"""
+Load Test Stats
+Client-side latency / error recording per operation, and a /metrics scraper
+that samples the server's process gauges during the run and diffs its
+pipeline and LLM counters between the first and last scrape.
+"""
+
+import asyncio
+import math
+import re
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+SampleKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile of already sorted values."""
+    if not values:
+        return None
+    pos = (len(values) - 1) * q
+    low, high = math.floor(pos), math.ceil(pos)
+    return values[low] + (values[high] - values[low]) * (pos - low)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+class Recorder:
+    """Latencies and errors per operation ("chat.message", "live.reply", ...)."""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self._latencies: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, op: str, latency_s: Optional[float] = None, error: Optional[str] = None):
+        if error:
+            self._errors[op][error] += 1
+        elif latency_s is not None:
+            self._latencies[op].append(latency_s)
+
+    @contextmanager
+    def measure(self, op: str) -> Iterator[None]:
+        """Time the block; an exception counts as an error of its type and propagates."""
+        start = time.monotonic()
+        try:
+            yield
+        except Exception as e:
+            self.record(op, error=_error_kind(e))
+            raise
+        self.record(op, time.monotonic() - start)
+
+    def report(self, elapsed_s: float) -> Dict[str, Any]:
+        ops = {}
+        for op in sorted(set(self._latencies) | set(self._errors)):
+            values = sorted(self._latencies.get(op, ()))
+            errors = self._errors.get(op, Counter())
+            total = len(values) + sum(errors.values())
+            ops[op] = {
+                "count": len(values),
+                "errors": sum(errors.values()),
+                "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+                "error_kinds": dict(errors),
+                "throughput_per_s": round(len(values) / elapsed_s, 3) if elapsed_s else 0.0,
+                "mean_ms": _ms(sum(values) / len(values)) if values else None,
+                **{f"p{int(q * 100)}_ms": _ms(percentile(values, q)) for q in PERCENTILES},
+                "max_ms": _ms(values[-1]) if values else None,
+            }
+        return ops
+
+
+def _error_kind(e: BaseException) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"http_{e.response.status_code}"
+    if isinstance(e, asyncio.TimeoutError):
+        return "timeout"
+    return type(e).__name__
+
+
+# ── Server side ───────────────────────────────────────────────
+
+def parse_metrics(text: str) -> Dict[SampleKey, float]:
+    """Prometheus text format → {(name, sorted labels): value}."""
+    samples: Dict[SampleKey, float] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        match = _SAMPLE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        try:
+            parsed = float(value)
+        except ValueError:
+            continue
+        key = tuple(sorted(_LABEL.findall(labels or "")))
+        samples[(name, key)] = parsed
+    return samples
+
+
+def _series(samples: Dict[SampleKey, float], name: str) -> Dict[Tuple[Tuple[str, str], ...], float]:
+    return {labels: value for (metric, labels), value in samples.items() if metric == name}
+
+
+def _label_str(labels: Tuple[Tuple[str, str], ...], *names: str) -> str:
+    values = dict(labels)
+    return "/".join(values.get(name, "") for name in names)
+
+
+class ServerSampler:
+    """Scrapes GET /metrics every `interval_s` while the load runs."""
+
+    def __init__(self, client: httpx.AsyncClient, interval_s: float = 2.0):
+        self.client = client
+        self.interval_s = interval_s
+        self.scrapes: List[Tuple[float, Dict[SampleKey, float]]] = []
+        self.failures = 0
+
+    async def scrape(self):
+        try:
+            response = await self.client.get("/metrics")
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.failures += 1
+            return
+        self.scrapes.append((time.monotonic(), parse_metrics(response.text)))
+
+    async def run(self, stop: asyncio.Event):
+        while not stop.is_set():
+            await self.scrape()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+        await self.scrape()
+
+    def report(self) -> Dict[str, Any]:
+        if len(self.scrapes) < 2:
+            return {"available": False, "scrape_failures": self.failures}
+        (t0, first), (t1, last) = self.scrapes[0], self.scrapes[-1]
+        wall = t1 - t0
+
+        def gauge(name: str) -> List[float]:
+            return [v for _, s in self.scrapes for (n, _), v in s.items() if n == name]
+
+        def delta(name: str, *label_names: str) -> Dict[str, float]:
+            before = _series(first, name)
+            out: Dict[str, float] = defaultdict(float)
+            for labels, value in _series(last, name).items():
+                out[_label_str(labels, *label_names)] += value - before.get(labels, 0.0)
+            return {k: round(v, 6) for k, v in sorted(out.items()) if v}
+
+        def mean_latency(name: str, *label_names: str) -> Dict[str, Dict[str, Any]]:
+            sums, counts = delta(f"{name}_sum", *label_names), delta(f"{name}_count", *label_names)
+            return {
+                key: {"count": int(count), "mean_ms": round(sums.get(key, 0.0) / count * 1000, 1)}
+                for key, count in counts.items()
+            }
+
+        rss = gauge("process_resident_memory_bytes")
+        cpu = delta("process_cpu_seconds_total")
+        cpu_s = next(iter(cpu.values()), 0.0)
+        connections: Dict[str, float] = defaultdict(float)
+        for _, samples in self.scrapes:
+            for labels, value in _series(samples, "live_active_connections").items():
+                key = _label_str(labels, "pipeline")
+                connections[key] = max(connections[key], value)
+
+        return {
+            "available": True,
+            "scrapes": len(self.scrapes),
+            "scrape_failures": self.failures,
+            "process": {
+                "cpu_seconds": round(cpu_s, 3),
+                "cpu_percent": round(cpu_s / wall * 100, 1) if wall else None,
+                "rss_mb_mean": round(sum(rss) / len(rss) / 2**20, 1) if rss else None,
+                "rss_mb_max": round(max(rss) / 2**20, 1) if rss else None,
+                "open_fds_max": max(gauge("process_open_fds"), default=None),
+                "threads_max": max(gauge("process_threads"), default=None),
+                "asyncio_tasks_max": max(gauge("process_asyncio_tasks"), default=None),
+            },
+            "live_connections_max": dict(connections),
+            "pipeline_turns": mean_latency("pipeline_turn_duration_seconds", "pipeline"),
+            "pipeline_stages": mean_latency("pipeline_stage_duration_seconds", "pipeline", "stage"),
+            "pipeline_stage_errors": delta("pipeline_stage_errors_total", "pipeline", "stage"),
+            "llm_requests": delta("llm_requests_total", "node", "outcome"),
+            "llm_latency": mean_latency("llm_request_duration_seconds", "node"),
+            "llm_tokens": delta("llm_tokens_total", "kind"),
+            "llm_cost_usd": round(sum(delta("llm_cost_usd_total", "node").values()), 6),
+        }
+
+
+# ── Comparison ────────────────────────────────────────────────
+
+# Metrics where a higher value is a regression; everything else numeric is informational
+_WORSE_WHEN_HIGHER = re.compile(r"(_ms|error_rate|cpu_seconds|cpu_percent|rss_mb_\w+|cost_usd)$")
+
+
+def _flatten(data: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    if isinstance(data, dict):
+        for key, value in data.items():
+            yield from _flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(data, (int, float)) and not isinstance(data, bool):
+        yield prefix, float(data)
+
+
+def compare(
+    base: Dict[str, Any],
+    new: Dict[str, Any],
+    threshold: float = 0.10,
+    sections: Tuple[str, ...] = ("operations", "server")
+) -> Dict[str, Any]:
+    """
+    Diff two run reports.
+
+    Args:
+        base: Report of the reference run
+        new: Report of the candidate run
+        threshold: Relative increase of a latency / error / resource figure
+            counted as a regression
+        sections: Top-level report keys to compare
+
+    Returns:
+        {"changes": {path: {base, new, change}}, "regressions": [path, ...]}
+    """
+    before = dict(_flatten({k: base.get(k) for k in sections}))
+    after = dict(_flatten({k: new.get(k) for k in sections}))
+    changes, regressions = {}, []
+    for path in sorted(set(before) | set(after)):
+        old, cur = before.get(path), after.get(path)
+        if old == cur:
+            continue
+        change = round((cur - old) / old, 4) if old and cur is not None else None
+        changes[path] = {"base": old, "new": cur, "change": change}
+        if _WORSE_WHEN_HIGHER.search(path) and old is not None and cur is not None:
+            if cur > old and (change is None or change > threshold):
+                regressions.append(path)
+    return {"changes": changes, "regressions": regressions}
@@ -1,5 +1,5 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
@@ -9,14 +9,17 @@ from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from config import settings
+from core.tracing import CorrelationLogFilter
 from db.mongo import MongoDB
 # Import routers (will be created in next stages)
 from api import message, sessions, voice
 from api import live_takeover, voice_clone, live_call, webrtc_signaling, sms_evidence
-from api import auth_routes, testing, elevenlabs_routes
+from api import auth_routes, testing, elevenlabs_routes, exports
 
 # Configure Logging
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(name)s:%(message)s%(trace)s", force=True)
+for _handler in logging.getLogger().handlers:
+    _handler.addFilter(CorrelationLogFilter())     # live pipeline logs carry [call/turn]
 logger = logging.getLogger("api")
 
 # --- Rate Limiter ---
@@ -35,14 +38,70 @@ except Exception:
     )
     logger.warning("Rate limiter using in-memory storage (Redis unavailable)")
 
+def register_component_metrics():
+    """Export process usage and each component's get_stats() on /metrics."""
+    from core.call_recorder import call_recorder
+    from core.metrics import metrics
+    from core.rate_limiter import get_rate_limiter_stats
+    from core.tracing import tracer
+    from agents.chains import chain_registry
+    from agents.llm_router import llm_router
+    from agents.llm_scheduler import llm_scheduler
+    from agents.llm_usage import llm_usage
+    from agents.memory import agent_memory
+    from features.live_takeover.phrase_bank import phrase_bank
+    from features.live_takeover.report_store import report_store
+    from features.live_takeover.url_scan_queue import url_scan_queue
+    from features.live_takeover.url_scanner import url_scanner
+    from services.piper_pool import piper_pool
+    from services.tts_cache import tts_cache
+    from services.upload_queue import upload_queue
+
+    for component, get_stats in {
+        "url_scanner": url_scanner.get_stats,
+        "url_scan_queue": url_scan_queue.get_stats,
+        "rate_limits": get_rate_limiter_stats,
+        "report_store": report_store.get_stats,
+        "upload_queue": upload_queue.get_stats,
+        "tts_cache": tts_cache.get_stats,
+        "piper_pool": piper_pool.get_stats,
+        "phrase_bank": phrase_bank.get_stats,
+        "agent_memory": agent_memory.get_stats,
+        "chains": chain_registry.get_stats,
+        "llm_router": llm_router.get_stats,
+        "llm_scheduler": llm_scheduler.get_stats,
+        "llm_usage": llm_usage.get_stats,
+        "tracing": tracer.get_stats,
+        "call_recorder": call_recorder.get_stats,
+    }.items():
+        metrics.register_stats(component, get_stats)
+    metrics.register_process()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting Agentic Honey-Pot...")
     await MongoDB.connect()
+    from services.upload_queue import upload_queue
+    await upload_queue.resume()
+    from features.live_takeover.phrase_bank import phrase_bank
+    phrase_bank.start()
+    from services.tts_service import tts_service
+    tts_service.warm_offline()
+    register_component_metrics()
     yield
     # Shutdown
     logger.info("🛑 Shutting down...")
+    from features.live_takeover.url_scan_queue import url_scan_queue
+    await url_scan_queue.stop()
+    from features.live_takeover.report_generator import report_generator
+    report_generator.shutdown()
+    await upload_queue.stop()
+    from services.piper_pool import piper_pool
+    await piper_pool.stop()
+    from agents.llm_usage import llm_usage
+    await llm_usage.stop()
     await MongoDB.close()
 
 app = FastAPI(
@@ -89,6 +148,7 @@ app.include_router(live_call.router, prefix="/api", tags=["Live Call"])
 app.include_router(webrtc_signaling.router, prefix="/api", tags=["WebRTC Signaling"])
 app.include_router(elevenlabs_routes.router, prefix="/api", tags=["ElevenLabs"])
 app.include_router(sms_evidence.router, prefix="/api", tags=["SMS Evidence"])
+app.include_router(exports.router, prefix="/api", tags=["Exports"])
 app.include_router(testing.router, prefix="/api", tags=["Testing"])
 
 # Mount Socket.IO for WebRTC signaling
@@ -98,3 +158,10 @@ app.mount("/socket.io", webrtc_signaling.sio_app)
 @app.get("/health")
 async def health_check():
     return {"status": "ok", "db": "connected" if MongoDB.client else "disconnected"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of in-process metrics (core/metrics.py)."""
+    from core.metrics import metrics
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
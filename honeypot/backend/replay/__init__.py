@@ -0,0 +1,9 @@
+"""
+Call Replay
+Replays a recorded live call (CALL_RECORDING_ENABLED) through the WebRTC or
+live takeover pipeline at its original pacing or N× faster, usually against
+`python -m fake_providers` with the recorded transcriptions as the fake STT
+script, and reports a per-stage latency timeline comparable across builds:
+
+    python -m replay run storage/recordings/webrtc-call-ab12-....jsonl --fakes http://127.0.0.1:9100
+"""
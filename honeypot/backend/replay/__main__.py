@@ -0,0 +1,226 @@
+"""
+Call Replay CLI
+`run` replays a recording and writes a JSON report with the per-stage latency
+timeline; `compare` diffs two reports (exit 1 on regressions with
+--fail-on-regression); `show` summarises a recording.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from loadtest.stats import Recorder, ServerSampler, compare
+from replay.player import PLAYERS, ClientTimings, ReplayContext, stage_stats, timeline
+from replay.recording import Recording, load
+
+logger = logging.getLogger("replay")
+
+COMPARED_SECTIONS = ("operations", "turns", "stages", "server")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+async def _prepare_fakes(url: str, recording: Recording, seed: int) -> None:
+    """Reseed the fake providers and make their STT say what production transcribed, in order."""
+    async with httpx.AsyncClient(base_url=url, timeout=10.0) as fakes:
+        (await fakes.post("/_fake/reset", json={"seed": seed})).raise_for_status()
+        texts = [event["text"] for event in recording.transcriptions]
+        if texts:
+            (await fakes.post("/_fake/config", json={"content": {"transcripts": texts}})).raise_for_status()
+
+
+async def _fake_stats(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        async with httpx.AsyncClient(base_url=url, timeout=10.0) as fakes:
+            response = await fakes.get("/_fake/stats")
+            response.raise_for_status()
+            return response.json()
+    except httpx.HTTPError:
+        return None
+
+
+async def run(args: argparse.Namespace, recording: Recording) -> Dict[str, Any]:
+    recorder = Recorder()
+    headers = {"x-api-key": args.api_key} if args.api_key else {}
+    started_at = datetime.now(timezone.utc).isoformat()
+    if args.fakes:
+        await _prepare_fakes(args.fakes, recording, args.seed)
+
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, timeout=args.reply_timeout) as http:
+        ctx = ReplayContext(
+            http=http,
+            base_url=args.url.rstrip("/"),
+            recorder=recorder,
+            speed=args.speed,
+            reply_timeout_s=args.reply_timeout,
+            settle_s=args.settle,
+            poll_interval_s=args.poll_interval,
+        )
+        prefix = "webrtc" if recording.pipeline == "webrtc" else "live"
+        timings = ClientTimings(recording, recorder, prefix)
+
+        stop = asyncio.Event()
+        sampler = ServerSampler(http, args.scrape_interval)
+        sampling = asyncio.create_task(sampler.run(stop))
+
+        logger.info(f"▶️  Replaying {recording.pipeline} call {recording.call_id} "
+                    f"({recording.duration_s:.0f}s, {len(recording.audio)} chunks) at {args.speed}× against {args.url}")
+        start = time.monotonic()
+        try:
+            with recorder.measure(f"{prefix}.session"):
+                await PLAYERS[recording.pipeline](ctx, recording, timings)
+        except Exception as e:
+            logger.error(f"❌ Replay failed: {e!r}")
+        finally:
+            elapsed = time.monotonic() - start
+            await ctx.finish()
+            stop.set()
+            await sampling
+
+    turns = list(ctx.poller.turns.values()) if ctx.poller else []
+    return {
+        "label": args.label,
+        "started_at": started_at,
+        "git_commit": _git_commit(),
+        "recording": recording.summary(),
+        "config": {
+            "url": args.url,
+            "speed": args.speed,
+            "start_s": args.start,
+            "end_s": args.end,
+            "fakes": args.fakes,
+            "seed": args.seed,
+            "settle_s": args.settle,
+        },
+        "call_id": ctx.call_id,
+        "elapsed_s": round(elapsed, 2),
+        "operations": recorder.report(elapsed),
+        "transcriptions": timings.report(),
+        **stage_stats(turns),
+        "timeline": timeline(turns, timings.wall_start),
+        "client_events": timings.events,
+        "trace_poll_failures": ctx.poller.failures if ctx.poller else None,
+        "server": sampler.report(),
+        "fakes": await _fake_stats(args.fakes) if args.fakes else None,
+    }
+
+
+def print_report(report: Dict[str, Any], rows: int):
+    print(f"\n{'offset':>9}  {'pipeline':13} {'turn':8} {'total':>8}  stages (ms)")
+    for turn in report["timeline"][:rows or None]:
+        stages = " · ".join(f"{s['stage']} {s['duration_ms']:.0f}" for s in turn["spans"])
+        print(f"{turn['offset_ms'] / 1000:8.2f}s  {turn['pipeline']:13} {turn['trace_id']:8} "
+              f"{turn['total_ms']:6.0f}ms  {stages}")
+    if rows and len(report["timeline"]) > rows:
+        print(f"   ... {len(report['timeline']) - rows} more turns in the report")
+
+    print(f"\n{'stage':30} {'count':>6} {'p50':>8} {'p95':>8} {'max':>8}")
+    rows_by_name = [(f"{p} turn", s) for p, s in report["turns"].items()]
+    rows_by_name += [(f"{p}.{stage}", s) for p, stages in report["stages"].items() for stage, s in stages.items()]
+    for name, s in rows_by_name:
+        print(f"{name:30} {s['count']:6d} {s['p50_ms']:8.0f} {s['p95_ms']:8.0f} {s['max_ms']:8.0f}")
+
+    print(f"\n{'client':30} {'count':>6} {'err%':>6} {'p50':>8} {'p95':>8}")
+    for op, s in report["operations"].items():
+        cells = [f"{s[k]:8.0f}" if s[k] is not None else f"{'-':>8}" for k in ("p50_ms", "p95_ms")]
+        print(f"{op:30} {s['count']:6d} {s['error_rate'] * 100:6.1f} {' '.join(cells)}")
+
+    t = report["transcriptions"]
+    print(f"\ntranscriptions: recorded {t['recorded']}  replayed {t['replayed']}  early {t['early']}")
+
+
+def print_comparison(result: Dict[str, Any]):
+    print(f"{'metric':60} {'base':>10} {'new':>10} {'change':>8}")
+    for path, change in result["changes"].items():
+        flag = "  ⚠️" if path in result["regressions"] else ""
+        pct = f"{change['change']:+.0%}" if change["change"] is not None else "-"
+        print(f"{path:60} {change['base']!s:>10} {change['new']!s:>10} {pct:>8}{flag}")
+    print(f"\n{len(result['regressions'])} regression(s)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m replay", description=__doc__.strip().splitlines()[1])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    r = commands.add_parser("run", help="Replay a recording and write a JSON report")
+    r.add_argument("recording", help="Recording written with CALL_RECORDING_ENABLED (.jsonl or .jsonl.gz)")
+    r.add_argument("--url", default="http://localhost:8000", help="Backend base URL")
+    r.add_argument("--api-key", default=os.environ.get("API_SECRET_KEY", ""),
+                   help="x-api-key value (default: $API_SECRET_KEY)")
+    r.add_argument("--speed", type=float, default=1.0, help="Pacing (1 = as recorded, 4 = four times faster)")
+    r.add_argument("--start", type=float, default=0.0, help="Replay from this second of the recording")
+    r.add_argument("--end", type=float, help="...up to this second")
+    r.add_argument("--fakes", help="Fake providers URL; reseeded and scripted with the recorded transcriptions")
+    r.add_argument("--seed", type=int, default=0, help="Fake provider seed for latency / fault draws")
+    r.add_argument("--reply-timeout", type=float, default=30.0,
+                   help="Per-request timeout, and wait for outstanding transcriptions")
+    r.add_argument("--settle", type=float, default=3.0,
+                   help="Seconds without server events before ending the call (late replies)")
+    r.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between /api/traces polls")
+    r.add_argument("--scrape-interval", type=float, default=2.0, help="Seconds between /metrics scrapes")
+    r.add_argument("--rows", type=int, default=40, help="Timeline rows to print (0 = all)")
+    r.add_argument("--label", default="", help="Free-form run label stored in the report")
+    r.add_argument("--out", help="Report path (default replay-<timestamp>.json)")
+    r.add_argument("-v", "--verbose", action="store_true")
+
+    c = commands.add_parser("compare", help="Diff two replay reports")
+    c.add_argument("base")
+    c.add_argument("new")
+    c.add_argument("--threshold", type=float, default=0.10,
+                   help="Relative increase counted as a regression (default 0.10)")
+    c.add_argument("--fail-on-regression", action="store_true", help="Exit 1 if anything regressed")
+
+    s = commands.add_parser("show", help="Summarise a recording")
+    s.add_argument("recording")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        if base.get("recording", {}).get("path") != new.get("recording", {}).get("path"):
+            print("⚠️  Reports come from different recordings\n")
+        result = compare(base, new, args.threshold, sections=COMPARED_SECTIONS)
+        print_comparison(result)
+        return 1 if args.fail_on_regression and result["regressions"] else 0
+
+    recording = load(args.recording)
+    if args.command == "show":
+        print(json.dumps(recording.summary(), indent=2))
+        return 0
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format="%(levelname)s:%(name)s:%(message)s")
+    if not args.verbose:
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.start or args.end is not None:
+        recording = recording.clip(args.start, args.end)
+    report = asyncio.run(run(args, recording))
+    out = args.out or f"replay-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    with open(out, "w") as f:
+        json.dump(report, f, indent=2)
+    print_report(report, args.rows)
+    print(f"\n📄 Report written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
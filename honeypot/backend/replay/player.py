@@ -0,0 +1,368 @@
+"""
+Replay Player
+Sends a recording's audio and control events to the backend on their
+recorded clock (compressed by `speed`), times transcriptions and replies as
+the client sees them, and collects the server's span traces for the replayed
+call from GET /api/traces/{call_id} into a per-turn timeline.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+import socketio
+import websockets
+
+from loadtest.stats import PERCENTILES, Recorder, percentile
+from replay.recording import Recording
+
+logger = logging.getLogger("replay.player")
+
+
+async def paced(events: List[Dict[str, Any]], speed: float = 1.0) -> AsyncIterator[Dict[str, Any]]:
+    """Yield events at their recorded offsets (from the first one), compressed by `speed`."""
+    if not events:
+        return
+    start, origin = time.monotonic(), events[0]["t"]
+    for event in events:
+        delay = start + (event["t"] - origin) / speed - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        yield event
+
+
+class TracePoller:
+    """
+    Polls the replayed call's recent traces. The server keeps only the last
+    few turns per call, so it polls throughout and merges by trace id.
+    """
+
+    def __init__(self, http: httpx.AsyncClient, call_id: str, interval_s: float = 1.0):
+        self.http = http
+        self.call_id = call_id
+        self.interval_s = interval_s
+        self.turns: Dict[str, Dict[str, Any]] = {}
+        self.failures = 0
+
+    async def poll(self):
+        try:
+            response = await self.http.get(f"/api/traces/{self.call_id}")
+            response.raise_for_status()
+        except httpx.HTTPError:
+            self.failures += 1
+            return
+        for turn in response.json().get("turns", []):
+            self.turns.setdefault(turn["trace_id"], turn)
+
+    async def run(self, stop: asyncio.Event):
+        while not stop.is_set():
+            await self.poll()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+        await self.poll()
+
+
+class ClientTimings:
+    """
+    Times what the client receives against the recording.
+
+    The n-th replayed transcription of a speaker is timed from the send of the
+    chunk that triggered that speaker's n-th recorded transcription
+    (`<prefix>.transcription`). Replies are timed from
+    the scammer transcription before them, first event of each kind only
+    (`<prefix>.<kind>`).
+    """
+
+    def __init__(self, recording: Recording, recorder: Recorder, prefix: str):
+        self.recorder = recorder
+        self.prefix = prefix
+        self.anchors = recording.anchors()
+        self.expected = Counter({speaker: len(a) for speaker, a in self.anchors.items()})
+        self.received: Counter = Counter()
+        self.early = 0
+        self.start = time.monotonic()
+        self.wall_start = time.time()
+        self.events: List[Dict[str, Any]] = []
+        self._last_event = self.start
+        self._sent: Dict[int, float] = {}
+        self._reply_from: Optional[float] = None
+        self._replied: set = set()
+
+    def begin(self):
+        """The first event is about to go out; offsets count from here."""
+        self.start, self.wall_start = time.monotonic(), time.time()
+
+    def sent(self, audio_index: int):
+        self._sent[audio_index] = time.monotonic()
+
+    def transcription(self, speaker: str, text: str):
+        now = time.monotonic()
+        n = self.received[speaker]
+        self.received[speaker] += 1
+        anchors = self.anchors.get(speaker, [])
+        if n < len(anchors):
+            if anchors[n] in self._sent:
+                self.recorder.record(f"{self.prefix}.transcription", now - self._sent[anchors[n]])
+            else:
+                self.early += 1         # before the chunk that triggered it in production was sent
+        self._mark(now, "transcription", speaker=speaker, text=text)
+        if speaker == "scammer":
+            self._reply_from, self._replied = now, set()
+
+    def reply(self, kind: str):
+        now = time.monotonic()
+        self._mark(now, kind)
+        if self._reply_from is None or kind in self._replied:
+            return
+        self._replied.add(kind)
+        self.recorder.record(f"{self.prefix}.{kind}", now - self._reply_from)
+
+    def _mark(self, now: float, event: str, **fields: Any):
+        self._last_event = now
+        self.events.append({"offset_ms": round((now - self.start) * 1000, 1), "event": event, **fields})
+
+    @property
+    def outstanding(self) -> int:
+        return sum(max(0, n - self.received[speaker]) for speaker, n in self.expected.items())
+
+    async def drain(self, timeout_s: float):
+        """Wait (up to timeout_s) for the transcriptions the recording had; the rest are errors."""
+        give_up = time.monotonic() + timeout_s
+        while self.outstanding and time.monotonic() < give_up:
+            await asyncio.sleep(0.1)
+        for _ in range(self.outstanding):
+            self.recorder.record(f"{self.prefix}.transcription", error="no_transcription")
+
+    async def settle(self, quiet_s: float, timeout_s: float):
+        """Wait until the server has sent nothing for quiet_s (late replies), at most timeout_s."""
+        give_up = time.monotonic() + timeout_s
+        while time.monotonic() < min(give_up, self._last_event + quiet_s):
+            await asyncio.sleep(0.1)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "recorded": dict(self.expected),
+            "replayed": dict(self.received),
+            "early": self.early,
+        }
+
+
+@dataclass
+class ReplayContext:
+    http: httpx.AsyncClient
+    base_url: str
+    recorder: Recorder
+    speed: float = 1.0
+    reply_timeout_s: float = 30.0
+    settle_s: float = 3.0
+    poll_interval_s: float = 1.0
+    call_id: Optional[str] = None
+    poller: Optional[TracePoller] = None
+    _stop: asyncio.Event = field(default_factory=asyncio.Event)
+    _polling: Optional[asyncio.Task] = None
+
+    @property
+    def ws_url(self) -> str:
+        return "ws" + self.base_url[len("http"):]
+
+    async def post(self, op: str, path: str, body: Optional[dict] = None) -> Dict[str, Any]:
+        with self.recorder.measure(op):
+            response = await self.http.post(path, json=body or {})
+            response.raise_for_status()
+        return response.json()
+
+    def begin(self, call_id: str):
+        """The replayed call exists; start collecting its traces."""
+        self.call_id = call_id
+        self.poller = TracePoller(self.http, call_id, self.poll_interval_s)
+        self._polling = asyncio.create_task(self.poller.run(self._stop))
+
+    async def wait_for_turns(self, transcriptions: int, timeout_s: float):
+        """Wait (up to timeout_s) until the turn behind each transcription has finished and been traced."""
+        give_up = time.monotonic() + timeout_s
+        while self.poller is not None and time.monotonic() < give_up:
+            await self.poller.poll()
+            traced = sum(1 for turn in self.poller.turns.values() if any(s["stage"] == "stt" for s in turn["spans"]))
+            if traced >= transcriptions:
+                return
+            await asyncio.sleep(self.poll_interval_s)
+
+    async def finish(self):
+        self._stop.set()
+        if self._polling is not None:
+            await self._polling
+
+
+# ── WebRTC (Socket.IO) ────────────────────────────────────────
+
+async def _join(ctx: ReplayContext, client: socketio.AsyncClient, room_id: str, role: str):
+    joined = asyncio.get_running_loop().create_future()
+    client.on("joined_room", lambda data: joined.done() or joined.set_result(data))
+    await client.connect(ctx.base_url, transports=["websocket"], socketio_path="socket.io")
+    await client.emit("join_room", {"room_id": room_id, "role": role})
+    await asyncio.wait_for(joined, timeout=ctx.reply_timeout_s)
+
+
+async def replay_webrtc(ctx: ReplayContext, recording: Recording, timings: ClientTimings):
+    """Join a fresh room as both peers and emit each chunk from its recorded speaker's socket."""
+    data = await ctx.post("webrtc.create", "/api/webrtc/room/create", {"operator_name": "replay"})
+    room_id = data["room_id"]
+    operator, scammer = socketio.AsyncClient(), socketio.AsyncClient()
+    sockets = {"operator": operator, "scammer": scammer}
+
+    @operator.on("transcription")
+    def on_transcription(data):
+        if data.get("speaker") == "ai":
+            timings.reply("ai_transcript")      # the agent's reply text, not STT output
+        else:
+            timings.transcription(data.get("speaker", "unknown"), data.get("text", ""))
+
+    for kind in ("ai_coaching", "audio_response", "intelligence_update"):
+        operator.on(kind, lambda data, kind=kind: timings.reply(kind))
+    operator.on("ai_error", lambda data: ctx.recorder.record("webrtc.server_error", error="ai_error"))
+
+    try:
+        with ctx.recorder.measure("webrtc.connect"):
+            await _join(ctx, operator, room_id, "operator")
+            await _join(ctx, scammer, room_id, "scammer")
+        ctx.begin(room_id)
+
+        audio_index = 0
+        timings.begin()
+        async for event in paced(recording.events, ctx.speed):
+            if event["type"] == "audio":
+                await sockets.get(event["speaker"], scammer).emit("transcription_chunk", {
+                    "audio": event["data"],
+                    "format": event["format"],
+                    "speaker": event["speaker"],
+                    "room_id": room_id,
+                })
+                timings.sent(audio_index)
+                audio_index += 1
+            elif event["type"] == "event" and event["name"] == "set_ai_mode":
+                await operator.emit("set_ai_mode", {**event["data"], "room_id": room_id})
+        await timings.drain(ctx.reply_timeout_s)
+        await ctx.wait_for_turns(sum(timings.received.values()), ctx.reply_timeout_s)
+        await timings.settle(ctx.settle_s, ctx.reply_timeout_s)
+    finally:
+        try:
+            await ctx.post("webrtc.end", f"/api/webrtc/room/{room_id}/end")
+        finally:
+            await asyncio.gather(operator.disconnect(), scammer.disconnect(), return_exceptions=True)
+
+
+# ── Live takeover (WebSocket) ─────────────────────────────────
+
+async def replay_live_takeover(ctx: ReplayContext, recording: Recording, timings: ClientTimings):
+    """Start a takeover session in the recorded mode and stream the chunks into its WebSocket."""
+    data = await ctx.post("live.start", "/api/live/start", {"mode": recording.meta.get("mode", "ai_takeover")})
+    session_id = data["session_id"]
+
+    def handle(message: Dict[str, Any]):
+        kind = message.get("type")
+        if kind == "transcription":
+            timings.transcription(message.get("speaker", "scammer"), message.get("text", ""))
+        elif kind in ("ai_response", "coaching_scripts", "threat_update", "intelligence_update"):
+            timings.reply(kind)
+        elif kind == "error":
+            ctx.recorder.record("live.server_error", error="error")
+
+    async def read(ws):
+        async for raw in ws:
+            try:
+                handle(json.loads(raw))
+            except (TypeError, ValueError):
+                continue
+
+    try:
+        with ctx.recorder.measure("live.connect"):
+            ws = await websockets.connect(f"{ctx.ws_url}/api/live/connect/{session_id}", max_size=None)
+            first = json.loads(await asyncio.wait_for(ws.recv(), timeout=ctx.reply_timeout_s))
+            if first.get("type") != "connected":
+                await ws.close()
+                raise ConnectionError(f"unexpected first message {first.get('type')}")
+        ctx.begin(session_id)
+
+        async with ws:
+            reader = asyncio.create_task(read(ws))
+            try:
+                audio_index = 0
+                timings.begin()
+                async for event in paced(recording.events, ctx.speed):
+                    if event["type"] == "audio":
+                        await ws.send(json.dumps({
+                            "type": "audio_chunk", "data": event["data"], "format": event["format"]
+                        }))
+                        timings.sent(audio_index)
+                        audio_index += 1
+                    elif event["type"] == "event" and event["name"] == "mode_switch":
+                        await ws.send(json.dumps({"type": "mode_switch", **event["data"]}))
+                    elif event["type"] == "event" and event["name"] == "text_input":
+                        await ws.send(json.dumps({"type": "text_input", **event["data"]}))
+                await timings.drain(ctx.reply_timeout_s)
+                await ctx.wait_for_turns(sum(timings.received.values()), ctx.reply_timeout_s)
+                await timings.settle(ctx.settle_s, ctx.reply_timeout_s)
+            finally:
+                reader.cancel()
+                await asyncio.gather(reader, return_exceptions=True)
+    finally:
+        await ctx.post("live.end", f"/api/live/end/{session_id}")
+
+
+PLAYERS: Dict[str, Callable[[ReplayContext, Recording, ClientTimings], Awaitable[None]]] = {
+    "webrtc": replay_webrtc,
+    "live_takeover": replay_live_takeover,
+}
+
+
+# ── Timeline ──────────────────────────────────────────────────
+
+def _summary(values_ms: List[float]) -> Dict[str, Any]:
+    values = sorted(values_ms)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 1),
+        **{f"p{int(q * 100)}_ms": round(percentile(values, q), 1) for q in PERCENTILES},
+        "max_ms": round(values[-1], 1),
+    }
+
+
+def timeline(turns: List[Dict[str, Any]], wall_start: float) -> List[Dict[str, Any]]:
+    """Server turns in start order, offsets from the start of the replay."""
+    return sorted(
+        (
+            {
+                "offset_ms": round((turn["started_at"] - wall_start) * 1000, 1),
+                "trace_id": turn["trace_id"],
+                "pipeline": turn["pipeline"],
+                "total_ms": turn["total_ms"],
+                "spans": turn["spans"],
+            }
+            for turn in turns
+        ),
+        key=lambda turn: turn["offset_ms"]
+    )
+
+
+def stage_stats(turns: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """{"turns": {pipeline: summary}, "stages": {pipeline: {stage: summary}}} over the traced turns."""
+    totals: Dict[str, List[float]] = defaultdict(list)
+    stages: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+    for turn in turns:
+        totals[turn["pipeline"]].append(turn["total_ms"])
+        for span in turn["spans"]:
+            stages[turn["pipeline"]][span["stage"]].append(span["duration_ms"])
+    return {
+        "turns": {pipeline: _summary(values) for pipeline, values in sorted(totals.items())},
+        "stages": {
+            pipeline: {stage: _summary(values) for stage, values in sorted(by_stage.items())}
+            for pipeline, by_stage in sorted(stages.items())
+        },
+    }
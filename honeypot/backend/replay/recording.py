@@ -0,0 +1,116 @@
+"""
+Replay Recording
+Reads a call recording written by core.call_recorder: a header line, then
+timed audio / event / transcription lines, then an end line (missing if the
+server stopped mid-call). Gzipped copies (.jsonl.gz) read the same way.
+"""
+
+import gzip
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+PIPELINES = ("webrtc", "live_takeover")
+
+
+@dataclass
+class Recording:
+    path: str
+    pipeline: str
+    call_id: str
+    started_at: str
+    meta: Dict[str, Any] = field(default_factory=dict)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    end: Optional[Dict[str, Any]] = None
+
+    @property
+    def duration_s(self) -> float:
+        if self.end is not None:
+            return self.end["t"]
+        return self.events[-1]["t"] if self.events else 0.0
+
+    @property
+    def audio(self) -> List[Dict[str, Any]]:
+        return [e for e in self.events if e["type"] == "audio"]
+
+    @property
+    def transcriptions(self) -> List[Dict[str, Any]]:
+        return [e for e in self.events if e["type"] == "transcription"]
+
+    def clip(self, start_s: float = 0.0, end_s: Optional[float] = None) -> "Recording":
+        """The events between start_s and end_s, re-timed to start at 0 (chunk indices follow)."""
+        skipped = sum(1 for e in self.events if e["type"] == "audio" and e["t"] < start_s)
+        events = []
+        for e in self.events:
+            if e["t"] < start_s or (end_s is not None and e["t"] >= end_s):
+                continue
+            e = {**e, "t": round(e["t"] - start_s, 4)}
+            if "chunk" in e:
+                e["chunk"] -= skipped
+                if e["chunk"] < 0:
+                    del e["chunk"]
+            events.append(e)
+        return Recording(self.path, self.pipeline, self.call_id, self.started_at, self.meta, events)
+
+    def anchors(self) -> Dict[str, List[int]]:
+        """
+        Per speaker, the index (into `audio`) of the chunk whose processing
+        produced each transcription, in order. Transcriptions not triggered by
+        a chunk (flushed when the call ended) are left out.
+        """
+        anchors: Dict[str, List[int]] = {}
+        for event in self.transcriptions:
+            if event.get("chunk") is not None:
+                anchors.setdefault(event["speaker"], []).append(event["chunk"])
+        return anchors
+
+    def summary(self) -> Dict[str, Any]:
+        audio = self.audio
+        return {
+            "path": self.path,
+            "pipeline": self.pipeline,
+            "call_id": self.call_id,
+            "started_at": self.started_at,
+            "meta": self.meta,
+            "duration_s": round(self.duration_s, 2),
+            "complete": self.end is not None,
+            "truncated": bool(self.end and self.end.get("truncated")),
+            "audio_chunks": dict(Counter(e["speaker"] for e in audio)),
+            "audio_formats": dict(Counter(e["format"] for e in audio)),
+            "audio_bytes": sum(len(e["data"]) * 3 // 4 for e in audio),
+            "events": dict(Counter(e["name"] for e in self.events if e["type"] == "event")),
+            "transcriptions": dict(Counter(e["speaker"] for e in self.transcriptions)),
+        }
+
+
+def load(path: str) -> Recording:
+    """Parse a recording; a torn last line (server killed mid-write) is ignored."""
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        lines = f.read().splitlines()
+
+    records = []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            if number == len(lines):
+                break
+            raise ValueError(f"{path}:{number}: not JSON")
+
+    if not records or records[0].get("type") != "header":
+        raise ValueError(f"{path}: not a call recording (no header line)")
+    header = records[0]
+    if header.get("pipeline") not in PIPELINES:
+        raise ValueError(f"{path}: unsupported pipeline {header.get('pipeline')!r}")
+
+    recording = Recording(path, header["pipeline"], header["call_id"], header["started_at"], header.get("meta", {}))
+    for record in records[1:]:
+        if record.get("type") == "end":
+            recording.end = record
+        else:
+            recording.events.append(record)
+    return recording
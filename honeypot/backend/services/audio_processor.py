@@ -4,6 +4,7 @@ Handles audio chunking, validation, format conversion, and storage.
 Uses StorageService (MinIO / local fallback) for persistence.
 """
 
+import asyncio
 import os
 import io
 import base64
@@ -114,7 +115,7 @@ class AudioProcessor:
             logger.error(f"Audio normalization failed: {e}", exc_info=True)
             raise
     
-    def save_chunk(
+    async def save_chunk(
         self, 
         session_id: str, 
         audio_data: bytes, 
@@ -122,15 +123,27 @@ class AudioProcessor:
         format: str = "wav"
     ) -> str:
         """
-        Save audio chunk to object storage (MinIO / local fallback).
-        Returns: object_name (key)
+        Save audio chunk locally and queue its upload to object storage
+        (MinIO / local fallback). Returns at once with the object_name (key);
+        load_chunk reads the local copy until the upload lands.
         """
         try:
             timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
             object_name = f"{session_id}/chunk_{sequence_number:04d}_{timestamp}.{format}"
             
+            local_path = self.storage_path / object_name
+            local_path.parent.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(local_path.write_bytes, audio_data)
+            
+            from services.upload_queue import upload_queue
             content_type = "audio/wav" if format == "wav" else f"audio/{format}"
-            storage.upload(object_name, audio_data, content_type=content_type)
+            await upload_queue.enqueue(
+                str(local_path),
+                target="minio",
+                object_name=object_name,
+                content_type=content_type,
+                delete_local=True
+            )
             
             logger.info(f"Saved audio chunk: {object_name}")
             return object_name
@@ -139,21 +152,17 @@ class AudioProcessor:
             logger.error(f"Failed to save audio chunk: {e}", exc_info=True)
             raise
     
-    def load_chunk(self, file_path: str) -> bytes:
+    async def load_chunk(self, file_path: str) -> bytes:
         """
         Load audio chunk from object storage.
         Accepts either an object_name key or a legacy local file path.
         """
         try:
             # Try storage service first (object key)
-            return storage.download(file_path)
+            return await storage.get(file_path)
         except FileNotFoundError:
             # Fallback: try reading as a raw local path (legacy data)
-            try:
-                with open(file_path, 'rb') as f:
-                    return f.read()
-            except Exception:
-                raise
+            return await asyncio.to_thread(Path(file_path).read_bytes)
         except Exception as e:
             logger.error(f"Failed to load audio chunk: {e}")
             raise
@@ -186,30 +195,26 @@ class AudioProcessor:
             logger.error(f"Failed to get audio duration: {e}")
             return 0.0
     
-    def cleanup_session_audio(self, session_id: str):
+    async def cleanup_session_audio(self, session_id: str):
         """
         Delete all audio files for a session.
-        Cleans both object storage and legacy local filesystem.
+        Cleans both object storage (one batch delete) and legacy local filesystem.
         """
         try:
-            # Clean local storage (legacy + fallback)
+            # Clean object storage - every key under the session prefix
+            try:
+                removed = await storage.delete_prefix(f"{session_id}/")
+                if removed:
+                    logger.info(f"Cleaned up {removed} stored audio objects for session: {session_id}")
+            except Exception as e:
+                logger.warning(f"Object storage cleanup skipped: {e}")
+            
+            # Clean local storage (legacy + upload spool)
             session_folder = self.storage_path / session_id
             if session_folder.exists():
                 import shutil
-                shutil.rmtree(session_folder)
+                await asyncio.to_thread(shutil.rmtree, session_folder, True)
                 logger.info(f"Cleaned up local audio for session: {session_id}")
-            
-            # Clean MinIO - list and delete all objects with session prefix
-            try:
-                from services.storage_service import _get_minio_client, _use_local_fallback
-                client = _get_minio_client()
-                if client and not _use_local_fallback:
-                    objects = client.list_objects(settings.MINIO_BUCKET, prefix=f"{session_id}/", recursive=True)
-                    for obj in objects:
-                        client.remove_object(settings.MINIO_BUCKET, obj.object_name)
-                    logger.info(f"Cleaned up MinIO audio for session: {session_id}")
-            except Exception as e:
-                logger.warning(f"MinIO cleanup skipped: {e}")
                 
         except Exception as e:
             logger.error(f"Failed to cleanup session audio: {e}")
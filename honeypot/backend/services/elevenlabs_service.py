@@ -7,13 +7,27 @@ import os
 import logging
 import hashlib
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, AsyncIterator
 import httpx
 
 from config import settings
+from core.rate_limiter import get_rate_limiter, parse_retry_after, request_with_limit
+from services.tts_cache import tts_cache, tts_cache_key
 
 logger = logging.getLogger("elevenlabs_service")
 
+# Streaming output: raw 16-bit mono PCM, playable the moment a chunk lands
+STREAM_FORMAT = getattr(settings, 'TTS_STREAM_FORMAT', 'pcm_16000')
+# Forwarded chunk size (bytes); 3200 bytes of pcm_16000 = 100 ms
+STREAM_CHUNK_BYTES = 3200
+
+DEFAULT_VOICE_SETTINGS = {
+    "stability": 0.5,
+    "similarity_boost": 0.75,
+    "style": 0.0,
+    "use_speaker_boost": True
+}
+
 
 class ElevenLabsService:
     """
@@ -24,7 +38,12 @@ class ElevenLabsService:
     def __init__(self):
         self.api_key = getattr(settings, 'ELEVENLABS_API_KEY', '')
         self.model = getattr(settings, 'ELEVENLABS_MODEL', 'eleven_turbo_v2_5')
-        self.base_url = "https://api.elevenlabs.io/v1"
+        self.base_url = settings.ELEVENLABS_BASE_URL
+        self.limiter = get_rate_limiter(
+            "elevenlabs",
+            rate_per_minute=getattr(settings, 'ELEVENLABS_RATE_PER_MIN', 120),
+            burst=getattr(settings, 'ELEVENLABS_BURST', 5)
+        )
         self.output_path = Path(getattr(settings, 'AUDIO_STORAGE_PATH', './storage/audio')) / 'synthesized'
         self.output_path.mkdir(parents=True, exist_ok=True)
         
@@ -227,11 +246,23 @@ class ElevenLabsService:
             # Check if already synthesized (cache)
             if output_file.exists():
                 logger.info(f"✅ Using cached audio: {output_file}")
-                return self._build_result(str(output_file), voice_id, voice_name)
+                return await self._build_result(str(output_file), voice_id, voice_name)
             
-            # Synthesize with ElevenLabs API
             model = model or self.model
+            voice_settings = {
+                "stability": stability,
+                "similarity_boost": similarity_boost,
+                "style": style,
+                "use_speaker_boost": use_speaker_boost
+            }
             
+            # Same phrase / voice / settings synthesized for another session
+            cache_key = tts_cache_key(text, voice_id, model, voice_settings)
+            if await tts_cache.link_to(cache_key, output_file):
+                logger.info(f"✅ TTS cache hit: {output_file}")
+                return await self._build_result(str(output_file), voice_id, voice_name)
+            
+            # Synthesize with ElevenLabs API
             async with httpx.AsyncClient() as client:
                 headers = {
                     "Accept": "audio/mpeg",
@@ -244,31 +275,30 @@ class ElevenLabsService:
                 payload = {
                     "text": text,
                     "model_id": model,
-                    "voice_settings": {
-                        "stability": stability,
-                        "similarity_boost": similarity_boost,
-                        "style": style,
-                        "use_speaker_boost": use_speaker_boost
-                    }
+                    "voice_settings": voice_settings
                 }
                 
                 url = f"{self.base_url}/text-to-speech/{voice_id}"
                 
-                response = await client.post(
-                    url,
-                    json=payload,
-                    headers=headers,
-                    timeout=30.0
+                response = await request_with_limit(
+                    self.limiter,
+                    lambda: client.post(url, json=payload, headers=headers, timeout=30.0),
+                    max_wait=5.0
                 )
                 
+                if response is None:
+                    logger.warning("⚠️ ElevenLabs quota exhausted, using fallback TTS")
+                    return await self._fallback_to_system_tts(text, session_id)
+                
                 if response.status_code == 200:
                     # Save audio file
                     with open(output_file, 'wb') as f:
                         f.write(response.content)
+                    await tts_cache.put(cache_key, response.content, "mp3")
                     
                     logger.info(f"✅ ElevenLabs synthesis successful: {output_file}")
                     
-                    return self._build_result(str(output_file), voice_id, voice_name)
+                    return await self._build_result(str(output_file), voice_id, voice_name)
                 else:
                     error_msg = response.text
                     logger.error(f"ElevenLabs API error ({response.status_code}): {error_msg}")
@@ -280,6 +310,85 @@ class ElevenLabsService:
             logger.error(f"ElevenLabs synthesis failed: {e}", exc_info=True)
             return await self._fallback_to_system_tts(text, session_id)
     
+    async def stream_synthesis(
+        self,
+        text: str,
+        voice_id: Optional[str] = None,
+        model: Optional[str] = None,
+        voice_settings: Optional[Dict[str, Any]] = None,
+        output_format: str = STREAM_FORMAT
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream speech from the ElevenLabs streaming endpoint as it is generated.
+        
+        Yields audio chunks (PCM chunks are whole 16-bit samples) as they
+        arrive. The full clip is written to the TTS cache when the stream
+        completes, and a cached clip is replayed at once. Yields nothing if
+        the API is unavailable or throttled; callers fall back to full synthesis.
+        
+        Args:
+            text: Text to synthesize
+            voice_id: Voice ID (defaults to Rachel)
+            model: Model (default ELEVENLABS_MODEL)
+            voice_settings: ElevenLabs voice settings (default DEFAULT_VOICE_SETTINGS)
+            output_format: e.g. "pcm_16000", "pcm_24000", "mp3_22050_32"
+        """
+        voice_id = voice_id or self.free_voices["Rachel"]
+        model = model or self.model
+        voice_settings = voice_settings or DEFAULT_VOICE_SETTINGS
+        
+        cache_key = tts_cache_key(text, voice_id, model, {**voice_settings, "output_format": output_format})
+        cached = await tts_cache.get(cache_key)
+        if cached is not None:
+            for i in range(0, len(cached), STREAM_CHUNK_BYTES):
+                yield cached[i:i + STREAM_CHUNK_BYTES]
+            return
+        
+        if not self.api_key:
+            logger.debug("ElevenLabs API key not configured, streaming unavailable")
+            return
+        if not await self.limiter.acquire(max_wait=5.0):
+            logger.warning("⚠️ ElevenLabs quota exhausted, streaming unavailable")
+            return
+        
+        clip = bytearray()
+        pending = b""
+        complete = False
+        try:
+            async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=5.0)) as client:
+                async with client.stream(
+                    "POST",
+                    f"{self.base_url}/text-to-speech/{voice_id}/stream",
+                    params={"output_format": output_format},
+                    json={"text": text, "model_id": model, "voice_settings": voice_settings},
+                    headers={"xi-api-key": self.api_key, "Content-Type": "application/json"}
+                ) as response:
+                    if response.status_code == 429:
+                        self.limiter.penalize(parse_retry_after(response.headers.get("retry-after")))
+                        logger.warning("⚠️ ElevenLabs stream throttled (429)")
+                        return
+                    if response.status_code != 200:
+                        body = await response.aread()
+                        logger.error(f"ElevenLabs stream error ({response.status_code}): {body[:200]!r}")
+                        return
+                    
+                    async for data in response.aiter_bytes():
+                        clip.extend(data)
+                        pending += data
+                        if len(pending) >= STREAM_CHUNK_BYTES:
+                            # Keep PCM chunks sample-aligned
+                            cut = len(pending) - len(pending) % 2
+                            chunk, pending = pending[:cut], pending[cut:]
+                            yield chunk
+                    if pending:
+                        yield pending
+                    complete = True
+        except httpx.HTTPError as e:
+            logger.error(f"ElevenLabs stream failed: {e}")
+        finally:
+            if complete and clip:
+                await tts_cache.put(cache_key, bytes(clip), output_format.split("_")[0])
+    
     async def _fallback_to_system_tts(self, text: str, session_id: Optional[str]) -> Dict:
         """Fallback to system TTS if ElevenLabs fails"""
         try:
@@ -297,27 +406,24 @@ class ElevenLabsService:
                 "error": "TTS service unavailable"
             }
     
-    def _build_result(self, audio_path: str, voice_id: str, voice_name: Optional[str]) -> Dict[str, Any]:
-        """Build synthesis result dictionary — uploads to Cloudinary."""
+    async def _build_result(self, audio_path: str, voice_id: str, voice_name: Optional[str]) -> Dict[str, Any]:
+        """Build synthesis result dictionary — queues the Cloudinary upload."""
         # Get audio duration
         duration = self._estimate_duration(audio_path)
         
-        # Upload to Cloudinary for persistent storage
-        audio_url = audio_path  # fallback
+        # Cloud copy is uploaded in the background; the local file serves meanwhile
+        upload_job_id = None
         try:
-            from services.cloudinary_service import cloudinary_service, FOLDER_AUDIO_SYNTHESIZED
-            with open(audio_path, "rb") as f:
-                audio_bytes = f.read()
-            audio_url = cloudinary_service.upload_audio(
-                audio_bytes,
-                Path(audio_path).name,
-                folder=FOLDER_AUDIO_SYNTHESIZED
-            )
+            from services.cloudinary_service import FOLDER_AUDIO_SYNTHESIZED
+            from services.upload_queue import upload_queue
+            upload_job_id = await upload_queue.enqueue(audio_path, folder=FOLDER_AUDIO_SYNTHESIZED)
         except Exception as e:
-            logger.error(f"Cloudinary upload failed, using local path: {e}")
+            logger.error(f"Could not queue audio upload: {e}")
         
         return {
-            "audio_path": audio_url,
+            "audio_path": audio_path,
+            "audio_url": None,  # Filled in on the owning record once uploaded
+            "upload_job_id": upload_job_id,
             "duration": duration,
             "format": "mp3",
             "voice_id": voice_id,
@@ -3,21 +3,55 @@ import logging
 from typing import Dict, List
 import os
 from langchain_groq import ChatGroq
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import JsonOutputParser
+from langchain_google_genai import ChatGoogleGenerativeAI
+from agents.chains import chain_registry
+from agents.llm_router import PROVIDER_MAX_RETRIES, llm_router
 from db.mongo import db
 from db.models import Intelligence
 from config import settings
 
 logger = logging.getLogger("intelligence")
 
+# Static instructions first so the prompt prefix is identical on every call
+EXTRACTION_SYSTEM_PROMPT = (
+    "You are a Forensic Intelligence Analyst for a High-Tech Honeypot. \n"
+    "Your task is to extract actionable scam intelligence from the latest message while avoiding false positives.\n\n"
+    "STRICT INSTRUCTIONS:\n"
+    "1. bank_accounts: Usually 9-18 digits. Often mentioned with bank names or 'send here'.\n"
+    "2. phone_numbers: STRICTLY 10 digits for India/Local. If a number is 10 digits, it is likely a phone number UNLESS context strongly implies otherwise.\n"
+    "3. upi_ids: Format like 'name@bank' or 'mobile@upi'.\n"
+    "4. urls: Phishing or suspicious links.\n"
+    "5. scam_keywords: Urgent terms like 'blocked', 'suspended', 'verify', 'KYC', 'lottery'.\n"
+    "6. behavioral_tactics: Urgency, Authority, Sympathy, Fear.\n\n"
+    "Return ONLY valid JSON with these keys: bank_accounts, upi_ids, phone_numbers, urls, scam_keywords, behavioral_tactics. "
+    "Use lists of strings. Empty lists if none detected."
+)
+
+chain_registry.register(
+    "extractor.intel",
+    EXTRACTION_SYSTEM_PROMPT,
+    "{context}\n\nLATEST MESSAGE: '{text}'",
+    parser="json"
+)
+
 class IntelligenceExtractor:
     def __init__(self):
         self.groq_key = settings.GROQ_API_KEY
         if self.groq_key:
-            self.llm = ChatGroq(temperature=0, model_name="llama-3.3-70b-versatile", api_key=self.groq_key)
+            self.llm = ChatGroq(temperature=0, model_name="llama-3.3-70b-versatile", api_key=self.groq_key,
+                                base_url=settings.GROQ_BASE_URL or None, max_retries=PROVIDER_MAX_RETRIES)
         else:
             self.llm = None
+        if settings.GEMINI_API_KEY:
+            self.fallback_llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash-lite", temperature=0,
+                                                       google_api_key=settings.GEMINI_API_KEY,
+                                                       base_url=settings.GEMINI_BASE_URL or None,
+                                                       max_retries=PROVIDER_MAX_RETRIES)
+        else:
+            self.fallback_llm = None
+        # Candidates in preference order; llm_router picks the healthiest per call
+        self.llms = [llm for llm in (self.llm, self.fallback_llm) if llm]
+        chain_registry.prepare(self.llms, "extractor.intel")
     
     async def extract(self, session_id: str, message: str, history: List[Dict] = None):
         """
@@ -27,29 +61,15 @@ class IntelligenceExtractor:
         extracted = self._regex_extract(message)
         
         # 2. LLM Extraction (The "Brain" - resolves overlap/ambiguity)
-        if self.llm:
+        if self.llms:
             try:
                 context = ""
                 if history:
                     context = "Conversation history for context:\n" + "\n".join([f"{m['role']}: {m['content']}" for m in history[-5:]])
                 
-                prompt = ChatPromptTemplate.from_template(
-                    "You are a Forensic Intelligence Analyst for a High-Tech Honeypot. \n"
-                    "Your task is to extract actionable scam intelligence from the latest message while avoiding false positives.\n\n"
-                    "{context}\n\n"
-                    "LATEST MESSAGE: '{text}'\n\n"
-                    "STRICT INSTRUCTIONS:\n"
-                    "1. bank_accounts: Usually 9-18 digits. Often mentioned with bank names or 'send here'.\n"
-                    "2. phone_numbers: STRICTLY 10 digits for India/Local. If a number is 10 digits, it is likely a phone number UNLESS context strongly implies otherwise.\n"
-                    "3. upi_ids: Format like 'name@bank' or 'mobile@upi'.\n"
-                    "4. urls: Phishing or suspicious links.\n"
-                    "5. scam_keywords: Urgent terms like 'blocked', 'suspended', 'verify', 'KYC', 'lottery'.\n"
-                    "6. behavioral_tactics: Urgency, Authority, Sympathy, Fear.\n\n"
-                    "Return ONLY valid JSON with these keys: bank_accounts, upi_ids, phone_numbers, urls, scam_keywords, behavioral_tactics. "
-                    "Use lists of strings. Empty lists if none detected."
+                llm_result = await llm_router.ainvoke(
+                    "extractor.intel", {"text": message, "context": context}, self.llms, "background"
                 )
-                chain = prompt | self.llm | JsonOutputParser()
-                llm_result = await chain.ainvoke({"text": message, "context": context})
                 
                 # Merge LLM results (LLM takes precedence for disambiguating 10-digit numbers)
                 for key in ["bank_accounts", "upi_ids", "phone_numbers", "urls", "scam_keywords", "behavioral_tactics"]:
@@ -0,0 +1,264 @@
+"""
+Piper Pool - long-lived local TTS worker processes.
+Each worker (services/piper_worker.py) loads one Piper voice model once and
+answers utterances over its stdin/stdout pipe with raw PCM, so offline TTS no
+longer pays a process spawn + ONNX model load per utterance and async callers
+never block the event loop.
+"""
+
+import asyncio
+import importlib.util
+import logging
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger("piper_pool")
+
+WORKER_SCRIPT = Path(__file__).with_name("piper_worker.py")
+
+_REQUEST = struct.Struct(">I")
+_RESPONSE = struct.Struct(">BI")
+_OK = 0
+
+
+class PiperWorkerError(Exception):
+    pass
+
+
+class _Worker:
+    def __init__(self, voice: str, proc: asyncio.subprocess.Process, sample_rate: int):
+        self.voice = voice
+        self.proc = proc
+        self.sample_rate = sample_rate
+        self.utterances = 0
+
+    async def read_frame(self) -> Tuple[int, bytes]:
+        status, size = _RESPONSE.unpack(await self.proc.stdout.readexactly(_RESPONSE.size))
+        return status, await self.proc.stdout.readexactly(size)
+
+    async def request(self, text: str) -> bytes:
+        data = text.encode("utf-8")
+        self.proc.stdin.write(_REQUEST.pack(len(data)) + data)
+        await self.proc.stdin.drain()
+        status, payload = await self.read_frame()
+        if status != _OK:
+            raise PiperWorkerError(payload.decode("utf-8", "replace"))
+        self.utterances += 1
+        return payload
+
+    def kill(self):
+        if self.proc.returncode is None:
+            self.proc.kill()
+
+
+class PiperPool:
+    """
+    Per-voice pools of Piper worker processes, spawned on first use (or by
+    warm()) up to `workers_per_voice` each.
+    """
+
+    RESPAWN_COOLDOWN_S = 60.0
+
+    def __init__(
+        self,
+        voice_path: Path,
+        workers_per_voice: int = 1,
+        timeout: float = 10.0,
+        load_timeout: float = 60.0
+    ):
+        self.voice_path = Path(voice_path)
+        self.workers_per_voice = max(1, workers_per_voice)
+        self.timeout = timeout
+        self.load_timeout = load_timeout
+        self._idle: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, List[_Worker]] = {}
+        self._spawning: Dict[str, int] = {}
+        self._broken: Dict[str, float] = {}         # voice -> monotonic time of last load failure
+        self._installed = importlib.util.find_spec("piper") is not None
+        self.stats = {
+            "utterances": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "spawned": 0,
+            "spawn_failures": 0,
+            "synth_seconds": 0.0,
+            "audio_seconds": 0.0,
+        }
+
+    # ── Availability ──────────────────────────────────────────────
+
+    def model_for(self, voice: str) -> Path:
+        return self.voice_path / f"{voice}.onnx"
+
+    def available(self, voice: str) -> bool:
+        """Piper installed, the voice model present and not recently failing to load."""
+        if not self._installed or not self.model_for(voice).exists():
+            return False
+        failed_at = self._broken.get(voice)
+        return failed_at is None or time.monotonic() - failed_at > self.RESPAWN_COOLDOWN_S
+
+    # ── Synthesis ─────────────────────────────────────────────────
+
+    async def synthesize(self, text: str, voice: str) -> Optional[Tuple[bytes, int]]:
+        """
+        Synthesize one utterance.
+
+        Returns:
+            (16-bit mono PCM bytes, sample_rate) or None if Piper can't serve it
+        """
+        if not self.available(voice):
+            return None
+        try:
+            worker = await self._acquire(voice)
+        except Exception as e:
+            logger.warning(f"Piper worker for {voice} unavailable: {e}")
+            return None
+
+        start = time.monotonic()
+        try:
+            pcm = await asyncio.wait_for(worker.request(text), timeout=self.timeout)
+        except PiperWorkerError as e:
+            # Utterance failed but the worker is still healthy
+            self._release(worker)
+            self.stats["errors"] += 1
+            logger.error(f"Piper synthesis failed: {e}")
+            return None
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, OSError) as e:
+            if isinstance(e, asyncio.TimeoutError):
+                self.stats["timeouts"] += 1
+            self.stats["errors"] += 1
+            logger.error(f"Piper worker for {voice} died or hung ({type(e).__name__}), replacing it")
+            self._discard(worker)
+            return None
+        except BaseException:
+            # Cancelled mid-utterance: the pipe is out of sync, drop the worker
+            self._discard(worker)
+            raise
+
+        self._release(worker)
+        elapsed = time.monotonic() - start
+        self.stats["utterances"] += 1
+        self.stats["synth_seconds"] += elapsed
+        self.stats["audio_seconds"] += len(pcm) / 2 / worker.sample_rate
+        return pcm, worker.sample_rate
+
+    async def warm(self, voices: List[str]):
+        """Load voice models ahead of the first request (app startup)."""
+        for voice in voices:
+            if not self.available(voice) or self._workers.get(voice):
+                continue
+            try:
+                self._release(await self._acquire(voice))
+            except Exception as e:
+                logger.warning(f"Piper warm-up failed for {voice}: {e}")
+
+    # ── Worker management ─────────────────────────────────────────
+
+    async def _acquire(self, voice: str) -> _Worker:
+        idle = self._idle.setdefault(voice, asyncio.Queue())
+        while True:
+            while not idle.empty():
+                worker = idle.get_nowait()
+                if worker is not None and worker.proc.returncode is None:
+                    return worker
+                if worker is not None:
+                    self._discard(worker)
+
+            running = len(self._workers.get(voice, [])) + self._spawning.get(voice, 0)
+            if running < self.workers_per_voice:
+                return await self._spawn(voice)
+
+            # All workers busy; None is a wake-up token after a worker was lost
+            worker = await idle.get()
+            if worker is not None and worker.proc.returncode is None:
+                return worker
+            if worker is not None:
+                self._discard(worker)
+
+    def _release(self, worker: _Worker):
+        self._idle.setdefault(worker.voice, asyncio.Queue()).put_nowait(worker)
+
+    def _discard(self, worker: _Worker):
+        worker.kill()
+        workers = self._workers.get(worker.voice, [])
+        if worker in workers:
+            workers.remove(worker)
+            self._wake(worker.voice)
+
+    def _wake(self, voice: str):
+        """Let one waiter in _acquire re-check capacity and spawn a replacement."""
+        self._idle.setdefault(voice, asyncio.Queue()).put_nowait(None)
+
+    async def _spawn(self, voice: str) -> _Worker:
+        self._spawning[voice] = self._spawning.get(voice, 0) + 1
+        proc = None
+        try:
+            start = time.monotonic()
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, str(WORKER_SCRIPT), "--model", str(self.model_for(voice)),
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE
+            )
+            worker = _Worker(voice, proc, sample_rate=0)
+            status, payload = await asyncio.wait_for(worker.read_frame(), timeout=self.load_timeout)
+            if status != _OK:
+                raise PiperWorkerError(payload.decode("utf-8", "replace"))
+            worker.sample_rate = int(payload)
+        except BaseException as e:
+            if proc is not None and proc.returncode is None:
+                proc.kill()
+            if not isinstance(e, asyncio.CancelledError):
+                self._broken[voice] = time.monotonic()
+                self.stats["spawn_failures"] += 1
+            self._spawning[voice] -= 1
+            self._wake(voice)
+            raise
+
+        self._spawning[voice] -= 1
+
+        self._broken.pop(voice, None)
+        self._workers.setdefault(voice, []).append(worker)
+        self.stats["spawned"] += 1
+        logger.info(f"🗣️ Piper worker ready: {voice} ({worker.sample_rate} Hz, "
+                    f"loaded in {time.monotonic() - start:.1f}s)")
+        return worker
+
+    async def stop(self):
+        """Close every worker (app shutdown)."""
+        workers = [w for pool in self._workers.values() for w in pool]
+        for worker in workers:
+            if worker.proc.stdin and not worker.proc.stdin.is_closing():
+                worker.proc.stdin.close()
+        for worker in workers:
+            try:
+                await asyncio.wait_for(worker.proc.wait(), timeout=2.0)
+            except asyncio.TimeoutError:
+                worker.kill()
+        self._workers.clear()
+        self._idle.clear()
+        if workers:
+            logger.info(f"Piper pool stopped ({len(workers)} workers)")
+
+    def get_stats(self) -> Dict[str, Any]:
+        utterances = self.stats["utterances"]
+        return {
+            **self.stats,
+            "installed": self._installed,
+            "workers": {voice: len(pool) for voice, pool in self._workers.items()},
+            "avg_latency_ms": round(self.stats["synth_seconds"] / utterances * 1000, 1) if utterances else 0.0,
+            "real_time_factor": round(self.stats["synth_seconds"] / self.stats["audio_seconds"], 3)
+                                if self.stats["audio_seconds"] else None,
+        }
+
+
+# Module-level singleton
+piper_pool = PiperPool(
+    voice_path=Path(getattr(settings, 'TTS_VOICE_PATH', './models/voices')),
+    workers_per_voice=getattr(settings, 'PIPER_WORKERS_PER_VOICE', 1),
+    timeout=getattr(settings, 'PIPER_TIMEOUT_S', 10.0)
+)
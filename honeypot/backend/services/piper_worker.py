@@ -0,0 +1,84 @@
+"""
+Piper Worker - long-lived local TTS process (one voice model per process).
+Started by services.piper_pool; reads utterances from stdin and writes raw
+16-bit mono PCM to stdout, so the ONNX model is loaded once, not per request.
+
+Framing (big-endian):
+    request:  u32 length + UTF-8 text
+    response: u8 status + u32 length + payload
+              status 0 = PCM, 1 = error message (UTF-8)
+    handshake (once, after the model loads): the same response frame with
+              status 0 and the sample rate as ASCII, or status 1 on failure.
+"""
+
+import argparse
+import struct
+import sys
+from typing import BinaryIO
+
+OK = 0
+ERROR = 1
+
+_REQUEST = struct.Struct(">I")
+_RESPONSE = struct.Struct(">BI")
+
+
+def write_frame(out: BinaryIO, status: int, payload: bytes):
+    out.write(_RESPONSE.pack(status, len(payload)))
+    out.write(payload)
+    out.flush()
+
+
+def read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = stream.read(size - len(data))
+        if not chunk:
+            raise EOFError
+        data += chunk
+    return data
+
+
+def _pcm(voice, text: str) -> bytes:
+    if hasattr(voice, "synthesize_stream_raw"):
+        # piper-tts < 1.3 yields raw int16 bytes directly
+        return b"".join(voice.synthesize_stream_raw(text))
+    return b"".join(chunk.audio_int16_bytes for chunk in voice.synthesize(text))
+
+
+def serve(voice, sample_rate: int, stdin: BinaryIO, stdout: BinaryIO):
+    """Handshake, then answer utterances until the parent closes stdin."""
+    write_frame(stdout, OK, str(sample_rate).encode())
+    while True:
+        try:
+            (size,) = _REQUEST.unpack(read_exact(stdin, _REQUEST.size))
+            text = read_exact(stdin, size).decode("utf-8")
+        except EOFError:
+            return
+        try:
+            write_frame(stdout, OK, _pcm(voice, text))
+        except Exception as e:
+            write_frame(stdout, ERROR, f"{type(e).__name__}: {e}".encode())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", required=True)
+    parser.add_argument("--config", default=None)
+    args = parser.parse_args()
+
+    stdin, stdout = sys.stdin.buffer, sys.stdout.buffer
+    # Anything piper / onnxruntime prints must not corrupt the PCM pipe
+    sys.stdout = sys.stderr
+
+    try:
+        from piper import PiperVoice
+        voice = PiperVoice.load(args.model, config_path=args.config)
+    except Exception as e:
+        write_frame(stdout, ERROR, f"Could not load {args.model}: {e}".encode())
+        return
+    serve(voice, voice.config.sample_rate, stdin, stdout)
+
+
+if __name__ == "__main__":
+    main()
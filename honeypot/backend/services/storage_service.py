@@ -1,13 +1,17 @@
 """
 Object Storage Service - MinIO / S3-compatible backend.
-Provides upload, download, presigned URL, and delete operations.
-Falls back to local filesystem if MinIO is unavailable.
+Provides upload, download, presigned URL, and delete operations, plus an async
+streaming API (multipart uploads, ranged downloads, batch deletes) for use
+from request handlers. Falls back to local filesystem if MinIO is unavailable.
 """
 
+import asyncio
 import io
 import logging
+import os
+import uuid
 from pathlib import Path
-from typing import Optional, BinaryIO
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, BinaryIO, Union
 from datetime import timedelta
 from urllib.parse import urljoin
 
@@ -57,31 +61,189 @@ def _get_minio_client():
 
 _LOCAL_STORAGE = Path(getattr(settings, "AUDIO_STORAGE_PATH", "./storage/audio"))
 _LOCAL_STORAGE.mkdir(parents=True, exist_ok=True)
+_LOCAL_ROOT = _LOCAL_STORAGE.resolve()
+
+
+# Streaming reads / local writes move this much per thread hop
+CHUNK_SIZE = 256 * 1024
+# Multipart part size; S3 requires >= 5 MiB for every part but the last
+PART_SIZE = max(5, getattr(settings, "MINIO_PART_SIZE_MB", 16)) * 1024 * 1024
+
+
+def _local_path(object_name: str) -> Path:
+    """
+    Filesystem path for an object key. Keys that resolve outside the storage
+    directory ("../..", absolute paths, symlinks out) raise ValueError.
+    """
+    path = (_LOCAL_ROOT / object_name).resolve()
+    if path == _LOCAL_ROOT or not path.is_relative_to(_LOCAL_ROOT):
+        raise ValueError(f"Invalid object key: {object_name!r}")
+    return path
 
 
 def _local_put(object_name: str, data: bytes, content_type: str = "application/octet-stream") -> str:
-    dest = _LOCAL_STORAGE / object_name
+    dest = _local_path(object_name)
     dest.parent.mkdir(parents=True, exist_ok=True)
     dest.write_bytes(data)
     return str(dest)
 
 
+def _local_put_stream(object_name: str, reader: BinaryIO) -> int:
+    """
+    Copy a reader into the object file. Written to a temp file and renamed so,
+    as with MinIO, readers never see a half-written object.
+    """
+    dest = _local_path(object_name)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex[:8]}.part")
+    size = 0
+    try:
+        with open(tmp, "wb") as f:
+            while chunk := reader.read(CHUNK_SIZE):
+                f.write(chunk)
+                size += len(chunk)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return size
+
+
+def _local_put_file(object_name: str, file_path: str) -> int:
+    dest = _local_path(object_name)
+    source = Path(file_path)
+    if dest.resolve() == source.resolve():
+        # Spooled straight into the fallback directory already
+        return source.stat().st_size
+    with open(source, "rb") as reader:
+        return _local_put_stream(object_name, reader)
+
+
 def _local_get(object_name: str) -> bytes:
-    path = _LOCAL_STORAGE / object_name
-    if not path.exists():
+    path = _local_path(object_name)
+    if not path.is_file():
         raise FileNotFoundError(f"Object not found: {object_name}")
     return path.read_bytes()
 
 
 def _local_delete(object_name: str):
-    path = _LOCAL_STORAGE / object_name
-    if path.exists():
+    path = _local_path(object_name)
+    if path.is_file():
         path.unlink()
 
 
 def _local_presigned_url(object_name: str) -> str:
     # Can't generate real presigned URLs locally; return a file path
-    return str(_LOCAL_STORAGE / object_name)
+    return str(_local_path(object_name))
+
+
+def _local_stat(object_name: str) -> Optional[Dict[str, Any]]:
+    try:
+        path = _local_path(object_name)
+    except ValueError:
+        return None
+    if not path.is_file():
+        return None
+    st = path.stat()
+    return {"size": st.st_size, "etag": None, "content_type": None, "last_modified": st.st_mtime}
+
+
+def _local_chunks(object_name: str, offset: int, length: Optional[int], chunk_size: int) -> Iterator[bytes]:
+    path = _local_path(object_name)
+    if not path.is_file():
+        raise FileNotFoundError(f"Object not found: {object_name}")
+    with open(path, "rb") as f:
+        f.seek(offset)
+        remaining = length
+        while remaining is None or remaining > 0:
+            chunk = f.read(chunk_size if remaining is None else min(chunk_size, remaining))
+            if not chunk:
+                break
+            if remaining is not None:
+                remaining -= len(chunk)
+            yield chunk
+
+
+def _local_list(prefix: str) -> List[str]:
+    names = []
+    for path in _LOCAL_STORAGE.rglob("*"):
+        if path.is_file() and not path.name.endswith(".part"):
+            name = path.relative_to(_LOCAL_STORAGE).as_posix()
+            if name.startswith(prefix):
+                names.append(name)
+    return sorted(names)
+
+
+def _local_delete_many(object_names: Iterable[str]) -> int:
+    removed = 0
+    for name in object_names:
+        try:
+            path = _local_path(name)
+        except ValueError:
+            continue
+        if path.is_file():
+            path.unlink()
+            removed += 1
+    return removed
+
+
+# --- Stream adapters ---
+
+class _IterReader(io.RawIOBase):
+    """File-like view over an iterator of byte chunks (read on a worker thread)."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self._buffer = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def _next_chunk(self) -> bytes:
+        return next(self._chunks, b"")
+
+    def read(self, size: int = -1) -> bytes:
+        while not self._buffer:
+            chunk = self._next_chunk()
+            if not chunk:
+                return b""
+            self._buffer = bytes(chunk)
+        if size is None or size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class _AsyncIterReader(_IterReader):
+    """
+    File-like view over an async iterator. read() runs on a worker thread and
+    pulls the next chunk from the event loop that owns the iterator.
+    """
+
+    def __init__(self, chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop):
+        super().__init__(iter(()))
+        self._achunks = chunks.__aiter__()
+        self._loop = loop
+
+    def _next_chunk(self) -> bytes:
+        async def pull():
+            try:
+                return await self._achunks.__anext__()
+            except StopAsyncIteration:
+                return b""
+        return asyncio.run_coroutine_threadsafe(pull(), self._loop).result()
+
+
+StreamSource = Union[bytes, bytearray, BinaryIO, Iterable[bytes], AsyncIterator[bytes]]
+
+
+def _as_reader(source: StreamSource, loop: asyncio.AbstractEventLoop) -> BinaryIO:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, "read"):
+        return source
+    if hasattr(source, "__aiter__"):
+        return _AsyncIterReader(source, loop)
+    return _IterReader(iter(source))
 
 
 # --- Public API ---
@@ -101,6 +263,12 @@ class StorageService:
             self._client = _get_minio_client()
             self._initialized = True
 
+    @property
+    def using_local(self) -> bool:
+        """True when objects are stored on the local filesystem."""
+        self._ensure_init()
+        return _use_local_fallback or self._client is None
+
     def upload(
         self,
         object_name: str,
@@ -139,9 +307,27 @@ class StorageService:
         file_path: str,
         content_type: str = "audio/wav",
     ) -> str:
-        """Upload a local file to storage."""
-        data = Path(file_path).read_bytes()
-        return self.upload(object_name, data, content_type)
+        """Upload a local file to storage (streamed; multipart above PART_SIZE)."""
+        self._ensure_init()
+
+        if _use_local_fallback or self._client is None:
+            _local_put_file(object_name, file_path)
+            return object_name
+
+        try:
+            self._client.fput_object(
+                settings.MINIO_BUCKET,
+                object_name,
+                file_path,
+                content_type=content_type,
+                part_size=PART_SIZE,
+            )
+            logger.debug(f"[minio] Uploaded {object_name} from {file_path}")
+            return object_name
+        except Exception as e:
+            logger.error(f"MinIO upload failed, using local fallback: {e}")
+            _local_put_file(object_name, file_path)
+            return object_name
 
     def download(self, object_name: str) -> bytes:
         """Download bytes from storage."""
@@ -202,7 +388,7 @@ class StorageService:
         self._ensure_init()
 
         if _use_local_fallback or self._client is None:
-            return (_LOCAL_STORAGE / object_name).exists()
+            return _local_stat(object_name) is not None
 
         try:
             self._client.stat_object(settings.MINIO_BUCKET, object_name)
@@ -211,5 +397,197 @@ class StorageService:
             return False
 
 
+    # ── Async streaming API ───────────────────────────────────────
+    # Blocking MinIO / filesystem calls run on worker threads, so these are
+    # safe to await from request handlers.
+
+    async def _ensure_init_async(self):
+        if not self._initialized:
+            # First use may probe MinIO over the network
+            await asyncio.to_thread(self._ensure_init)
+
+    async def put_stream(
+        self,
+        object_name: str,
+        source: StreamSource,
+        content_type: str = "application/octet-stream",
+        length: Optional[int] = None,
+    ) -> str:
+        """
+        Stream an object into storage without holding it in memory.
+
+        Args:
+            object_name: Object key
+            source: bytes, a binary file object, or a (async) iterator of chunks
+            content_type: Stored content type
+            length: Total size if known. Unknown sizes are uploaded as
+                multipart in PART_SIZE parts.
+
+        Returns:
+            The object_name (key) stored.
+        """
+        await self._ensure_init_async()
+        reader = _as_reader(source, asyncio.get_running_loop())
+        if length is None and isinstance(source, (bytes, bytearray, memoryview)):
+            length = len(source)
+
+        if self.using_local:
+            size = await asyncio.to_thread(_local_put_stream, object_name, reader)
+            logger.debug(f"[local] Streamed {object_name} ({size} bytes)")
+            return object_name
+
+        start = reader.tell() if getattr(reader, "seekable", lambda: False)() else None
+        try:
+            await asyncio.to_thread(
+                self._client.put_object,
+                settings.MINIO_BUCKET,
+                object_name,
+                reader,
+                length if length is not None else -1,
+                content_type=content_type,
+                part_size=PART_SIZE,
+            )
+            logger.debug(f"[minio] Streamed {object_name}")
+            return object_name
+        except Exception as e:
+            if start is None:
+                # A consumed iterator can't be replayed into the fallback
+                raise
+            logger.error(f"MinIO upload failed, using local fallback: {e}")
+            reader.seek(start)
+            await asyncio.to_thread(_local_put_stream, object_name, reader)
+            return object_name
+
+    async def put_file(
+        self,
+        object_name: str,
+        file_path: str,
+        content_type: str = "application/octet-stream",
+    ) -> str:
+        """Stream a local file into storage (multipart above PART_SIZE)."""
+        await self._ensure_init_async()
+        return await asyncio.to_thread(self.upload_file, object_name, file_path, content_type)
+
+    async def stream(
+        self,
+        object_name: str,
+        offset: int = 0,
+        length: Optional[int] = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield an object (or the byte range offset..offset+length) in chunks.
+
+        Raises:
+            FileNotFoundError: The object does not exist
+        """
+        await self._ensure_init_async()
+        if length == 0:
+            return
+
+        response = None
+        if not self.using_local:
+            try:
+                response = await asyncio.to_thread(
+                    self._client.get_object,
+                    settings.MINIO_BUCKET,
+                    object_name,
+                    offset=offset,
+                    length=length or 0,
+                )
+            except Exception as e:
+                logger.debug(f"MinIO download failed, trying local: {e}")
+
+        if response is not None:
+            chunks = response.stream(chunk_size)
+        else:
+            chunks = _local_chunks(object_name, offset, length, chunk_size)
+
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            if response is not None:
+                response.close()
+                response.release_conn()
+            else:
+                chunks.close()
+
+    async def get(self, object_name: str, offset: int = 0, length: Optional[int] = None) -> bytes:
+        """Download an object (or a byte range of it)."""
+        return b"".join([chunk async for chunk in self.stream(object_name, offset, length)])
+
+    async def stat(self, object_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns:
+            {"size", "etag", "content_type", "last_modified"} or None if missing
+        """
+        await self._ensure_init_async()
+        if self.using_local:
+            return await asyncio.to_thread(_local_stat, object_name)
+        try:
+            st = await asyncio.to_thread(self._client.stat_object, settings.MINIO_BUCKET, object_name)
+        except Exception:
+            return await asyncio.to_thread(_local_stat, object_name)
+        return {
+            "size": st.size,
+            "etag": st.etag,
+            "content_type": st.content_type,
+            "last_modified": st.last_modified.timestamp() if st.last_modified else None,
+        }
+
+    async def list_objects(self, prefix: str) -> List[str]:
+        """Keys under a prefix (recursive)."""
+        await self._ensure_init_async()
+        if self.using_local:
+            return await asyncio.to_thread(_local_list, prefix)
+
+        def _list():
+            return [
+                obj.object_name
+                for obj in self._client.list_objects(settings.MINIO_BUCKET, prefix=prefix, recursive=True)
+            ]
+        return await asyncio.to_thread(_list)
+
+    async def delete_many(self, object_names: Iterable[str]) -> int:
+        """
+        Delete objects in bulk (one multi-object delete request per 1000 keys).
+        Returns the number of objects removed.
+        """
+        await self._ensure_init_async()
+        names = list(object_names)
+        if not names:
+            return 0
+        if self.using_local:
+            return await asyncio.to_thread(_local_delete_many, names)
+
+        def _remove():
+            from minio.deleteobjects import DeleteObject
+            # remove_objects is lazy: draining the error iterator sends the requests
+            errors = list(self._client.remove_objects(
+                settings.MINIO_BUCKET, (DeleteObject(name) for name in names)
+            ))
+            for error in errors:
+                logger.warning(f"MinIO delete failed for {error.name}: {error.message}")
+            return len(names) - len(errors)
+
+        try:
+            removed = await asyncio.to_thread(_remove)
+            logger.debug(f"[minio] Deleted {removed} objects")
+            return removed
+        except Exception as e:
+            logger.error(f"MinIO batch delete failed: {e}")
+            return await asyncio.to_thread(_local_delete_many, names)
+
+    async def delete_prefix(self, prefix: str) -> int:
+        """Delete every object under a prefix (e.g. "<session_id>/")."""
+        if not prefix:
+            raise ValueError("Refusing to delete with an empty prefix")
+        return await self.delete_many(await self.list_objects(prefix))
+
+
 # Singleton instance
 storage = StorageService()
@@ -0,0 +1,280 @@
+"""
+TTS Audio Cache
+Content-addressed cache of synthesized audio shared by every TTS path
+(ElevenLabs, voice clones, Piper / gTTS / system). A byte-bounded in-memory LRU
+sits in front of a byte-bounded disk tier evicted least-recently-used first,
+so popular stall phrases cost neither API quota nor synthesis latency.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger("tts_cache")
+
+
+def tts_cache_key(
+    text: str,
+    voice_id: str,
+    model: str,
+    voice_settings: Optional[Dict[str, Any]] = None
+) -> str:
+    """sha256 over (text, voice, model, voice settings) in canonical form."""
+    payload = json.dumps(
+        [text, voice_id, model, voice_settings or {}],
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    Memory LRU + disk tier, both bounded in bytes.
+
+    Disk layout: <cache_dir>/<key[:2]>/<key>.<ext>. File mtimes carry the LRU
+    order across restarts (a hit touches the file).
+    """
+
+    def __init__(self, cache_dir: Path, memory_bytes: int, disk_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        # One clip may take at most this share of the memory tier
+        self.max_item_bytes = max(memory_bytes // 8, 1)
+
+        self._memory: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()  # key -> (audio, ext)
+        self._memory_used = 0
+        self._disk: "OrderedDict[str, Tuple[Path, int]]" = OrderedDict()    # key -> (path, size)
+        self._disk_used = 0
+        self._index_lock: Optional[asyncio.Lock] = None
+        self._index_ready = False
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "bytes_served": 0,
+            "bytes_stored": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0,
+        }
+
+    # ── Disk index ────────────────────────────────────────────────
+
+    def _scan(self) -> "OrderedDict[str, Tuple[Path, int]]":
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        found = []
+        for path in self.cache_dir.glob("*/*"):
+            if path.is_file() and not path.name.startswith("."):
+                st = path.stat()
+                found.append((st.st_mtime, path.stem, path, st.st_size))
+        found.sort()
+        return OrderedDict((key, (path, size)) for _, key, path, size in found)
+
+    async def _ensure_index(self):
+        if self._index_ready:
+            return
+        if self._index_lock is None:
+            self._index_lock = asyncio.Lock()
+        async with self._index_lock:
+            if self._index_ready:
+                return
+            try:
+                self._disk = await asyncio.to_thread(self._scan)
+            except OSError as e:
+                logger.warning(f"TTS cache directory unavailable ({e}), memory tier only")
+                self._disk = OrderedDict()
+            self._disk_used = sum(size for _, size in self._disk.values())
+            self._index_ready = True
+            if self._disk:
+                logger.info(f"🔊 TTS cache: {len(self._disk)} clips on disk "
+                            f"({self._disk_used / 1e6:.1f} MB)")
+
+    # ── Lookup ────────────────────────────────────────────────────
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Cached audio bytes for a key, from memory then disk, else None."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            self.stats["bytes_served"] += len(entry[0])
+            return entry[0]
+
+        await self._ensure_index()
+        disk_entry = self._disk.get(key)
+        if disk_entry is not None:
+            path, _ = disk_entry
+            try:
+                data = await asyncio.to_thread(self._read_and_touch, path)
+            except OSError:
+                self._forget_disk(key)
+            else:
+                self._disk.move_to_end(key)
+                self._remember(key, data, path.suffix.lstrip("."))
+                self.stats["disk_hits"] += 1
+                self.stats["bytes_served"] += len(data)
+                return data
+
+        self.stats["misses"] += 1
+        return None
+
+    async def link_to(self, key: str, dest: Path) -> bool:
+        """
+        Materialize a cached clip at `dest` (hard link to the disk copy when
+        possible, else a copy). Returns False on a miss.
+        """
+        dest = Path(dest)
+        await self._ensure_index()
+        disk_entry = self._disk.get(key)
+        if disk_entry is not None:
+            try:
+                await asyncio.to_thread(self._link, disk_entry[0], dest)
+            except OSError:
+                self._forget_disk(key)
+            else:
+                self._disk.move_to_end(key)
+                self.stats["disk_hits"] += 1
+                self.stats["bytes_served"] += disk_entry[1]
+                return True
+
+        data = await self.get(key)
+        if data is None:
+            return False
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(dest.write_bytes, data)
+        return True
+
+    # ── Store ─────────────────────────────────────────────────────
+
+    async def put(self, key: str, data: bytes, ext: str = "mp3"):
+        """Store a synthesized clip in both tiers."""
+        if not data:
+            return
+        self._remember(key, data, ext)
+        self.stats["stores"] += 1
+        self.stats["bytes_stored"] += len(data)
+
+        await self._ensure_index()
+        if key in self._disk or len(data) > self.disk_bytes:
+            return
+        path = self.cache_dir / key[:2] / f"{key}.{ext}"
+        try:
+            await asyncio.to_thread(self._write_atomic, path, data)
+        except OSError as e:
+            logger.warning(f"TTS cache disk write failed: {e}")
+            return
+        # A concurrent put of the same key may have finished the write first
+        self._forget_disk(key)
+        self._disk[key] = (path, len(data))
+        self._disk_used += len(data)
+        await self._evict_disk()
+
+    async def put_file(self, key: str, file_path: str):
+        """Store a clip a synthesizer already wrote to disk."""
+        path = Path(file_path)
+        try:
+            data = await asyncio.to_thread(path.read_bytes)
+        except OSError as e:
+            logger.warning(f"TTS cache could not read {path}: {e}")
+            return
+        await self.put(key, data, path.suffix.lstrip(".") or "wav")
+
+    def clear_memory(self):
+        self._memory.clear()
+        self._memory_used = 0
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    def _remember(self, key: str, data: bytes, ext: str):
+        if len(data) > self.max_item_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_used -= len(old[0])
+        self._memory[key] = (data, ext)
+        self._memory_used += len(data)
+        while self._memory_used > self.memory_bytes and self._memory:
+            _, (evicted, _) = self._memory.popitem(last=False)
+            self._memory_used -= len(evicted)
+            self.stats["memory_evictions"] += 1
+
+    async def _evict_disk(self):
+        victims = []
+        while self._disk_used > self.disk_bytes and self._disk:
+            key, (path, size) = self._disk.popitem(last=False)
+            self._disk_used -= size
+            victims.append(path)
+        if victims:
+            self.stats["disk_evictions"] += len(victims)
+            await asyncio.to_thread(self._unlink_all, victims)
+
+    def _forget_disk(self, key: str):
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_used -= entry[1]
+
+    @staticmethod
+    def _read_and_touch(path: Path) -> bytes:
+        data = path.read_bytes()
+        os.utime(path)
+        return data
+
+    @staticmethod
+    def _link(source: Path, dest: Path):
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(source, dest)
+        except OSError:
+            shutil.copyfile(source, dest)
+        os.utime(source)
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _unlink_all(paths):
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_used,
+            "memory_limit_bytes": self.memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_used,
+            "disk_limit_bytes": self.disk_bytes,
+        }
+
+
+# Module-level singleton
+tts_cache = TTSCache(
+    cache_dir=Path(getattr(settings, 'AUDIO_STORAGE_PATH', './storage/audio')) / 'tts_cache',
+    memory_bytes=getattr(settings, 'TTS_CACHE_MEMORY_MB', 64) * 1024 * 1024,
+    disk_bytes=getattr(settings, 'TTS_CACHE_DISK_MB', 1024) * 1024 * 1024
+)
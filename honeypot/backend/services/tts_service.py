@@ -3,9 +3,10 @@ Text-to-Speech Service using Piper TTS
 Generates natural-sounding voice from text
 """
 
-import os
+import asyncio
 import logging
-import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional, Dict
 import hashlib
@@ -23,7 +24,10 @@ except ImportError:
     GTTS_AVAILABLE = False
 
 from config import settings
-from services.elevenlabs_service import elevenlabs_service
+from core.rate_limiter import get_rate_limiter, request_with_limit
+from services.elevenlabs_service import DEFAULT_VOICE_SETTINGS, elevenlabs_service
+from services.piper_pool import piper_pool
+from services.tts_cache import tts_cache, tts_cache_key
 
 logger = logging.getLogger("tts_service")
 
@@ -50,6 +54,9 @@ class TTSService:
         
         self._pyttsx3_engine = None
         self._initialized = False
+        # pyttsx3 engines must be created and driven from one thread
+        self._system_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyttsx3")
+        self._warm_task = None
     
     def initialize(self):
         """
@@ -94,7 +101,7 @@ class TTSService:
             }
         """
         if not self._initialized:
-            self.initialize()
+            await asyncio.get_running_loop().run_in_executor(self._system_executor, self.initialize)
         
         try:
             # Generate unique filename
@@ -110,23 +117,28 @@ class TTSService:
             
             # Try ElevenLabs first (Primary high-quality TTS)
              
-                
-            # Try Piper next (Local fallback)
-            if self.engine_type == 'piper':
-                success = self._synthesize_piper(text, str(output_file), language)
-                if success:
-                    return self._build_result(str(output_file), language)
             
-            # Fallback to gTTS (Higher quality online fallback)
+            # Shared TTS cache: same phrase synthesized for any earlier session.
+            # Clips are keyed by the engine that produced them and engines are
+            # tried in order, so a fallback clip never stands in for Piper's.
+            voice = self.voice_map.get(language, self.voice_map['en'])
+            engines = []
+            if self.engine_type == 'piper':
+                engines.append(('piper', lambda: self._synthesize_piper(text, str(output_file), language)))
             if GTTS_AVAILABLE:
-                success = self._synthesize_gtts(text, str(output_file), language)
-                if success:
-                    return self._build_result(str(output_file), language)
-
-            # Fallback to system TTS
+                engines.append(('gtts', lambda: asyncio.to_thread(
+                    self._synthesize_gtts, text, str(output_file), language)))
             if self._pyttsx3_engine:
-                self._synthesize_system(text, str(output_file))
-                return self._build_result(str(output_file), language)
+                engines.append(('system', lambda: self._run_system(text, str(output_file))))
+
+            for engine, synthesize in engines:
+                cache_key = tts_cache_key(text, voice, engine)
+                if await tts_cache.link_to(cache_key, output_file):
+                    logger.info(f"TTS cache hit ({engine}): {output_file}")
+                    return await self._build_result(str(output_file), language)
+                if await synthesize():
+                    await tts_cache.put_file(cache_key, str(output_file))
+                    return await self._build_result(str(output_file), language)
             
             # If all fails, return error
             logger.error("No TTS engine available")
@@ -136,48 +148,46 @@ class TTSService:
             logger.error(f"TTS synthesis failed: {e}", exc_info=True)
             return self._fallback_synthesis()
     
-    def _synthesize_piper(self, text: str, output_file: str, language: str) -> bool:
+    async def _run_system(self, text: str, output_file: str) -> bool:
+        await asyncio.get_running_loop().run_in_executor(
+            self._system_executor, self._synthesize_system, text, output_file
+        )
+        return True
+    
+    async def _synthesize_piper(self, text: str, output_file: str, language: str) -> bool:
         """
-        Synthesize using Piper TTS (subprocess call)
+        Synthesize using the Piper worker pool (model stays loaded between calls)
         """
-        try:
-            voice_model = self.voice_map.get(language, self.voice_map['en'])
-            voice_file = self.voice_path / f"{voice_model}.onnx"
-            
-            if not voice_file.exists():
-                logger.warning(f"Piper voice model not found: {voice_file}")
-                return False
-            
-            # Call piper CLI
-            cmd = [
-                "piper",
-                "--model", str(voice_file),
-                "--output_file", output_file
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                input=text.encode('utf-8'),
-                capture_output=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0 and os.path.exists(output_file):
-                logger.info(f"Piper synthesis successful: {output_file}")
-                return True
-            else:
-                logger.error(f"Piper synthesis failed: {result.stderr.decode()}")
-                return False
-                
-        except subprocess.TimeoutExpired:
-            logger.error("Piper synthesis timeout")
+        voice_model = self.voice_map.get(language, self.voice_map['en'])
+        if not piper_pool.available(voice_model):
+            logger.warning(f"Piper voice unavailable: {piper_pool.model_for(voice_model)}")
             return False
-        except FileNotFoundError:
-            logger.warning("Piper CLI not found. Install: pip install piper-tts")
+        
+        result = await piper_pool.synthesize(text, voice_model)
+        if result is None:
             return False
-        except Exception as e:
-            logger.error(f"Piper synthesis error: {e}")
+        
+        pcm, sample_rate = result
+        try:
+            await asyncio.to_thread(self._write_wav, output_file, pcm, sample_rate)
+        except OSError as e:
+            logger.error(f"Piper output write failed: {e}")
             return False
+        logger.info(f"Piper synthesis successful: {output_file}")
+        return True
+    
+    @staticmethod
+    def _write_wav(output_file: str, pcm: bytes, sample_rate: int):
+        with wave.open(output_file, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(sample_rate)
+            wav.writeframes(pcm)
+    
+    def warm_offline(self):
+        """Load the default Piper voice in the background (app startup)."""
+        if self.engine_type == 'piper':
+            self._warm_task = asyncio.create_task(piper_pool.warm([self.voice_map['en']]))
     
     def _synthesize_gtts(self, text: str, output_file: str, language: str) -> bool:
         """
@@ -205,30 +215,27 @@ class TTSService:
             logger.error(f"System TTS synthesis failed: {e}")
             raise
     
-    def _build_result(self, audio_path: str, language: str) -> Dict[str, any]:
+    async def _build_result(self, audio_path: str, language: str) -> Dict[str, any]:
         """
         Build synthesis result dictionary.
-        Uploads the audio to Cloudinary and returns the secure URL.
+        Queues the Cloudinary upload; audio_path stays the local file.
         """
         # Get audio duration (approximate)
         duration = self._estimate_duration(audio_path)
         
-        # Upload to Cloudinary for persistent storage
-        audio_url = audio_path  # fallback to local path if upload fails
+        # Cloud copy is uploaded in the background; the local file serves meanwhile
+        upload_job_id = None
         try:
-            from services.cloudinary_service import cloudinary_service, FOLDER_AUDIO_SYNTHESIZED
-            with open(audio_path, "rb") as f:
-                audio_bytes = f.read()
-            audio_url = cloudinary_service.upload_audio(
-                audio_bytes,
-                Path(audio_path).name,
-                folder=FOLDER_AUDIO_SYNTHESIZED
-            )
+            from services.cloudinary_service import FOLDER_AUDIO_SYNTHESIZED
+            from services.upload_queue import upload_queue
+            upload_job_id = await upload_queue.enqueue(audio_path, folder=FOLDER_AUDIO_SYNTHESIZED)
         except Exception as e:
-            logger.error(f"Cloudinary upload failed, using local path: {e}")
+            logger.error(f"Could not queue audio upload: {e}")
         
         return {
-            "audio_path": audio_url,
+            "audio_path": audio_path,
+            "audio_url": None,  # Filled in on the owning record once uploaded
+            "upload_job_id": upload_job_id,
             "duration": duration,
             "format": "wav",
             "language": language
@@ -286,31 +293,47 @@ class TTSService:
             voice_id = "21m00Tcm4TlvDq8ikWAM"  # Rachel (default free voice)
 
         model = getattr(settings, 'ELEVENLABS_MODEL', 'eleven_turbo_v2_5')
+        voice_settings = DEFAULT_VOICE_SETTINGS
+
+        cache_key = tts_cache_key(text, voice_id, model, voice_settings)
+        cached = await tts_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        limiter = get_rate_limiter(
+            "elevenlabs",
+            rate_per_minute=getattr(settings, 'ELEVENLABS_RATE_PER_MIN', 120),
+            burst=getattr(settings, 'ELEVENLABS_BURST', 5)
+        )
 
         try:
             async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"https://api.elevenlabs.io/v1/text-to-speech/{voice_id}",
-                    json={
-                        "text": text,
-                        "model_id": model,
-                        "voice_settings": {
-                            "stability": 0.5,
-                            "similarity_boost": 0.75,
-                            "style": 0.0,
-                            "use_speaker_boost": True
-                        }
-                    },
-                    headers={
-                        "Accept": "audio/mpeg",
-                        "Content-Type": "application/json",
-                        "xi-api-key": api_key
-                    },
-                    timeout=30.0
+                response = await request_with_limit(
+                    limiter,
+                    lambda: client.post(
+                        f"{settings.ELEVENLABS_BASE_URL}/text-to-speech/{voice_id}",
+                        json={
+                            "text": text,
+                            "model_id": model,
+                            "voice_settings": voice_settings
+                        },
+                        headers={
+                            "Accept": "audio/mpeg",
+                            "Content-Type": "application/json",
+                            "xi-api-key": api_key
+                        },
+                        timeout=30.0
+                    ),
+                    max_wait=5.0
                 )
 
+                if response is None:
+                    logger.warning("ElevenLabs quota exhausted for synthesize_to_bytes")
+                    return None
+
                 if response.status_code == 200:
                     logger.info(f"✅ synthesize_to_bytes: {len(response.content)} bytes")
+                    await tts_cache.put(cache_key, response.content, "mp3")
                     return response.content
                 else:
                     logger.error(f"ElevenLabs API error ({response.status_code}): {response.text}")
@@ -0,0 +1,357 @@
+"""
+Upload Queue - durable background uploads to Cloudinary / MinIO.
+Callers write the file locally, enqueue it and return the local handle at once;
+worker tasks upload with retry + exponential backoff and fill the cloud URL
+and upload_status into the owning record when done. Jobs live in MongoDB
+(`upload_jobs`) and are resumed on startup.
+"""
+
+import asyncio
+import logging
+import random
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from pymongo import ReturnDocument
+
+from config import settings
+from db.mongo import db
+
+logger = logging.getLogger("upload_queue")
+
+# Job / record upload_status values
+PENDING = "pending"
+UPLOADING = "uploading"
+UPLOADED = "uploaded"
+FAILED = "failed"
+
+
+class UploadQueue:
+    """
+    Worker pool draining upload jobs.
+
+    Job targets:
+        "cloudinary": kind "audio" (folder) or "report"
+        "minio":      object_name in the StorageService bucket
+    """
+
+    BACKOFF_BASE_S = 2.0
+    BACKOFF_MAX_S = 300.0
+
+    def __init__(self, workers: int = 2, max_attempts: int = 6):
+        self.worker_count = workers
+        self.max_attempts = max_attempts
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._jobs: Dict[str, Dict[str, Any]] = {}     # job_id -> job doc (not yet finished)
+        self._timers: Set[asyncio.TimerHandle] = set()
+        self.stats = {
+            "enqueued": 0,
+            "uploaded": 0,
+            "retries": 0,
+            "failed": 0,
+            "resumed": 0,
+            "bytes_uploaded": 0,
+        }
+
+    # ── Lifecycle ─────────────────────────────────────────────────
+
+    def _ensure_started(self):
+        if self._workers:
+            return
+        self._queue = asyncio.Queue()
+        self._workers = [
+            asyncio.create_task(self._worker(i), name=f"upload-worker-{i}")
+            for i in range(self.worker_count)
+        ]
+        logger.info(f"☁️ Upload queue started ({self.worker_count} workers)")
+
+    async def resume(self):
+        """Re-enqueue jobs left unfinished by a previous run (app startup)."""
+        self._ensure_started()
+        try:
+            cursor = db.upload_jobs.find({"status": {"$in": [PENDING, UPLOADING]}})
+            async for job in cursor:
+                if job["_id"] in self._jobs:
+                    continue
+                self._jobs[job["_id"]] = job
+                self._queue.put_nowait(job["_id"])
+                self.stats["resumed"] += 1
+        except Exception as e:
+            logger.error(f"Could not resume upload jobs: {e}")
+            return
+        if self.stats["resumed"]:
+            logger.info(f"☁️ Resumed {self.stats['resumed']} unfinished uploads")
+
+    async def stop(self):
+        """Cancel workers and retry timers; unfinished jobs resume next start."""
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+        for task in self._workers:
+            task.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            logger.info("Upload queue stopped")
+        self._workers = []
+        self._queue = None
+
+    # ── Submission ────────────────────────────────────────────────
+
+    async def enqueue(
+        self,
+        local_path: str,
+        target: str = "cloudinary",
+        kind: str = "audio",
+        folder: Optional[str] = None,
+        object_name: Optional[str] = None,
+        content_type: str = "application/octet-stream",
+        record: Optional[Dict[str, Any]] = None,
+        delete_local: bool = False
+    ) -> str:
+        """
+        Queue a local file for upload. Returns immediately.
+
+        Args:
+            local_path: File already written to local disk
+            target: "cloudinary" | "minio"
+            kind: Cloudinary helper to use: "audio" | "report"
+            folder: Cloudinary folder (audio)
+            object_name: MinIO key (defaults to the file name)
+            content_type: MinIO content type
+            record: Owning record to update when done:
+                {"collection": str, "filter": dict, "url_field": str,
+                 "status_field": str (default "upload_status")}
+            delete_local: Remove the local copy after a successful upload
+
+        Returns:
+            job_id
+        """
+        self._ensure_started()
+        now = datetime.utcnow()
+        job = {
+            "_id": uuid.uuid4().hex,
+            "target": target,
+            "kind": kind,
+            "local_path": str(local_path),
+            "folder": folder,
+            "object_name": object_name or Path(local_path).name,
+            "content_type": content_type,
+            "records": [record] if record else [],
+            "delete_local": delete_local,
+            "status": PENDING,
+            "attempts": 0,
+            "result_url": None,
+            "last_error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        try:
+            await db.upload_jobs.insert_one(job)
+        except Exception as e:
+            # Still upload; the job just won't survive a restart
+            logger.warning(f"Upload job not persisted ({e}), keeping in memory")
+
+        self._jobs[job["_id"]] = job
+        self._queue.put_nowait(job["_id"])
+        self.stats["enqueued"] += 1
+        return job["_id"]
+
+    async def attach(
+        self,
+        job_id: Optional[str],
+        collection: str,
+        filter: Dict[str, Any],
+        url_field: str,
+        status_field: str = "upload_status"
+    ):
+        """
+        Link a record created after enqueue() (e.g. the chat message holding a
+        TTS reply) so it receives the URL. Applied at once if already finished.
+        """
+        if not job_id:
+            return
+        record = {
+            "collection": collection,
+            "filter": filter,
+            "url_field": url_field,
+            "status_field": status_field,
+        }
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job["records"].append(record)
+        try:
+            stored = await db.upload_jobs.find_one_and_update(
+                {"_id": job_id},
+                {"$push": {"records": record}},
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            logger.debug(f"Upload job attach not persisted: {e}")
+            stored = job
+        if stored and stored.get("status") in (UPLOADED, FAILED):
+            await self._update_record(record, stored["status"], stored.get("result_url"))
+
+    # ── Workers ───────────────────────────────────────────────────
+
+    async def _worker(self, index: int):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Upload worker {index} failed on {job_id}: {e}", exc_info=True)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]):
+        job["attempts"] += 1
+        await self._save(job, status=UPLOADING, attempts=job["attempts"])
+
+        try:
+            url, size = await self._upload(job)
+        except Exception as e:
+            await self._handle_failure(job, e)
+            return
+
+        self._jobs.pop(job["_id"], None)
+        self.stats["uploaded"] += 1
+        self.stats["bytes_uploaded"] += size
+        stored = await self._save(job, status=UPLOADED, result_url=url, last_error=None)
+
+        for record in (stored or job).get("records", []):
+            await self._update_record(record, UPLOADED, url)
+
+        if job.get("delete_local") and not self._is_local_copy(job):
+            try:
+                Path(job["local_path"]).unlink(missing_ok=True)
+            except OSError:
+                pass
+        logger.debug(f"☁️ Uploaded {job['local_path']} → {url}")
+
+    async def _upload(self, job: Dict[str, Any]):
+        path = Path(job["local_path"])
+        if not path.exists():
+            raise FileNotFoundError(f"Local file gone: {path}")
+
+        if job["target"] == "minio":
+            from services.storage_service import storage
+            size = path.stat().st_size
+            await storage.put_file(job["object_name"], str(path), job["content_type"])
+            return job["object_name"], size
+
+        from services.cloudinary_service import cloudinary_service
+        data = await asyncio.to_thread(path.read_bytes)
+        if job["kind"] == "report":
+            url = await asyncio.to_thread(cloudinary_service.upload_report, data, path.name)
+        else:
+            url = await asyncio.to_thread(
+                cloudinary_service.upload_audio, data, path.name, job["folder"] or "honeybadger/audio"
+            )
+        return url, len(data)
+
+    @staticmethod
+    def _is_local_copy(job: Dict[str, Any]) -> bool:
+        """MinIO in local-fallback mode stores the upload at the spool path itself."""
+        if job["target"] != "minio":
+            return False
+        from services.storage_service import storage
+        return storage.using_local
+
+    async def _handle_failure(self, job: Dict[str, Any], error: Exception):
+        if job["attempts"] >= self.max_attempts or isinstance(error, FileNotFoundError):
+            self._jobs.pop(job["_id"], None)
+            self.stats["failed"] += 1
+            logger.error(f"❌ Upload gave up after {job['attempts']} attempts: {job['local_path']} ({error})")
+            stored = await self._save(job, status=FAILED, last_error=str(error))
+            for record in (stored or job).get("records", []):
+                await self._update_record(record, FAILED, None)
+            return
+
+        # Exponential backoff with jitter
+        delay = min(self.BACKOFF_MAX_S, self.BACKOFF_BASE_S * 2 ** (job["attempts"] - 1))
+        delay *= random.uniform(0.8, 1.2)
+        self.stats["retries"] += 1
+        logger.warning(f"Upload attempt {job['attempts']} failed for {job['local_path']}: {error} "
+                       f"(retrying in {delay:.0f}s)")
+        await self._save(
+            job,
+            status=PENDING,
+            last_error=str(error),
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=delay)
+        )
+        self._schedule_retry(job["_id"], delay)
+
+    def _schedule_retry(self, job_id: str, delay: float):
+        def _enqueue():
+            self._timers.discard(timer)
+            if self._queue is not None:
+                self._queue.put_nowait(job_id)
+
+        timer = asyncio.get_running_loop().call_later(delay, _enqueue)
+        self._timers.add(timer)
+
+    # ── Persistence ───────────────────────────────────────────────
+
+    async def _save(self, job: Dict[str, Any], **fields) -> Optional[Dict[str, Any]]:
+        job.update(fields)
+        job["updated_at"] = datetime.utcnow()
+        try:
+            return await db.upload_jobs.find_one_and_update(
+                {"_id": job["_id"]},
+                {"$set": {**fields, "updated_at": job["updated_at"]}},
+                return_document=ReturnDocument.AFTER
+            )
+        except Exception as e:
+            logger.debug(f"Upload job state not persisted: {e}")
+            return None
+
+    async def _update_record(self, record: Dict[str, Any], status: str, url: Optional[str]):
+        update: Dict[str, Any] = {record.get("status_field", "upload_status"): status}
+        if url:
+            update[record["url_field"]] = url
+        try:
+            await getattr(db, record["collection"]).update_one(record["filter"], {"$set": update})
+        except Exception as e:
+            logger.error(f"Failed to record upload result on {record['collection']}: {e}")
+
+    # ── Introspection ─────────────────────────────────────────────
+
+    async def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            try:
+                job = await db.upload_jobs.find_one({"_id": job_id})
+            except Exception:
+                return None
+        if job is None:
+            return None
+        return {
+            "job_id": job["_id"],
+            "status": job["status"],
+            "attempts": job["attempts"],
+            "result_url": job.get("result_url"),
+            "last_error": job.get("last_error"),
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "pending": len(self._jobs),
+            "depth": self._queue.qsize() if self._queue else 0,
+            "scheduled_retries": len(self._timers),
+            "workers": len(self._workers),
+        }
+
+
+# Module-level singleton
+upload_queue = UploadQueue(
+    workers=getattr(settings, 'UPLOAD_WORKERS', 2),
+    max_attempts=getattr(settings, 'UPLOAD_MAX_ATTEMPTS', 6)
+)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Per-call Python overhead of the LLM chains, before vs after the chain registry.
+Uses an in-process fake chat model, so only template / chain work is measured
+(no network). Fails if the registry is not cheaper than rebuilding chains.
+Run from honeypot/backend:  python test_chain_overhead.py [calls]
+"""
+import asyncio
+import importlib
+import sys
+import time
+sys.path.insert(0, ".")
+
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate
+
+from agents.chains import PARSERS, chain_registry
+
+# Importing these registers their chains
+CHAIN_MODULES = (
+    "agents.graph",
+    "agents.memory",
+    "agents.speech_naturalizer",
+    "features.live_takeover.takeover_agent",
+    "services.intelligence_extractor",
+    "services.scam_detector",
+)
+for module in CHAIN_MODULES:
+    importlib.import_module(module)
+
+REPLIES = {"str": "okay", "json": '{"ok": true}'}
+MIN_TOTAL_SAVING = 0.10     # registry vs rebuild, summed over every chain
+PER_CHAIN_NOISE = 1.25      # a single chain may not be this much slower than rebuilding
+
+
+def sample_inputs(prompt: ChatPromptTemplate) -> dict:
+    return {name: "Sir your KYC is pending, send OTP to 9876543210 now" for name in prompt.input_variables}
+
+
+async def per_call_us(build, inputs: dict, calls: int) -> float:
+    await build().ainvoke(inputs)   # warm-up
+    start = time.perf_counter()
+    for _ in range(calls):
+        await build().ainvoke(inputs)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+async def profile(calls: int) -> dict:
+    """Print and return {chain: (before_us, after_us)}."""
+    results = {}
+    print(f"{'chain':24} {'before µs':>10} {'after µs':>10} {'saved':>7}")
+    total_before = total_after = 0.0
+    for name in chain_registry.names():
+        spec = chain_registry._specs[name]
+        llm = FakeListChatModel(responses=[REPLIES[spec.parser]])
+        inputs = sample_inputs(spec.prompt)
+
+        def rebuild():
+            # What every call site used to do
+            prompt = ChatPromptTemplate.from_messages([("system", spec.system), ("user", spec.user)])
+            return prompt | llm | PARSERS[spec.parser]()
+
+        before = await per_call_us(rebuild, inputs, calls)
+        after = await per_call_us(lambda: chain_registry.get(name, llm), inputs, calls)
+        total_before += before
+        total_after += after
+        results[name] = (before, after)
+        print(f"{name:24} {before:10.0f} {after:10.0f} {1 - after / before:7.0%}")
+    print(f"{'total':24} {total_before:10.0f} {total_after:10.0f} {1 - total_after / total_before:7.0%}")
+    return results
+
+
+def test_chain_overhead(calls: int = 100):
+    results = asyncio.run(profile(calls))
+    assert results, "no chains registered"
+    for name, (before, after) in results.items():
+        assert after < before * PER_CHAIN_NOISE, f"{name}: {after:.0f} µs via registry vs {before:.0f} µs rebuilt"
+    total_before = sum(before for before, _ in results.values())
+    total_after = sum(after for _, after in results.values())
+    saving = 1 - total_after / total_before
+    assert saving >= MIN_TOTAL_SAVING, f"registry saves {saving:.0%} per call (expected >= {MIN_TOTAL_SAVING:.0%})"
+
+
+if __name__ == "__main__":
+    test_chain_overhead(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
+    print("✅ Chain registry reduces per-call overhead")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Domain reputation lookups: blocklist entries cover subdomains, allowlist
+entries only cover the exact host unless written as "*.domain", and a
+wildcard never reaches across shared-hosting suffixes.
+Run from honeypot/backend:  python test_domain_index.py
+"""
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, ".")
+
+from features.live_takeover.domain_index import DomainReputation
+
+BLOCKLIST = """
+# synced feed
+evil.xyz
+0.0.0.0 phish-kit.github.io
+https://sbi-kyc.sites.google.com/view/login
+"""
+
+ALLOWLIST = """
+onlinesbi.sbi
+*.hdfcbank.com
+google.com
+*.github.io
+"""
+
+
+def make_reputation(directory: Path) -> DomainReputation:
+    (directory / "blocklist.txt").write_text(BLOCKLIST)
+    (directory / "allowlist.txt").write_text(ALLOWLIST)
+    return DomainReputation(str(directory / "blocklist.txt"), str(directory / "allowlist.txt"))
+
+
+def test_domain_reputation():
+    with tempfile.TemporaryDirectory() as tmp:
+        reputation = make_reputation(Path(tmp))
+        cases = {
+            # Blocklist: the listed domain and everything under it
+            "evil.xyz": ("blocked", "evil.xyz"),
+            "login.evil.xyz": ("blocked", "evil.xyz"),
+            "phish-kit.github.io": ("blocked", "phish-kit.github.io"),
+            # Allowlist: exact host only...
+            "onlinesbi.sbi": ("allowed", "onlinesbi.sbi"),
+            "retail.onlinesbi.sbi": (None, None),
+            "google.com": ("allowed", "google.com"),
+            "mail.google.com": (None, None),
+            # ...unless wildcarded, which still stops at user-content hosts
+            "netbanking.hdfcbank.com": ("allowed", "*.hdfcbank.com"),
+            "hdfcbank.com": (None, None),
+            "sites.google.com": (None, None),
+            "sbi-kyc.sites.google.com": ("blocked", "sbi-kyc.sites.google.com"),
+            "anyone.github.io": (None, None),
+        }
+        for hostname, expected in cases.items():
+            got = reputation.check(hostname)
+            assert got == expected, f"{hostname}: expected {expected}, got {got}"
+
+
+if __name__ == "__main__":
+    test_domain_reputation()
+    print("✅ Domain reputation lookups OK")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+LLM provider routing under injected faults, against the local fake providers
+(real ChatGroq / ChatGoogleGenerativeAI clients over HTTP):
+  - slow Groq: traffic moves to Gemini after the first slow answers
+  - 429 storm: Groq is left alone for its Retry-After and calls fail over
+    at once instead of waiting it out
+  - transient 500s: every request still succeeds via failover
+Run from honeypot/backend:  python test_llm_failover.py
+"""
+import asyncio
+import socket
+import sys
+import time
+from typing import Dict
+sys.path.insert(0, ".")
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_groq import ChatGroq
+
+from agents.llm_router import PROVIDER_MAX_RETRIES, LLMRouter
+from fake_providers.server import FakeProviders
+
+REQUESTS = 12
+TOKENS = 200        # keeps the Groq token budget out of the picture
+FAST = {"latency": {"dist": "fixed", "median_ms": 150}, "tokens_per_s": 0}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def make_llms(scenario: str, env: Dict[str, str]):
+    """
+    Same clients the services build, pointed at the fakes' keys and base URLs
+    (not the process settings), with a model name per scenario so breaker /
+    scheduler state does not leak between scenarios.
+    """
+    groq = ChatGroq(temperature=0, model_name=f"llama-{scenario}", api_key=env["GROQ_API_KEY"],
+                    base_url=env["GROQ_BASE_URL"], max_retries=PROVIDER_MAX_RETRIES)
+    gemini = ChatGoogleGenerativeAI(model=f"gemini-{scenario}", temperature=0,
+                                    google_api_key=env["GEMINI_API_KEY"],
+                                    base_url=env["GEMINI_BASE_URL"], max_retries=PROVIDER_MAX_RETRIES)
+    return [groq, gemini]
+
+
+async def run_scenario(scenario: str, groq: dict, request_class: str = "live"):
+    """Send REQUESTS calls through a fresh router; returns (results, elapsed per call, routed, Groq hits)."""
+    router = LLMRouter()
+    async with FakeProviders(config={"groq": groq, "gemini": FAST}, port=_free_port()) as fakes:
+        llms = make_llms(scenario, fakes.env())
+        results, elapsed = [], []
+        for _ in range(REQUESTS):
+            started = time.perf_counter()
+            try:
+                reply = await router.arun(llms, lambda llm: llm.ainvoke("Sir your KYC is pending"),
+                                          request_class, tokens=TOKENS)
+                results.append(bool(reply.content))
+            except Exception:
+                results.append(False)
+            elapsed.append(time.perf_counter() - started)
+        groq_hits = fakes.state.get_stats()["groq"]["requests"]
+    stats = router.get_stats()
+    routed = stats["routed"].get(request_class, {})
+    print(f"{scenario:12} ok {sum(results)}/{REQUESTS}  routed {routed}  "
+          f"failovers {stats['failovers']}  slowest {max(elapsed) * 1000:.0f} ms  "
+          f"last {elapsed[-1] * 1000:.0f} ms  groq hits {groq_hits}")
+    return results, elapsed, routed, groq_hits
+
+
+def test_slow_groq():
+    results, elapsed, routed, _ = asyncio.run(run_scenario(
+        "slow", {"latency": {"dist": "fixed", "median_ms": 3000}, "tokens_per_s": 0}
+    ))
+    assert all(results)
+    # One slow answer is enough to rank Gemini first for live traffic
+    assert routed.get("googlegenerativeai:gemini-slow", 0) >= REQUESTS - 2, routed
+    assert max(elapsed[2:]) < 1.5, f"still slow after rerouting: {elapsed}"
+
+
+def test_429_storm():
+    results, elapsed, routed, groq_hits = asyncio.run(run_scenario(
+        "storm", {**FAST, "rate_limit_rate": 1.0, "retry_after_s": 30}
+    ))
+    assert all(results)
+    assert routed == {"googlegenerativeai:gemini-storm": REQUESTS}, routed
+    # Retry-After is 30 s: Groq is not retried inside it, and nobody waits it out
+    assert groq_hits == 1, f"Groq was called {groq_hits} times during its Retry-After"
+    assert max(elapsed) < 1.0, f"a call waited {max(elapsed):.1f}s behind the 429"
+
+
+def test_transient_500s():
+    results, _, routed, _ = asyncio.run(run_scenario(
+        "flaky", {**FAST, "error_rate": 0.3}, request_class="chat"
+    ))
+    assert all(results), "a request failed despite a healthy fallback"
+    assert sum(routed.values()) == REQUESTS
+
+
+if __name__ == "__main__":
+    test_slow_groq()
+    test_429_storm()
+    test_transient_500s()
+    print("✅ LLM router fails over under slow, rate-limited and flaky providers")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Async storage API against the filesystem stand-in (the MinIO fallback):
+streamed uploads from bytes / files / iterators, ranged downloads, stat,
+batch deletes, key containment, and rough throughput numbers.
+Run from honeypot/backend:  python test_storage_service.py
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+sys.path.insert(0, ".")
+
+import services.storage_service as storage_module
+from services.storage_service import StorageService
+
+SIZE = 32 * 1024 * 1024
+PAYLOAD = os.urandom(1024 * 1024) * (SIZE // (1024 * 1024))
+
+
+def local_storage() -> StorageService:
+    """A StorageService pinned to the filesystem fallback (no MinIO probe)."""
+    service = StorageService()
+    service._initialized = True
+    return service
+
+
+@contextmanager
+def storage_dir(root: Path):
+    """Point the filesystem fallback (set from settings at import) at `root`; restored on exit."""
+    saved = storage_module._LOCAL_STORAGE, storage_module._LOCAL_ROOT
+    root.mkdir(parents=True, exist_ok=True)
+    storage_module._LOCAL_STORAGE, storage_module._LOCAL_ROOT = root, root.resolve()
+    try:
+        yield
+    finally:
+        storage_module._LOCAL_STORAGE, storage_module._LOCAL_ROOT = saved
+
+
+def mb_per_s(nbytes: int, seconds: float) -> str:
+    return f"{nbytes / seconds / 1024 / 1024:,.0f} MB/s"
+
+
+async def check_round_trips(storage: StorageService):
+    await storage.put_stream("sessions/a/bytes.wav", b"RIFF0123456789")
+    assert await storage.get("sessions/a/bytes.wav") == b"RIFF0123456789"
+    assert await storage.get("sessions/a/bytes.wav", offset=4, length=3) == b"012"
+    assert await storage.get("sessions/a/bytes.wav", offset=10) == b"6789"
+
+    await storage.put_stream("sessions/a/iter.wav", iter([b"ab", b"cd", b"ef"]))
+
+    async def chunks():
+        for piece in (b"12", b"34"):
+            yield piece
+    await storage.put_stream("sessions/b/aiter.wav", chunks())
+    assert await storage.get("sessions/a/iter.wav") == b"abcdef"
+    assert await storage.get("sessions/b/aiter.wav") == b"1234"
+
+    info = await storage.stat("sessions/a/iter.wav")
+    assert info is not None and info["size"] == 6
+    assert await storage.stat("sessions/a/missing.wav") is None
+    try:
+        await storage.get("sessions/a/missing.wav")
+        raise AssertionError("missing object did not raise")
+    except FileNotFoundError:
+        pass
+
+    assert await storage.list_objects("sessions/a/") == ["sessions/a/bytes.wav", "sessions/a/iter.wav"]
+    assert await storage.delete_prefix("sessions/a/") == 2
+    assert await storage.list_objects("sessions/") == ["sessions/b/aiter.wav"]
+
+
+async def check_containment(storage: StorageService, outside: str):
+    secret = os.path.join(outside, "secret.txt")
+    with open(secret, "w") as f:
+        f.write("outside the storage directory")
+
+    for key in ("../secret.txt", "sessions/../../secret.txt", secret, ""):
+        assert await storage.stat(key) is None, f"stat({key!r}) escaped the storage directory"
+        for call in (storage.get(key), storage.put_stream(key, b"x")):
+            try:
+                await call
+                raise AssertionError(f"{key!r} was not rejected")
+            except ValueError:
+                pass
+    assert not storage.exists("../secret.txt")
+    assert await storage.delete_many(["../secret.txt"]) == 0
+    assert os.path.exists(secret)
+
+
+async def measure_throughput(storage: StorageService):
+    started = time.perf_counter()
+    await storage.put_stream("bench/bytes.bin", PAYLOAD)
+    put_bytes = time.perf_counter() - started
+
+    async def chunks():
+        for i in range(0, SIZE, 64 * 1024):
+            yield PAYLOAD[i:i + 64 * 1024]
+    started = time.perf_counter()
+    await storage.put_stream("bench/aiter.bin", chunks())
+    put_iter = time.perf_counter() - started
+
+    # Loop lag while streaming the object back
+    lag = 0.0
+    stop = asyncio.Event()
+
+    async def probe():
+        nonlocal lag
+        while not stop.is_set():
+            tick = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lag = max(lag, time.perf_counter() - tick - 0.005)
+    probing = asyncio.create_task(probe())
+    started = time.perf_counter()
+    received = 0
+    async for chunk in storage.stream("bench/bytes.bin"):
+        received += len(chunk)
+    read = time.perf_counter() - started
+    stop.set()
+    await probing
+    assert received == SIZE
+
+    await storage.delete_prefix("bench/")
+    print(f"{SIZE // 2**20} MiB: put_stream(bytes) {mb_per_s(SIZE, put_bytes)}, "
+          f"put_stream(async iterator) {mb_per_s(SIZE, put_iter)}, "
+          f"stream {mb_per_s(SIZE, read)} (max loop lag {lag * 1000:.1f} ms)")
+
+
+def test_storage_service():
+    storage = local_storage()
+    assert storage.using_local
+
+    async def run(tmp: str):
+        await check_round_trips(storage)
+        await check_containment(storage, tmp)
+        await measure_throughput(storage)
+
+    with tempfile.TemporaryDirectory() as tmp, storage_dir(Path(tmp) / "audio"):
+        asyncio.run(run(tmp))
+
+
+if __name__ == "__main__":
+    test_storage_service()
+    print("✅ Storage streaming API OK")
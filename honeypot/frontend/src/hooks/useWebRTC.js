@@ -4,6 +4,7 @@
 
 import { useState, useEffect, useRef, useCallback } from 'react';
 import WebRTCService from '../services/webrtc';
+import { PcmStreamPlayer, sampleRateFromFormat } from '../utils/pcmStreamPlayer';
 
 export const useWebRTC = (roomId, role = 'operator') => {
   const [isConnected, setIsConnected] = useState(false);
@@ -24,6 +25,7 @@ export const useWebRTC = (roomId, role = 'operator') => {
   const statsIntervalRef = useRef(null);
   const aiAudioContextRef = useRef(null);
   const originalAudioTrackRef = useRef(null);
+  const aiStreamRef = useRef(null);
   
   /**
    * Initialize WebRTC connection
@@ -180,6 +182,43 @@ export const useWebRTC = (roomId, role = 'operator') => {
           }
         });
 
+        // Streaming AI audio (TTS_STREAMING) — PCM chunks played as they arrive
+        socket.on('audio_chunk', async (data) => {
+          try {
+            if (data.final) return;
+            if (!aiAudioContextRef.current || aiAudioContextRef.current.state === 'closed') {
+              aiAudioContextRef.current = new (window.AudioContext || window.webkitAudioContext)();
+              aiStreamRef.current = null;
+            }
+            const ctx = aiAudioContextRef.current;
+            if (ctx.state === 'suspended') await ctx.resume();
+
+            // One destination per context; its track replaces the mic for the scammer
+            if (!aiStreamRef.current) {
+              const destNode = ctx.createMediaStreamDestination();
+              aiStreamRef.current = { destNode, player: new PcmStreamPlayer(ctx, destNode) };
+            }
+            const { destNode, player } = aiStreamRef.current;
+
+            if (data.seq === 0) {
+              console.log('%c🔊 [AI AUDIO] Streaming', 'color:cyan;font-weight:bold', data.text);
+              const pc = webrtcRef.current?.peerConnection;
+              const audioSender = pc?.getSenders().find(s => s.track?.kind === 'audio');
+              const aiTrack = destNode.stream.getAudioTracks()[0];
+              if (audioSender && audioSender.track !== aiTrack) {
+                if (!originalAudioTrackRef.current) {
+                  originalAudioTrackRef.current = audioSender.track;
+                }
+                await audioSender.replaceTrack(aiTrack);
+              }
+            }
+
+            player.push(data.audio, data.sample_rate || sampleRateFromFormat(data.format));
+          } catch (err) {
+            console.error('❌ [AI AUDIO] Stream chunk error:', err);
+          }
+        });
+
         // AI error — notify UI and revert mode
         socket.on('ai_error', (data) => {
           console.error('%c❌ [AI ERROR] ' + data.text, 'color:red;font-weight:bold', data);
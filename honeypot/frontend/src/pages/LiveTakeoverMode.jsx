@@ -12,6 +12,7 @@ import LiveCallControls from '../components/LiveCallControls';
 import IntelligenceStream from '../components/IntelligenceStream';
 import AICoachPanel from '../components/AICoachPanel';
 import liveService from '../services/liveApi';
+import { PcmStreamPlayer, sampleRateFromFormat } from '../utils/pcmStreamPlayer';
 
 const LiveTakeoverMode = () => {
   // ── State ──────────────────────────────────────────────────
@@ -42,6 +43,7 @@ const LiveTakeoverMode = () => {
   const mediaRecorderRef = useRef(null);
   const audioContextRef = useRef(null);
   const durationIntervalRef = useRef(null);
+  const streamPlayerRef = useRef(null);
 
   // ── WebSocket Event Handlers ───────────────────────────────
 
@@ -74,6 +76,10 @@ const LiveTakeoverMode = () => {
         }
       }),
 
+      liveService.on('ai_audio_chunk', (data) => {
+        if (!data.final) playAudioChunk(data);
+      }),
+
       liveService.on('coaching_scripts', (data) => {
         setCoachingScripts(data.scripts || []);
       }),
@@ -148,6 +154,21 @@ const LiveTakeoverMode = () => {
     }
   }, []);
 
+  // Streamed PCM chunks (TTS_STREAMING) scheduled back-to-back
+  const playAudioChunk = useCallback((data) => {
+    try {
+      if (!streamPlayerRef.current || streamPlayerRef.current.ctx.state === 'closed') {
+        const ctx = new (window.AudioContext || window.webkitAudioContext)();
+        streamPlayerRef.current = new PcmStreamPlayer(ctx);
+      }
+      const player = streamPlayerRef.current;
+      if (player.ctx.state === 'suspended') player.ctx.resume();
+      player.push(data.audio, sampleRateFromFormat(data.format));
+    } catch (e) {
+      console.error('Audio stream playback error:', e);
+    }
+  }, []);
+
   // ── Recording ──────────────────────────────────────────────
 
   const startRecording = useCallback(async () => {
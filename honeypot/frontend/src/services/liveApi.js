@@ -261,6 +261,9 @@ class LiveTakeoverService {
       case 'ai_response':
         this.emit('ai_response', msg);
         break;
+      case 'ai_audio_chunk':
+        this.emit('ai_audio_chunk', msg);
+        break;
       case 'coaching_scripts':
         this.emit('coaching_scripts', msg);
         break;
@@ -0,0 +1,67 @@
+/**
+ * PCM Stream Player
+ * Gap-free playback of streamed 16-bit mono PCM chunks (TTS_STREAMING)
+ */
+
+/**
+ * Decode a base64 PCM16 chunk into Float32 samples
+ */
+function pcm16ToFloat32(base64) {
+  const binary = atob(base64);
+  const samples = new Float32Array(Math.floor(binary.length / 2));
+  for (let i = 0; i < samples.length; i++) {
+    let value = binary.charCodeAt(2 * i) | (binary.charCodeAt(2 * i + 1) << 8);
+    if (value >= 0x8000) value -= 0x10000;
+    samples[i] = value / 0x8000;
+  }
+  return samples;
+}
+
+export class PcmStreamPlayer {
+  /**
+   * @param {AudioContext} ctx - Audio context to play through
+   * @param {AudioNode} [destination] - Defaults to ctx.destination
+   */
+  constructor(ctx, destination) {
+    this.ctx = ctx;
+    this.destination = destination || ctx.destination;
+    this.playhead = 0;
+    this.lastSource = null;
+  }
+
+  /**
+   * Schedule one chunk right after the previous one
+   */
+  push(base64, sampleRate = 16000) {
+    if (!base64) return;
+    const samples = pcm16ToFloat32(base64);
+    if (!samples.length) return;
+
+    const buffer = this.ctx.createBuffer(1, samples.length, sampleRate);
+    buffer.copyToChannel(samples, 0);
+    const source = this.ctx.createBufferSource();
+    source.buffer = buffer;
+    source.connect(this.destination);
+
+    // Small lead on the first chunk so scheduling jitter doesn't click
+    const startAt = Math.max(this.playhead, this.ctx.currentTime + 0.05);
+    source.start(startAt);
+    this.playhead = startAt + buffer.duration;
+    this.lastSource = source;
+  }
+
+  /**
+   * Seconds of audio still queued
+   */
+  get buffered() {
+    return Math.max(0, this.playhead - this.ctx.currentTime);
+  }
+}
+
+/**
+ * Parse the sample rate from an ElevenLabs output format ("pcm_16000")
+ */
+export function sampleRateFromFormat(format, fallback = 16000) {
+  const match = /^pcm_(\d+)$/.exec(format || '');
+  return match ? parseInt(match[1], 10) : fallback;
+}